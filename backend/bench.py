@@ -0,0 +1,292 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/bench.py
+# DESCRIÇÃO: Benchmark sem interface gráfica que compara a vazão e a latência
+#            dos mecanismos de IPC (Pipes, Sockets, Memória Compartilhada e
+#            arquivo mapeado em memória).
+#
+# USO: python -m backend.bench [--mecanismos pipes sockets ...]
+#                              [--tamanhos 16 4096 ...] [--mensagens 1000 ...]
+#                              [--concorrencia 1 4 ...] [--repeticoes 3]
+#                              [--salvar [ARQUIVO]] [--rotulo linha-base]
+#      (--salvar grava a execução no armazém de backend/resultados.py, que
+#       a compara com a linha de base)
+# -----------------------------------------------------------------------------
+
+import argparse  # Importa a biblioteca para ler as opções da linha de comando.
+import functools  # Importa partial() para registrar variantes de um mesmo benchmark.
+import json  # Importa a biblioteca para emitir os resultados em JSON.
+import math  # Importa ceil() para o posto dos percentis.
+import sys  # Importa a biblioteca do sistema para escrever na saída padrão.
+import time  # Importa a biblioteca de tempo para sincronizar os pares concorrentes.
+
+from backend.pipes import logic as pipes_logic  # Benchmark de eco via Pipes.
+from backend.sockets import logic as sockets_logic  # Benchmark de eco via Sockets (TCP e AF_UNIX).
+from backend.shared_memory import logic as shared_memory_logic  # Benchmark de eco via Memória Compartilhada.
+from backend.mmap_file import logic as mmap_file_logic  # Benchmark de eco via arquivo mapeado em memória.
+from backend.processos import METODOS_INICIO, PoolProcessos, obter_contexto  # Criação de processos e pool.
+from backend.resultados import ArmazemResultados, ARQUIVO_PADRAO, amostrar_valores  # Armazém dos resultados.
+from backend.matrizes import np  # NumPy, opcional: None se não estiver instalado.
+
+# Perfil de ajuste dos sockets medidos (backend/sockets/ajustes.py): o benchmark mede latência, e com o
+# Nagle ligado as mensagens pequenas em voo no pipelining esperam o ACK atrasado (~40 ms no p999). Só o
+# TCP_NODELAY: rearmar o QUICKACK a cada leitura custa mais do que economiza no eco.
+PERFIL_SOCKETS = "sem_nagle"
+
+# Registro dos mecanismos disponíveis: nome -> função que executa o benchmark de eco.
+# Cada função recebe (tamanho_payload, num_mensagens) e devolve um dicionário com
+# as latências de ida e volta ("latencias_ns") e a duração total ("duracao_ns").
+MECANISMOS = {
+    "pipes": pipes_logic.benchmark_eco,
+    "pipes_bytes": functools.partial(pipes_logic.benchmark_eco, modo="bytes"),
+    "pipes_fd": functools.partial(pipes_logic.benchmark_eco, modo="fd"),
+    "pipes_lote": functools.partial(pipes_logic.benchmark_eco, modo="lote"),
+    "pipes_hibrido": functools.partial(pipes_logic.benchmark_eco, modo="hibrido"),
+    "sockets": functools.partial(sockets_logic.benchmark_eco, perfil=PERFIL_SOCKETS),
+    "sockets_pipeline": functools.partial(sockets_logic.benchmark_pipeline, perfil=PERFIL_SOCKETS),
+    "sockets_unix": functools.partial(sockets_logic.benchmark_eco, transporte="unix", perfil=PERFIL_SOCKETS),
+    "sockets_unix_pipeline": functools.partial(sockets_logic.benchmark_pipeline, transporte="unix",
+                                               perfil=PERFIL_SOCKETS),
+    "shared_memory": shared_memory_logic.benchmark_eco,
+    "shared_memory_segmento": shared_memory_logic.benchmark_eco_segmento,
+    "mmap_file": mmap_file_logic.benchmark_eco,
+}
+
+# Payload de matriz NumPy de float64 (ver backend/matrizes.py), só com o NumPy instalado.
+if np is not None:
+    MECANISMOS.update({
+        "pipes_matriz": functools.partial(pipes_logic.benchmark_eco, modo="matriz"),
+        "sockets_matriz": functools.partial(sockets_logic.benchmark_eco, carga="matriz", perfil=PERFIL_SOCKETS),
+        "shared_memory_matriz": shared_memory_logic.benchmark_eco_matriz,
+    })
+
+# Mecanismos cujos processos precisam herdar buffers na criação (mp.RawArray) ou compartilhar o
+# rastreador de segmentos iniciado antes deles, e por isso não podem usar o pool: sempre criam
+# processos novos.
+MECANISMOS_SEM_POOL = {"shared_memory", "shared_memory_segmento", "shared_memory_matriz", "pipes_hibrido"}
+
+# Tamanhos de payload padrão: de 16 B até 64 MB, multiplicando por 16 a cada passo
+# (e incluindo os 64 MB do limite superior).
+TAMANHOS_PADRAO = [16, 256, 4096, 65536, 1 << 20, 16 << 20, 64 << 20]
+
+# Quantidades de mensagens padrão para cada ponto da varredura.
+MENSAGENS_PADRAO = [1000]
+
+# Volume máximo de dados (em bytes) movido em cada ponto da varredura. Limita o número
+# de mensagens para os payloads grandes, que de outra forma levariam minutos.
+MAX_BYTES_PADRAO = 256 << 20
+
+# Número mínimo de mensagens por ponto, mesmo quando o limite de bytes é atingido.
+MIN_MENSAGENS = 5
+
+# Quantidades de pares (processo que mede + processo de eco) executados ao mesmo tempo em cada ponto.
+CONCORRENCIA_PADRAO = [1]
+
+
+# Calcula o percentil 'p' (0-100) de uma lista já ordenada, pelo método do posto mais próximo.
+def percentil(valores_ordenados, p):
+    if not valores_ordenados:
+        return 0
+    # Posto = ceil(p/100 * N), de 1 a N. 'p' multiplica N antes da divisão para não arredondar 7% de 100
+    # para 7.000000000000001 (e o posto para 8).
+    indice = max(0, min(len(valores_ordenados) - 1, math.ceil(p * len(valores_ordenados) / 100) - 1))
+    return valores_ordenados[indice]
+
+
+# Converte o resultado bruto de um benchmark nas métricas que serão reportadas.
+def resumir(mecanismo, tamanho_payload, resultado, concorrencia=1):
+    latencias = sorted(resultado["latencias_ns"])
+    num_mensagens = len(latencias)
+    duracao_s = resultado["duracao_ns"] / 1e9
+    return {
+        "mecanismo": mecanismo,
+        "tamanho_payload": tamanho_payload,
+        "concorrencia": concorrencia,
+        "mensagens": num_mensagens,
+        "duracao_s": duracao_s,
+        "mensagens_por_s": num_mensagens / duracao_s if duracao_s else 0.0,
+        "mb_por_s": num_mensagens * tamanho_payload / duracao_s / 1e6 if duracao_s else 0.0,
+        "p50_us": percentil(latencias, 50) / 1e3,
+        "p99_us": percentil(latencias, 99) / 1e3,
+        "p999_us": percentil(latencias, 99.9) / 1e3,
+    }
+
+
+# Ajusta o número de mensagens de um ponto para respeitar o volume máximo de dados.
+def mensagens_para_ponto(tamanho_payload, num_mensagens, max_bytes):
+    limite = max(MIN_MENSAGENS, max_bytes // tamanho_payload)
+    return min(num_mensagens, limite)
+
+
+# Função executada por cada par concorrente: espera a largada comum, executa o benchmark e devolve as
+# latências junto com os instantes (relógio monotônico) de início e fim da região medida, que não
+# inclui a criação do processo de eco.
+def _executar_par(funcao, tamanho_payload, num_mensagens, largada, conn_resultado):
+    largada.wait()
+    resultado = funcao(tamanho_payload, num_mensagens)
+    fim = time.monotonic_ns()
+    conn_resultado.send((fim - resultado["duracao_ns"], fim, resultado["latencias_ns"]))
+    conn_resultado.close()
+
+
+# Executa 'concorrencia' cópias do benchmark ao mesmo tempo, cada uma em seu processo e com o seu
+# próprio processo de eco. A duração vai do primeiro início ao último fim, então a vazão do
+# resultado é a soma de todos os pares.
+def executar_concorrente(funcao, tamanho_payload, num_mensagens, concorrencia, metodo_inicio=None):
+    contexto = obter_contexto(metodo_inicio)
+    largada = contexto.Event()
+    processos = []
+    conexoes = []
+    for _ in range(concorrencia):
+        conn_resultado, conn_filho = contexto.Pipe(duplex=False)
+        processo = contexto.Process(target=_executar_par,
+                                    args=(funcao, tamanho_payload, num_mensagens, largada, conn_filho))
+        processo.start()
+        conn_filho.close()
+        processos.append(processo)
+        conexoes.append(conn_resultado)
+    largada.set()
+    resultados = [conn.recv() for conn in conexoes]
+    for processo in processos:
+        processo.join()
+    return {
+        "latencias_ns": [latencia for _, _, latencias in resultados for latencia in latencias],
+        "duracao_ns": max(fim for _, fim, _ in resultados) - min(inicio for inicio, _, _ in resultados),
+    }
+
+
+# Junta as repetições de um ponto num único resultado: as latências de todas, na ordem de medição, e a
+# soma das durações. A vazão de cada repetição vai em "mb_por_s_repeticoes", as amostras que o
+# comparador de backend/resultados.py usa no teste de regressão.
+def juntar_repeticoes(tamanho_payload, resultados):
+    return {
+        "latencias_ns": [latencia for resultado in resultados for latencia in resultado["latencias_ns"]],
+        "duracao_ns": sum(resultado["duracao_ns"] for resultado in resultados),
+        "mb_por_s_repeticoes": [len(resultado["latencias_ns"]) * tamanho_payload / resultado["duracao_ns"] * 1e3
+                                if resultado["duracao_ns"] else 0.0 for resultado in resultados],
+    }
+
+
+# Executa a varredura completa (mecanismo x tamanho x concorrência x quantidade), devolvendo um resumo
+# por ponto. Os processos de cada ponto são criados com 'metodo_inicio' ou reaproveitados de 'pool'
+# (só com concorrência 1: os pares concorrentes sempre criam processos novos). Cada ponto é medido
+# 'repeticoes' vezes; com 'amostras', o resumo inclui uma amostra das latências (para o armazém).
+def executar_varredura(mecanismos, tamanhos, mensagens, max_bytes=MAX_BYTES_PADRAO, metodo_inicio=None, pool=None,
+                       concorrencias=CONCORRENCIA_PADRAO, repeticoes=1, amostras=False):
+    for mecanismo in mecanismos:
+        funcao = MECANISMOS[mecanismo]
+        if pool is not None and mecanismo not in MECANISMOS_SEM_POOL:
+            funcao_serial = functools.partial(funcao, pool=pool)
+        else:
+            funcao_serial = functools.partial(funcao, metodo_inicio=metodo_inicio)
+        for tamanho in tamanhos:
+            for concorrencia in concorrencias:
+                for quantidade in mensagens:
+                    num_mensagens = mensagens_para_ponto(tamanho, quantidade, max_bytes)
+                    resultados = []
+                    for _ in range(repeticoes):
+                        if concorrencia == 1:
+                            resultados.append(funcao_serial(tamanho, num_mensagens))
+                        else:
+                            resultados.append(executar_concorrente(
+                                functools.partial(funcao, metodo_inicio=metodo_inicio), tamanho, num_mensagens,
+                                concorrencia, metodo_inicio))
+                    resultado = juntar_repeticoes(tamanho, resultados)
+                    resumo = resumir(mecanismo, tamanho, resultado, concorrencia)
+                    resumo["mb_por_s_repeticoes"] = resultado["mb_por_s_repeticoes"]
+                    if amostras:
+                        resumo["amostra_latencias_us"] = [latencia / 1e3 for latencia in
+                                                          amostrar_valores(resultado["latencias_ns"])]
+                    yield resumo
+
+
+# Formata um tamanho em bytes de forma legível (ex: 65536 -> "64 KB", 70000 -> "68.4 KB"): valores
+# inteiros sem casas decimais, os demais com uma.
+def formatar_tamanho(num_bytes):
+    for unidade in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024 or unidade == "GB":
+            return f"{num_bytes:.0f} {unidade}" if num_bytes == int(num_bytes) else f"{num_bytes:.1f} {unidade}"
+        num_bytes /= 1024
+
+
+# Imprime o cabeçalho da tabela de resultados.
+def imprimir_cabecalho():
+    print(f"{'mecanismo':<24}{'payload':>10}{'conc.':>6}{'msgs':>8}{'msgs/s':>12}{'MB/s':>10}"
+          f"{'p50 (us)':>12}{'p99 (us)':>12}{'p999 (us)':>12}", flush=True)
+
+
+# Imprime uma linha da tabela de resultados.
+def imprimir_linha(resumo):
+    print(f"{resumo['mecanismo']:<24}{formatar_tamanho(resumo['tamanho_payload']):>10}"
+          f"{resumo['concorrencia']:>6}{resumo['mensagens']:>8}{resumo['mensagens_por_s']:>12.0f}{resumo['mb_por_s']:>10.1f}"
+          f"{resumo['p50_us']:>12.1f}{resumo['p99_us']:>12.1f}{resumo['p999_us']:>12.1f}", flush=True)
+
+
+# Lê as opções da linha de comando.
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Benchmark de vazão e latência dos mecanismos de IPC.")
+    parser.add_argument("--mecanismos", nargs="+", choices=list(MECANISMOS), default=list(MECANISMOS),
+                        help="Mecanismos a medir (padrão: todos).")
+    parser.add_argument("--tamanhos", nargs="+", type=int, default=TAMANHOS_PADRAO,
+                        help="Tamanhos de payload em bytes (padrão: 16 B a 64 MB).")
+    parser.add_argument("--mensagens", nargs="+", type=int, default=MENSAGENS_PADRAO,
+                        help="Quantidades de mensagens por ponto da varredura.")
+    parser.add_argument("--concorrencia", nargs="+", type=int, default=CONCORRENCIA_PADRAO,
+                        help="Quantidades de pares medidos ao mesmo tempo, cada um com o seu processo de eco; "
+                             "as mensagens/s e os MB/s somam todos os pares.")
+    parser.add_argument("--max-bytes", type=int, default=MAX_BYTES_PADRAO,
+                        help="Volume máximo de dados por ponto; reduz as mensagens dos payloads grandes.")
+    parser.add_argument("--metodo-inicio", choices=METODOS_INICIO, default=None,
+                        help="Como os processos de cada ponto são criados (padrão: o da plataforma).")
+    parser.add_argument("--pool", action="store_true",
+                        help="Reaproveita processos pré-iniciados entre os pontos, em vez de criar novos "
+                             "(exceto na Memória Compartilhada).")
+    parser.add_argument("--repeticoes", type=int, default=1,
+                        help="Vezes que cada ponto é medido; a tabela mostra o conjunto, e a vazão de cada "
+                             "repetição é a amostra do teste de regressão (ver backend/resultados.py).")
+    parser.add_argument("--salvar", nargs="?", const=ARQUIVO_PADRAO, default=None, metavar="ARQUIVO",
+                        help="Grava a execução, com os dados da máquina e uma amostra das latências, no "
+                             "armazém de resultados (padrão: resultados/bench.jsonl).")
+    parser.add_argument("--rotulo", default=None,
+                        help="Com --salvar, rótulo da execução (ex: linha-base), para escolhê-la como base "
+                             "em 'python -m backend.resultados comparar --base-rotulo'.")
+    parser.add_argument("--json", action="store_true",
+                        help="Emite um objeto JSON por linha em vez da tabela.")
+    return parser
+
+
+# Ponto de entrada do benchmark.
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    armazem = execucao = None
+    if args.salvar:
+        armazem = ArmazemResultados(args.salvar)
+        execucao = armazem.iniciar_execucao(args.rotulo, {
+            "mecanismos": args.mecanismos, "tamanhos": args.tamanhos, "mensagens": args.mensagens,
+            "concorrencia": args.concorrencia, "max_bytes": args.max_bytes, "metodo_inicio": args.metodo_inicio,
+            "pool": args.pool, "repeticoes": args.repeticoes,
+        })
+    pool = PoolProcessos(1, args.metodo_inicio) if args.pool else None
+    if not args.json:
+        imprimir_cabecalho()
+    try:
+        for resumo in executar_varredura(args.mecanismos, args.tamanhos, args.mensagens, args.max_bytes,
+                                         args.metodo_inicio, pool, args.concorrencia, args.repeticoes,
+                                         amostras=armazem is not None):
+            if armazem is not None:
+                # Cada ponto é gravado assim que medido; a amostra das latências só vai para o armazém.
+                armazem.registrar_ponto(execucao, resumo)
+                resumo = {campo: valor for campo, valor in resumo.items() if campo != "amostra_latencias_us"}
+            if args.json:
+                print(json.dumps(resumo), flush=True)
+            else:
+                imprimir_linha(resumo)
+    finally:
+        if pool is not None:
+            pool.fechar()
+        if armazem is not None:
+            print(f"Execução {execucao} gravada em {armazem.caminho}.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
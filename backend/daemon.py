@@ -0,0 +1,486 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/daemon.py
+# DESCRIÇÃO: Serviço de backend de longa duração. Em vez de iniciar um novo
+#            interpretador Python a cada execução (importações, inicialização
+#            do multiprocessing, etc.), a GUI ou a linha de comando pedem ao
+#            daemon que execute um cenário.
+#
+# FUNCIONAMENTO:
+#   - O daemon escuta num socket de controle (AF_UNIX, ou TCP onde não houver).
+#   - Para cada mecanismo (pipes, sockets, shared_memory, mmap_file) há sempre um processo
+#     trabalhador "quente": já criado, com o módulo backend.<mecanismo>.logic
+#     importado, esperando um pedido.
+#   - Um pedido é um quadro JSON (protocolo de backend/sockets/protocolo.py)
+#     como {"mecanismo": "pipes", "argumentos": ["Olá", "--modo", "fd"]}.
+#   - O daemon entrega o socket do cliente ao trabalhador, que o coloca no
+#     lugar da sua saída padrão e de erro e chama main(argumentos). O cliente
+#     lê as linhas de log JSON exatamente como leria a saída de um subprocesso,
+#     até o socket fechar. Um novo trabalhador quente é criado na hora.
+#   - Se o cliente fechar a conexão antes do fim, o cenário é interrompido.
+#
+# PLATAFORMA: só POSIX (Linux, macOS). Cada cenário roda num grupo de processos
+# próprio (os.setpgrp), interrompido de uma vez com os.killpg; no Windows, o
+# daemon recusa iniciar e a GUI não oferece a opção.
+#
+# USO: python -m backend.daemon servir
+#      python -m backend.daemon executar pipes "Olá" --modo fd
+#      python -m backend.daemon status | encerrar
+# -----------------------------------------------------------------------------
+
+import argparse  # Importa a biblioteca para ler as opções da linha de comando.
+import importlib  # Importa a biblioteca para importar os módulos de lógica pelo nome.
+import json  # Importa a biblioteca para codificar os pedidos e respostas.
+import multiprocessing as mp  # Importa a biblioteca para criar e gerenciar os trabalhadores.
+import os  # Importa a biblioteca do sistema para redirecionar descritores e sinalizar processos.
+import selectors  # Importa o multiplexador de E/S do laço do daemon.
+import signal  # Importa os sinais usados para interromper um cenário.
+import socket  # Importa a biblioteca de Sockets.
+import subprocess  # Importa a biblioteca para iniciar o daemon em segundo plano.
+import sys  # Importa a biblioteca do sistema para a saída padrão e o executável do Python.
+import tempfile  # Importa a biblioteca para localizar o diretório temporário.
+import time  # Importa a biblioteca de tempo para esperar o daemon ficar pronto.
+from multiprocessing import reduction  # Importa o envio de descritores entre processos.
+
+from backend.sockets.protocolo import CABECALHO_QUADRO, enviar_quadro  # Quadros com prefixo de tamanho.
+
+# Mecanismos que o daemon mantém aquecidos.
+MECANISMOS = ["pipes", "sockets", "shared_memory", "mmap_file"]
+
+# Indica se o daemon funciona nesta plataforma (grupos de processos só existem no POSIX).
+DISPONIVEL = os.name == "posix"
+
+# Endereço padrão do socket de controle: um arquivo AF_UNIX por usuário, ou uma porta fixa de loopback.
+if DISPONIVEL and hasattr(socket, "AF_UNIX"):
+    ENDERECO_PADRAO = os.path.join(tempfile.gettempdir(), f"ipc_daemon_{os.getuid()}.sock")
+else:
+    ENDERECO_PADRAO = ("127.0.0.1", 50555)
+
+# Tempo máximo para um cliente enviar o pedido depois de conectar.
+TIMEOUT_PEDIDO = 5.0
+
+# Tamanho máximo do quadro de um pedido; acima dele, o pedido é recusado.
+TAMANHO_MAXIMO_PEDIDO = 1 << 20
+
+# Tempo máximo que garantir_daemon() espera o daemon recém-iniciado aceitar conexões.
+TIMEOUT_INICIO = 10.0
+
+# Diretório raiz do projeto, para iniciar o daemon com 'python -m backend.daemon'.
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Função executada por cada trabalhador quente. Importa o módulo do mecanismo e espera um pedido;
+# ao receber, assume o socket do cliente como saída padrão e executa o cenário uma única vez.
+def processo_trabalhador(mecanismo, conn, metodo_inicio):
+    modulo = importlib.import_module(f"backend.{mecanismo}.logic")
+    # Processos criados pelo forkserver herdam 'forkserver' como método de início padrão. Os cenários
+    # devem criar seus processos como numa execução direta (ex: 'fork' no Linux), sem esse desvio.
+    mp.set_start_method(metodo_inicio, force=True)
+    try:
+        argumentos = conn.recv()
+        fd_cliente = reduction.recv_handle(conn)
+    except EOFError:
+        # O daemon encerrou sem usar este trabalhador.
+        return
+    conn.close()
+
+    # Um grupo de processos próprio: interromper o cenário atinge também os processos filhos dele.
+    os.setpgrp()
+    # A saída padrão e a de erro passam a ser o socket do cliente.
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.dup2(fd_cliente, 1)
+    os.dup2(fd_cliente, 2)
+    os.close(fd_cliente)
+    sys.argv = [modulo.__file__, *argumentos]
+    try:
+        modulo.main(argumentos)
+    except SystemExit:
+        # Erros de argumentos do argparse já foram escritos na saída de erro (o socket).
+        pass
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+
+class Execucao:
+    """Um cenário em andamento: o trabalhador que o executa e a cópia do socket do cliente no daemon."""
+
+    def __init__(self, processo, sock_cliente):
+        self.processo = processo
+        self.sock_cliente = sock_cliente
+        self.cliente_conectado = True
+
+
+class DaemonIPC:
+    """Laço do daemon: aceita pedidos no socket de controle e os entrega aos trabalhadores quentes."""
+
+    def __init__(self, endereco=ENDERECO_PADRAO):
+        self.endereco = endereco
+        # Os trabalhadores nascem de um processo 'forkserver' limpo, que já importou os módulos de
+        # lógica. Assim cada novo trabalhador é um fork barato e não herda os sockets dos clientes
+        # atendidos pelo daemon (o que atrasaria o fim de arquivo que o cliente espera).
+        metodos = mp.get_all_start_methods()
+        self.contexto = mp.get_context("forkserver" if "forkserver" in metodos else "spawn")
+        if "forkserver" in metodos:
+            self.contexto.set_forkserver_preload([f"backend.{m}.logic" for m in MECANISMOS])
+        self.seletor = selectors.DefaultSelector()
+        # mecanismo -> (processo, conn) do trabalhador quente.
+        self.quentes = {}
+        # sentinela do processo -> Execucao.
+        self.execucoes = {}
+        self.execucoes_concluidas = 0
+        # Conexões de controle aceitas cujo pedido ainda não chegou inteiro: socket -> (bytes lidos, prazo).
+        self.pedidos = {}
+        self.rodando = False
+
+    # Cria o socket de controle. Um arquivo AF_UNIX antigo só é removido se ninguém responder nele.
+    def _criar_socket_controle(self):
+        if isinstance(self.endereco, str):
+            if os.path.exists(self.endereco):
+                try:
+                    conectar_daemon(self.endereco).close()
+                    raise RuntimeError(f"Já existe um daemon escutando em {self.endereco}.")
+                except (ConnectionRefusedError, FileNotFoundError):
+                    os.unlink(self.endereco)
+            s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        s.bind(self.endereco)
+        s.listen(64)
+        return s
+
+    # Cria o trabalhador quente de um mecanismo.
+    def _aquecer(self, mecanismo):
+        conn, conn_trabalhador = self.contexto.Pipe()
+        processo = self.contexto.Process(target=processo_trabalhador,
+                                         args=(mecanismo, conn_trabalhador, mp.get_start_method()),
+                                         name=f"trabalhador-{mecanismo}")
+        processo.start()
+        conn_trabalhador.close()
+        self.quentes[mecanismo] = (processo, conn)
+
+    # Aceita uma conexão de controle. O pedido é lido pelo próprio laço, à medida que chega
+    # (_ler_pedido): um cliente lento não segura os outros pedidos nem as execuções.
+    def _aceitar(self, sock_escuta):
+        sock_cliente, _ = sock_escuta.accept()
+        sock_cliente.setblocking(False)
+        self.pedidos[sock_cliente] = (bytearray(), time.monotonic() + TIMEOUT_PEDIDO)
+        self.seletor.register(sock_cliente, selectors.EVENT_READ, self._ler_pedido)
+
+    # Lê o que chegou do pedido de uma conexão de controle e o atende quando o quadro estiver completo.
+    def _ler_pedido(self, sock_cliente):
+        dados, _ = self.pedidos[sock_cliente]
+        try:
+            lidos = sock_cliente.recv(65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            lidos = b""
+        if not lidos:
+            # O cliente desistiu antes de enviar o pedido inteiro.
+            self._descartar_pedido(sock_cliente)
+            sock_cliente.close()
+            return
+        dados += lidos
+        if len(dados) < CABECALHO_QUADRO.size:
+            return
+        (tamanho,) = CABECALHO_QUADRO.unpack_from(dados)
+        if tamanho > TAMANHO_MAXIMO_PEDIDO:
+            self._descartar_pedido(sock_cliente)
+            self._responder(sock_cliente, {"erro": f"Pedido inválido: {tamanho} bytes."})
+            return
+        if len(dados) < CABECALHO_QUADRO.size + tamanho:
+            return
+
+        self._descartar_pedido(sock_cliente)
+        try:
+            pedido = json.loads(bytes(dados[CABECALHO_QUADRO.size:CABECALHO_QUADRO.size + tamanho]))
+        except ValueError as erro:
+            self._responder(sock_cliente, {"erro": f"Pedido inválido: {erro}"})
+            return
+        if not isinstance(pedido, dict):
+            self._responder(sock_cliente, {"erro": f"Pedido desconhecido: {pedido!r}"})
+            return
+        self._atender(sock_cliente, pedido)
+
+    # Tira uma conexão de controle da lista de pedidos pendentes e a devolve ao modo bloqueante, usado
+    # na resposta (e pelo trabalhador que recebe o socket).
+    def _descartar_pedido(self, sock_cliente):
+        del self.pedidos[sock_cliente]
+        self.seletor.unregister(sock_cliente)
+        sock_cliente.setblocking(True)
+
+    # Fecha as conexões de controle que não enviaram o pedido dentro de TIMEOUT_PEDIDO. Devolve quanto
+    # falta para o próximo prazo (None se não houver pedidos pendentes), o timeout do próximo select().
+    def _expirar_pedidos(self):
+        agora = time.monotonic()
+        for sock_cliente, (_, prazo) in list(self.pedidos.items()):
+            if prazo <= agora:
+                self._descartar_pedido(sock_cliente)
+                self._responder(sock_cliente, {"erro": "Pedido não recebido a tempo."})
+        prazos = [prazo for _, prazo in self.pedidos.values()]
+        return max(0.0, min(prazos) - agora) if prazos else None
+
+    # Atende um pedido completo.
+    def _atender(self, sock_cliente, pedido):
+        comando = pedido.get("comando", "executar")
+        if comando == "status":
+            self._responder(sock_cliente, self.status())
+        elif comando == "encerrar":
+            self._responder(sock_cliente, {"ok": True})
+            self.rodando = False
+        elif comando == "executar" and pedido.get("mecanismo") in MECANISMOS:
+            self._executar(sock_cliente, pedido["mecanismo"], list(pedido.get("argumentos", [])))
+        else:
+            self._responder(sock_cliente, {"erro": f"Pedido desconhecido: {pedido!r}"})
+
+    # Envia uma resposta curta (uma linha JSON) e fecha a conexão de controle.
+    def _responder(self, sock_cliente, resposta):
+        try:
+            sock_cliente.sendall((json.dumps(resposta) + "\n").encode("utf-8"))
+        except OSError:
+            pass
+        sock_cliente.close()
+
+    # Entrega o pedido ao trabalhador quente do mecanismo e já aquece o próximo.
+    def _executar(self, sock_cliente, mecanismo, argumentos):
+        processo, conn = self.quentes.pop(mecanismo)
+        conn.send(argumentos)
+        reduction.send_handle(conn, sock_cliente.fileno(), processo.pid)
+        conn.close()
+        self._aquecer(mecanismo)
+
+        # O daemon mantém sua cópia do socket para perceber se o cliente desistir.
+        execucao = Execucao(processo, sock_cliente)
+        self.execucoes[processo.sentinel] = execucao
+        self.seletor.register(processo.sentinel, selectors.EVENT_READ, self._execucao_terminou)
+        self.seletor.register(sock_cliente, selectors.EVENT_READ, self._cliente_desconectou)
+
+    # O cliente fechou a conexão (ou a GUI clicou em "Parar"): interrompe o cenário, se ainda rodando.
+    def _cliente_desconectou(self, sock_cliente):
+        for execucao in self.execucoes.values():
+            if execucao.sock_cliente is sock_cliente:
+                break
+        else:
+            return
+        self.seletor.unregister(sock_cliente)
+        execucao.cliente_conectado = False
+        try:
+            os.killpg(execucao.processo.pid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    # O trabalhador terminou o cenário: fecha a cópia do socket, e o cliente recebe o fim de arquivo.
+    def _execucao_terminou(self, sentinela):
+        execucao = self.execucoes.pop(sentinela)
+        self.seletor.unregister(sentinela)
+        if execucao.cliente_conectado:
+            self.seletor.unregister(execucao.sock_cliente)
+        execucao.processo.join()
+        execucao.sock_cliente.close()
+        self.execucoes_concluidas += 1
+
+    # Resumo do estado do daemon.
+    def status(self):
+        return {
+            "pid": os.getpid(),
+            "trabalhadores_quentes": {m: p.pid for m, (p, _) in self.quentes.items()},
+            "execucoes_em_andamento": len(self.execucoes),
+            "execucoes_concluidas": self.execucoes_concluidas,
+        }
+
+    # Executa o laço do daemon até receber o comando "encerrar".
+    def servir(self):
+        sock_escuta = self._criar_socket_controle()
+        for mecanismo in MECANISMOS:
+            self._aquecer(mecanismo)
+        self.seletor.register(sock_escuta, selectors.EVENT_READ, self._aceitar)
+        self.rodando = True
+        try:
+            while self.rodando:
+                for chave, _ in self.seletor.select(self._expirar_pedidos()):
+                    chave.data(chave.fileobj)
+        finally:
+            sock_escuta.close()
+            for sock_cliente in self.pedidos:
+                sock_cliente.close()
+            if isinstance(self.endereco, str) and os.path.exists(self.endereco):
+                os.unlink(self.endereco)
+            # Fechar a conexão de um trabalhador quente faz ele terminar sem executar nada.
+            for processo, conn in self.quentes.values():
+                conn.close()
+                processo.join()
+            for execucao in self.execucoes.values():
+                os.killpg(execucao.processo.pid, signal.SIGTERM)
+                execucao.processo.join()
+                execucao.sock_cliente.close()
+            self.seletor.close()
+
+
+# Conecta ao socket de controle do daemon.
+def conectar_daemon(endereco=ENDERECO_PADRAO):
+    if isinstance(endereco, str):
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            s.connect(endereco)
+        except OSError:
+            s.close()
+            raise
+        return s
+    return socket.create_connection(endereco)
+
+
+# Envia um pedido ao daemon e devolve o socket pelo qual chega a resposta.
+def enviar_pedido(pedido, endereco=ENDERECO_PADRAO):
+    s = conectar_daemon(endereco)
+    enviar_quadro(s, json.dumps(pedido).encode("utf-8"))
+    return s
+
+
+# Levanta um erro claro fora do POSIX, em vez de um AttributeError de os.setpgrp ou os.killpg.
+def exigir_posix():
+    if not DISPONIVEL:
+        raise OSError("O daemon de backend só funciona em sistemas POSIX (Linux, macOS).")
+
+
+# Inicia o daemon em segundo plano, se ainda não houver um respondendo, e espera ele aceitar conexões.
+def garantir_daemon(endereco=ENDERECO_PADRAO):
+    exigir_posix()
+    try:
+        conectar_daemon(endereco).close()
+        return
+    except OSError:
+        pass
+    comando = [sys.executable, "-m", "backend.daemon"]
+    if isinstance(endereco, str):
+        comando += ["--endereco", endereco]
+    comando.append("servir")
+    subprocess.Popen(comando, cwd=RAIZ_PROJETO, start_new_session=True,
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    limite = time.monotonic() + TIMEOUT_INICIO
+    while True:
+        try:
+            conectar_daemon(endereco).close()
+            return
+        except OSError:
+            if time.monotonic() > limite:
+                raise TimeoutError("O daemon de backend não respondeu a tempo.")
+            time.sleep(0.05)
+
+
+class SessaoDaemon:
+    """Uma execução de cenário no daemon, com a mesma interface usada pela GUI num subprocess.Popen
+    (stdout, stderr, poll, terminate, kill, wait), para que os dois caminhos sejam intercambiáveis.
+    """
+
+    def __init__(self, mecanismo, argumentos, endereco=ENDERECO_PADRAO):
+        self.sock = enviar_pedido({"comando": "executar", "mecanismo": mecanismo, "argumentos": argumentos},
+                                  endereco)
+        self._arquivo = self.sock.makefile("r", encoding="utf-8")
+        # Saída padrão e de erro chegam misturadas pelo mesmo socket.
+        self.stdout = _LinhasSessao(self)
+        self.stderr = None
+        self.returncode = None
+
+    # Lê a próxima linha; no fim do fluxo, marca a sessão como concluída.
+    def _ler_linha(self):
+        try:
+            linha = self._arquivo.readline()
+        except (OSError, ValueError):
+            linha = ''
+        if not linha:
+            self.returncode = 0 if self.returncode is None else self.returncode
+        return linha
+
+    def poll(self):
+        return self.returncode
+
+    # Fechar a conexão faz o daemon interromper o cenário.
+    def terminate(self):
+        if self.returncode is None:
+            self.returncode = -signal.SIGTERM
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+    kill = terminate
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+
+class _LinhasSessao:
+    """Objeto de arquivo mínimo (readline/fileno/close) sobre a saída de uma SessaoDaemon."""
+
+    def __init__(self, sessao):
+        self._sessao = sessao
+
+    def readline(self):
+        return self._sessao._ler_linha()
+
+    # Descritor do socket, para que a saída possa ser lida por um seletor em vez de readline()
+    # (ex: a GUI, que lê todas as sessões numa única thread).
+    def fileno(self):
+        return self._sessao.sock.fileno()
+
+    # A saída só é fechada no fim do fluxo, então a sessão fica concluída também quando ela foi lida
+    # pelo descritor. O socket é fechado junto: a sessão não tem mais nada a receber.
+    def close(self):
+        self._sessao._arquivo.close()
+        self._sessao.sock.close()
+        if self._sessao.returncode is None:
+            self._sessao.returncode = 0
+
+
+# Lê as opções da linha de comando.
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Daemon de backend com trabalhadores quentes por mecanismo.")
+    parser.add_argument("--endereco", default=ENDERECO_PADRAO if isinstance(ENDERECO_PADRAO, str) else None,
+                        help="Caminho do socket de controle (AF_UNIX).")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    sub.add_parser("servir", help="Executa o daemon em primeiro plano.")
+    sub.add_parser("status", help="Mostra os trabalhadores quentes e as execuções.")
+    sub.add_parser("encerrar", help="Encerra o daemon.")
+    executar = sub.add_parser("executar", help="Executa um cenário no daemon (iniciando-o se preciso).")
+    executar.add_argument("mecanismo", choices=MECANISMOS, help="Mecanismo de IPC a executar.")
+    executar.add_argument("argumentos", nargs=argparse.REMAINDER,
+                          help="Argumentos repassados ao main() do módulo de lógica.")
+    return parser
+
+
+# Ponto de entrada do daemon e do cliente de linha de comando.
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    try:
+        exigir_posix()
+    except OSError as erro:
+        print(erro, file=sys.stderr)
+        return 1
+    endereco = args.endereco or ENDERECO_PADRAO
+    if args.comando == "servir":
+        DaemonIPC(endereco).servir()
+    elif args.comando == "executar":
+        garantir_daemon(endereco)
+        inicio = time.perf_counter()
+        sessao = SessaoDaemon(args.mecanismo, args.argumentos, endereco)
+        for linha in iter(sessao.stdout.readline, ''):
+            sys.stdout.write(linha)
+            sys.stdout.flush()
+        sessao.stdout.close()
+        print(f"Execução concluída em {(time.perf_counter() - inicio) * 1e3:.1f} ms.", file=sys.stderr)
+    else:
+        try:
+            s = enviar_pedido({"comando": args.comando}, endereco)
+        except OSError:
+            print("Nenhum daemon respondendo.", file=sys.stderr)
+            return 1
+        with s, s.makefile("r", encoding="utf-8") as arquivo:
+            sys.stdout.write(arquivo.read())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
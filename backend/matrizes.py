@@ -0,0 +1,384 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/matrizes.py
+# DESCRIÇÃO: Transferência de matrizes NumPy (numpy.ndarray) grandes pelos três
+#            mecanismos de IPC, comparando o caminho ingênuo de cada um com o
+#            caminho mais rápido disponível, em GB/s. Os caminhos rápidos são
+#            os modos de payload de matriz dos próprios backends, também
+#            medidos pelo benchmark principal (pipes_matriz, sockets_matriz e
+#            shared_memory_matriz em backend/bench.py):
+#
+#   pipes         ingênuo -> conn.send(matriz): pickle com a matriz copiada dentro
+#                            do fluxo, e conn.recv() que a reconstrói (outra cópia).
+#                 rápido  -> modo "matriz" do canal (backend/pipes/canal.py):
+#                            pickle protocolo 5 com buffers fora de banda
+#                            (PickleBuffer): só o cabeçalho passa pelo pickle; os
+#                            dados vão direto da matriz para o pipe e do pipe para
+#                            um buffer pré-alocado (recv_bytes_into), sem cópias
+#                            extras no Python.
+#   sockets       ingênuo -> sendall(cabeçalho + matriz.tobytes()) e recv() em
+#                            pedaços juntados no final.
+#                 rápido  -> sendmsg com scatter/gather (cabeçalho e matriz sem
+#                            concatenar) e recv_into direto numa matriz pré-alocada
+#                            (LeitorMatriz), depois de conferir o tamanho do quadro.
+#   shared_memory ingênuo -> matriz.tobytes() pelo buffer circular, copiada para
+#                            dentro e para fora da memória compartilhada.
+#                 rápido  -> a matriz do leitor é uma visão (ndarray) sobre o
+#                            próprio segmento: o escritor copia os dados uma vez
+#                            para o segmento e o leitor não copia nada. Dois
+#                            segmentos se alternam, devolvidos pelo leitor.
+#
+# O NumPy é opcional (pip install numpy): sem ele, só os modos de matriz ficam indisponíveis.
+#
+# USO: python -m backend.matrizes [--mecanismos pipes sockets shared_memory]
+#                                 [--tamanhos 1048576 16777216] [--mensagens 10]
+#                                 [--transporte tcp|unix]
+# -----------------------------------------------------------------------------
+
+import argparse  # Importa a biblioteca para ler as opções da linha de comando.
+import json  # Importa a biblioteca para emitir os resultados em JSON.
+import struct  # Importa a biblioteca para codificar a confirmação do receptor.
+import sys  # Importa a biblioteca do sistema para escrever na saída padrão.
+import time  # Importa a biblioteca de tempo para medir as transferências.
+
+try:
+    import numpy as np  # Biblioteca opcional de matrizes numéricas.
+except ImportError:
+    np = None
+
+from backend.pipes.canal import ReceptorOOB, enviar_oob  # Pickle protocolo 5 com buffers fora de banda.
+from backend.processos import METODOS_INICIO, SinalPronto, obter_contexto
+from backend.shared_memory.ring_buffer import RingBufferSPSC, CABECALHO
+from backend.shared_memory.segmento import Segmento, iniciar_rastreador
+from backend.sockets.protocolo import CABECALHO_QUADRO, enviar_quadro
+from backend.sockets.transporte import TRANSPORTES, conectar, criar_socket_escuta, remover_endereco
+
+# Mecanismos disponíveis.
+MECANISMOS = ["pipes", "sockets", "shared_memory"]
+
+# Tamanhos padrão das matrizes, em bytes: 1 MB, 16 MB e 64 MB.
+TAMANHOS_PADRAO = [1 << 20, 16 << 20, 64 << 20]
+
+# Matrizes transferidas em cada ponto.
+MENSAGENS_PADRAO = 10
+
+# Pedaço máximo lido por recv() no caminho ingênuo dos sockets.
+PEDACO_RECV = 1 << 20
+
+
+# Garante que o NumPy está instalado antes de uma medição.
+def exigir_numpy():
+    if np is None:
+        raise RuntimeError("Este modo precisa do NumPy: instale com 'pip install numpy'.")
+
+
+# Cria a matriz de float64 transferida nas medições, com 'tamanho_bytes' bytes.
+def criar_matriz(tamanho_bytes):
+    exigir_numpy()
+    return np.arange(max(1, tamanho_bytes // 8), dtype=np.float64)
+
+
+# Matriz (ndarray) sobre a memória de 'buffer' (ex: os dados de um segmento compartilhado), sem copiá-la.
+def matriz_sobre(buffer, forma, tipo):
+    exigir_numpy()
+    return np.ndarray(forma, dtype=tipo, buffer=buffer)
+
+
+# --- Pipes: pickle protocolo 5 com buffers fora de banda (modo "matriz" do canal) ---
+
+# Função executada pelo receptor nos Pipes: recebe as matrizes e confirma com o último elemento.
+def processo_receptor_pipes(conn, num_mensagens, rapido, pronto):
+    pronto.sinalizar()
+    receptor = ReceptorOOB(conn) if rapido else None
+    matriz = None
+    for _ in range(num_mensagens):
+        matriz = receptor.receber() if rapido else conn.recv()
+    conn.send(float(matriz[-1]))
+    conn.close()
+
+
+# Transfere 'num_mensagens' cópias de 'matriz' para outro processo por um Pipe.
+def transferir_pipes(matriz, num_mensagens, rapido, metodo_inicio=None):
+    contexto = obter_contexto(metodo_inicio)
+    conn, conn_filho = contexto.Pipe()
+    pronto = SinalPronto(contexto)
+    processo = contexto.Process(target=processo_receptor_pipes, args=(conn_filho, num_mensagens, rapido, pronto))
+    processo.start()
+    conn_filho.close()
+    pronto.esperar()
+
+    inicio = time.perf_counter_ns()
+    for _ in range(num_mensagens):
+        if rapido:
+            enviar_oob(conn, matriz)
+        else:
+            conn.send(matriz)
+    confirmacao = conn.recv()
+    duracao_ns = time.perf_counter_ns() - inicio
+
+    processo.join()
+    conn.close()
+    return duracao_ns, confirmacao
+
+
+# --- Sockets: sendmsg com scatter/gather e recv_into na matriz ---------------
+
+# Lê exatamente len(visao) bytes do socket para 'visao'.
+def receber_exato(sock, visao):
+    while visao:
+        n = sock.recv_into(visao)
+        if n == 0:
+            raise ConnectionError("Conexão fechada antes de receber a matriz completa.")
+        visao = visao[n:]
+
+
+class LeitorMatriz:
+    """Recebe quadros (backend/sockets/protocolo.py) direto numa matriz pré-alocada, com recv_into.
+
+    Cada quadro precisa ter exatamente o tamanho da matriz; receber() devolve sempre a mesma matriz,
+    sobrescrita a cada chamada.
+    """
+
+    def __init__(self, sock, forma, tipo):
+        exigir_numpy()
+        self.sock = sock
+        self.matriz = np.empty(forma, dtype=tipo)
+        # Visão em bytes da matriz: len() de uma ndarray conta elementos, não bytes.
+        self._visao = memoryview(self.matriz).cast('B')
+        self._cabecalho = bytearray(CABECALHO_QUADRO.size)
+
+    def receber(self):
+        receber_exato(self.sock, memoryview(self._cabecalho))
+        (tamanho,) = CABECALHO_QUADRO.unpack(self._cabecalho)
+        # O tamanho vem do outro lado: é conferido antes de qualquer byte ser escrito na matriz.
+        if tamanho != self.matriz.nbytes:
+            raise ValueError(f"Quadro de {tamanho} bytes, mas a matriz de destino tem {self.matriz.nbytes} bytes.")
+        receber_exato(self.sock, self._visao)
+        return self.matriz
+
+    # Libera a visão sobre a matriz.
+    def fechar(self):
+        self._visao.release()
+
+
+# Caminho ingênuo: lê o quadro em pedaços (novos objetos bytes) e os junta no final.
+def receber_quadro_ingenuo(sock):
+    cabecalho = bytearray(CABECALHO_QUADRO.size)
+    receber_exato(sock, memoryview(cabecalho))
+    (faltam,) = CABECALHO_QUADRO.unpack(cabecalho)
+    pedacos = []
+    while faltam:
+        pedaco = sock.recv(min(faltam, PEDACO_RECV))
+        if not pedaco:
+            raise ConnectionError("Conexão fechada antes de receber a matriz completa.")
+        pedacos.append(pedaco)
+        faltam -= len(pedaco)
+    return b"".join(pedacos)
+
+
+# Função executada pelo receptor nos Sockets: escuta, recebe as matrizes e confirma com o último elemento.
+def processo_receptor_sockets(conn_endereco, transporte, num_mensagens, forma, tipo, rapido):
+    with criar_socket_escuta(transporte) as s:
+        endereco = s.getsockname()
+        conn_endereco.send(endereco)
+        conn_endereco.close()
+        conn, _ = s.accept()
+        with conn:
+            # No caminho rápido, uma única matriz pré-alocada recebe todos os dados, direto do kernel.
+            leitor = LeitorMatriz(conn, forma, tipo) if rapido else None
+            matriz = None
+            for _ in range(num_mensagens):
+                if rapido:
+                    matriz = leitor.receber()
+                else:
+                    matriz = np.frombuffer(receber_quadro_ingenuo(conn), dtype=tipo).reshape(forma)
+            conn.sendall(struct.pack("<d", float(matriz[-1])))
+            if leitor is not None:
+                leitor.fechar()
+    remover_endereco(endereco)
+
+
+# Transfere 'num_mensagens' cópias de 'matriz' para outro processo por uma conexão de socket.
+def transferir_sockets(matriz, num_mensagens, rapido, metodo_inicio=None, transporte="tcp"):
+    contexto = obter_contexto(metodo_inicio)
+    conn_endereco, conn_endereco_filho = contexto.Pipe(duplex=False)
+    processo = contexto.Process(target=processo_receptor_sockets,
+                                args=(conn_endereco_filho, transporte, num_mensagens, matriz.shape,
+                                      matriz.dtype, rapido))
+    processo.start()
+    conn_endereco_filho.close()
+    # O endereço só chega com o receptor já escutando.
+    endereco = conn_endereco.recv()
+    conn_endereco.close()
+
+    # Visão em bytes da matriz: len() de uma ndarray conta elementos, não bytes.
+    visao = memoryview(matriz).cast('B')
+    with conectar(endereco) as s:
+        inicio = time.perf_counter_ns()
+        for _ in range(num_mensagens):
+            if rapido:
+                # Cabeçalho e matriz saem juntos por sendmsg, sem concatenar (ver protocolo.py).
+                enviar_quadro(s, visao)
+            else:
+                s.sendall(CABECALHO_QUADRO.pack(matriz.nbytes) + matriz.tobytes())
+        confirmacao = bytearray(8)
+        receber_exato(s, memoryview(confirmacao))
+        duracao_ns = time.perf_counter_ns() - inicio
+
+    processo.join()
+    return duracao_ns, struct.unpack("<d", confirmacao)[0]
+
+
+# --- Memória compartilhada: ndarray sobre o próprio segmento ----------------
+
+# Função executada pelo leitor no caminho ingênuo: copia cada matriz para fora do buffer circular.
+def processo_leitor_memoria_ingenuo(ring, num_mensagens, forma, tipo, pronto, conn_confirmacao):
+    pronto.sinalizar()
+    matriz = None
+    for _ in range(num_mensagens):
+        matriz = np.frombuffer(ring.ler(), dtype=tipo).reshape(forma)
+    conn_confirmacao.send(float(matriz[-1]))
+    conn_confirmacao.close()
+
+
+# Função executada pelo leitor no caminho rápido: as matrizes são visões sobre os segmentos
+# (nenhuma cópia); cada segmento é devolvido ao escritor depois de lido.
+def processo_leitor_memoria_rapido(ring_ida, ring_volta, nomes, num_mensagens, forma, tipo, pronto,
+                                   conn_confirmacao):
+    segmentos = [Segmento.abrir(nome) for nome in nomes]
+    matrizes = [matriz_sobre(segmento.dados, forma, tipo) for segmento in segmentos]
+    pronto.sinalizar()
+    ultimo = 0.0
+    for _ in range(num_mensagens):
+        indice = ring_ida.ler()[0]
+        ultimo = float(matrizes[indice][-1])
+        ring_volta.escrever(bytes([indice]))
+    conn_confirmacao.send(ultimo)
+    conn_confirmacao.close()
+    # As visões precisam ser liberadas antes de fechar os segmentos.
+    del matrizes
+    for segmento in segmentos:
+        segmento.fechar()
+
+
+# Transfere 'num_mensagens' cópias de 'matriz' para outro processo pela memória compartilhada.
+def transferir_memoria(matriz, num_mensagens, rapido, metodo_inicio=None):
+    contexto = obter_contexto(metodo_inicio)
+    pronto = SinalPronto(contexto)
+    conn_confirmacao, conn_confirmacao_filho = contexto.Pipe(duplex=False)
+
+    if not rapido:
+        ring = RingBufferSPSC(matriz.nbytes + CABECALHO.size)
+        processo = contexto.Process(target=processo_leitor_memoria_ingenuo,
+                                    args=(ring, num_mensagens, matriz.shape, matriz.dtype, pronto,
+                                          conn_confirmacao_filho))
+        processo.start()
+        pronto.esperar()
+        inicio = time.perf_counter_ns()
+        for _ in range(num_mensagens):
+            ring.escrever(matriz.tobytes())
+        confirmacao = conn_confirmacao.recv()
+        duracao_ns = time.perf_counter_ns() - inicio
+        processo.join()
+        return duracao_ns, confirmacao
+
+    # Dois segmentos do tamanho da matriz: enquanto o leitor usa um, o escritor preenche o outro.
+    iniciar_rastreador()
+    segmentos = [Segmento.criar(matriz.nbytes) for _ in range(2)]
+    visoes = [matriz_sobre(segmento.dados, matriz.shape, matriz.dtype) for segmento in segmentos]
+    # Toca todas as páginas antes da medição: as faltas de página do primeiro acesso não fazem parte da transferência.
+    for visao in visoes:
+        visao.fill(0)
+    ring_ida = RingBufferSPSC(64)
+    ring_volta = RingBufferSPSC(64)
+    processo = contexto.Process(target=processo_leitor_memoria_rapido,
+                                args=(ring_ida, ring_volta, [segmento.nome for segmento in segmentos],
+                                      num_mensagens, matriz.shape, matriz.dtype, pronto, conn_confirmacao_filho))
+    processo.start()
+    pronto.esperar()
+
+    livres = [0, 1]
+    inicio = time.perf_counter_ns()
+    for _ in range(num_mensagens):
+        indice = livres.pop() if livres else ring_volta.ler()[0]
+        # A única cópia do caminho: da matriz de origem para o segmento.
+        np.copyto(visoes[indice], matriz)
+        ring_ida.escrever(bytes([indice]))
+    confirmacao = conn_confirmacao.recv()
+    duracao_ns = time.perf_counter_ns() - inicio
+
+    processo.join()
+    del visoes
+    for segmento in segmentos:
+        segmento.remover()
+    return duracao_ns, confirmacao
+
+
+# Funções de transferência de cada mecanismo: (matriz, num_mensagens, rapido, metodo_inicio) -> (ns, último).
+TRANSFERENCIAS = {
+    "pipes": transferir_pipes,
+    "sockets": transferir_sockets,
+    "shared_memory": transferir_memoria,
+}
+
+
+# Mede os dois caminhos de um mecanismo para matrizes de 'tamanho_bytes' bytes. 'transporte' só vale
+# para os Sockets.
+def medir(mecanismo, tamanho_bytes, num_mensagens=MENSAGENS_PADRAO, metodo_inicio=None, transporte="tcp"):
+    matriz = criar_matriz(tamanho_bytes)
+    opcoes = {"transporte": transporte} if mecanismo == "sockets" else {}
+    esperado = float(matriz[-1])
+    resumo = {"mecanismo": mecanismo, "tamanho": matriz.nbytes, "mensagens": num_mensagens}
+    for caminho, rapido in (("ingenuo", False), ("rapido", True)):
+        duracao_ns, ultimo = TRANSFERENCIAS[mecanismo](matriz, num_mensagens, rapido, metodo_inicio, **opcoes)
+        if ultimo != esperado:
+            raise RuntimeError(f"{mecanismo} ({caminho}): a matriz chegou corrompida.")
+        resumo[f"{caminho}_gb_s"] = matriz.nbytes * num_mensagens / duracao_ns
+    resumo["ganho"] = resumo["rapido_gb_s"] / resumo["ingenuo_gb_s"]
+    return resumo
+
+
+# Lê as opções da linha de comando.
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Transferência de matrizes NumPy: caminho ingênuo x rápido (GB/s).")
+    parser.add_argument("--mecanismos", nargs="+", choices=MECANISMOS, default=MECANISMOS,
+                        help="Mecanismos a medir.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS_PADRAO,
+                        help="Tamanhos das matrizes em bytes.")
+    parser.add_argument("--mensagens", type=int, default=MENSAGENS_PADRAO,
+                        help="Matrizes transferidas em cada ponto.")
+    parser.add_argument("--transporte", choices=TRANSPORTES, default="tcp",
+                        help="Transporte dos Sockets: 'tcp' (loopback) ou 'unix' (AF_UNIX).")
+    parser.add_argument("--metodo-inicio", choices=METODOS_INICIO, default=None,
+                        help="Como o processo receptor é criado (padrão: o da plataforma).")
+    parser.add_argument("--json", action="store_true",
+                        help="Emite um objeto JSON por linha em vez da tabela.")
+    return parser
+
+
+# Ponto de entrada da medição.
+def main(argv=None):
+    from backend.bench import formatar_tamanho  # Importado aqui: o benchmark importa os backends, que importam este módulo.
+
+    args = criar_parser().parse_args(argv)
+    try:
+        exigir_numpy()
+    except RuntimeError as erro:
+        print(erro, file=sys.stderr)
+        return 1
+    if not args.json:
+        print(f"{'mecanismo':<16}{'matriz':>10}{'msgs':>6}{'ingênuo (GB/s)':>16}{'rápido (GB/s)':>15}{'ganho':>8}",
+              flush=True)
+    for mecanismo in args.mecanismos:
+        for tamanho in args.tamanhos:
+            resumo = medir(mecanismo, tamanho, args.mensagens, args.metodo_inicio, args.transporte)
+            if args.json:
+                print(json.dumps(resumo), flush=True)
+            else:
+                print(f"{mecanismo:<16}{formatar_tamanho(resumo['tamanho']):>10}{resumo['mensagens']:>6}"
+                      f"{resumo['ingenuo_gb_s']:>16.2f}{resumo['rapido_gb_s']:>15.2f}{resumo['ganho']:>7.1f}x",
+                      flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
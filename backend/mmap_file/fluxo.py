@@ -0,0 +1,235 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/mmap_file/fluxo.py
+# DESCRIÇÃO: Fluxo de mensagens de um produtor e um consumidor através de um
+#            arquivo mapeado em memória (mmap), em /dev/shm ou em disco.
+#
+# LAYOUT DO ARQUIVO:
+#   [0:8]        magic     -> identifica o formato ("IPCMMAP1")
+#   [8:16]       bloco     -> tamanho dos blocos mapeados (múltiplo da página)
+#   [64:72]      publicado -> total de bytes já publicados (escrito só pelo produtor)
+#   [128:136]    consumido -> total de bytes já consumidos (escrito só pelo consumidor)
+#   [192:200]    fim       -> 1 quando o produtor não vai publicar mais nada
+#   [4096:...]   área de dados, com registros [tamanho (8 bytes)][dados]
+#
+# Diferente do buffer circular (backend/shared_memory/ring_buffer.py), o
+# arquivo só cresce: o produtor acrescenta registros no final e o consumidor
+# segue o final, então o volume total não é limitado pela memória compartilhada
+# alocada de antemão, e um registro pode ter qualquer tamanho. O arquivo é
+# mapeado em blocos alinhados à página, criados sob demanda; os blocos já
+# percorridos são desmapeados, com madvise(MADV_DONTNEED), e os novos recebem
+# madvise(MADV_SEQUENTIAL) para a leitura antecipada do kernel.
+#
+# A posição do consumidor fica no próprio arquivo, então um consumidor que
+# reinicia (ou outro processo que abre o arquivo depois) continua do primeiro
+# registro ainda não consumido. Como no buffer circular, cada índice tem um
+# único processo escritor e não há locks: o produtor copia o registro e só
+# depois publica o novo total (a ordem das escritas depende da CPU, ver
+# ring_buffer.py).
+#
+# Em /dev/shm o arquivo fica na memória (tmpfs): para transferências de vários
+# GB, use um diretório em disco (o cache de páginas do kernel faz o resto).
+# -----------------------------------------------------------------------------
+
+import mmap  # Importa a biblioteca de arquivos mapeados em memória.
+import os  # Importa a biblioteca do sistema para criar, estender e remover o arquivo.
+import struct  # Importa a biblioteca para codificar o cabeçalho dos registros.
+import tempfile  # Importa a biblioteca para escolher o diretório temporário.
+
+from backend.shared_memory.ring_buffer import esperar  # Espera progressiva (spin, ceder, dormir).
+
+# Identificação do formato do arquivo.
+MAGIC = b"IPCMMAP1"
+
+# Tamanho da página de memória; o cabeçalho ocupa a primeira página e os dados começam na seguinte.
+PAGINA = mmap.ALLOCATIONGRANULARITY
+
+# Deslocamentos dos campos do cabeçalho (cada índice numa linha de cache própria).
+OFFSET_BLOCO = 8
+OFFSET_PUBLICADO = 64
+OFFSET_CONSUMIDO = 128
+OFFSET_FIM = 192
+
+# Tamanho padrão dos blocos mapeados (64 MB).
+TAMANHO_BLOCO_PADRAO = 64 << 20
+
+# Cabeçalho de cada registro: tamanho dos dados em 8 bytes (little-endian), sem limite prático.
+CABECALHO = struct.Struct("<Q")
+
+
+# Diretório padrão dos arquivos: /dev/shm (memória) quando existe, senão o diretório temporário.
+def diretorio_padrao():
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+# Aplica um conselho de madvise, se a plataforma o tiver.
+def _aconselhar(bloco, nome):
+    conselho = getattr(mmap, nome, None)
+    if conselho is not None and hasattr(bloco, "madvise"):
+        bloco.madvise(conselho)
+
+
+class FluxoArquivo:
+    """Fluxo de mensagens num arquivo mapeado em memória: o produtor acrescenta, o consumidor segue o final.
+
+    Cada processo abre o arquivo pelo caminho (FluxoArquivo.abrir), então o objeto não precisa
+    ser herdado na criação do processo e o consumidor pode reiniciar a qualquer momento.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._fd = os.open(caminho, os.O_RDWR)
+        self._cabecalho = mmap.mmap(self._fd, PAGINA)
+        if self._cabecalho[:len(MAGIC)] != MAGIC:
+            self._cabecalho.close()
+            os.close(self._fd)
+            raise ValueError(f"{caminho} não é um arquivo de fluxo ({MAGIC.decode()}).")
+        visao = memoryview(self._cabecalho)
+        self.tamanho_bloco = visao[OFFSET_BLOCO:OFFSET_BLOCO + 8].cast('Q')[0]
+        self._publicado = visao[OFFSET_PUBLICADO:OFFSET_PUBLICADO + 8].cast('Q')
+        self._consumido = visao[OFFSET_CONSUMIDO:OFFSET_CONSUMIDO + 8].cast('Q')
+        self._fim = visao[OFFSET_FIM:OFFSET_FIM + 8].cast('Q')
+        visao.release()
+        # Blocos mapeados neste processo: índice -> mmap.
+        self._blocos = {}
+
+    # Cria um arquivo de fluxo vazio em 'diretorio' (padrão: /dev/shm) e o abre.
+    @classmethod
+    def criar(cls, diretorio=None, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+        if tamanho_bloco % PAGINA:
+            raise ValueError(f"O tamanho do bloco deve ser múltiplo da página ({PAGINA} bytes).")
+        fd, caminho = tempfile.mkstemp(prefix="ipc_fluxo_", suffix=".mmap", dir=diretorio or diretorio_padrao())
+        try:
+            os.ftruncate(fd, PAGINA)
+            os.pwrite(fd, MAGIC + struct.pack("<Q", tamanho_bloco), 0)
+        finally:
+            os.close(fd)
+        return cls(caminho)
+
+    # Abre um arquivo de fluxo existente, com as posições de produtor e consumidor gravadas nele.
+    @classmethod
+    def abrir(cls, caminho):
+        return cls(caminho)
+
+    # Mapeia o bloco 'indice' (estendendo o arquivo, no produtor) e desmapeia os já percorridos.
+    def _bloco(self, indice, estender=False):
+        bloco = self._blocos.get(indice)
+        if bloco is not None:
+            return bloco
+        fim = PAGINA + (indice + 1) * self.tamanho_bloco
+        if estender and os.fstat(self._fd).st_size < fim:
+            # O arquivo cresce um bloco por vez; ftruncate não grava nada (as páginas nascem vazias).
+            os.ftruncate(self._fd, fim)
+        bloco = mmap.mmap(self._fd, self.tamanho_bloco, offset=PAGINA + indice * self.tamanho_bloco)
+        _aconselhar(bloco, "MADV_SEQUENTIAL")
+        self._blocos[indice] = bloco
+        # Os dois lados só avançam: blocos anteriores ao atual não serão mais acessados por este processo.
+        for antigo in [i for i in self._blocos if i < indice]:
+            anterior = self._blocos.pop(antigo)
+            _aconselhar(anterior, "MADV_DONTNEED")
+            anterior.close()
+        return bloco
+
+    # Copia 'dados' para a área de dados a partir da posição 'pos', atravessando os blocos necessários.
+    def _copiar_para(self, pos, dados):
+        dados = memoryview(dados).cast('B')
+        while dados:
+            indice, deslocamento = divmod(pos, self.tamanho_bloco)
+            parte = min(len(dados), self.tamanho_bloco - deslocamento)
+            self._bloco(indice, estender=True)[deslocamento:deslocamento + parte] = dados[:parte]
+            dados = dados[parte:]
+            pos += parte
+
+    # Copia 'tamanho' bytes da área de dados a partir da posição 'pos', atravessando os blocos necessários.
+    def _copiar_de(self, pos, tamanho):
+        destino = bytearray(tamanho)
+        copiados = 0
+        while copiados < tamanho:
+            indice, deslocamento = divmod(pos + copiados, self.tamanho_bloco)
+            parte = min(tamanho - copiados, self.tamanho_bloco - deslocamento)
+            with memoryview(self._bloco(indice)) as visao:
+                destino[copiados:copiados + parte] = visao[deslocamento:deslocamento + parte]
+            copiados += parte
+        return destino
+
+    # Posição do consumidor: total de bytes já consumidos, gravado no arquivo.
+    @property
+    def consumido(self):
+        return self._consumido[0]
+
+    # Indica se o produtor encerrou o fluxo e o consumidor já leu tudo.
+    @property
+    def terminado(self):
+        return self._fim[0] == 1 and self.pendentes == 0
+
+    # Total de bytes publicados e ainda não consumidos.
+    @property
+    def pendentes(self):
+        return self._publicado[0] - self._consumido[0]
+
+    # Acrescenta uma mensagem (bytes-like) ao final do fluxo. Nunca espera: o arquivo cresce.
+    def escrever(self, dados):
+        pos = self._publicado[0]
+        tamanho = memoryview(dados).nbytes
+        self._copiar_para(pos, CABECALHO.pack(tamanho))
+        self._copiar_para(pos + CABECALHO.size, dados)
+        # Publica o registro: só agora o consumidor passa a enxergá-lo.
+        self._publicado[0] = pos + CABECALHO.size + tamanho
+
+    # Sinaliza ao consumidor que não haverá mais mensagens.
+    def fechar_escrita(self):
+        self._fim[0] = 1
+
+    # Tenta ler o próximo registro. Devolve (True, dados), (True, None) no fim do fluxo
+    # ou (False, None) se não houver nada publicado no momento.
+    def tentar_ler(self):
+        # 'fim' é lido antes: se já estava marcado e não há registro novo, não haverá mais.
+        fim = self._fim[0]
+        pos = self._consumido[0]
+        if pos == self._publicado[0]:
+            return fim == 1, None
+        (tamanho,) = CABECALHO.unpack(self._copiar_de(pos, CABECALHO.size))
+        dados = self._copiar_de(pos + CABECALHO.size, tamanho)
+        # Grava a nova posição no arquivo: um consumidor que reiniciar continua daqui.
+        self._consumido[0] = pos + CABECALHO.size + tamanho
+        return True, dados
+
+    # Lê a próxima mensagem, esperando se não houver nenhuma publicada. Devolve None no fim do fluxo.
+    def ler(self):
+        tentativa = 0
+        while True:
+            leu, dados = self.tentar_ler()
+            if leu:
+                return dados
+            esperar(tentativa)
+            tentativa += 1
+
+    # Permite percorrer o fluxo com 'for mensagem in fluxo:' até o fim.
+    def __iter__(self):
+        while True:
+            dados = self.ler()
+            if dados is None:
+                return
+            yield dados
+
+    # Desmapeia o arquivo neste processo. Em disco, flush() grava as páginas alteradas antes.
+    def fechar(self):
+        for bloco in self._blocos.values():
+            bloco.flush()
+            bloco.close()
+        self._blocos.clear()
+        for visao in (self._publicado, self._consumido, self._fim):
+            visao.release()
+        self._cabecalho.flush()
+        self._cabecalho.close()
+        os.close(self._fd)
+
+    # Fecha e apaga o arquivo. Deve ser chamado por quem fica com a posse final do fluxo.
+    def remover(self):
+        self.fechar()
+        os.unlink(self.caminho)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
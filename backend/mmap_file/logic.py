@@ -0,0 +1,212 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/mmap_file/logic.py
+# DESCRIÇÃO: Lógica de comunicação entre dois processos através de um arquivo
+#            mapeado em memória (ver backend/mmap_file/fluxo.py).
+# -----------------------------------------------------------------------------
+
+import os  # Importa a biblioteca do sistema para obter o ID do processo (PID).
+import time  # Importa a biblioteca de tempo para medir os tempos de ida e volta.
+import argparse  # Importa a biblioteca para ler as opções da linha de comando.
+
+# Fluxo de mensagens num arquivo mapeado em memória, que cresce conforme o produtor escreve.
+from backend.mmap_file.fluxo import FluxoArquivo, PAGINA, TAMANHO_BLOCO_PADRAO
+# Método de início dos processos, sinal de "pronto" e pool de processos pré-iniciados.
+from backend.processos import METODOS_INICIO, SinalPronto, iniciar_processo, obter_contexto
+
+# Função de log compartilhada pelos backends: registros binários no canal de telemetria da GUI,
+# ou linhas JSON na saída padrão quando executado pela linha de comando.
+from backend.telemetria import log_message
+# Recursos usados por cada papel (CPU, RSS, trocas de contexto, chamadas de E/S), enviados no fim.
+from backend.recursos import iniciar_medicao
+# Marcas de rastreio de cada envio e recebimento (ligadas com IPC_RASTRO=1).
+from backend.rastreio import (
+    codificar_texto, criar_rastro, enviar_rastreado, receber_rastreado,
+)
+
+# Número máximo de mensagens do fluxo que cada leitor registra individualmente no log.
+MAX_MENSAGENS_LOGADAS = 5
+
+# Trecho inicial de cada payload grande exibido no log.
+MAX_CARACTERES_LOGADOS = 80
+
+
+# Gera um payload de 'tamanho' bytes repetindo a mensagem (ou a própria mensagem, sem tamanho).
+def montar_payload(msg_bytes, tamanho):
+    if not tamanho:
+        return msg_bytes
+    repeticoes, resto = divmod(tamanho, len(msg_bytes) or 1)
+    return (msg_bytes or b"x") * repeticoes + (msg_bytes or b"x")[:resto]
+
+
+# Função que define o comportamento do processo que escreve no arquivo.
+def processo_escritor(caminho, msg, repeticoes, tamanho_payload, pronto=None):
+    pid = os.getpid()
+    source_id = f"PROCESSO ESCRITOR (PID: {pid})"
+    medicao = iniciar_medicao(source_id)
+
+    log_message(source_id, "Iniciado.")
+    # Espera o leitor avisar que está pronto, para que o log mostre os dois lados na ordem.
+    if pronto:
+        pronto.esperar()
+
+    with FluxoArquivo.abrir(caminho) as fluxo:
+        rastro = criar_rastro("escritor->leitor")
+        if tamanho_payload:
+            # Payload grande: montado uma única vez e acrescentado 'repeticoes' vezes ao arquivo.
+            payload = montar_payload(msg.encode('utf-8'), tamanho_payload)
+            log_message(source_id, f"PID: {pid} -> Escrevendo {repeticoes} payload(s) de {len(payload)} bytes "
+                                   f"em {caminho}.")
+            for _ in range(repeticoes):
+                enviar_rastreado(rastro, payload, lambda dados: dados, fluxo.escrever)
+        else:
+            log_message(source_id, f"PID: {pid} -> Escrevendo '{msg}' em {caminho} ({repeticoes}x).")
+            for _ in range(repeticoes):
+                enviar_rastreado(rastro, msg, codificar_texto, fluxo.escrever)
+
+        # Marca o fim do fluxo para o leitor (e para os leitores que ainda vão reiniciar).
+        fluxo.fechar_escrita()
+    log_message(source_id, f"PID: {pid} -> Escrita finalizada. Fluxo encerrado para o processo leitor.")
+    medicao.encerrar(repeticoes)
+
+
+# Função que define o comportamento do processo que lê do arquivo. Com 'limite', o leitor sai depois
+# de ler esse número de mensagens, simulando uma queda; o próximo continua da posição gravada no arquivo.
+def processo_leitor(caminho, pronto=None, limite=None):
+    pid = os.getpid()
+    source_id = f"PROCESSO LEITOR (PID: {pid})"
+    medicao = iniciar_medicao(source_id)
+
+    with FluxoArquivo.abrir(caminho) as fluxo:
+        posicao = fluxo.consumido
+        if posicao:
+            log_message(source_id, f"PID: {pid} -> Reiniciado. Continuando do byte {posicao} do arquivo "
+                                   f"({fluxo.pendentes} byte(s) publicados ainda não lidos).")
+        else:
+            log_message(source_id, f"PID: {pid} -> Iniciado. Aguardando mensagens do escritor...")
+        if pronto:
+            pronto.sinalizar()
+
+        rastro = criar_rastro("escritor->leitor")
+        total = 0
+        total_bytes = 0
+        while limite is None or total < limite:
+            # Os bytes lidos ficam como estão: só o trecho exibido no log é decodificado.
+            dados = receber_rastreado(rastro, fluxo.ler, lambda dados: dados)
+            if dados is None:
+                break
+            total += 1
+            total_bytes += len(dados)
+            if total <= MAX_MENSAGENS_LOGADAS:
+                # Só o início de cada mensagem aparece no log; payloads grandes são truncados.
+                texto = bytes(dados[:MAX_CARACTERES_LOGADOS]).decode('utf-8', errors='replace')
+                reticencias = "..." if len(dados) > MAX_CARACTERES_LOGADOS else ""
+                log_message(source_id, f"PID: {pid} -> Leu do arquivo ({len(dados)} bytes): '{texto}{reticencias}'")
+
+        if limite is not None and total == limite:
+            log_message(source_id, f"PID: {pid} -> Saindo depois de {total} mensagem(ns) ({total_bytes} bytes); "
+                                   f"a posição fica gravada no arquivo.")
+        else:
+            log_message(source_id, f"PID: {pid} -> Fim do fluxo. {total} mensagem(ns), {total_bytes} bytes lidos.")
+    log_message(source_id, f"PID: {pid} -> Encerrando.")
+    medicao.encerrar(total)
+
+
+# Função executada pelo processo de eco durante o benchmark: abre os dois arquivos pelo caminho,
+# lê cada mensagem do arquivo de ida e a devolve pelo de volta.
+def processo_eco(caminho_ida, caminho_volta, pronto):
+    with FluxoArquivo.abrir(caminho_ida) as ida, FluxoArquivo.abrir(caminho_volta) as volta:
+        pronto.sinalizar()
+        for dados in ida:
+            volta.escrever(dados)
+        volta.fechar_escrita()
+
+
+# Mede o tempo de ida e volta (RTT) de 'num_mensagens' mensagens de 'tamanho_payload' bytes usando
+# um arquivo mapeado para cada sentido. Os arquivos são abertos pelo caminho no filho, então o
+# processo de eco pode ser criado com 'metodo_inicio' ou reaproveitado de 'pool'.
+def benchmark_eco(tamanho_payload, num_mensagens, metodo_inicio=None, pool=None, diretorio=None,
+                  tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    ida = FluxoArquivo.criar(diretorio, tamanho_bloco)
+    volta = FluxoArquivo.criar(diretorio, tamanho_bloco)
+
+    pronto = SinalPronto()
+    p_eco = iniciar_processo(processo_eco, (ida.caminho, volta.caminho, pronto), metodo_inicio, pool)
+    # A medição só começa com o processo de eco pronto, para não incluir o tempo de criação do processo.
+    pronto.esperar()
+
+    # Monta o payload uma única vez, fora da região medida.
+    payload = b"x" * tamanho_payload
+    latencias_ns = []
+
+    inicio = time.perf_counter_ns()
+    for _ in range(num_mensagens):
+        t0 = time.perf_counter_ns()
+        ida.escrever(payload)
+        volta.ler()
+        latencias_ns.append(time.perf_counter_ns() - t0)
+    duracao_ns = time.perf_counter_ns() - inicio
+
+    ida.fechar_escrita()
+    p_eco.join()
+    ida.remover()
+    volta.remover()
+    return {"latencias_ns": latencias_ns, "duracao_ns": duracao_ns}
+
+
+# Executa a demonstração com as opções de 'argv' (ou da linha de comando). Também é chamada
+# pelos trabalhadores do daemon (backend/daemon.py), que já têm este módulo importado.
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Demonstração de IPC com um arquivo mapeado em memória.")
+    parser.add_argument("mensagem", help="Mensagem enviada pelo escritor ao leitor.")
+    parser.add_argument("--repeticoes", type=int, default=1,
+                        help="Quantas vezes o escritor acrescenta a mensagem ao arquivo.")
+    parser.add_argument("--tamanho-payload", type=int, default=0,
+                        help="Gera um payload deste tamanho repetindo a mensagem (ex: 1048576 com "
+                             "--repeticoes 4096 transfere 4 GB).")
+    parser.add_argument("--diretorio", default=None,
+                        help="Diretório do arquivo (padrão: /dev/shm, na memória). Para vários GB, use um "
+                             "diretório em disco.")
+    parser.add_argument("--tamanho-bloco", type=int, default=TAMANHO_BLOCO_PADRAO >> 20,
+                        help="Tamanho, em MB, de cada bloco do arquivo mapeado por vez.")
+    parser.add_argument("--reiniciar-leitor", type=int, default=0,
+                        help="O leitor sai a cada N mensagens e um novo leitor continua da posição gravada "
+                             "no arquivo (0: um único leitor).")
+    parser.add_argument("--manter", action="store_true",
+                        help="Não apaga o arquivo no fim (ele pode ser reaberto por outro processo).")
+    parser.add_argument("--metodo-inicio", choices=METODOS_INICIO, default=None,
+                        help="Como os processos escritor e leitor são criados (padrão: o da plataforma).")
+    args = parser.parse_args(argv)
+    contexto = obter_contexto(args.metodo_inicio)
+    # Sinal pelo qual o primeiro leitor avisa o escritor que já está esperando as mensagens.
+    pronto = SinalPronto(contexto)
+
+    # O processo principal cria o arquivo e fica com a posse dele; os filhos o abrem pelo caminho.
+    tamanho_bloco = max(PAGINA, (args.tamanho_bloco << 20) // PAGINA * PAGINA)
+    fluxo = FluxoArquivo.criar(args.diretorio, tamanho_bloco)
+    limite = args.reiniciar_leitor or None
+
+    p_escritor = contexto.Process(target=processo_escritor,
+                                  args=(fluxo.caminho, args.mensagem, args.repeticoes, args.tamanho_payload, pronto))
+    p_leitor = contexto.Process(target=processo_leitor, args=(fluxo.caminho, pronto, limite))
+    p_escritor.start()
+    p_leitor.start()
+    p_leitor.join()
+    # Enquanto o fluxo não terminar, cada leitor que sai é substituído por um novo, que retoma do
+    # primeiro registro não consumido. Um leitor que falhou não é substituído.
+    while limite and p_leitor.exitcode == 0 and not fluxo.terminado:
+        p_leitor = contexto.Process(target=processo_leitor, args=(fluxo.caminho, None, limite))
+        p_leitor.start()
+        p_leitor.join()
+    p_escritor.join()
+
+    if args.manter:
+        fluxo.fechar()
+        log_message("MAIN", f"Arquivo mantido em {fluxo.caminho}.")
+    else:
+        fluxo.remover()
+    log_message("MAIN", "Demonstração com Arquivo Mapeado em Memória finalizada.")
+
+
+# Ponto de entrada do script.
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/pipes/arquivo.py
+# DESCRIÇÃO: Modo --arquivo do backend de Pipes: o pai envia um arquivo ao
+#            filho, que o grava no destino.
+#
+#   kernel  -> os.pipe() com os.splice nas duas pontas (arquivo -> pipe no pai,
+#              pipe -> arquivo no filho): o conteúdo não passa pela memória de
+#              nenhum dos dois processos. O pipe é ampliado para CAPACIDADE_PIPE.
+#   usuario -> mp.Pipe com send_bytes/recv_bytes_into, o caminho de bytes crus
+#              do modo 'bytes' (backend/pipes/canal.py), bloco a bloco.
+#
+# O tamanho do arquivo vai antes do conteúdo e o filho responde com o total de
+# bytes gravados (ver backend/transferencia.py).
+# -----------------------------------------------------------------------------
+
+import os  # Importa a biblioteca do sistema para o PID e os descritores de arquivo.
+
+from backend.pipes.canal import criar_canais  # Canais 'fd' (os.pipe) e 'bytes' (mp.Pipe).
+# Cópias pelo kernel e em espaço de usuário, e o progresso da transferência.
+from backend.transferencia import (
+    BLOCO_PADRAO, CABECALHO_ARQUIVO, Progresso, abrir_destino, ampliar_pipe, enviar_copiando, enviar_splice,
+    escrever_tudo, ler_exato, receber_copiando, receber_splice,
+)
+from backend.processos import SinalPronto, obter_contexto  # Método de início e sinal de "pronto".
+from backend.telemetria import log_message  # Função de log compartilhada pelos backends.
+from backend.recursos import iniciar_medicao  # Recursos usados por cada papel, enviados no fim.
+
+# Descrição de cada tipo de cópia nos logs: (envio, recepção).
+DESCRICOES_COPIA = {
+    "kernel": ("os.splice (arquivo -> pipe)", "os.splice (pipe -> arquivo)"),
+    "usuario": ("read() + conn.send_bytes()", "conn.recv_bytes_into() + write()"),
+}
+
+
+# Função do filho no modo arquivo: recebe o arquivo pelo canal e o grava em 'destino'
+# (ou num arquivo temporário, apagado no fim).
+def processo_filho_arquivo(canal, copia, destino=None, bloco=BLOCO_PADRAO, pronto=None):
+    pid = os.getpid()
+    source_id = f"PROCESSO FILHO (PID: {pid})"
+    medicao = iniciar_medicao(source_id)
+
+    log_message(source_id, f"PID: {pid} -> Iniciado e aguardando o arquivo do pai.")
+    if pronto:
+        pronto.sinalizar()
+
+    if copia == "kernel":
+        (total,) = CABECALHO_ARQUIVO.unpack(ler_exato(canal.fd_leitura, CABECALHO_ARQUIVO.size))
+    else:
+        (total,) = CABECALHO_ARQUIVO.unpack(canal.receber())
+    fd_destino, caminho_destino, temporario = abrir_destino(destino)
+    log_message(source_id, f"PID: {pid} -> Recebendo {total / 1e6:.1f} MB com {DESCRICOES_COPIA[copia][1]} "
+                           f"em {caminho_destino}.")
+    progresso = Progresso(source_id, total, "recepcao")
+    try:
+        if copia == "kernel":
+            recebidos = receber_splice(canal.fd_leitura, fd_destino, total, progresso, bloco)
+        else:
+            recebidos = receber_copiando(canal.conn.recv_bytes_into, fd_destino, total, progresso, bloco)
+    finally:
+        os.close(fd_destino)
+    relatorio = progresso.concluir()
+
+    # Confirma ao pai quantos bytes foram gravados.
+    if copia == "kernel":
+        escrever_tudo(canal.fd_escrita, CABECALHO_ARQUIVO.pack(recebidos))
+    else:
+        canal.enviar(CABECALHO_ARQUIVO.pack(recebidos))
+    canal.fechar()
+
+    log_message(source_id, f"PID: {pid} -> Recebeu {recebidos / 1e6:.1f} MB em {relatorio['duracao_s']:.2f} s "
+                           f"({relatorio['mb_por_s_medio']:.1f} MB/s).")
+    if temporario:
+        os.unlink(caminho_destino)
+    log_message(source_id, f"PID: {pid} -> Encerrando.")
+    medicao.encerrar()
+
+
+# Executa a demonstração do modo arquivo: o processo principal (o pai) envia 'caminho' ao filho.
+def demonstrar(caminho, copia="kernel", destino=None, metodo_inicio=None, bloco=BLOCO_PADRAO):
+    pid_pai = os.getpid()
+    source_id_pai = f"PROCESSO PAI (PID: {pid_pai})"
+    medicao = iniciar_medicao(source_id_pai)
+
+    # No modo kernel, os descritores dos dois os.pipe() são usados direto; no modo usuário, um mp.Pipe.
+    canal_pai, canal_filho = criar_canais("fd" if copia == "kernel" else "bytes")
+    if copia == "kernel":
+        ampliar_pipe(canal_pai.fd_escrita)
+
+    contexto = obter_contexto(metodo_inicio)
+    pronto = SinalPronto(contexto)
+    p_filho = contexto.Process(target=processo_filho_arquivo, args=(canal_filho, copia, destino, bloco, pronto))
+    p_filho.start()
+    canal_filho.fechar()
+    pronto.esperar()
+
+    fd_arquivo = os.open(caminho, os.O_RDONLY)
+    try:
+        total = os.fstat(fd_arquivo).st_size
+        log_message(source_id_pai, f"PID: {pid_pai} -> Enviando {caminho} ({total / 1e6:.1f} MB) com "
+                                   f"{DESCRICOES_COPIA[copia][0]}.")
+        progresso = Progresso(source_id_pai, total, "envio")
+        if copia == "kernel":
+            escrever_tudo(canal_pai.fd_escrita, CABECALHO_ARQUIVO.pack(total))
+            enviar_splice(fd_arquivo, canal_pai.fd_escrita, total, progresso, bloco)
+            relatorio = progresso.concluir()
+            (confirmados,) = CABECALHO_ARQUIVO.unpack(ler_exato(canal_pai.fd_leitura, CABECALHO_ARQUIVO.size))
+        else:
+            canal_pai.enviar(CABECALHO_ARQUIVO.pack(total))
+            enviar_copiando(fd_arquivo, canal_pai.conn.send_bytes, total, progresso, bloco)
+            relatorio = progresso.concluir()
+            (confirmados,) = CABECALHO_ARQUIVO.unpack(canal_pai.receber())
+    finally:
+        os.close(fd_arquivo)
+
+    p_filho.join()
+    canal_pai.fechar()
+    log_message(source_id_pai, f"PID: {pid_pai} -> Enviou {relatorio['bytes'] / 1e6:.1f} MB em "
+                               f"{relatorio['duracao_s']:.2f} s ({relatorio['mb_por_s_medio']:.1f} MB/s); o filho "
+                               f"confirmou {confirmados} bytes.")
+    log_message(source_id_pai, f"PID: {pid_pai} -> Demonstração com Pipes finalizada.")
+    medicao.encerrar()
@@ -0,0 +1,501 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/pipes/canal.py
+# DESCRIÇÃO: Modos de transporte do backend de Pipes. Todos expõem a mesma
+#            interface (enviar, receber, descarregar, fechar), então o pai e o
+#            filho usam o mesmo código qualquer que seja o modo escolhido:
+#
+#   objeto -> conn.send/conn.recv: cada mensagem é um objeto Python serializado
+#             com pickle (o comportamento original da demonstração).
+#   bytes  -> conn.send_bytes/conn.recv_bytes_into: bytes crus, sem pickle, lidos
+#             num buffer reaproveitado entre as mensagens.
+#   fd     -> dois os.pipe() usados diretamente pelos descritores de arquivo, com
+#             quadros de prefixo de tamanho (mesmo protocolo dos Sockets).
+#   lote   -> agrupa várias mensagens pequenas em uma única escrita sobre o modo
+#             bytes, pagando uma chamada ao sistema por lote.
+#   hibrido -> o Pipe só leva as mensagens pequenas e as de controle; os payloads
+#             acima de um limiar vão num slab de memória compartilhada
+#             reaproveitado (backend/shared_memory/slabs.py) e só o endereço do
+#             slab passa pelo Pipe.
+#   matriz -> objetos com pickle protocolo 5 e buffers fora de banda: só o
+#             cabeçalho passa pelo pickle; os dados de uma matriz NumPy vão direto
+#             da matriz para o Pipe e do Pipe para um buffer reaproveitado
+#             (recv_bytes_into), sem cópias extras no Python.
+#
+# Para o rastreio (backend/rastreio.py), cada modo também separa o envio de uma
+# mensagem de texto em serializar + enviar_serializado, e o recebimento em
+# receber_serializado + desserializar.
+# -----------------------------------------------------------------------------
+
+import collections  # Importa deque para as mensagens lidas antes da hora no modo híbrido.
+import multiprocessing as mp  # Importa a biblioteca para criar os Pipes.
+import os  # Importa a biblioteca do sistema para os pipes por descritor de arquivo.
+import pickle  # Importa o pickle, com o protocolo 5 e os buffers fora de banda (modo "matriz").
+import struct  # Importa a biblioteca para codificar os registros dos lotes.
+from multiprocessing import reduction  # Importa a duplicação de descritores para outros processos.
+
+from backend.sockets.protocolo import LeitorQuadros, enviar_quadro  # Quadros com prefixo de tamanho.
+# Slabs reaproveitáveis e segmentos avulsos de memória compartilhada (modo "hibrido").
+from backend.shared_memory.slabs import PoolSlabs
+from backend.shared_memory.segmento import Segmento, iniciar_rastreador
+
+# Modos disponíveis.
+MODOS = ["objeto", "bytes", "fd", "lote", "hibrido", "matriz"]
+
+# Tamanho inicial do buffer reaproveitado na recepção (64 KB); cresce sob demanda.
+TAMANHO_BUFFER_INICIAL = 64 * 1024
+
+# Número padrão de mensagens agrupadas em cada lote.
+TAMANHO_LOTE_PADRAO = 64
+
+# Cabeçalho de cada registro dentro de um lote: tamanho da mensagem em 4 bytes.
+CABECALHO_REGISTRO = struct.Struct("<I")
+
+# No modo "hibrido", payloads maiores que este limiar (em bytes) vão por slab; os menores, pelo próprio Pipe.
+LIMIAR_SLAB_PADRAO = 16 * 1024
+
+# Tipos de mensagem do modo "hibrido" (primeiro byte de cada mensagem no Pipe).
+TIPO_DADOS = 0  # [tipo][payload]: payload pequeno, pelo próprio Pipe
+TIPO_SLAB = 1  # CONTROLE_SLAB: payload no slab (classe, índice) do remetente
+TIPO_SEGMENTO = 2  # [tipo][nome]: payload num segmento avulso, removido por quem lê
+TIPO_DEVOLVER = 3  # CONTROLE_SLAB: quem leu devolve o slab (classe, índice) ao remetente
+
+# Mensagem de controle de um slab: tipo, classe, índice e tamanho do payload.
+CONTROLE_SLAB = struct.Struct("<BHIQ")
+
+# Cabeçalho da mensagem de pickle fora de banda (modo "matriz"): número de buffers, seguido do tamanho de cada um.
+CABECALHO_OOB = struct.Struct("<I")
+TAMANHO_BUFFER_OOB = struct.Struct("<Q")
+
+
+class _CanalDeBytes:
+    """Base dos modos que transportam bytes: a mensagem de texto é serializada com UTF-8."""
+
+    def serializar(self, texto):
+        return texto.encode('utf-8')
+
+    def enviar_serializado(self, dados):
+        self.enviar(dados)
+
+    def receber_serializado(self):
+        return self.receber()
+
+    def desserializar(self, dados):
+        return bytes(dados).decode('utf-8')
+
+
+class CanalObjeto:
+    """Objetos Python serializados com pickle pelo próprio Pipe (conn.send/conn.recv)."""
+
+    tamanho_lote = 1
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def enviar(self, obj):
+        self.conn.send(obj)
+
+    def receber(self):
+        return self.conn.recv()
+
+    # conn.send(obj) é conn.send_bytes(pickle de obj): as duas etapas, separadas para o rastreio.
+    def serializar(self, obj):
+        return reduction.ForkingPickler.dumps(obj)
+
+    def enviar_serializado(self, dados):
+        self.conn.send_bytes(dados)
+
+    def receber_serializado(self):
+        return self.conn.recv_bytes()
+
+    def desserializar(self, dados):
+        return reduction.ForkingPickler.loads(dados)
+
+    # Nada fica pendente neste modo.
+    def descarregar(self):
+        pass
+
+    def fechar(self):
+        self.conn.close()
+
+
+class CanalBytes(_CanalDeBytes):
+    """Bytes crus pelo Pipe (send_bytes/recv_bytes_into), sem pickle e sem alocar a cada mensagem.
+
+    O memoryview devolvido por receber() aponta para o buffer interno e só é válido até a próxima
+    chamada.
+    """
+
+    tamanho_lote = 1
+
+    def __init__(self, conn, tamanho_buffer=TAMANHO_BUFFER_INICIAL):
+        self.conn = conn
+        self.tamanho_buffer = tamanho_buffer
+        self._buffer = bytearray(tamanho_buffer)
+
+    # Só a conexão e o tamanho do buffer viajam para outro processo; o buffer é recriado lá.
+    def __reduce__(self):
+        return (CanalBytes, (self.conn, self.tamanho_buffer))
+
+    def enviar(self, dados):
+        self.conn.send_bytes(dados)
+
+    def receber(self):
+        try:
+            tamanho = self.conn.recv_bytes_into(self._buffer)
+        except mp.BufferTooShort as erro:
+            # A mensagem não coube: ela vem inteira na exceção. O buffer cresce para as próximas.
+            dados = erro.args[0]
+            self._buffer = bytearray(max(len(dados), 2 * len(self._buffer)))
+            self._buffer[:len(dados)] = dados
+            tamanho = len(dados)
+        return memoryview(self._buffer)[:tamanho]
+
+    def descarregar(self):
+        pass
+
+    def fechar(self):
+        self.conn.close()
+
+
+class _ExtremidadeFd:
+    """Adapta um par de descritores de pipe à interface de socket usada pelo protocolo de quadros."""
+
+    def __init__(self, fd_leitura, fd_escrita):
+        self.fd_leitura = fd_leitura
+        self.fd_escrita = fd_escrita
+
+    def recv_into(self, visao):
+        return os.readv(self.fd_leitura, [visao])
+
+    # Escrita com scatter/gather (cabeçalho e payload sem concatenar), como o sendmsg dos sockets.
+    def sendmsg(self, partes):
+        return os.writev(self.fd_escrita, partes)
+
+    def sendall(self, dados):
+        visao = memoryview(dados)
+        while visao:
+            visao = visao[os.write(self.fd_escrita, visao):]
+
+
+class CanalFd(_CanalDeBytes):
+    """Quadros com prefixo de tamanho sobre dois os.pipe(), lidos e escritos direto nos descritores."""
+
+    tamanho_lote = 1
+
+    def __init__(self, fd_leitura, fd_escrita):
+        self.fd_leitura = fd_leitura
+        self.fd_escrita = fd_escrita
+        self._extremidade = _ExtremidadeFd(fd_leitura, fd_escrita)
+        self._leitor = LeitorQuadros(self._extremidade)
+
+    # Descritores não podem ser copiados como números: DupFd os entrega ao processo de destino
+    # (da mesma forma que o multiprocessing faz com as conexões de mp.Pipe).
+    def __reduce__(self):
+        return (_reconstruir_canal_fd, (reduction.DupFd(self.fd_leitura), reduction.DupFd(self.fd_escrita)))
+
+    def enviar(self, dados):
+        enviar_quadro(self._extremidade, dados)
+
+    def receber(self):
+        return self._leitor.receber()
+
+    def descarregar(self):
+        pass
+
+    def fechar(self):
+        os.close(self.fd_leitura)
+        os.close(self.fd_escrita)
+
+
+# Recria um CanalFd no processo de destino a partir dos descritores duplicados.
+def _reconstruir_canal_fd(dup_leitura, dup_escrita):
+    return CanalFd(dup_leitura.detach(), dup_escrita.detach())
+
+
+class CanalLote(_CanalDeBytes):
+    """Agrupa até 'tamanho_lote' mensagens em uma única escrita no canal de baixo (o modo bytes).
+
+    As mensagens ficam pendentes até o lote encher ou até descarregar() ser chamado. Na
+    recepção, cada lote é lido de uma vez e as mensagens são devolvidas uma a uma, como
+    memoryviews válidos até o próximo lote ser lido.
+    """
+
+    def __init__(self, canal, tamanho_lote=TAMANHO_LOTE_PADRAO):
+        self.canal = canal
+        self.tamanho_lote = tamanho_lote
+        self._pendente = bytearray()
+        self._num_pendentes = 0
+        self._lote = None
+        self._pos = 0
+
+    def __reduce__(self):
+        return (CanalLote, (self.canal, self.tamanho_lote))
+
+    def enviar(self, dados):
+        self._pendente += CABECALHO_REGISTRO.pack(len(dados))
+        self._pendente += dados
+        self._num_pendentes += 1
+        if self._num_pendentes >= self.tamanho_lote:
+            self.descarregar()
+
+    # Envia as mensagens pendentes como um único lote.
+    def descarregar(self):
+        if self._num_pendentes:
+            self.canal.enviar(self._pendente)
+            self._pendente.clear()
+            self._num_pendentes = 0
+
+    def receber(self):
+        if self._lote is None or self._pos >= len(self._lote):
+            self._lote = self.canal.receber()
+            self._pos = 0
+        (tamanho,) = CABECALHO_REGISTRO.unpack_from(self._lote, self._pos)
+        inicio = self._pos + CABECALHO_REGISTRO.size
+        self._pos = inicio + tamanho
+        return self._lote[inicio:self._pos]
+
+    def fechar(self):
+        self.canal.fechar()
+
+
+class CanalHibrido(_CanalDeBytes):
+    """Mensagens pequenas e de controle pelo Pipe; payloads acima de 'limiar' em slabs reaproveitados.
+
+    Cada lado escreve nos slabs do seu 'pool_envio' e lê os do 'pool_recepcao' (o pool de envio do
+    outro lado). O memoryview devolvido por receber() aponta para o slab e só é válido até a próxima
+    chamada de receber() ou liberar(), quando o slab é devolvido ao remetente. Sem slab livre, o
+    payload vai num segmento avulso, do seu tamanho, e o envio nunca espera.
+    """
+
+    tamanho_lote = 1
+
+    def __init__(self, canal, pool_envio, pool_recepcao, limiar=LIMIAR_SLAB_PADRAO, dono=False):
+        self.canal = canal
+        self.pool_envio = pool_envio
+        self.pool_recepcao = pool_recepcao
+        self.limiar = limiar
+        # O dono (o lado do processo que criou os pools) remove os segmentos ao fechar.
+        self.dono = dono
+        # Mensagens lidas do Pipe enquanto se procuravam devoluções, entregues antes das próximas.
+        self._adiantadas = collections.deque()
+        # Slab (classe, indice, visao) ou Segmento da última mensagem recebida, ainda não devolvido.
+        self._recebida = None
+        # Mensagens enviadas por slab e por segmento avulso (pool esgotado ou payload maior que a maior classe).
+        self.enviadas_slab = 0
+        self.enviadas_segmento = 0
+
+    # Só o canal de baixo, os pools e o limiar viajam para outro processo; o filho nunca é o dono.
+    def __reduce__(self):
+        return (CanalHibrido, (self.canal, self.pool_envio, self.pool_recepcao, self.limiar))
+
+    def enviar(self, dados):
+        visao = memoryview(dados).cast('B')
+        if len(visao) <= self.limiar:
+            self.canal.enviar(bytes((TIPO_DADOS,)) + visao)
+            return
+        # Só quando o pool parece esgotado vale a chamada ao sistema para buscar as devoluções pendentes.
+        if not self.pool_envio.tem_livre(len(visao)):
+            self._recolher_devolucoes()
+        slab = self.pool_envio.alocar(len(visao))
+        if slab is None:
+            segmento = Segmento.publicar(visao)
+            self.canal.enviar(bytes((TIPO_SEGMENTO,)) + segmento.nome.encode('ascii'))
+            # A posse do segmento passa para quem lê, que o remove.
+            segmento.fechar()
+            self.enviadas_segmento += 1
+            return
+        classe, indice = slab
+        # A única cópia do payload: direto para o slab compartilhado.
+        with self.pool_envio.visao(classe, indice, len(visao)) as destino:
+            destino[:] = visao
+        self.canal.enviar(CONTROLE_SLAB.pack(TIPO_SLAB, classe, indice, len(visao)))
+        self.enviadas_slab += 1
+
+    # Lê as mensagens já disponíveis no Pipe sem esperar: devolve ao pool os slabs devolvidos e guarda as
+    # demais para receber(). Usa recv_bytes (e não o buffer do canal), que pode estar em uso por quem chama.
+    def _recolher_devolucoes(self):
+        while self.canal.conn.poll():
+            mensagem = self.canal.conn.recv_bytes()
+            if mensagem[0] == TIPO_DEVOLVER:
+                _, classe, indice, _ = CONTROLE_SLAB.unpack(mensagem)
+                self.pool_envio.liberar(classe, indice)
+            else:
+                self._adiantadas.append(mensagem)
+
+    def receber(self):
+        self.liberar()
+        while True:
+            mensagem = self._adiantadas.popleft() if self._adiantadas else self.canal.receber()
+            tipo = mensagem[0]
+            if tipo == TIPO_DADOS:
+                return memoryview(mensagem)[1:]
+            if tipo == TIPO_DEVOLVER:
+                _, classe, indice, _ = CONTROLE_SLAB.unpack(mensagem)
+                self.pool_envio.liberar(classe, indice)
+                continue
+            if tipo == TIPO_SLAB:
+                _, classe, indice, tamanho = CONTROLE_SLAB.unpack(mensagem)
+                visao = self.pool_recepcao.visao(classe, indice, tamanho)
+                self._recebida = (classe, indice, visao)
+                return visao
+            segmento = Segmento.abrir(bytes(mensagem[1:]).decode('ascii'))
+            self._recebida = segmento
+            return segmento.dados
+
+    # Devolve ao remetente o slab da última mensagem recebida (ou remove o segmento avulso dela).
+    # Com 'devolver=False', só libera a visão: o outro lado já pode ter fechado o Pipe.
+    def liberar(self, devolver=True):
+        recebida, self._recebida = self._recebida, None
+        if recebida is None:
+            return
+        if isinstance(recebida, Segmento):
+            recebida.remover()
+            return
+        classe, indice, visao = recebida
+        visao.release()
+        if devolver:
+            try:
+                self.canal.enviar(CONTROLE_SLAB.pack(TIPO_DEVOLVER, classe, indice, 0))
+            except (BrokenPipeError, ConnectionResetError):
+                # O outro lado já enviou a última mensagem e fechou o Pipe: não precisa mais do slab.
+                pass
+
+    # Nada fica pendente neste modo. O slab recebido por último não é devolvido aqui: depois do último
+    # envio, o outro lado pode já ter fechado o Pipe.
+    def descarregar(self):
+        pass
+
+    def fechar(self):
+        self.liberar(devolver=False)
+        self.canal.fechar()
+        for pool in (self.pool_envio, self.pool_recepcao):
+            if self.dono:
+                pool.remover()
+            else:
+                pool.fechar()
+
+
+# Serializa um objeto com os buffers grandes fora do pickle: devolve as partes a enviar, o cabeçalho
+# (pickle + tamanhos dos buffers) seguido de uma visão direta sobre a memória de cada buffer.
+def serializar_oob(obj):
+    buffers = []
+    dados_pickle = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    visoes = [buffer.raw() for buffer in buffers]
+    cabecalho = CABECALHO_OOB.pack(len(visoes)) + b"".join(TAMANHO_BUFFER_OOB.pack(v.nbytes) for v in visoes)
+    return [cabecalho + dados_pickle, *visoes]
+
+
+# Envia um objeto serializado por serializar_oob(): cada parte numa escrita própria.
+def enviar_oob(conn, obj):
+    for parte in serializar_oob(obj):
+        conn.send_bytes(parte)
+
+
+class ReceptorOOB:
+    """Recebe objetos enviados por enviar_oob(), lendo os buffers em memória pré-alocada e reaproveitada.
+
+    Os objetos devolvidos (ex: matrizes) apontam para esses buffers, então só são válidos até a
+    próxima chamada de receber().
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._buffers = []
+
+    # Lê a mensagem de um objeto: o cabeçalho com o pickle e as visões sobre os buffers recebidos.
+    def receber_serializado(self):
+        mensagem = self.conn.recv_bytes()
+        (num_buffers,) = CABECALHO_OOB.unpack_from(mensagem, 0)
+        pos = CABECALHO_OOB.size
+        visoes = []
+        for i in range(num_buffers):
+            (tamanho,) = TAMANHO_BUFFER_OOB.unpack_from(mensagem, pos)
+            pos += TAMANHO_BUFFER_OOB.size
+            if i == len(self._buffers):
+                self._buffers.append(bytearray(tamanho))
+            elif len(self._buffers[i]) < tamanho:
+                self._buffers[i] = bytearray(tamanho)
+            # Os dados vão do pipe direto para o buffer, sem passar por um objeto bytes intermediário.
+            self.conn.recv_bytes_into(self._buffers[i])
+            visoes.append(memoryview(self._buffers[i])[:tamanho])
+        return memoryview(mensagem)[pos:], visoes
+
+    # O pickle reconstrói o objeto sobre os buffers recebidos, sem copiá-los.
+    def desserializar(self, serializado):
+        dados_pickle, visoes = serializado
+        return pickle.loads(dados_pickle, buffers=visoes)
+
+    def receber(self):
+        return self.desserializar(self.receber_serializado())
+
+
+class CanalMatriz:
+    """Objetos com pickle protocolo 5 pelo Pipe, com os buffers (ex: os dados de uma matriz NumPy) fora de banda.
+
+    A matriz devolvida por receber() aponta para um buffer interno e só é válida até a próxima chamada.
+    """
+
+    tamanho_lote = 1
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._receptor = ReceptorOOB(conn)
+
+    # Só a conexão viaja para outro processo; os buffers de recepção são recriados lá.
+    def __reduce__(self):
+        return (CanalMatriz, (self.conn,))
+
+    def enviar(self, obj):
+        enviar_oob(self.conn, obj)
+
+    def receber(self):
+        return self._receptor.receber()
+
+    def serializar(self, obj):
+        return serializar_oob(obj)
+
+    def enviar_serializado(self, partes):
+        for parte in partes:
+            self.conn.send_bytes(parte)
+
+    def receber_serializado(self):
+        return self._receptor.receber_serializado()
+
+    def desserializar(self, serializado):
+        return self._receptor.desserializar(serializado)
+
+    def descarregar(self):
+        pass
+
+    def fechar(self):
+        self.conn.close()
+
+
+# Cria o par de canais (pai, filho) do modo escolhido. 'limiar_slab' só vale para o modo "hibrido".
+def criar_canais(modo="objeto", tamanho_lote=TAMANHO_LOTE_PADRAO, limiar_slab=LIMIAR_SLAB_PADRAO):
+    if modo == "objeto":
+        conn_pai, conn_filho = mp.Pipe()
+        return CanalObjeto(conn_pai), CanalObjeto(conn_filho)
+    if modo == "bytes":
+        conn_pai, conn_filho = mp.Pipe()
+        return CanalBytes(conn_pai), CanalBytes(conn_filho)
+    if modo == "fd":
+        # Um pipe por sentido: os.pipe() é unidirecional.
+        leitura_filho, escrita_pai = os.pipe()
+        leitura_pai, escrita_filho = os.pipe()
+        return CanalFd(leitura_pai, escrita_pai), CanalFd(leitura_filho, escrita_filho)
+    if modo == "lote":
+        canal_pai, canal_filho = criar_canais("bytes")
+        return CanalLote(canal_pai, tamanho_lote), CanalLote(canal_filho, tamanho_lote)
+    if modo == "hibrido":
+        # Os processos precisam compartilhar o rastreador dos segmentos avulsos (ver segmento.py).
+        iniciar_rastreador()
+        canal_pai, canal_filho = criar_canais("bytes")
+        pool_pai, pool_filho = PoolSlabs(), PoolSlabs()
+        # O canal do filho tem as suas próprias instâncias: o pai o fecha logo depois de iniciar o filho.
+        return (CanalHibrido(canal_pai, pool_pai, pool_filho, limiar_slab, dono=True),
+                CanalHibrido(canal_filho, pool_filho.reabrir(), pool_pai.reabrir(), limiar_slab))
+    if modo == "matriz":
+        conn_pai, conn_filho = mp.Pipe()
+        return CanalMatriz(conn_pai), CanalMatriz(conn_filho)
+    raise ValueError(f"Modo desconhecido: {modo!r}. Use um de {MODOS}.")
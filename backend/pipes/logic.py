@@ -1,103 +1,244 @@
-# -----------------------------------------------------------------------------
-# ARQUIVO: backend/pipes/logic.py
-# DESCRIÇÃO: Lógica de comunicação entre dois processos usando Pipes.
-# -----------------------------------------------------------------------------
-
-import multiprocessing as mp  # Importa a biblioteca para criar e gerenciar processos.
-import json  # Importa a biblioteca para formatar os logs em JSON.
-import sys  # Importa a biblioteca do sistema para ler argumentos da linha de comando.
-import os  # Importa a biblioteca do sistema para obter o ID do processo (PID).
-import time  # Importa a biblioteca de tempo para adicionar pequenas pausas.
-
-# Função para criar e imprimir logs no formato JSON esperado pela GUI.
-def log_message(source, message):
-    # Cria um dicionário (estrutura de dados) para o log.
-    pid = os.getpid()
-
-    log_entry = {
-        "source": source,  # A origem da mensagem (ex: "PROCESSO PAI").
-        "payload": {"message": message}  # O conteúdo da mensagem.
-    }
-    # Converte o dicionário para uma string JSON e a imprime na saída padrão.
-    # 'flush=True' força a impressão imediata, sem esperar o buffer encher.
-    print(json.dumps(log_entry), flush=True)
-
-# Função que define o comportamento do processo filho.
-def processo_filho(conn):
-    # Obtém o ID deste processo.
-    pid = os.getpid()
-    # Define um nome de origem para os logs deste processo.
-    source_id = f"PROCESSO FILHO (PID: {pid})"
-    
-    # Loga que o processo foi iniciado.
-    log_message(source_id, f"PID: {pid} -> Iniciado e aguardando mensagem do pai.")
-
-    # Fica bloqueado aqui até receber uma mensagem do pai através do pipe 'conn'.
-    mensagem = conn.recv()
-    # Loga a mensagem que foi recebida.
-    log_message(source_id, f"PID: {pid} -> Recebeu: '{mensagem}'")
-    
-    # Adiciona uma pequena pausa para visualização.
-    time.sleep(1)
-    
-    # Prepara uma resposta para o pai.
-    resposta = f"Obrigado pela mensagem, pai!"
-    # Loga que está enviando a resposta.
-    log_message(source_id, f"PID: {pid} -> Enviando resposta: '{resposta}'")
-    # Envia a resposta para o pai através do pipe.
-    conn.send(resposta)
-    
-    # Fecha sua ponta da conexão do pipe.
-    conn.close()
-    # Loga que o processo está terminando.
-    log_message(source_id, f"PID: {pid} -> Conexão fechada. Encerrando.")
-
-# Ponto de entrada do script.
-if __name__ == "__main__":
-    # Obtém a mensagem enviada pela GUI a partir dos argumentos da linha de comando.
-    # sys.argv[0] é o nome do script, sys.argv[1] é o primeiro argumento.
-    mensagem_da_gui = sys.argv[1]
-    
-    # Obtém o ID do processo principal (que atuará como o pai).
-    pid_pai = os.getpid()
-    # Define um nome de origem para os logs do processo pai.
-    source_id_pai = f"PROCESSO PAI (PID: {pid_pai})"
-    
-    # Loga o início da operação.
-    log_message(source_id_pai, f"PID: {pid_pai} -> Iniciando demonstração com Pipes.")
-
-    # Cria um Pipe. Isso retorna duas pontas de conexão: uma para o pai, outra para o filho.
-    conn_pai, conn_filho = mp.Pipe()
-    
-    # Cria um novo processo que executará a função 'processo_filho'.
-    # Passa a ponta do pipe do filho ('conn_filho') como argumento para a função.
-    p_filho = mp.Process(target=processo_filho, args=(conn_filho,))
-    
-    # Inicia a execução do processo filho.
-    p_filho.start()
-    
-    # O processo pai fecha a ponta do pipe do filho, pois não a usará.
-    conn_filho.close()
-    
-    # Adiciona uma pequena pausa para garantir que o filho esteja pronto para receber.
-    time.sleep(1)
-    
-    # Loga a mensagem que será enviada.
-    log_message(source_id_pai, f"PID: {pid_pai} -> Enviando mensagem: '{mensagem_da_gui}'")
-    # Envia a mensagem da GUI para o filho através da sua ponta do pipe.
-    conn_pai.send(mensagem_da_gui)
-    
-    # Loga que está aguardando a resposta.
-    log_message(source_id_pai, f"PID: {pid_pai} -> Aguardando resposta do filho...")
-    # Fica bloqueado aqui até receber a resposta do filho.
-    resposta_filho = conn_pai.recv()
-    # Loga a resposta recebida.
-    log_message(source_id_pai, f"PID: {pid_pai} -> Recebeu a resposta: '{resposta_filho}'")
-
-    # Espera até que o processo filho termine sua execução.
-    p_filho.join()
-    
-    # Fecha a ponta do pipe do pai.
-    conn_pai.close()
-    # Loga o fim da demonstração.
-    log_message(source_id_pai, f"PID: {pid_pai} -> Demonstração com Pipes finalizada.")
\ No newline at end of file
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/pipes/logic.py
+# DESCRIÇÃO: Lógica de comunicação entre dois processos usando Pipes.
+# -----------------------------------------------------------------------------
+
+import os  # Importa a biblioteca do sistema para obter o ID do processo (PID).
+import time  # Importa a biblioteca de tempo para medir os tempos de ida e volta e de inicialização.
+import argparse  # Importa a biblioteca para ler as opções da linha de comando.
+
+# Modos de transporte: objetos com pickle, bytes crus, os.pipe direto, lotes, slabs e matrizes NumPy.
+from backend.pipes.canal import LIMIAR_SLAB_PADRAO, MODOS, TAMANHO_LOTE_PADRAO, criar_canais
+# Matriz NumPy usada como payload do benchmark no modo "matriz" (o NumPy é opcional).
+from backend.matrizes import criar_matriz
+# Topologia fan-out/fan-in: o pai distribui o trabalho entre vários processos filhos.
+from backend.pipes.topologia import DISTRIBUICOES, demonstrar
+# Modo arquivo: o pai envia um arquivo ao filho, com os.splice ou pelo mp.Pipe.
+from backend.pipes import arquivo
+from backend.transferencia import BLOCO_PADRAO, COPIAS
+# Método de início dos processos, sinal de "pronto" e pool de processos pré-iniciados.
+from backend.processos import METODOS_INICIO, SinalPronto, iniciar_processo, obter_contexto
+
+# Função de log compartilhada pelos backends: registros binários no canal de telemetria da GUI,
+# ou linhas JSON na saída padrão quando executado pela linha de comando.
+from backend.telemetria import log_message
+# Recursos usados por cada papel (CPU, RSS, trocas de contexto, chamadas de E/S), enviados no fim.
+from backend.recursos import iniciar_medicao
+# Marcas de rastreio de cada envio e recebimento (ligadas com IPC_RASTRO=1).
+from backend.rastreio import criar_rastro, enviar_rastreado, receber_rastreado
+
+# Número máximo de mensagens do fluxo registradas individualmente no log de cada processo.
+MAX_MENSAGENS_LOGADAS = 5
+
+# Função que define o comportamento do processo filho.
+def processo_filho(canal, repeticoes=1, pronto=None):
+    # Obtém o ID deste processo.
+    pid = os.getpid()
+    # Define um nome de origem para os logs deste processo.
+    source_id = f"PROCESSO FILHO (PID: {pid})"
+    medicao = iniciar_medicao(source_id)
+    
+    # Loga que o processo foi iniciado.
+    log_message(source_id, f"PID: {pid} -> Iniciado e aguardando mensagem do pai.")
+    # Avisa o pai que já está pronto para receber.
+    if pronto:
+        pronto.sinalizar()
+
+    # Prepara a resposta para o pai. O canal a serializa (pickle no modo "objeto", UTF-8 nos demais).
+    resposta = f"Obrigado pela mensagem, pai!"
+    # Rastros de cada sentido do canal (None se o rastreio estiver desligado).
+    rastro_ida = criar_rastro("pai->filho")
+    rastro_volta = criar_rastro("filho->pai")
+
+    for i in range(1, repeticoes + 1):
+        # Fica bloqueado aqui até receber uma mensagem do pai através do canal.
+        mensagem = receber_rastreado(rastro_ida, canal.receber_serializado, canal.desserializar)
+        if i <= MAX_MENSAGENS_LOGADAS:
+            # Loga a mensagem que foi recebida e a resposta que será enviada.
+            log_message(source_id, f"PID: {pid} -> Recebeu: '{mensagem}'")
+            log_message(source_id, f"PID: {pid} -> Enviando resposta: '{resposta}'")
+        # Envia a resposta para o pai. No modo "lote", ela só parte quando o lote enche.
+        enviar_rastreado(rastro_volta, resposta, canal.serializar, canal.enviar_serializado)
+    # Envia as respostas que ainda estiverem pendentes num lote incompleto.
+    canal.descarregar()
+    
+    # Fecha sua ponta do canal.
+    canal.fechar()
+    # Loga que o processo está terminando.
+    log_message(source_id, f"PID: {pid} -> {repeticoes} mensagem(ns) respondida(s). Conexão fechada. Encerrando.")
+    medicao.encerrar(repeticoes)
+
+# Envia 'repeticoes' cópias da mensagem de texto 'mensagem' e recebe as respostas. O pai espera as
+# respostas de cada lote antes de enviar o próximo, para que nenhum dos lados fique bloqueado escrevendo
+# num pipe cheio enquanto o outro também escreve. Chama 'ao_receber(i, resposta)' a cada resposta.
+def trocar_mensagens(canal, mensagem, repeticoes, ao_receber=None, rastro_ida=None, rastro_volta=None):
+    enviadas = 0
+    recebidas = 0
+    while enviadas < repeticoes:
+        tamanho_lote = min(canal.tamanho_lote, repeticoes - enviadas)
+        for _ in range(tamanho_lote):
+            enviar_rastreado(rastro_ida, mensagem, canal.serializar, canal.enviar_serializado)
+        canal.descarregar()
+        enviadas += tamanho_lote
+        for _ in range(tamanho_lote):
+            resposta = receber_rastreado(rastro_volta, canal.receber_serializado, canal.desserializar)
+            recebidas += 1
+            if ao_receber:
+                ao_receber(recebidas, resposta)
+
+# Função executada pelo processo filho durante o benchmark: devolve (eco) cada mensagem recebida.
+def processo_filho_eco(canal, num_mensagens, pronto):
+    pronto.sinalizar()
+    # Repete o ciclo recebe/envia exatamente o número de mensagens combinado com o pai.
+    for _ in range(num_mensagens):
+        canal.enviar(canal.receber())
+    canal.descarregar()
+    # Fecha sua ponta do canal ao terminar.
+    canal.fechar()
+
+# Mede o tempo de ida e volta (RTT) de 'num_mensagens' mensagens de 'tamanho_payload' bytes pelo Pipe,
+# no modo escolhido. No modo "objeto" o caminho é o mesmo da demonstração original (conn.send/conn.recv,
+# com pickle). Num lote, todas as mensagens têm a latência da ida e volta do lote inteiro. No modo
+# "matriz", o payload é uma matriz NumPy de float64 com 'tamanho_payload' bytes.
+# O filho é criado com 'metodo_inicio' ou, se houver, reaproveitado de 'pool'.
+def benchmark_eco(tamanho_payload, num_mensagens, modo="objeto", tamanho_lote=TAMANHO_LOTE_PADRAO,
+                  metodo_inicio=None, pool=None):
+    # Monta o payload uma única vez, fora da região medida (e antes do filho: sem o NumPy, o modo
+    # "matriz" falha aqui).
+    payload = criar_matriz(tamanho_payload) if modo == "matriz" else b"x" * tamanho_payload
+    # Cria o canal e o processo filho que fará o eco.
+    canal_pai, canal_filho = criar_canais(modo, tamanho_lote)
+    pronto = SinalPronto()
+    p_filho = iniciar_processo(processo_filho_eco, (canal_filho, num_mensagens, pronto), metodo_inicio, pool)
+    canal_filho.fechar()
+    # A medição só começa com o filho pronto, para não incluir o tempo de criação do processo.
+    pronto.esperar()
+
+    latencias_ns = []
+
+    inicio = time.perf_counter_ns()
+    restantes = num_mensagens
+    while restantes:
+        quantidade = min(canal_pai.tamanho_lote, restantes)
+        t0 = time.perf_counter_ns()
+        for _ in range(quantidade):
+            canal_pai.enviar(payload)
+        canal_pai.descarregar()
+        for _ in range(quantidade):
+            canal_pai.receber()
+        latencias_ns.extend([time.perf_counter_ns() - t0] * quantidade)
+        restantes -= quantidade
+    duracao_ns = time.perf_counter_ns() - inicio
+
+    # Aguarda o filho terminar e libera o canal.
+    p_filho.join()
+    canal_pai.fechar()
+    return {"latencias_ns": latencias_ns, "duracao_ns": duracao_ns}
+
+# Executa a demonstração com as opções de 'argv' (ou da linha de comando). Também é chamada
+# pelos trabalhadores do daemon (backend/daemon.py), que já têm este módulo importado.
+def main(argv=None):
+    # Obtém a mensagem enviada pela GUI e as opções do modo a partir dos argumentos da linha de comando.
+    parser = argparse.ArgumentParser(description="Demonstração de IPC com Pipes.")
+    parser.add_argument("mensagem", help="Mensagem enviada pelo pai ao filho.")
+    parser.add_argument("--modo", choices=MODOS, default="objeto",
+                        help="'objeto': conn.send com pickle; 'bytes': send_bytes/recv_bytes_into; "
+                             "'fd': os.pipe direto; 'lote': várias mensagens por escrita; "
+                             "'hibrido': payloads grandes em slabs de memória compartilhada; "
+                             "'matriz': pickle protocolo 5 com os buffers fora de banda.")
+    parser.add_argument("--repeticoes", type=int, default=1,
+                        help="Quantas vezes o pai envia a mensagem ao filho.")
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE_PADRAO,
+                        help="No modo 'lote', quantas mensagens são agrupadas em cada escrita.")
+    parser.add_argument("--limiar-slab", type=int, default=LIMIAR_SLAB_PADRAO,
+                        help="No modo 'hibrido', mensagens acima deste tamanho em bytes vão por slab "
+                             "(0: todas).")
+    parser.add_argument("--metodo-inicio", choices=METODOS_INICIO, default=None,
+                        help="Como o processo filho é criado (padrão: o da plataforma).")
+    parser.add_argument("--trabalhadores", type=int, default=1,
+                        help="Com mais de 1, o pai distribui as repetições entre vários filhos, cada um com "
+                             "o seu Pipe (conn.send com pickle).")
+    parser.add_argument("--distribuicao", choices=DISTRIBUICOES, default="round_robin",
+                        help="Com --trabalhadores, como os itens são distribuídos entre os filhos.")
+    parser.add_argument("--arquivo", default=None,
+                        help="Envia este arquivo em vez da mensagem, gravando-o no destino (a mensagem não é usada).")
+    parser.add_argument("--copia", choices=COPIAS, default=COPIAS[0],
+                        help="Com --arquivo: 'kernel' (os.pipe com os.splice) ou 'usuario' (mp.Pipe com send_bytes).")
+    parser.add_argument("--destino", default=None,
+                        help="Com --arquivo, onde gravar o arquivo recebido (padrão: um temporário, apagado no fim).")
+    parser.add_argument("--bloco", type=int, default=BLOCO_PADRAO >> 10,
+                        help="Com --arquivo, tamanho de cada bloco transferido, em KB.")
+    args = parser.parse_args(argv)
+    mensagem_da_gui = args.mensagem
+
+    # Modo arquivo: o conteúdo de um arquivo no lugar da mensagem.
+    if args.arquivo:
+        arquivo.demonstrar(args.arquivo, args.copia, args.destino, args.metodo_inicio, args.bloco << 10)
+        return
+
+    # Topologia com vários filhos: um Pipe por filho, resultados recolhidos com connection.wait.
+    if args.trabalhadores > 1:
+        demonstrar(mensagem_da_gui, args.repeticoes, args.trabalhadores, args.distribuicao, args.metodo_inicio,
+                   MAX_MENSAGENS_LOGADAS)
+        return
+    
+    # Obtém o ID do processo principal (que atuará como o pai).
+    pid_pai = os.getpid()
+    # Define um nome de origem para os logs do processo pai.
+    source_id_pai = f"PROCESSO PAI (PID: {pid_pai})"
+    medicao = iniciar_medicao(source_id_pai)
+    
+    # Loga o início da operação.
+    log_message(source_id_pai, f"PID: {pid_pai} -> Iniciando demonstração com Pipes (modo '{args.modo}').")
+
+    # Cria o canal. Isso retorna duas pontas: uma para o pai, outra para o filho.
+    canal_pai, canal_filho = criar_canais(args.modo, args.lote, args.limiar_slab)
+    
+    # Cria um novo processo que executará a função 'processo_filho', com o método de início escolhido.
+    # Passa a ponta do canal do filho ('canal_filho') e o sinal de "pronto" como argumentos para a função.
+    contexto = obter_contexto(args.metodo_inicio)
+    pronto = SinalPronto(contexto)
+    p_filho = contexto.Process(target=processo_filho, args=(canal_filho, args.repeticoes, pronto))
+    
+    # Inicia a execução do processo filho.
+    inicio = time.monotonic_ns()
+    p_filho.start()
+    
+    # O processo pai fecha a ponta do canal do filho, pois não a usará.
+    canal_filho.fechar()
+    
+    # Espera o filho avisar que está pronto para receber (em vez de uma pausa fixa).
+    instante_pronto = pronto.esperar()
+    log_message(source_id_pai, f"PID: {pid_pai} -> Filho pronto em {(instante_pronto - inicio) / 1e6:.1f} ms "
+                               f"(método de início '{contexto.get_start_method()}').")
+    
+    # Loga a mensagem que será enviada.
+    log_message(source_id_pai, f"PID: {pid_pai} -> Enviando mensagem: '{mensagem_da_gui}' ({args.repeticoes}x)")
+
+    # Loga cada uma das primeiras respostas recebidas do filho.
+    def ao_receber(i, resposta_filho):
+        if i <= MAX_MENSAGENS_LOGADAS:
+            log_message(source_id_pai, f"PID: {pid_pai} -> Recebeu a resposta: '{resposta_filho}'")
+
+    # Loga que está trocando mensagens e aguardando as respostas.
+    log_message(source_id_pai, f"PID: {pid_pai} -> Aguardando resposta do filho...")
+    trocar_mensagens(canal_pai, mensagem_da_gui, args.repeticoes, ao_receber,
+                     criar_rastro("pai->filho"), criar_rastro("filho->pai"))
+
+    # Espera até que o processo filho termine sua execução.
+    p_filho.join()
+    if args.modo == "hibrido":
+        log_message(source_id_pai, f"PID: {pid_pai} -> {canal_pai.enviadas_slab} mensagem(ns) enviada(s) por slab "
+                                   f"(reaproveitados), {canal_pai.enviadas_segmento} por segmento avulso e as "
+                                   f"demais pelo Pipe (limiar de {args.limiar_slab} bytes).")
+    
+    # Fecha a ponta do canal do pai.
+    canal_pai.fechar()
+    # Loga o fim da demonstração.
+    log_message(source_id_pai, f"PID: {pid_pai} -> Demonstração com Pipes finalizada.")
+    medicao.encerrar(args.repeticoes)
+
+
+# Ponto de entrada do script.
+if __name__ == "__main__":
+    main()
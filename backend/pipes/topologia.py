@@ -0,0 +1,303 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/pipes/topologia.py
+# DESCRIÇÃO: Topologia fan-out/fan-in sobre Pipes: o processo pai distribui
+#            itens de trabalho para N processos trabalhadores, cada um com o
+#            seu próprio Pipe, e recolhe os resultados de todos ao mesmo tempo
+#            com multiprocessing.connection.wait.
+#
+#   round_robin     -> os itens vão para os trabalhadores em rodízio fixo; se o
+#                      próximo da vez estiver com a janela cheia, o pai espera.
+#   menos_carregado -> cada item vai para o trabalhador com menos itens em
+#                      andamento (o primeiro que tiver espaço, em caso de empate).
+#
+# Cada trabalhador aceita até 'janela' itens em andamento: o pai nunca enche um
+# pipe, e um trabalhador lento não acumula uma fila enquanto os outros ficam
+# ociosos (no modo menos_carregado).
+#
+# USO: python -m backend.pipes.topologia [--trabalhadores 1 2 4] [--itens 2000]
+#                                        [--custo-us 200] [--distribuicao round_robin]
+#      (mede como a vazão escala de 1 trabalhador até o número de núcleos)
+# -----------------------------------------------------------------------------
+
+import argparse  # Importa a biblioteca para ler as opções da linha de comando.
+import json  # Importa a biblioteca para emitir os resultados em JSON.
+import os  # Importa a biblioteca do sistema para obter o ID do processo (PID).
+import sys  # Importa a biblioteca do sistema para escrever na saída padrão.
+import time  # Importa a biblioteca de tempo para simular o trabalho e medir a vazão.
+from multiprocessing.connection import wait  # Espera qualquer uma de várias conexões ficar pronta.
+
+from backend.processos import METODOS_INICIO, SinalPronto, obter_contexto, quantidades_ate_nucleos
+from backend.recursos import iniciar_medicao  # Recursos usados pelo pai na demonstração.
+from backend.telemetria import log_message  # Log compartilhado pelos backends.
+
+# Políticas de distribuição dos itens.
+DISTRIBUICOES = ["round_robin", "menos_carregado"]
+
+# Itens em andamento aceitos por trabalhador.
+JANELA_PADRAO = 4
+
+# Parâmetros padrão da medição.
+ITENS_PADRAO = 2000
+CUSTO_US_PADRAO = 200
+TAMANHO_PADRAO = 64
+
+# Tempo máximo (em segundos) que cada trabalhador tem para sair depois do aviso de fim; depois disso, é terminado.
+TIMEOUT_ENCERRAR = 5.0
+
+
+# Simula o processamento de um item: ocupa a CPU por 'custo_us' microssegundos e devolve o tamanho do item.
+def processar(item, custo_us):
+    fim = time.perf_counter_ns() + int(custo_us * 1000)
+    while time.perf_counter_ns() < fim:
+        pass
+    return len(item)
+
+
+# Função executada por cada trabalhador: processa os itens recebidos até receber None e devolve
+# (identificador, resultado) de cada um pelo mesmo Pipe.
+def processo_trabalhador(conn, custo_us, pronto, processar_item=processar):
+    pronto.sinalizar()
+    while True:
+        mensagem = conn.recv()
+        if mensagem is None:
+            break
+        identificador, item = mensagem
+        conn.send((identificador, processar_item(item, custo_us)))
+    conn.close()
+
+
+class Distribuidor:
+    """Distribui itens para vários trabalhadores e recolhe os resultados com connection.wait.
+
+    'conexoes' são as pontas do pai dos Pipes de cada trabalhador. Cada resultado é entregue a
+    'ao_receber(indice_trabalhador, identificador, resultado)'.
+    """
+
+    def __init__(self, conexoes, distribuicao="round_robin", janela=JANELA_PADRAO):
+        if distribuicao not in DISTRIBUICOES:
+            raise ValueError(f"Distribuição desconhecida: {distribuicao!r}. Use uma de {DISTRIBUICOES}.")
+        # Sem trabalhadores ou sem janela, nenhum item poderia ser enviado e o recolhimento esperaria para sempre.
+        if not conexoes:
+            raise ValueError("O distribuidor precisa de ao menos um trabalhador.")
+        if janela < 1:
+            raise ValueError(f"A janela deve ser de ao menos 1 item por trabalhador (recebido: {janela}).")
+        self.conexoes = conexoes
+        self.distribuicao = distribuicao
+        self.janela = janela
+        self.em_andamento = [0] * len(conexoes)
+        # Itens processados por trabalhador, para mostrar como a carga foi dividida.
+        self.concluidos = [0] * len(conexoes)
+        self._indices = {conn: i for i, conn in enumerate(conexoes)}
+        self._proximo = 0
+
+    # Escolhe o trabalhador do próximo item, ou None se ele tiver que esperar um resultado.
+    def _escolher(self):
+        if self.distribuicao == "round_robin":
+            i = self._proximo
+            if self.em_andamento[i] >= self.janela:
+                return None
+            self._proximo = (i + 1) % len(self.conexoes)
+            return i
+        i = min(range(len(self.conexoes)), key=self.em_andamento.__getitem__)
+        return i if self.em_andamento[i] < self.janela else None
+
+    # Recolhe os resultados de todos os trabalhadores que já responderam (espera ao menos um).
+    def _recolher(self, ao_receber):
+        for conn in wait([c for i, c in enumerate(self.conexoes) if self.em_andamento[i]]):
+            i = self._indices[conn]
+            try:
+                identificador, resultado = conn.recv()
+            except EOFError:
+                # O trabalhador saiu (ex: com uma exceção) e o Pipe fechou com itens ainda em andamento.
+                raise ConnectionError(f"O trabalhador {i} encerrou sem devolver {self.em_andamento[i]} "
+                                      f"item(ns) em andamento.") from None
+            self.em_andamento[i] -= 1
+            self.concluidos[i] += 1
+            if ao_receber:
+                ao_receber(i, identificador, resultado)
+
+    # Processa todos os 'itens' nos trabalhadores e espera o último resultado. 'ao_enviar(identificador)'
+    # é chamado logo antes de cada item partir para um trabalhador.
+    def executar(self, itens, ao_receber=None, ao_enviar=None):
+        for identificador, item in enumerate(itens):
+            i = self._escolher()
+            while i is None:
+                self._recolher(ao_receber)
+                i = self._escolher()
+            if ao_enviar:
+                ao_enviar(identificador)
+            self.conexoes[i].send((identificador, item))
+            self.em_andamento[i] += 1
+        while any(self.em_andamento):
+            self._recolher(ao_receber)
+
+
+# Cria 'num_trabalhadores' processos, cada um com o seu Pipe. Devolve (processos, conexões do pai).
+def iniciar_trabalhadores(num_trabalhadores, custo_us=0, metodo_inicio=None, processar_item=processar):
+    contexto = obter_contexto(metodo_inicio)
+    processos = []
+    conexoes = []
+    prontos = []
+    for _ in range(num_trabalhadores):
+        conn, conn_filho = contexto.Pipe()
+        pronto = SinalPronto(contexto)
+        processo = contexto.Process(target=processo_trabalhador, args=(conn_filho, custo_us, pronto, processar_item))
+        processo.start()
+        conn_filho.close()
+        processos.append(processo)
+        conexoes.append(conn)
+        prontos.append(pronto)
+    for pronto in prontos:
+        pronto.esperar()
+    return processos, conexoes
+
+
+# Avisa os trabalhadores que não há mais itens e espera todos terminarem. Quem já saiu (Pipe fechado)
+# não recebe o aviso, e quem não sair em 'timeout' segundos é terminado.
+def encerrar_trabalhadores(processos, conexoes, timeout=TIMEOUT_ENCERRAR):
+    for conn in conexoes:
+        try:
+            conn.send(None)
+        except OSError:
+            pass
+    for processo, conn in zip(processos, conexoes):
+        processo.join(timeout)
+        if processo.is_alive():
+            processo.terminate()
+            processo.join()
+        conn.close()
+
+
+# Mede um ponto: 'num_itens' itens de 'tamanho' bytes, cada um com 'custo_us' de processamento,
+# distribuídos entre 'num_trabalhadores' processos.
+def executar_ponto(num_trabalhadores, num_itens=ITENS_PADRAO, custo_us=CUSTO_US_PADRAO, tamanho=TAMANHO_PADRAO,
+                   distribuicao="round_robin", janela=JANELA_PADRAO, metodo_inicio=None):
+    from backend.bench import percentil  # Importado aqui: o benchmark importa a demonstração, que importa este módulo.
+
+    processos, conexoes = iniciar_trabalhadores(num_trabalhadores, custo_us, metodo_inicio)
+    item = b"x" * tamanho
+    enviados_ns = [0] * num_itens
+    latencias_ns = []
+
+    # Latência de cada item: do envio ao trabalhador até o resultado chegar ao pai.
+    def ao_enviar(identificador):
+        enviados_ns[identificador] = time.perf_counter_ns()
+
+    def ao_receber(_, identificador, resultado):
+        latencias_ns.append(time.perf_counter_ns() - enviados_ns[identificador])
+
+    # Os trabalhadores são encerrados mesmo se um deles falhar no meio da distribuição (ou se os
+    # parâmetros do distribuidor forem recusados).
+    try:
+        distribuidor = Distribuidor(conexoes, distribuicao, janela)
+        inicio = time.perf_counter_ns()
+        distribuidor.executar([item] * num_itens, ao_receber, ao_enviar)
+        duracao_ns = time.perf_counter_ns() - inicio
+    finally:
+        encerrar_trabalhadores(processos, conexoes)
+
+    latencias_ns.sort()
+    return {
+        "trabalhadores": num_trabalhadores,
+        "distribuicao": distribuicao,
+        "itens": num_itens,
+        "custo_us": custo_us,
+        "itens_s": num_itens / (duracao_ns / 1e9),
+        # Vazão máxima teórica: todos os trabalhadores ocupados o tempo todo, sem custo de IPC.
+        "itens_s_ideal": num_trabalhadores * 1e6 / custo_us if custo_us else None,
+        "latencia_p50_us": percentil(latencias_ns, 50) / 1e3,
+        "latencia_p99_us": percentil(latencias_ns, 99) / 1e3,
+        "por_trabalhador": distribuidor.concluidos,
+    }
+
+
+# Processamento dos itens na demonstração: o trabalhador devolve a mensagem com o seu PID.
+def responder(mensagem, _):
+    return f"Processado pelo trabalhador (PID: {os.getpid()}): '{mensagem}'"
+
+
+# Demonstração da topologia (opção --trabalhadores da demonstração de Pipes): cada repetição da
+# mensagem é um item de trabalho, e as primeiras respostas aparecem no log.
+def demonstrar(mensagem, repeticoes, num_trabalhadores, distribuicao="round_robin", metodo_inicio=None,
+               max_logadas=5):
+    pid_pai = os.getpid()
+    source_id_pai = f"PROCESSO PAI (PID: {pid_pai})"
+    medicao = iniciar_medicao(source_id_pai)
+    log_message(source_id_pai, f"PID: {pid_pai} -> Iniciando {num_trabalhadores} trabalhadores "
+                               f"(distribuição '{distribuicao}').")
+    processos, conexoes = iniciar_trabalhadores(num_trabalhadores, metodo_inicio=metodo_inicio,
+                                                processar_item=responder)
+    log_message(source_id_pai, f"PID: {pid_pai} -> Trabalhadores prontos (PIDs: "
+                               f"{', '.join(str(p.pid) for p in processos)}). Distribuindo '{mensagem}' "
+                               f"({repeticoes}x).")
+    recebidas = 0
+
+    def ao_receber(i, identificador, resposta):
+        nonlocal recebidas
+        recebidas += 1
+        if recebidas <= max_logadas:
+            log_message(source_id_pai, f"PID: {pid_pai} -> Item {identificador} voltou do trabalhador {i}: "
+                                       f"'{resposta}'")
+
+    distribuidor = Distribuidor(conexoes, distribuicao)
+    try:
+        distribuidor.executar([mensagem] * repeticoes, ao_receber)
+    finally:
+        encerrar_trabalhadores(processos, conexoes)
+    divisao = ", ".join(f"PID {p.pid}: {n}" for p, n in zip(processos, distribuidor.concluidos))
+    log_message(source_id_pai, f"PID: {pid_pai} -> {recebidas} item(ns) processado(s) ({divisao}).")
+    medicao.encerrar(recebidas)
+
+
+# Tipo das opções que precisam de um inteiro maior que zero.
+def inteiro_positivo(texto):
+    valor = int(texto)
+    if valor < 1:
+        raise argparse.ArgumentTypeError(f"deve ser um inteiro maior que zero (recebido: {texto})")
+    return valor
+
+
+# Lê as opções da linha de comando.
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Escalabilidade da distribuição de trabalho por Pipes (fan-out/fan-in).")
+    parser.add_argument("--trabalhadores", type=inteiro_positivo, nargs="+", default=quantidades_ate_nucleos(),
+                        help="Quantidades de processos trabalhadores (padrão: de 1 ao número de núcleos).")
+    parser.add_argument("--itens", type=int, default=ITENS_PADRAO, help="Itens de trabalho em cada ponto.")
+    parser.add_argument("--custo-us", type=float, default=CUSTO_US_PADRAO,
+                        help="Tempo de CPU de cada item, em microssegundos (0 = só o custo do IPC).")
+    parser.add_argument("--tamanho", type=int, default=TAMANHO_PADRAO, help="Tamanho de cada item em bytes.")
+    parser.add_argument("--distribuicao", nargs="+", choices=DISTRIBUICOES, default=DISTRIBUICOES,
+                        help="Políticas de distribuição a medir.")
+    parser.add_argument("--janela", type=inteiro_positivo, default=JANELA_PADRAO,
+                        help="Itens em andamento aceitos por trabalhador.")
+    parser.add_argument("--metodo-inicio", choices=METODOS_INICIO, default=None,
+                        help="Como os processos trabalhadores são criados (padrão: o da plataforma).")
+    parser.add_argument("--json", action="store_true",
+                        help="Emite um objeto JSON por linha em vez da tabela.")
+    return parser
+
+
+# Ponto de entrada do benchmark.
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    if not args.json:
+        print(f"{'distribuição':<18}{'trab.':>6}{'itens/s':>10}{'ideal':>10}{'eficiência':>12}"
+              f"{'p50 (us)':>10}{'p99 (us)':>10}  itens por trabalhador", flush=True)
+    for distribuicao in args.distribuicao:
+        for num_trabalhadores in args.trabalhadores:
+            resumo = executar_ponto(num_trabalhadores, args.itens, args.custo_us, args.tamanho, distribuicao,
+                                    args.janela, args.metodo_inicio)
+            if args.json:
+                print(json.dumps(resumo), flush=True)
+                continue
+            ideal = resumo["itens_s_ideal"]
+            texto_ideal = f"{ideal:.0f}" if ideal else "-"
+            eficiencia = f"{100 * resumo['itens_s'] / ideal:.0f}%" if ideal else "-"
+            print(f"{distribuicao:<18}{num_trabalhadores:>6}{resumo['itens_s']:>10.0f}"
+                  f"{texto_ideal:>10}{eficiencia:>12}{resumo['latencia_p50_us']:>10.1f}"
+                  f"{resumo['latencia_p99_us']:>10.1f}  {resumo['por_trabalhador']}", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/processos.py
+# DESCRIÇÃO: Criação dos processos usados pelos backends: escolha do método de
+#            início (fork, forkserver ou spawn), sinal de "pronto" enviado pelo
+#            processo filho (em vez de pausas fixas com time.sleep) e um pool de
+#            processos pré-iniciados, reaproveitados entre execuções.
+#
+#   fork       -> copia o processo pai: rápido, mas herda todo o estado dele.
+#   forkserver -> um servidor limpo faz o fork de cada filho; os argumentos são
+#                 enviados por pickle.
+#   spawn      -> um interpretador novo para cada filho: o mais lento, mas o
+#                 único disponível em todas as plataformas (padrão no Windows
+#                 e no macOS).
+#
+# USO: python -m backend.processos [--metodos fork spawn] [--repeticoes 20]
+#      (mede a latência entre criar o processo e ele sinalizar que está pronto)
+# -----------------------------------------------------------------------------
+
+import argparse  # Importa a biblioteca para ler as opções da linha de comando.
+import json  # Importa a biblioteca para emitir os resultados em JSON.
+import multiprocessing as mp  # Importa a biblioteca para criar e gerenciar processos.
+import os  # Importa a biblioteca do sistema para contar os núcleos de CPU.
+import sys  # Importa a biblioteca do sistema para escrever na saída padrão.
+import time  # Importa a biblioteca de tempo para medir a inicialização.
+
+# Métodos de início disponíveis nesta plataforma.
+METODOS_INICIO = mp.get_all_start_methods()
+
+# Tempo máximo (em segundos) que o pai espera um filho sinalizar que está pronto.
+TIMEOUT_PRONTO = 30.0
+
+
+# Devolve o contexto do multiprocessing para o método de início escolhido (None = padrão da plataforma).
+def obter_contexto(metodo_inicio=None):
+    return mp.get_context(metodo_inicio)
+
+
+class SinalPronto:
+    """Aviso de que um processo terminou de iniciar e já pode receber trabalho.
+
+    O filho chama sinalizar() e o pai, esperar(). O aviso leva o instante (relógio monotônico,
+    comum a todos os processos da máquina) em que o filho ficou pronto.
+    """
+
+    def __init__(self, contexto=None):
+        self._conn_espera, self._conn_sinal = (contexto or mp).Pipe(duplex=False)
+
+    def sinalizar(self):
+        self._conn_sinal.send(time.monotonic_ns())
+        self._conn_sinal.close()
+
+    # Bloqueia até o sinal chegar e devolve o instante em que o filho ficou pronto.
+    def esperar(self, timeout=TIMEOUT_PRONTO):
+        if not self._conn_espera.poll(timeout):
+            raise TimeoutError("O processo filho não sinalizou que está pronto.")
+        instante = self._conn_espera.recv()
+        self._conn_espera.close()
+        return instante
+
+
+# Função executada por cada processo do pool: sinaliza que está pronto e executa as tarefas
+# recebidas, uma de cada vez, até receber None (ou o pool fechar a conexão).
+def _trabalhador_pool(conn):
+    conn.send(time.monotonic_ns())
+    while True:
+        try:
+            tarefa = conn.recv()
+        except EOFError:
+            return
+        if tarefa is None:
+            return
+        alvo, args = tarefa
+        try:
+            alvo(*args)
+            conn.send(0)
+        except Exception as erro:
+            conn.send(f"{type(erro).__name__}: {erro}")
+
+
+class TarefaPool:
+    """Uma tarefa em execução num processo do pool, com a mesma interface básica de mp.Process."""
+
+    def __init__(self, pool, processo, conn):
+        self._pool = pool
+        self._processo = processo
+        self._conn = conn
+        self.pid = processo.pid
+        self.exitcode = None
+        self.erro = None
+
+    # Espera a tarefa terminar e devolve o processo ao pool. Se o processo morreu no meio da tarefa
+    # (morto por um sinal, os._exit, falha de segmentação), o pool o troca por um novo.
+    def join(self, timeout=None):
+        if self.exitcode is not None or not self._conn.poll(timeout):
+            return
+        try:
+            resultado = self._conn.recv()
+        except (EOFError, OSError):
+            self._processo.join()
+            self.exitcode = self._processo.exitcode or 1
+            self.erro = f"O processo do pool (PID: {self.pid}) terminou no meio da tarefa (código {self.exitcode})."
+            self._pool._substituir(self._processo, self._conn)
+            return
+        self.exitcode = 0 if resultado == 0 else 1
+        self.erro = None if resultado == 0 else resultado
+        self._pool._devolver(self._processo, self._conn)
+
+    def is_alive(self):
+        return self.exitcode is None
+
+
+class PoolProcessos:
+    """Processos pré-iniciados que executam as funções dos backends sem criar um processo novo a cada vez.
+
+    Os argumentos de cada tarefa são enviados por pickle a um processo que já existe, então
+    conexões (mp.Pipe), sockets e canais de descritores funcionam, mas objetos que só podem
+    ser herdados na criação do processo (ex: mp.RawArray) não.
+    """
+
+    def __init__(self, tamanho=2, metodo_inicio=None):
+        self.contexto = obter_contexto(metodo_inicio)
+        self._livres = []
+        self._todos = []
+        # Tempo entre criar cada processo do pool e ele sinalizar que está pronto.
+        self.latencias_pronto_ns = []
+        for _ in range(tamanho):
+            self._iniciar_trabalhador()
+
+    # Inicia um processo do pool, espera ele ficar pronto e o coloca entre os livres.
+    def _iniciar_trabalhador(self):
+        conn, conn_filho = self.contexto.Pipe()
+        processo = self.contexto.Process(target=_trabalhador_pool, args=(conn_filho,), daemon=True)
+        inicio = time.monotonic_ns()
+        processo.start()
+        conn_filho.close()
+        self.latencias_pronto_ns.append(conn.recv() - inicio)
+        self._livres.append((processo, conn))
+        self._todos.append((processo, conn))
+
+    # Executa alvo(*args) num processo livre do pool e devolve a TarefaPool correspondente.
+    def executar(self, alvo, *args):
+        if not self._livres:
+            raise RuntimeError("Nenhum processo livre no pool; aguarde (join) uma tarefa anterior.")
+        processo, conn = self._livres.pop()
+        conn.send((alvo, args))
+        return TarefaPool(self, processo, conn)
+
+    def _devolver(self, processo, conn):
+        self._livres.append((processo, conn))
+
+    # Descarta um processo que morreu no meio de uma tarefa e inicia outro no lugar dele.
+    def _substituir(self, processo, conn):
+        self._todos.remove((processo, conn))
+        conn.close()
+        self._iniciar_trabalhador()
+
+    # Encerra todos os processos do pool.
+    def fechar(self):
+        for processo, conn in self._todos:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+            conn.close()
+            processo.join()
+        self._livres.clear()
+        self._todos.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+# Quantidades de processos para as varreduras de escalabilidade: potências de 2 até o número de
+# núcleos, mais o próprio número de núcleos.
+def quantidades_ate_nucleos():
+    nucleos = os.cpu_count() or 1
+    quantidades = {nucleos}
+    n = 1
+    while n < nucleos:
+        quantidades.add(n)
+        n *= 2
+    return sorted(quantidades)
+
+
+# Inicia 'alvo(*args)' num processo novo criado com o método escolhido, ou num processo do pool.
+# Devolve um objeto com join() e pid (mp.Process ou TarefaPool).
+def iniciar_processo(alvo, args=(), metodo_inicio=None, pool=None):
+    if pool is not None:
+        return pool.executar(alvo, *args)
+    processo = obter_contexto(metodo_inicio).Process(target=alvo, args=args)
+    processo.start()
+    return processo
+
+
+# Função executada pelo filho na medição: só sinaliza que está pronto.
+def _filho_pronto(pronto):
+    pronto.sinalizar()
+
+
+# Mede 'repeticoes' vezes o tempo entre pedir um processo e ele sinalizar que está pronto.
+# Com 'pool', mede o tempo para um processo já iniciado do pool começar uma tarefa nova.
+def medir_inicializacao(metodo_inicio=None, repeticoes=20, pool=None):
+    contexto = obter_contexto(metodo_inicio)
+    latencias_ns = []
+    for _ in range(repeticoes):
+        pronto = SinalPronto(contexto)
+        inicio = time.monotonic_ns()
+        processo = iniciar_processo(_filho_pronto, (pronto,), metodo_inicio, pool)
+        latencias_ns.append(pronto.esperar() - inicio)
+        processo.join()
+    return latencias_ns
+
+
+# Lê as opções da linha de comando.
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Latência de inicialização de processos por método de início.")
+    parser.add_argument("--metodos", nargs="+", choices=METODOS_INICIO, default=METODOS_INICIO,
+                        help="Métodos de início a medir (padrão: todos os disponíveis).")
+    parser.add_argument("--repeticoes", type=int, default=20,
+                        help="Processos criados para cada método.")
+    parser.add_argument("--json", action="store_true",
+                        help="Emite um objeto JSON por linha em vez da tabela.")
+    return parser
+
+
+# Ponto de entrada da medição.
+def main(argv=None):
+    from backend.bench import percentil  # Importado aqui: o benchmark importa os backends, que importam este módulo.
+
+    args = criar_parser().parse_args(argv)
+    if not args.json:
+        print(f"{'método':<24}{'p50 (ms)':>12}{'p99 (ms)':>12}{'máx (ms)':>12}", flush=True)
+    casos = [(metodo, metodo, False) for metodo in args.metodos]
+    casos += [(f"pool ({metodo})", metodo, True) for metodo in args.metodos]
+    for nome, metodo, usar_pool in casos:
+        if usar_pool:
+            with PoolProcessos(1, metodo) as pool:
+                latencias = sorted(medir_inicializacao(metodo, args.repeticoes, pool))
+        else:
+            latencias = sorted(medir_inicializacao(metodo, args.repeticoes))
+        resumo = {
+            "metodo": nome,
+            "repeticoes": len(latencias),
+            "p50_ms": percentil(latencias, 50) / 1e6,
+            "p99_ms": percentil(latencias, 99) / 1e6,
+            "max_ms": latencias[-1] / 1e6,
+        }
+        if args.json:
+            print(json.dumps(resumo), flush=True)
+        else:
+            print(f"{nome:<24}{resumo['p50_ms']:>12.2f}{resumo['p99_ms']:>12.2f}{resumo['max_ms']:>12.2f}",
+                  flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/rastreio.py
+# DESCRIÇÃO: Rastreio de cada mensagem trocada pelos backends, com instantes em
+#            nanossegundos, e a ferramenta que decompõe a latência por etapa e
+#            exporta a linha do tempo no formato de trace do Chrome/Perfetto.
+#
+# Com a variável de ambiente IPC_RASTRO=1, cada envio e cada recebimento das
+# demonstrações gera marcas no canal de telemetria (backend/telemetria.py), com o
+# relógio monotônico (comum a todos os processos da máquina), o nome do canal
+# (ex: "pai->filho") e o número de sequência da mensagem nele. Como os canais
+# entregam as mensagens em ordem, o n-ésimo envio e o n-ésimo recebimento são a
+# mesma mensagem: canal + sequência formam a correlação, sem alterar os bytes
+# que trafegam.
+#
+# ETAPAS DE UMA MENSAGEM (entre as marcas de cada fase):
+#   serialização    -> envio .......... serializado   (pickle, encode, ...)
+#   envio           -> serializado .... enviado       (chamada ao sistema ou cópia)
+#   despertar       -> enviado ........ recebido      (até o receptor acordar com os dados)
+#   desserialização -> recebido ....... desserializado
+# Se o receptor acorda antes de a chamada de envio retornar, o trecho em que as
+# duas se sobrepõem conta como envio e o despertar é zero.
+#
+# USO: python -m backend.rastreio pipes "Olá" --repeticoes 200 --saida rastro.json
+#      (as opções não reconhecidas, como --repeticoes, vão para a demonstração)
+#      Abra o arquivo em https://ui.perfetto.dev ou em chrome://tracing.
+# -----------------------------------------------------------------------------
+
+import argparse  # Importa a biblioteca para ler as opções da linha de comando.
+import collections  # Importa defaultdict para agrupar as marcas de cada mensagem.
+import json  # Importa a biblioteca para ler os eventos e gravar o trace.
+import os  # Importa a biblioteca do sistema para o ambiente e os descritores do canal.
+import subprocess  # Importa a biblioteca para executar a demonstração rastreada.
+import sys  # Importa a biblioteca do sistema para o interpretador atual.
+import threading  # Importa a biblioteca para ler o canal enquanto a demonstração executa.
+
+from backend.telemetria import (
+    EVENTO_RASTRO, FASES_RASTRO, MARCA_RASTRO, VARIAVEL_POLITICA, criar_canal, ler_canal, registrar_evento,
+)
+
+# Variável de ambiente que liga o rastreio nos processos dos backends.
+VARIAVEL_RASTRO = "IPC_RASTRO"
+
+# Códigos das fases de uma mensagem (ver FASES_RASTRO em backend/telemetria.py).
+FASE_ENVIO, FASE_SERIALIZADO, FASE_ENVIADO, FASE_RECEBIDO, FASE_DESSERIALIZADO = range(1, 6)
+
+# Etapas calculadas para cada mensagem, na ordem do trajeto.
+ETAPAS = ["serializacao", "envio", "despertar", "desserializacao"]
+
+# Mecanismos que a ferramenta sabe executar.
+MECANISMOS = ["pipes", "sockets", "shared_memory", "mmap_file"]
+
+# Raiz do projeto, para executar os backends com 'python -m' de qualquer diretório.
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Rastro:
+    """Marcas de um sentido de um canal (ex: "pai->filho"), com a sequência das mensagens nele.
+
+    Cada processo usa um Rastro para o que envia e outro para o que recebe em cada canal; o
+    mesmo objeto não deve ser usado por duas threads.
+    """
+
+    def __init__(self, canal):
+        self.canal = canal
+        self.seq = 0
+
+    # Avança para a próxima mensagem do canal e devolve o número de sequência dela.
+    def proxima(self):
+        self.seq += 1
+        return self.seq
+
+    # Registra o instante em que a mensagem 'seq' chegou à fase 'fase'.
+    def marcar(self, fase, seq):
+        registrar_evento(EVENTO_RASTRO, self.canal, MARCA_RASTRO.pack(fase, seq))
+
+
+# Devolve se o rastreio está ligado neste processo.
+def rastreio_ativo():
+    return os.environ.get(VARIAVEL_RASTRO) == "1"
+
+
+# Cria o Rastro de um canal, ou devolve None se o rastreio estiver desligado.
+def criar_rastro(canal):
+    return Rastro(canal) if rastreio_ativo() else None
+
+
+# Serializadores das mensagens de texto das demonstrações.
+def codificar_texto(texto):
+    return texto.encode('utf-8')
+
+
+def decodificar_texto(dados):
+    return bytes(dados).decode('utf-8')
+
+
+# Serializa e envia uma mensagem, marcando as fases se houver rastro.
+def enviar_rastreado(rastro, mensagem, serializar, enviar):
+    if rastro is None:
+        enviar(serializar(mensagem))
+        return
+    seq = rastro.proxima()
+    rastro.marcar(FASE_ENVIO, seq)
+    dados = serializar(mensagem)
+    rastro.marcar(FASE_SERIALIZADO, seq)
+    enviar(dados)
+    rastro.marcar(FASE_ENVIADO, seq)
+
+
+# Recebe e desserializa uma mensagem, marcando as fases se houver rastro.
+# Devolve None se 'receber' indicar o fim do fluxo (None).
+def receber_rastreado(rastro, receber, desserializar):
+    dados = receber()
+    if dados is None:
+        return None
+    if rastro is None:
+        return desserializar(dados)
+    seq = rastro.proxima()
+    rastro.marcar(FASE_RECEBIDO, seq)
+    mensagem = desserializar(dados)
+    rastro.marcar(FASE_DESSERIALIZADO, seq)
+    return mensagem
+
+
+# Agrupa as marcas por mensagem: correlação -> {fase: (instante_ns, pid)}.
+def agrupar_mensagens(eventos):
+    mensagens = collections.defaultdict(dict)
+    for evento in eventos:
+        marca = evento.get("trace")
+        if marca:
+            mensagens[marca["correlacao"]][marca["fase"]] = (evento["timestamp_ns"], evento["pid"])
+    return mensagens
+
+
+# Calcula a duração (ns) de cada etapa de uma mensagem, ou None se faltar alguma marca.
+def calcular_etapas(marcas):
+    if any(fase not in marcas for fase in FASES_RASTRO):
+        return None
+    envio, serializado, enviado, recebido, desserializado = (marcas[fase][0] for fase in FASES_RASTRO)
+    # O receptor pode acordar antes de a chamada de envio retornar: o trecho sobreposto conta como envio.
+    fim_envio = min(enviado, recebido)
+    return {
+        "serializacao": serializado - envio,
+        "envio": fim_envio - serializado,
+        "despertar": recebido - fim_envio,
+        "desserializacao": desserializado - recebido,
+        "total": desserializado - envio,
+    }
+
+
+# Resume as etapas por canal: {canal: {"mensagens": n, etapa: {"p50_us", "p99_us", "media_us", "fracao"}}}.
+def resumir(eventos):
+    from backend.bench import percentil  # Importado aqui: o benchmark importa os backends, que importam este módulo.
+
+    por_canal = collections.defaultdict(list)
+    for correlacao, marcas in agrupar_mensagens(eventos).items():
+        etapas = calcular_etapas(marcas)
+        if etapas:
+            por_canal[correlacao.rsplit("#", 1)[0]].append(etapas)
+
+    resumo = {}
+    for canal, lista in sorted(por_canal.items()):
+        total_medio = sum(etapas["total"] for etapas in lista) / len(lista)
+        resumo[canal] = {"mensagens": len(lista)}
+        for etapa in ETAPAS + ["total"]:
+            valores = sorted(etapas[etapa] for etapas in lista)
+            media = sum(valores) / len(valores)
+            resumo[canal][etapa] = {
+                "p50_us": percentil(valores, 50) / 1e3,
+                "p99_us": percentil(valores, 99) / 1e3,
+                "media_us": media / 1e3,
+                "fracao": media / total_medio if total_medio else 0.0,
+            }
+    return resumo
+
+
+# Monta o trace no formato JSON do Chrome/Perfetto: as etapas de cada mensagem como blocos no
+# processo que as executou (linha "envio" ou "recebimento"), uma seta ligando o envio ao
+# recebimento e os logs como eventos instantâneos.
+def exportar_chrome(eventos):
+    if not eventos:
+        return {"traceEvents": []}
+    inicio = min(evento["timestamp_ns"] for evento in eventos)
+
+    def em_us(instante_ns):
+        return (instante_ns - inicio) / 1e3
+
+    trace = []
+    nomes_processos = {}
+    for evento in eventos:
+        if evento.get("event") == "log":
+            nomes_processos.setdefault(evento["pid"], evento["source"])
+            trace.append({"name": evento["payload"]["message"][:80], "ph": "i", "s": "t", "cat": "log",
+                          "pid": evento["pid"], "tid": 0, "ts": em_us(evento["timestamp_ns"])})
+
+    for indice, (correlacao, marcas) in enumerate(sorted(agrupar_mensagens(eventos).items())):
+        if calcular_etapas(marcas) is None:
+            continue
+        canal = correlacao.rsplit("#", 1)[0]
+        (envio, pid_envio), (serializado, _), (enviado, _), (recebido, pid_recebimento), (desserializado, _) = (
+            marcas[fase] for fase in FASES_RASTRO)
+        fim_envio = min(enviado, recebido)
+        blocos = [
+            ("serialização", envio, serializado, pid_envio, 1),
+            ("envio", serializado, enviado, pid_envio, 1),
+            ("despertar", fim_envio, recebido, pid_recebimento, 2),
+            ("desserialização", recebido, desserializado, pid_recebimento, 2),
+        ]
+        for nome, de, ate, pid, tid in blocos:
+            trace.append({"name": nome, "ph": "X", "cat": canal, "pid": pid, "tid": tid,
+                          "ts": em_us(de), "dur": (ate - de) / 1e3, "args": {"correlacao": correlacao}})
+        # Seta do envio até o recebimento da mesma mensagem.
+        trace.append({"name": canal, "ph": "s", "cat": "mensagem", "id": indice,
+                      "pid": pid_envio, "tid": 1, "ts": em_us(serializado)})
+        trace.append({"name": canal, "ph": "f", "bp": "e", "cat": "mensagem", "id": indice,
+                      "pid": pid_recebimento, "tid": 2, "ts": em_us(recebido)})
+
+    # Nomes dos processos e das linhas de cada um, para a visualização.
+    for pid in {evento["pid"] for evento in eventos}:
+        trace.append({"name": "process_name", "ph": "M", "pid": pid,
+                      "args": {"name": nomes_processos.get(pid, f"PID {pid}")}})
+        for tid, nome in ((0, "log"), (1, "envio"), (2, "recebimento")):
+            trace.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": nome}})
+    return {"traceEvents": trace, "displayTimeUnit": "ns"}
+
+
+# Executa uma demonstração com o canal de telemetria e devolve todos os eventos que ela gerou,
+# em ordem. 'ambiente' acrescenta variáveis ao ambiente da demonstração.
+def executar_demonstracao(mecanismo, argumentos, ambiente=None):
+    fd_leitura, fd_escrita, ambiente_canal = criar_canal()
+    ambiente = {**ambiente_canal, **(ambiente or {})}
+    processo = subprocess.Popen(
+        [sys.executable, "-m", f"backend.{mecanismo}.logic", *argumentos],
+        stdout=subprocess.PIPE, text=True, encoding='utf-8', cwd=RAIZ_PROJETO,
+        pass_fds=(fd_escrita,), env={**os.environ, **ambiente},
+    )
+    os.close(fd_escrita)
+
+    eventos = []
+
+    def ler_telemetria():
+        try:
+            for registros in ler_canal(fd_leitura):
+                eventos.extend(registros)
+        finally:
+            os.close(fd_leitura)
+
+    leitor = threading.Thread(target=ler_telemetria)
+    leitor.start()
+    # Processos sem o canal (ex: criados com 'spawn') enviam os eventos em JSON pela saída padrão.
+    saida, _ = processo.communicate()
+    leitor.join()
+    for linha in saida.splitlines():
+        try:
+            eventos.append(json.loads(linha))
+        except json.JSONDecodeError:
+            print(linha, file=sys.stderr)
+    eventos.sort(key=lambda evento: evento.get("timestamp_ns", 0))
+    return eventos
+
+
+# Executa uma demonstração com o rastreio ligado e devolve todos os eventos que ela gerou.
+def executar_rastreado(mecanismo, argumentos):
+    # Nenhuma marca pode ser descartada: com a fila cheia, o processo espera.
+    return executar_demonstracao(mecanismo, argumentos, {VARIAVEL_RASTRO: "1", VARIAVEL_POLITICA: "bloquear"})
+
+
+# Imprime a decomposição da latência de cada canal.
+def imprimir_resumo(resumo):
+    for canal, dados in resumo.items():
+        print(f"\n{canal} ({dados['mensagens']} mensagens)")
+        print(f"  {'etapa':<18}{'p50 (us)':>12}{'p99 (us)':>12}{'média (us)':>12}{'% do total':>12}")
+        for etapa in ETAPAS + ["total"]:
+            valores = dados[etapa]
+            print(f"  {etapa:<18}{valores['p50_us']:>12.1f}{valores['p99_us']:>12.1f}"
+                  f"{valores['media_us']:>12.1f}{100 * valores['fracao']:>11.0f}%")
+        gargalo = max(ETAPAS, key=lambda etapa: dados[etapa]["media_us"])
+        print(f"  -> maior etapa: {gargalo}")
+
+
+# Lê as opções da linha de comando.
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        description="Rastreia as mensagens de uma demonstração e decompõe a latência por etapa.",
+        epilog="Opções não reconhecidas (ex: --repeticoes 200 --modo bytes) são repassadas à demonstração.")
+    parser.add_argument("mecanismo", nargs="?", choices=MECANISMOS, help="Demonstração a executar.")
+    parser.add_argument("mensagem", nargs="?", default="Olá", help="Mensagem enviada na demonstração.")
+    parser.add_argument("--saida", help="Arquivo do trace no formato do Chrome/Perfetto (JSON).")
+    parser.add_argument("--eventos", help="Grava os eventos recebidos, um JSON por linha.")
+    parser.add_argument("--entrada", help="Analisa eventos gravados antes com --eventos, sem executar nada.")
+    parser.add_argument("--json", action="store_true", help="Imprime o resumo em JSON em vez da tabela.")
+    return parser
+
+
+# Ponto de entrada da ferramenta de rastreio.
+def main(argv=None):
+    parser = criar_parser()
+    args, argumentos_demo = parser.parse_known_args(argv)
+    if args.entrada:
+        with open(args.entrada, encoding='utf-8') as arquivo:
+            eventos = [json.loads(linha) for linha in arquivo if linha.strip()]
+    elif args.mecanismo:
+        eventos = executar_rastreado(args.mecanismo, [args.mensagem, *argumentos_demo])
+    else:
+        parser.error("informe o mecanismo a rastrear ou um arquivo de eventos (--entrada).")
+
+    if args.eventos:
+        with open(args.eventos, "w", encoding='utf-8') as arquivo:
+            for evento in eventos:
+                arquivo.write(json.dumps(evento) + "\n")
+    if args.saida:
+        with open(args.saida, "w", encoding='utf-8') as arquivo:
+            json.dump(exportar_chrome(eventos), arquivo)
+
+    resumo = resumir(eventos)
+    if args.json:
+        print(json.dumps(resumo))
+    elif not resumo:
+        print("Nenhuma mensagem rastreada por completo.")
+    else:
+        imprimir_resumo(resumo)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/recursos.py
+# DESCRIÇÃO: Perfil dos recursos usados por cada papel dos backends (pai e
+#            filho, servidor e cliente, escritor e leitor) e a ferramenta que
+#            executa uma demonstração e compara o custo de cada papel por
+#            mensagem.
+#
+# Cada papel chama iniciar_medicao() ao começar e encerrar() ao terminar; a
+# diferença entre as duas amostras vai para o canal de telemetria como um
+# evento "recursos" (backend/telemetria.py), que a GUI mostra no resumo.
+# Se o papel terminar sem chamar encerrar() (ex: num erro), o relatório sai na
+# saída do processo, sem a contagem de mensagens.
+#
+# CADA AMOSTRA:
+#   resource.getrusage -> CPU de usuário e de sistema, pico de RSS e trocas de
+#                         contexto voluntárias (o processo esperou) e
+#                         involuntárias (o processo foi preemptado);
+#   /proc/<pid>/io     -> bytes e chamadas read()/write() (rchar, wchar, syscr,
+#                         syscw), incluindo as dos pipes; as chamadas send()/recv()
+#                         dos sockets não entram nesses contadores, e os papéis que
+#                         as usam (iniciar_medicao(..., contar_es=False)) não os
+#                         incluem no relatório;
+#   /proc/<pid>/status -> RSS atual (VmRSS).
+# As medidas são do processo inteiro: incluem a thread de telemetria, que também
+# escreve no canal. Onde não houver resource ou /proc (ex: Windows), os campos
+# ausentes não aparecem no relatório.
+#
+# USO: python -m backend.recursos pipes "Olá" --repeticoes 10000
+#      (as opções não reconhecidas, como --repeticoes, vão para a demonstração)
+# -----------------------------------------------------------------------------
+
+import argparse  # Importa a biblioteca para ler as opções da linha de comando.
+import json  # Importa a biblioteca para codificar os relatórios.
+import os  # Importa a biblioteca do sistema para o PID.
+import sys  # Importa a biblioteca do sistema para a plataforma e a saída padrão.
+import time  # Importa a biblioteca de tempo para a duração de cada papel.
+from multiprocessing import util  # Importa Finalize, executado também na saída dos processos filhos.
+
+from backend.telemetria import EVENTO_RECURSOS, registrar_evento
+
+try:
+    import resource  # Só existe nos sistemas Unix.
+except ImportError:
+    resource = None
+
+# Campos de /proc/<pid>/io incluídos nas amostras.
+CAMPOS_IO = ("rchar", "wchar", "syscr", "syscw")
+
+# Campos que são contadores (o relatório traz a diferença entre o fim e o início); os demais são
+# o valor no fim (os picos e o RSS atual).
+CONTADORES = ("cpu_usuario_s", "cpu_sistema_s", "trocas_voluntarias", "trocas_involuntarias") + CAMPOS_IO
+
+# No macOS, ru_maxrss vem em bytes; no Linux, em KB.
+ESCALA_RSS = 1024 if sys.platform == "darwin" else 1
+
+
+# Lê os contadores de E/S do processo em /proc, se disponível.
+def _ler_proc_io():
+    try:
+        with open(f"/proc/{os.getpid()}/io") as arquivo:
+            linhas = dict(linha.split(":", 1) for linha in arquivo)
+    except OSError:
+        return {}
+    return {campo: int(linhas[campo]) for campo in CAMPOS_IO if campo in linhas}
+
+
+# Lê o RSS atual do processo em /proc, em KB, se disponível.
+def _ler_rss_atual():
+    try:
+        with open(f"/proc/{os.getpid()}/status") as arquivo:
+            for linha in arquivo:
+                if linha.startswith("VmRSS:"):
+                    return {"rss_kb": int(linha.split()[1])}
+    except OSError:
+        pass
+    return {}
+
+
+# Amostra dos recursos usados por este processo até agora. Com 'contar_es' falso, omite /proc/<pid>/io.
+def amostrar(contar_es=True):
+    amostra = {}
+    if resource is not None:
+        uso = resource.getrusage(resource.RUSAGE_SELF)
+        amostra.update({
+            "cpu_usuario_s": uso.ru_utime,
+            "cpu_sistema_s": uso.ru_stime,
+            "rss_pico_kb": uso.ru_maxrss // ESCALA_RSS,
+            "trocas_voluntarias": uso.ru_nvcsw,
+            "trocas_involuntarias": uso.ru_nivcsw,
+        })
+    if contar_es:
+        amostra.update(_ler_proc_io())
+    amostra.update(_ler_rss_atual())
+    return amostra
+
+
+# Relatório entre duas amostras: a diferença dos contadores e o valor final dos demais campos.
+# Com 'mensagens', acrescenta o custo médio por mensagem.
+def comparar(inicio, fim, mensagens=None):
+    relatorio = {campo: fim[campo] - inicio.get(campo, 0) if campo in CONTADORES else fim[campo] for campo in fim}
+    if mensagens:
+        cpu_s = relatorio.get("cpu_usuario_s", 0) + relatorio.get("cpu_sistema_s", 0)
+        relatorio["cpu_por_mensagem_us"] = cpu_s / mensagens * 1e6
+        if "trocas_voluntarias" in relatorio:
+            relatorio["trocas_por_mensagem"] = (relatorio["trocas_voluntarias"]
+                                                + relatorio["trocas_involuntarias"]) / mensagens
+        if "syscr" in relatorio:
+            relatorio["syscalls_por_mensagem"] = (relatorio["syscr"] + relatorio["syscw"]) / mensagens
+    return relatorio
+
+
+class MedicaoRecursos:
+    """Recursos usados por um papel, da criação até encerrar() (ou até a saída do processo)."""
+
+    def __init__(self, origem, contar_es=True):
+        self.origem = origem
+        self.contar_es = contar_es
+        self._inicio_ns = time.monotonic_ns()
+        self._inicio = amostrar(contar_es)
+        # Roda antes do registrador de telemetria (exitpriority=0), que ainda escreve o relatório.
+        self._finalizador = util.Finalize(None, self.encerrar, exitpriority=10)
+        self.relatorio = None
+
+    # Registra o relatório do papel, com o custo por mensagem se 'mensagens' for informado.
+    # Só a primeira chamada vale.
+    def encerrar(self, mensagens=None):
+        if self.relatorio is not None:
+            return self.relatorio
+        self._finalizador.cancel()
+        self.relatorio = {
+            "papel": self.origem.split(" (")[0],
+            "mensagens": mensagens,
+            "duracao_s": (time.monotonic_ns() - self._inicio_ns) / 1e9,
+            **comparar(self._inicio, amostrar(self.contar_es), mensagens),
+        }
+        registrar_evento(EVENTO_RECURSOS, self.origem, json.dumps(self.relatorio))
+        return self.relatorio
+
+
+# Começa a medir os recursos do papel 'origem' (a mesma origem dos logs, ex: "SERVIDOR (PID: 123)").
+# Os papéis que trocam as mensagens com send()/recv() passam contar_es=False: /proc/<pid>/io não
+# conta essas chamadas, e o relatório mostraria só as escritas da telemetria.
+def iniciar_medicao(origem, contar_es=True):
+    return MedicaoRecursos(origem, contar_es)
+
+
+# Formata o relatório de um papel numa linha da tabela.
+def formatar_linha(origem, relatorio):
+    def valor(campo, escala=1, formato=".1f"):
+        return format(relatorio[campo] * escala, formato) if relatorio.get(campo) is not None else "-"
+
+    syscalls = (relatorio["syscr"] + relatorio["syscw"]) if "syscr" in relatorio else None
+    return (f"{origem:<34}{valor('mensagens', formato='d'):>8}{valor('cpu_usuario_s', 1e3):>10}"
+            f"{valor('cpu_sistema_s', 1e3):>10}{valor('cpu_por_mensagem_us'):>14}"
+            f"{valor('rss_pico_kb', 1 / 1024):>10}{valor('trocas_voluntarias', formato='d'):>10}"
+            f"{valor('trocas_involuntarias', formato='d'):>10}{syscalls if syscalls is not None else '-':>12}"
+            f"{valor('rchar', 1 / 1e6, '.2f'):>11}{valor('wchar', 1 / 1e6, '.2f'):>11}")
+
+
+# Lê as opções da linha de comando.
+def criar_parser():
+    from backend.rastreio import MECANISMOS  # Importado aqui: a ferramenta de rastreio executa as demonstrações.
+
+    parser = argparse.ArgumentParser(
+        description="Executa uma demonstração e mostra os recursos usados por cada papel.",
+        epilog="Opções não reconhecidas (ex: --repeticoes 10000) são repassadas à demonstração.")
+    parser.add_argument("mecanismo", choices=MECANISMOS, help="Demonstração a executar.")
+    parser.add_argument("mensagem", nargs="?", default="Olá", help="Mensagem enviada na demonstração.")
+    parser.add_argument("--json", action="store_true",
+                        help="Emite o relatório de cada papel em JSON, um por linha.")
+    return parser
+
+
+# Ponto de entrada da ferramenta.
+def main(argv=None):
+    from backend.rastreio import executar_demonstracao
+
+    args, argumentos_demo = criar_parser().parse_known_args(argv)
+    eventos = executar_demonstracao(args.mecanismo, [args.mensagem, *argumentos_demo])
+    relatorios = [evento for evento in eventos if evento.get("event") == "recursos"]
+    if args.json:
+        for evento in relatorios:
+            print(json.dumps({"origem": evento["source"], **evento["recursos"]}))
+        return 0
+    print(f"{'papel':<34}{'msgs':>8}{'usr (ms)':>10}{'sys (ms)':>10}{'CPU/msg (us)':>14}{'RSS (MB)':>10}"
+          f"{'trocas v':>10}{'trocas i':>10}{'read/write':>12}{'lido (MB)':>11}{'escr. (MB)':>11}")
+    for evento in relatorios:
+        print(formatar_linha(evento["source"], evento["recursos"]))
+    if not relatorios:
+        print("Nenhum relatório de recursos recebido.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,406 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/resultados.py
+# DESCRIÇÃO: Armazém dos resultados do benchmark (backend/bench.py) e
+#            comparador que verifica se uma execução nova ficou mais lenta
+#            que a linha de base.
+#
+# ARMAZÉM (JSONL, um objeto por linha, só acrescentado):
+#   {"tipo": "execucao", "execucao": id, "instante": ..., "rotulo": ...,
+#    "maquina": {...}, "parametros": {...}}
+#   {"tipo": "ponto", "execucao": id, "mecanismo": ..., "tamanho_payload": ...,
+#    "concorrencia": ..., "mb_por_s": ..., "p50_us": ..., ...,
+#    "mb_por_s_repeticoes": [...], "amostra_latencias_us": [...]}
+# Cada ponto é gravado assim que é medido, então uma varredura interrompida
+# também fica registrada.
+#
+# COMPARAÇÃO (por mecanismo, tamanho e concorrência):
+#   vazão    -> teste t de Welch entre as vazões de cada repetição (a da base
+#               junta todas as execuções escolhidas como base);
+#   latência -> teste U de Mann-Whitney entre as amostras de latências de ida
+#               e volta, que não supõe distribuição normal (as latências têm
+#               cauda longa).
+# Um ponto é uma regressão quando piora mais que o limiar (em %) e o teste é
+# significativo (p < alfa, unilateral). As latências de uma mesma execução não
+# são independentes (ex: uma pausa atrasa várias mensagens seguidas), então o
+# p-valor da latência é otimista; o limiar protege contra diferenças pequenas.
+#
+# USO: python -m backend.bench --repeticoes 3 --salvar --rotulo linha-base
+#      python -m backend.bench --repeticoes 3 --salvar
+#      python -m backend.resultados comparar --base-rotulo linha-base
+#      python -m backend.resultados listar
+# -----------------------------------------------------------------------------
+
+import argparse  # Importa a biblioteca para ler as opções da linha de comando.
+import hashlib  # Importa o hash que identifica a máquina.
+import json  # Importa a biblioteca para codificar os registros.
+import math  # Importa as funções usadas nos testes estatísticos.
+import os  # Importa a biblioteca do sistema para o caminho do armazém e o número de núcleos.
+import platform  # Importa os dados da máquina e do Python.
+import subprocess  # Importa a biblioteca para consultar o commit do git.
+import sys  # Importa a biblioteca do sistema para a saída padrão.
+import time  # Importa a biblioteca de tempo para o instante de cada execução.
+
+# Raiz do projeto, onde fica o armazém padrão.
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Armazém padrão dos resultados.
+ARQUIVO_PADRAO = os.path.join(RAIZ_PROJETO, "resultados", "bench.jsonl")
+
+# Máximo de latências guardadas por ponto (amostradas a intervalos regulares na ordem de medição).
+MAX_AMOSTRAS_LATENCIA = 2000
+
+# Piora mínima (em %) para que um ponto seja marcado como regressão, e o nível de significância padrão.
+LIMIAR_PADRAO = 5.0
+ALFA_PADRAO = 0.05
+
+# Campos de cada ponto que identificam o que foi medido: pontos com a mesma chave são comparados.
+CHAVE_PONTO = ("mecanismo", "tamanho_payload", "concorrencia")
+
+
+# Dados da máquina e do ambiente de uma execução. O "id" junta o que muda os números de uma máquina
+# para outra (nome, sistema, processador, núcleos e versão do Python), para comparar só execuções
+# da mesma máquina.
+def dados_maquina():
+    maquina = {
+        "nome": platform.node(),
+        "sistema": platform.platform(),
+        "arquitetura": platform.machine(),
+        "processador": platform.processor(),
+        "nucleos": os.cpu_count(),
+        "python": platform.python_version(),
+        "implementacao": platform.python_implementation(),
+    }
+    maquina["id"] = hashlib.sha1(json.dumps(maquina, sort_keys=True).encode()).hexdigest()[:12]
+    # O commit não entra no id: é justamente o que muda entre a base e a execução nova.
+    maquina["commit"] = _commit_atual()
+    return maquina
+
+
+# Commit atual do repositório, se o projeto estiver num repositório git (com "+" se houver alterações).
+def _commit_atual():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ_PROJETO, capture_output=True,
+                                text=True, timeout=5).stdout.strip()
+        alterado = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=RAIZ_PROJETO,
+                                  capture_output=True, text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return f"{commit}+" if commit and alterado else commit or None
+
+
+# Até 'maximo' valores de 'valores', a intervalos regulares, para guardar no armazém.
+def amostrar_valores(valores, maximo=MAX_AMOSTRAS_LATENCIA):
+    if len(valores) <= maximo:
+        return list(valores)
+    passo = len(valores) / maximo
+    return [valores[int(i * passo)] for i in range(maximo)]
+
+
+class ArmazemResultados:
+    """Resultados do benchmark num arquivo JSONL, com uma linha por execução e uma por ponto medido."""
+
+    def __init__(self, caminho=ARQUIVO_PADRAO):
+        self.caminho = caminho
+
+    # Registra o início de uma execução e devolve o seu id, usado em registrar_ponto().
+    def iniciar_execucao(self, rotulo=None, parametros=None):
+        execucao = time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+        self._acrescentar({
+            "tipo": "execucao",
+            "execucao": execucao,
+            "instante": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "rotulo": rotulo,
+            "maquina": dados_maquina(),
+            "parametros": parametros or {},
+        })
+        return execucao
+
+    # Grava um ponto medido (o resumo de backend/bench.py) da execução 'execucao'.
+    def registrar_ponto(self, execucao, resumo):
+        self._acrescentar({"tipo": "ponto", "execucao": execucao, **resumo})
+
+    def _acrescentar(self, registro):
+        os.makedirs(os.path.dirname(os.path.abspath(self.caminho)), exist_ok=True)
+        # Uma linha por write(), em modo de acréscimo: execuções simultâneas não misturam as linhas.
+        with open(self.caminho, "a", encoding="utf-8") as arquivo:
+            arquivo.write(json.dumps(registro) + "\n")
+
+    # Lê o armazém e devolve as execuções, da mais antiga para a mais nova, cada uma com a lista
+    # dos seus pontos em "pontos". Linhas incompletas (ex: de uma gravação interrompida) são ignoradas.
+    def carregar(self):
+        execucoes = {}
+        if not os.path.exists(self.caminho):
+            return []
+        with open(self.caminho, encoding="utf-8") as arquivo:
+            for linha in arquivo:
+                try:
+                    registro = json.loads(linha)
+                except json.JSONDecodeError:
+                    continue
+                if registro.get("tipo") == "execucao":
+                    execucoes[registro["execucao"]] = {**registro, "pontos": []}
+                elif registro.get("tipo") == "ponto" and registro.get("execucao") in execucoes:
+                    execucoes[registro["execucao"]]["pontos"].append(registro)
+        return list(execucoes.values())
+
+
+# Função de distribuição acumulada da normal padrão.
+def _normal_cdf(z):
+    return 0.5 * math.erfc(-z / math.sqrt(2))
+
+
+# Função beta incompleta regularizada I_x(a, b), pela fração contínua de Lentz.
+def _beta_incompleta(x, a, b):
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    # A fração converge rápido para x < (a + 1) / (a + b + 2); do outro lado, usa a simetria.
+    if x > (a + 1) / (a + b + 2):
+        return 1.0 - _beta_incompleta(1 - x, b, a)
+    frente = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1 - x)) / a
+    minimo = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > minimo else minimo)
+    resultado = d
+    for m in range(1, 300):
+        for numerador in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 + numerador * d
+            d = 1.0 / (d if abs(d) > minimo else minimo)
+            c = 1.0 + numerador / c
+            c = c if abs(c) > minimo else minimo
+            resultado *= c * d
+        if abs(c * d - 1.0) < 1e-12:
+            break
+    return frente * resultado
+
+
+# Função de distribuição acumulada da t de Student com 'gl' graus de liberdade.
+def _t_cdf(t, gl):
+    cauda = 0.5 * _beta_incompleta(gl / (gl + t * t), gl / 2, 0.5)
+    return 1.0 - cauda if t > 0 else cauda
+
+
+# Teste t de Welch, unilateral: p-valor de a hipótese "a média de 'a' é menor que a de 'b'".
+# Devolve None se alguma amostra tiver menos de 2 valores.
+def welch_menor(a, b):
+    if len(a) < 2 or len(b) < 2:
+        return None
+    media_a, media_b = sum(a) / len(a), sum(b) / len(b)
+    var_a = sum((x - media_a) ** 2 for x in a) / (len(a) - 1)
+    var_b = sum((x - media_b) ** 2 for x in b) / (len(b) - 1)
+    erro_a, erro_b = var_a / len(a), var_b / len(b)
+    if erro_a + erro_b == 0:
+        # Sem variação nas duas amostras: a diferença, se houver, é certa.
+        return 0.0 if media_a < media_b else 1.0
+    t = (media_a - media_b) / math.sqrt(erro_a + erro_b)
+    gl = (erro_a + erro_b) ** 2 / (erro_a ** 2 / (len(a) - 1) + erro_b ** 2 / (len(b) - 1))
+    return _t_cdf(t, gl)
+
+
+# Teste U de Mann-Whitney, unilateral, pela aproximação normal (com correção de empates e de
+# continuidade): p-valor de a hipótese "os valores de 'a' tendem a ser maiores que os de 'b'".
+# Devolve None se alguma amostra estiver vazia.
+def mann_whitney_maior(a, b):
+    n_a, n_b = len(a), len(b)
+    if not n_a or not n_b:
+        return None
+    # Postos médios da amostra conjunta (valores empatados recebem a média dos seus postos).
+    valores = sorted([(x, 0) for x in a] + [(x, 1) for x in b])
+    soma_postos_a = 0.0
+    correcao_empates = 0.0
+    i = 0
+    while i < len(valores):
+        j = i
+        while j + 1 < len(valores) and valores[j + 1][0] == valores[i][0]:
+            j += 1
+        posto = (i + j) / 2 + 1
+        soma_postos_a += posto * sum(1 for k in range(i, j + 1) if valores[k][1] == 0)
+        empatados = j - i + 1
+        correcao_empates += empatados ** 3 - empatados
+        i = j + 1
+    u_a = soma_postos_a - n_a * (n_a + 1) / 2
+    n = n_a + n_b
+    variancia = n_a * n_b / 12 * ((n + 1) - correcao_empates / (n * (n - 1)))
+    if variancia <= 0:
+        return 1.0  # Todos os valores iguais.
+    z = (u_a - n_a * n_b / 2 - 0.5) / math.sqrt(variancia)
+    return 1.0 - _normal_cdf(z)
+
+
+# Mediana de uma lista não vazia.
+def _mediana(valores):
+    ordenados = sorted(valores)
+    meio = len(ordenados) // 2
+    return ordenados[meio] if len(ordenados) % 2 else (ordenados[meio - 1] + ordenados[meio]) / 2
+
+
+# Veredito de uma métrica: 'piora_pct' é quanto a execução nova piorou (negativo se melhorou), e os
+# p-valores são os dos testes unilaterais de piora e de melhora (None se não houve teste).
+def _veredito(piora_pct, p_piora, p_melhora, limiar, alfa):
+    if p_piora is None:
+        return "sem teste"
+    if piora_pct > limiar and p_piora < alfa:
+        return "REGRESSÃO"
+    if -piora_pct > limiar and p_melhora < alfa:
+        return "melhora"
+    return "igual"
+
+
+# Compara um ponto da execução nova com os pontos equivalentes da base.
+def comparar_ponto(novos, base, limiar=LIMIAR_PADRAO, alfa=ALFA_PADRAO):
+    # Vazão: uma amostra por repetição de cada execução (a base junta as suas execuções).
+    vazao_nova = [v for ponto in novos for v in ponto.get("mb_por_s_repeticoes") or [ponto["mb_por_s"]]]
+    vazao_base = [v for ponto in base for v in ponto.get("mb_por_s_repeticoes") or [ponto["mb_por_s"]]]
+    media_nova, media_base = sum(vazao_nova) / len(vazao_nova), sum(vazao_base) / len(vazao_base)
+    piora_vazao = (media_base - media_nova) / media_base * 100 if media_base else 0.0
+    p_vazao = welch_menor(vazao_nova, vazao_base)
+    p_vazao_melhora = welch_menor(vazao_base, vazao_nova)
+
+    # Latência: as amostras de latências de ida e volta, comparadas pela mediana.
+    latencias_novas = [v for ponto in novos for v in ponto.get("amostra_latencias_us", [])]
+    latencias_base = [v for ponto in base for v in ponto.get("amostra_latencias_us", [])]
+    if latencias_novas and latencias_base:
+        mediana_nova, mediana_base = _mediana(latencias_novas), _mediana(latencias_base)
+        p_latencia = mann_whitney_maior(latencias_novas, latencias_base)
+        p_latencia_melhora = mann_whitney_maior(latencias_base, latencias_novas)
+    else:
+        # Pontos gravados sem amostras: só a diferença das medianas reportadas, sem teste.
+        mediana_nova = _mediana([ponto["p50_us"] for ponto in novos])
+        mediana_base = _mediana([ponto["p50_us"] for ponto in base])
+        p_latencia = p_latencia_melhora = None
+    piora_latencia = (mediana_nova - mediana_base) / mediana_base * 100 if mediana_base else 0.0
+
+    vereditos = (_veredito(piora_vazao, p_vazao, p_vazao_melhora, limiar, alfa),
+                 _veredito(piora_latencia, p_latencia, p_latencia_melhora, limiar, alfa))
+    return {
+        **{campo: novos[0][campo] for campo in CHAVE_PONTO},
+        "mb_por_s_base": media_base,
+        "mb_por_s": media_nova,
+        "vazao_piora_pct": piora_vazao,
+        "vazao_p": p_vazao,
+        "vazao": vereditos[0],
+        "p50_us_base": mediana_base,
+        "p50_us": mediana_nova,
+        "latencia_piora_pct": piora_latencia,
+        "latencia_p": p_latencia,
+        "latencia": vereditos[1],
+        "regressao": "REGRESSÃO" in vereditos,
+    }
+
+
+# Compara os pontos da execução 'nova' com os das execuções 'base', ponto a ponto (pela CHAVE_PONTO).
+# Pontos que só existem de um lado ficam de fora.
+def comparar_execucoes(nova, base, limiar=LIMIAR_PADRAO, alfa=ALFA_PADRAO):
+    def agrupar(execucoes):
+        grupos = {}
+        for execucao in execucoes:
+            for ponto in execucao["pontos"]:
+                grupos.setdefault(tuple(ponto[campo] for campo in CHAVE_PONTO), []).append(ponto)
+        return grupos
+
+    novos, antigos = agrupar([nova]), agrupar(base)
+    return [comparar_ponto(novos[chave], antigos[chave], limiar, alfa) for chave in sorted(novos) if chave in antigos]
+
+
+# Escolhe a execução nova e as execuções de base. A nova é a indicada ou a mais recente; a base são as
+# execuções com o rótulo indicado, as indicadas, ou a última execução anterior à nova. Só entram na
+# base execuções da mesma máquina, a menos que 'outras_maquinas' seja verdadeiro.
+def escolher_execucoes(execucoes, nova=None, base=None, base_rotulo=None, outras_maquinas=False):
+    if not execucoes:
+        raise ValueError("O armazém não tem execuções.")
+    por_id = {execucao["execucao"]: execucao for execucao in execucoes}
+    for execucao in [nova, *(base or [])]:
+        if execucao is not None and execucao not in por_id:
+            raise ValueError(f"Execução desconhecida: {execucao}")
+    execucao_nova = por_id[nova] if nova else execucoes[-1]
+    candidatas = [execucao for execucao in execucoes if execucao is not execucao_nova and execucao["pontos"]
+                  and (outras_maquinas or execucao["maquina"]["id"] == execucao_nova["maquina"]["id"])]
+    if base:
+        escolhidas = [por_id[execucao] for execucao in base]
+    elif base_rotulo:
+        escolhidas = [execucao for execucao in candidatas if execucao.get("rotulo") == base_rotulo]
+    else:
+        # O armazém está em ordem de gravação: as anteriores vêm antes da nova na lista.
+        anteriores = execucoes[:execucoes.index(execucao_nova)]
+        escolhidas = [execucao for execucao in candidatas if execucao in anteriores][-1:]
+    if not escolhidas:
+        raise ValueError("Nenhuma execução de base encontrada (da mesma máquina; veja --outras-maquinas).")
+    return execucao_nova, escolhidas
+
+
+# Formata um p-valor para a tabela.
+def _formatar_p(p):
+    return "-" if p is None else f"{p:.3f}"
+
+
+# Imprime a tabela da comparação.
+def imprimir_comparacao(comparacoes):
+    from backend.bench import formatar_tamanho  # Importado aqui: o benchmark importa este módulo.
+
+    print(f"{'mecanismo':<24}{'payload':>10}{'conc.':>6}{'MB/s base':>12}{'MB/s':>10}{'Δ %':>8}{'p':>7}"
+          f"{'':>2}{'vazão':<11}{'p50 base':>10}{'p50 (us)':>10}{'Δ %':>8}{'p':>7}{'':>2}{'latência':<11}")
+    for c in comparacoes:
+        print(f"{c['mecanismo']:<24}{formatar_tamanho(c['tamanho_payload']):>10}{c['concorrencia']:>6}"
+              f"{c['mb_por_s_base']:>12.1f}{c['mb_por_s']:>10.1f}{-c['vazao_piora_pct']:>+8.1f}"
+              f"{_formatar_p(c['vazao_p']):>7}{'':>2}{c['vazao']:<11}"
+              f"{c['p50_us_base']:>10.1f}{c['p50_us']:>10.1f}{c['latencia_piora_pct']:>+8.1f}"
+              f"{_formatar_p(c['latencia_p']):>7}{'':>2}{c['latencia']:<11}")
+
+
+# Lê as opções da linha de comando.
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Armazém dos resultados do benchmark e comparação com a linha de base.")
+    parser.add_argument("--arquivo", default=ARQUIVO_PADRAO, help="Armazém dos resultados (JSONL).")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    sub.add_parser("listar", help="Lista as execuções gravadas.")
+    comparar = sub.add_parser("comparar", help="Compara uma execução com a linha de base; sai com código 1 "
+                                               "se houver regressão.")
+    comparar.add_argument("--execucao", default=None, help="Execução a verificar (padrão: a mais recente).")
+    comparar.add_argument("--base", nargs="+", default=None, help="Execuções usadas como linha de base.")
+    comparar.add_argument("--base-rotulo", default=None,
+                          help="Usa como base todas as execuções com este rótulo (ver bench --rotulo).")
+    comparar.add_argument("--outras-maquinas", action="store_true",
+                          help="Aceita na base execuções de outras máquinas.")
+    comparar.add_argument("--limiar", type=float, default=LIMIAR_PADRAO,
+                          help="Piora mínima, em %%, para marcar uma regressão.")
+    comparar.add_argument("--alfa", type=float, default=ALFA_PADRAO, help="Nível de significância dos testes.")
+    comparar.add_argument("--json", action="store_true", help="Emite a comparação de cada ponto em JSON, um por linha.")
+    return parser
+
+
+# Ponto de entrada da ferramenta.
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    execucoes = ArmazemResultados(args.arquivo).carregar()
+
+    if args.comando == "listar":
+        print(f"{'execução':<24}{'instante':<26}{'rótulo':<16}{'commit':<12}{'máquina':<14}{'pontos':>7}")
+        for execucao in execucoes:
+            print(f"{execucao['execucao']:<24}{execucao['instante']:<26}{execucao.get('rotulo') or '-':<16}"
+                  f"{execucao['maquina'].get('commit') or '-':<12}{execucao['maquina']['id']:<14}"
+                  f"{len(execucao['pontos']):>7}")
+        return 0
+
+    try:
+        nova, base = escolher_execucoes(execucoes, args.execucao, args.base, args.base_rotulo, args.outras_maquinas)
+    except ValueError as erro:
+        print(erro, file=sys.stderr)
+        return 2
+    comparacoes = comparar_execucoes(nova, base, args.limiar, args.alfa)
+    if args.json:
+        for comparacao in comparacoes:
+            print(json.dumps(comparacao))
+    else:
+        print(f"Execução {nova['execucao']} ({nova['maquina'].get('commit') or 'sem commit'}) contra "
+              f"{', '.join(execucao['execucao'] for execucao in base)}:")
+        imprimir_comparacao(comparacoes)
+        regressoes = sum(comparacao["regressao"] for comparacao in comparacoes)
+        print(f"{len(comparacoes)} pontos comparados, {regressoes} com regressão "
+              f"(limiar {args.limiar:g}%, alfa {args.alfa:g}).")
+    return 1 if any(comparacao["regressao"] for comparacao in comparacoes) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,104 +1,457 @@
-import multiprocessing as mp  # Importa a biblioteca para criar e gerenciar processos.
-import json  # Importa a biblioteca para formatar os logs em JSON.
-import sys  # Importa a biblioteca para ler argumentos da linha de comando.
-import os  # Importa a biblioteca para obter o ID do processo (PID).
-import time  # Importa a biblioteca de tempo para adicionar pequenas pausas.
-
-# Função para criar e imprimir logs no formato JSON esperado pela GUI.
-def log_message(source, message):
-    # Cria um dicionário (estrutura de dados) para o log.
-    log_entry = {
-        "source": source,  # A origem da mensagem (ex: "PROCESSO ESCRITOR").
-        "payload": {"message": message}  # O conteúdo da mensagem.
-    }
-    # Converte o dicionário para uma string JSON e a imprime na saída padrão.
-    print(json.dumps(log_entry), flush=True)
-
-# Função que define o comportamento do processo que escreve na memória.
-def processo_escritor(shared_mem, sync_event, msg):
-    # Obtém o ID deste processo.
-    pid = os.getpid()
-    # Define um nome de origem para os logs deste processo.
-    source_id = f"PROCESSO ESCRITOR (PID: {pid})"
-    
-    # Loga que o processo foi iniciado.
-    log_message(source_id, "Iniciado.")
-    # Adiciona uma pausa para visualização.
-    time.sleep(1)
-
-    # Codifica a mensagem (string) para bytes, no formato utf-8.
-    msg_bytes = msg.encode('utf-8')
-
-    # Verifica se a mensagem codificada cabe no buffer de memória compartilhada.
-    buffer_size = len(shared_mem)
-    if len(msg_bytes) >= buffer_size:
-        log_message(source_id,
-                    f"ERRO: A mensagem ({len(msg_bytes)} bytes) excede o tamanho do buffer ({buffer_size} bytes).")
-        log_message(source_id, "Processo encerrado devido a erro.")
-
-        # Ativa o evento mesmo em caso de erro para que o processo leitor não fique esperando para sempre.
-        sync_event.set()
-        return  # Encerra a função e o processo de forma limpa, evitando o crash.
-
-    log_message(source_id, f"PID: {pid} -> Escrevendo '{msg}' na memória compartilhada.")
-
-    # Escreve os bytes da mensagem na memória compartilhada.
-    shared_mem[:len(msg_bytes)] = msg_bytes
-
-    time.sleep(1)
-    log_message(source_id, f"PID: {pid} -> Escrita finalizada. Sinalizando o processo leitor.")
-    sync_event.set()
-
-
-# Função que define o comportamento do processo que lê da memória.
-def processo_leitor(shared_mem, sync_event):
-    # Obtém o ID deste processo.
-    pid = os.getpid()
-    # Define um nome de origem para os logs deste processo.
-    source_id = f"PROCESSO LEITOR (PID: {pid})"
-
-    # Loga que o processo iniciou e está esperando pelo sinal.
-    log_message(source_id, f"PID: {pid} -> Iniciado. Aguardando sinal do escritor...")
-    # Fica bloqueado aqui até que o evento 'sync_event' seja ativado pelo escritor.
-    sync_event.wait()
-
-    # Lê os bytes da memória compartilhada. Se a mensagem for vazia (caso de erro no escritor), não vai ler nada.
-    mensagem_lida_bytes = shared_mem[:].rstrip(b'\x00')
-
-    # Só processa se alguma mensagem foi de fato escrita.
-    if mensagem_lida_bytes:
-        log_message(source_id, f"PID: {pid} -> Sinal recebido! Lendo da memória compartilhada.")
-        mensagem_lida = mensagem_lida_bytes.decode('utf-8')
-        log_message(source_id, f"PID: {pid} -> Leu da memória: '{mensagem_lida}'")
-    else:
-        # O escritor sinalizou, mas não escreveu nada (provavelmente por causa do erro de tamanho).
-        log_message(source_id, "Sinal recebido, mas sem mensagem para ler. Provavelmente o escritor encontrou um erro.")
-
-    log_message(source_id, f"PID: {pid} -> Encerrando.")
-
-
-# Ponto de entrada do script.
-if __name__ == "__main__":
-    # Obtém a mensagem da GUI a partir dos argumentos da linha de comando.
-    mensagem_da_gui = sys.argv[1]
-
-    # Cria um 'Evento', um objeto de sincronização simples. Começa "desativado".
-    evento = mp.Event()
-    # Cria um 'Array' de memória compartilhada de 1024 bytes.
-    memoria_compartilhada = mp.Array('c', 1024)
-
-    # Cria o processo escritor, passando a memória, o evento e a mensagem.
-    p_escritor = mp.Process(target=processo_escritor, args=(memoria_compartilhada, evento, mensagem_da_gui))
-    # Cria o processo leitor, passando a memória e o evento.
-    p_leitor = mp.Process(target=processo_leitor, args=(memoria_compartilhada, evento))
-
-    # Inicia a execução dos dois processos.
-    p_escritor.start()
-    p_leitor.start()
-
-    # O processo principal espera até que ambos os processos filhos terminem.
-    p_escritor.join()
-    p_leitor.join()
-
-    # Loga o fim da demonstração (este log virá de uma fonte "Desconhecida" na GUI, o que é normal).
-    log_message("MAIN", "Demonstração com Memória Compartilhada finalizada.")
\ No newline at end of file
+import os  # Importa a biblioteca para obter o ID do processo (PID).
+import time  # Importa a biblioteca de tempo para medir os tempos de ida e volta e de inicialização.
+import argparse  # Importa a biblioteca para ler as opções da linha de comando.
+
+# Buffer circular SPSC (um escritor, um leitor) em memória compartilhada.
+from backend.shared_memory.ring_buffer import RingBufferSPSC, CABECALHO, CAPACIDADE_PADRAO
+# Estratégias com que o escritor acorda o leitor do buffer circular (eventfd, pipe, híbrida, ...).
+from backend.shared_memory.notificacao import NOTIFICACOES, criar_notificacao
+# Segmentos de memória compartilhada dimensionados para o payload (modo "segmento").
+from backend.shared_memory.segmento import Segmento, iniciar_rastreador
+# Snapshot versionado lido por vários processos através de um seqlock (modo "broadcast").
+from backend.shared_memory.seqlock import SeqlockBroadcast
+# Matrizes NumPy sobre a própria memória compartilhada (benchmark com matrizes; o NumPy é opcional).
+from backend.matrizes import criar_matriz, matriz_sobre
+# Método de início dos processos e sinal de "pronto" (em vez de pausas fixas).
+from backend.processos import METODOS_INICIO, SinalPronto, iniciar_processo, obter_contexto
+
+# Função de log compartilhada pelos backends: registros binários no canal de telemetria da GUI,
+# ou linhas JSON na saída padrão quando executado pela linha de comando.
+from backend.telemetria import log_message
+# Recursos usados por cada papel (CPU, RSS, trocas de contexto, chamadas de E/S), enviados no fim.
+from backend.recursos import iniciar_medicao
+# Marcas de rastreio de cada envio e recebimento (ligadas com IPC_RASTRO=1).
+from backend.rastreio import (
+    codificar_texto, criar_rastro, decodificar_texto, enviar_rastreado, receber_rastreado,
+)
+
+# Número máximo de mensagens do fluxo que o leitor registra individualmente no log.
+MAX_MENSAGENS_LOGADAS = 5
+
+# Função que define o comportamento do processo que escreve na memória.
+def processo_escritor(ring, msg, repeticoes, pronto=None):
+    # Obtém o ID deste processo.
+    pid = os.getpid()
+    # Define um nome de origem para os logs deste processo.
+    source_id = f"PROCESSO ESCRITOR (PID: {pid})"
+    medicao = iniciar_medicao(source_id)
+    
+    # Loga que o processo foi iniciado.
+    log_message(source_id, "Iniciado.")
+    # Espera o leitor avisar que está pronto, para que o log mostre os dois lados na ordem.
+    if pronto:
+        pronto.esperar()
+
+    # Codifica a mensagem (string) para bytes, no formato utf-8.
+    msg_bytes = msg.encode('utf-8')
+
+    # Verifica se a mensagem codificada cabe no buffer circular de memória compartilhada.
+    if len(msg_bytes) > ring.tamanho_maximo:
+        log_message(source_id,
+                    f"ERRO: A mensagem ({len(msg_bytes)} bytes) excede o tamanho do buffer ({ring.tamanho_maximo} bytes).")
+        log_message(source_id, "Processo encerrado devido a erro.")
+
+        # Fecha o fluxo mesmo em caso de erro para que o processo leitor não fique esperando para sempre.
+        ring.fechar_escrita()
+        return  # Encerra a função e o processo de forma limpa, evitando o crash.
+
+    log_message(source_id, f"PID: {pid} -> Escrevendo '{msg}' na memória compartilhada ({repeticoes}x).")
+
+    # Publica as mensagens em fluxo contínuo: cada escrita só espera se o buffer estiver cheio.
+    rastro = criar_rastro("escritor->leitor")
+    for _ in range(repeticoes):
+        enviar_rastreado(rastro, msg, codificar_texto, ring.escrever)
+
+    # Marca o fim do fluxo para o leitor.
+    ring.fechar_escrita()
+    log_message(source_id, f"PID: {pid} -> Escrita finalizada. Fluxo encerrado para o processo leitor.")
+    medicao.encerrar(repeticoes)
+
+
+# Função que define o comportamento do processo que lê da memória.
+def processo_leitor(ring, pronto=None):
+    # Obtém o ID deste processo.
+    pid = os.getpid()
+    # Define um nome de origem para os logs deste processo.
+    source_id = f"PROCESSO LEITOR (PID: {pid})"
+    medicao = iniciar_medicao(source_id)
+
+    # Loga que o processo iniciou e está esperando pelas mensagens.
+    log_message(source_id, f"PID: {pid} -> Iniciado. Aguardando mensagens do escritor...")
+    if pronto:
+        pronto.sinalizar()
+
+    # Consome o fluxo até o escritor marcar o fim. O tamanho de cada registro vem no
+    # cabeçalho, então mensagens terminadas em bytes nulos chegam intactas.
+    rastro = criar_rastro("escritor->leitor")
+    total = 0
+    while True:
+        # Lê a próxima mensagem e a decodifica para uma string (None no fim do fluxo).
+        mensagem_lida = receber_rastreado(rastro, ring.ler, decodificar_texto)
+        if mensagem_lida is None:
+            break
+        total += 1
+        if total <= MAX_MENSAGENS_LOGADAS:
+            log_message(source_id, f"PID: {pid} -> Leu da memória: '{mensagem_lida}'")
+
+    # Só informa o total se alguma mensagem foi de fato escrita.
+    if total:
+        log_message(source_id, f"PID: {pid} -> Fim do fluxo. {total} mensagem(ns) lida(s).")
+    else:
+        # O escritor encerrou o fluxo sem escrever nada (provavelmente por causa do erro de tamanho).
+        log_message(source_id, "Fluxo encerrado sem mensagens para ler. Provavelmente o escritor encontrou um erro.")
+
+    log_message(source_id, f"PID: {pid} -> Encerrando.")
+    medicao.encerrar(total)
+
+
+# Preenche a visão 'visao' repetindo 'padrao', copiando dentro da própria memória compartilhada
+# (dobrando o trecho já preenchido) para não montar um payload gigante na memória do processo.
+# Com 'padrao' vazio, a visão é preenchida com zeros.
+def preencher_repetindo(visao, padrao):
+    padrao = padrao or b"\0"
+    total = len(visao)
+    preenchido = min(len(padrao), total)
+    visao[:preenchido] = padrao[:preenchido]
+    while preenchido < total:
+        bloco = min(preenchido, total - preenchido)
+        visao[preenchido:preenchido + bloco] = visao[:bloco]
+        preenchido += bloco
+
+
+# Função que define o comportamento do escritor no modo "segmento": cada mensagem vai em um
+# segmento próprio, do tamanho exato do payload, e só o nome do segmento passa pelo buffer circular.
+def processo_escritor_segmento(ring, msg, repeticoes, tamanho_payload, pronto=None):
+    pid = os.getpid()
+    source_id = f"PROCESSO ESCRITOR (PID: {pid})"
+    medicao = iniciar_medicao(source_id)
+
+    log_message(source_id, "Iniciado.")
+    if pronto:
+        pronto.esperar()
+
+    msg_bytes = msg.encode('utf-8')
+    # Sem tamanho explícito, o payload é a própria mensagem da GUI.
+    tamanho = tamanho_payload or len(msg_bytes)
+    log_message(source_id, f"PID: {pid} -> Publicando {repeticoes} segmento(s) de {tamanho} bytes.")
+
+    for _ in range(repeticoes):
+        # Escreve o payload direto no segmento compartilhado.
+        segmento = Segmento.criar(tamanho)
+        preencher_repetindo(segmento.dados, msg_bytes)
+        # Entrega ao leitor apenas o nome do segmento: custo constante, qualquer que seja o tamanho.
+        ring.escrever(segmento.nome.encode('ascii'))
+        # O escritor desfaz seu mapeamento; a posse do segmento passa para o leitor, que o remove.
+        segmento.fechar()
+
+    ring.fechar_escrita()
+    log_message(source_id, f"PID: {pid} -> Escrita finalizada. Fluxo encerrado para o processo leitor.")
+    medicao.encerrar(repeticoes)
+
+
+# Função que define o comportamento do leitor no modo "segmento": abre cada segmento pelo nome
+# e acessa o payload por um memoryview, sem copiá-lo.
+def processo_leitor_segmento(ring, pronto=None):
+    pid = os.getpid()
+    source_id = f"PROCESSO LEITOR (PID: {pid})"
+    medicao = iniciar_medicao(source_id)
+
+    log_message(source_id, f"PID: {pid} -> Iniciado. Aguardando segmentos do escritor...")
+    if pronto:
+        pronto.sinalizar()
+
+    total = 0
+    total_bytes = 0
+    for nome in ring:
+        segmento = Segmento.abrir(nome.decode('ascii'))
+        visao = segmento.dados
+        total += 1
+        total_bytes += len(visao)
+        if total <= MAX_MENSAGENS_LOGADAS:
+            # Só o trecho exibido no log é copiado; o restante do payload é lido no próprio segmento.
+            inicio = bytes(visao[:80]).decode('utf-8', errors='replace')
+            reticencias = "..." if len(visao) > 80 else ""
+            log_message(source_id, f"PID: {pid} -> Leu {len(visao)} bytes do segmento {segmento.nome}: "
+                                   f"'{inicio}{reticencias}'")
+        # Última etapa do ciclo de vida: o leitor remove o segmento do sistema.
+        segmento.remover()
+
+    log_message(source_id, f"PID: {pid} -> Fim do fluxo. {total} segmento(s), {total_bytes} bytes lidos.")
+    log_message(source_id, f"PID: {pid} -> Encerrando.")
+    medicao.encerrar(total)
+
+
+# Função que define o comportamento do escritor no modo "broadcast": publica 'repeticoes' versões
+# do estado, uma a cada 'intervalo' segundos, para todos os leitores ao mesmo tempo.
+def processo_escritor_broadcast(seqlock, msg, repeticoes, intervalo, prontos):
+    pid = os.getpid()
+    source_id = f"PROCESSO ESCRITOR (PID: {pid})"
+    medicao = iniciar_medicao(source_id)
+
+    log_message(source_id, "Iniciado.")
+    # Espera todos os leitores estarem prontos, para que vejam as primeiras versões.
+    for pronto in prontos:
+        pronto.esperar()
+    # A maior versão (com o sufixo do número) precisa caber no snapshot; senão o fluxo é encerrado sem nada.
+    if len(f"{msg} (versão {repeticoes})".encode('utf-8')) > seqlock.capacidade:
+        log_message(source_id, f"ERRO: A mensagem excede o tamanho do snapshot ({seqlock.capacidade} bytes).")
+        seqlock.encerrar()
+        return
+    log_message(source_id, f"PID: {pid} -> Publicando {repeticoes} versão(ões) de '{msg}' "
+                           f"para {len(prontos)} leitor(es).")
+
+    for versao in range(1, repeticoes + 1):
+        # Cada versão substitui a anterior; leitores atrasados simplesmente pulam para a mais recente.
+        seqlock.publicar(f"{msg} (versão {versao})".encode('utf-8'))
+        if intervalo:
+            time.sleep(intervalo)
+
+    seqlock.encerrar()
+    log_message(source_id, f"PID: {pid} -> Publicação finalizada na versão {seqlock.versao}.")
+    medicao.encerrar(repeticoes)
+
+
+# Função que define o comportamento de cada leitor no modo "broadcast": acompanha as versões
+# publicadas, sem lock e sem interferir no escritor ou nos outros leitores.
+def processo_leitor_broadcast(seqlock, pronto):
+    pid = os.getpid()
+    source_id = f"PROCESSO LEITOR (PID: {pid})"
+    medicao = iniciar_medicao(source_id)
+
+    log_message(source_id, f"PID: {pid} -> Iniciado. Acompanhando as versões do escritor...")
+    pronto.sinalizar()
+
+    versao = 0
+    vistas = 0
+    while True:
+        snapshot = seqlock.esperar_nova(versao)
+        if snapshot is None:
+            break
+        versao, dados, _ = snapshot
+        vistas += 1
+        if vistas <= MAX_MENSAGENS_LOGADAS:
+            log_message(source_id, f"PID: {pid} -> Leu a versão {versao}: '{dados.decode('utf-8')}'")
+
+    log_message(source_id, f"PID: {pid} -> Fim da publicação. Viu {vistas} de {versao} versão(ões); "
+                           f"{seqlock.leituras_repetidas} leitura(s) refeita(s) por escrita em andamento.")
+    medicao.encerrar(vistas)
+
+
+# Função executada pelo processo leitor durante o benchmark: lê cada mensagem e a devolve (eco).
+def processo_leitor_eco(ring_ida, ring_volta, pronto):
+    pronto.sinalizar()
+    # Devolve cada mensagem pelo buffer de volta até o fim do fluxo de ida.
+    for dados in ring_ida:
+        ring_volta.escrever(dados)
+    ring_volta.fechar_escrita()
+
+# Mede o tempo de ida e volta (RTT) de 'num_mensagens' mensagens de 'tamanho_payload' bytes
+# usando um par de buffers circulares em memória compartilhada (um para cada sentido).
+# Os buffers só podem ser herdados na criação do processo, então não há opção de pool.
+# Com 'notificacao', cada sentido tem a sua (ver backend/shared_memory/notificacao.py).
+def benchmark_eco(tamanho_payload, num_mensagens, metodo_inicio=None, notificacao=None, opcoes_notificacao=None):
+    # Os buffers precisam comportar ao menos um registro completo.
+    capacidade = max(CAPACIDADE_PADRAO, tamanho_payload + CABECALHO.size)
+    contexto = obter_contexto(metodo_inicio)
+    ring_ida = RingBufferSPSC(capacidade, criar_notificacao(notificacao, contexto, **(opcoes_notificacao or {})))
+    ring_volta = RingBufferSPSC(capacidade, criar_notificacao(notificacao, contexto, **(opcoes_notificacao or {})))
+
+    pronto = SinalPronto()
+    p_leitor = iniciar_processo(processo_leitor_eco, (ring_ida, ring_volta, pronto), metodo_inicio)
+    # A medição só começa com o leitor pronto, para não incluir o tempo de criação do processo.
+    pronto.esperar()
+
+    # Monta o payload uma única vez, fora da região medida.
+    payload = b"x" * tamanho_payload
+    latencias_ns = []
+
+    inicio = time.perf_counter_ns()
+    for _ in range(num_mensagens):
+        t0 = time.perf_counter_ns()
+        ring_ida.escrever(payload)
+        ring_volta.ler()
+        latencias_ns.append(time.perf_counter_ns() - t0)
+    duracao_ns = time.perf_counter_ns() - inicio
+
+    ring_ida.fechar_escrita()
+    p_leitor.join()
+    for ring in (ring_ida, ring_volta):
+        if ring.notificacao is not None:
+            ring.notificacao.fechar()
+    return {"latencias_ns": latencias_ns, "duracao_ns": duracao_ns}
+
+
+# Função executada pelo leitor no benchmark do modo "segmento": abre cada segmento e devolve o nome.
+def processo_leitor_eco_segmento(ring_ida, ring_volta, pronto):
+    pronto.sinalizar()
+    for nome in ring_ida:
+        # Abre o segmento e obtém a visão sobre o payload, sem copiá-lo.
+        with Segmento.abrir(nome.decode('ascii')):
+            ring_volta.escrever(nome)
+    ring_volta.fechar_escrita()
+
+# Mede o tempo de ida e volta no modo "segmento": o payload vai em um segmento do seu tamanho
+# e só o nome trafega pelos buffers circulares.
+def benchmark_eco_segmento(tamanho_payload, num_mensagens, metodo_inicio=None):
+    ring_ida = RingBufferSPSC()
+    ring_volta = RingBufferSPSC()
+
+    # Os processos precisam compartilhar o rastreador de segmentos (ver segmento.py).
+    iniciar_rastreador()
+    pronto = SinalPronto()
+    p_leitor = iniciar_processo(processo_leitor_eco_segmento, (ring_ida, ring_volta, pronto), metodo_inicio)
+    pronto.esperar()
+
+    payload = b"x" * tamanho_payload
+    latencias_ns = []
+
+    inicio = time.perf_counter_ns()
+    for _ in range(num_mensagens):
+        t0 = time.perf_counter_ns()
+        segmento = Segmento.publicar(payload)
+        ring_ida.escrever(segmento.nome.encode('ascii'))
+        ring_volta.ler()
+        segmento.remover()
+        latencias_ns.append(time.perf_counter_ns() - t0)
+    duracao_ns = time.perf_counter_ns() - inicio
+
+    ring_ida.fechar_escrita()
+    p_leitor.join()
+    return {"latencias_ns": latencias_ns, "duracao_ns": duracao_ns}
+
+
+# Função executada pelo leitor no benchmark com matrizes: a matriz é uma visão (ndarray) sobre o
+# segmento, lida sem cópia. A cada aviso do escritor, devolve o último elemento da matriz.
+def processo_leitor_eco_matriz(ring_ida, ring_volta, nome, forma, tipo, pronto):
+    segmento = Segmento.abrir(nome)
+    matriz = matriz_sobre(segmento.dados, forma, tipo)
+    pronto.sinalizar()
+    for _ in ring_ida:
+        ring_volta.escrever(matriz[-1:].tobytes())
+    ring_volta.fechar_escrita()
+    # A visão precisa ser liberada antes de fechar o segmento.
+    del matriz
+    segmento.fechar()
+
+# Mede o tempo de ida e volta com uma matriz NumPy de float64 de 'tamanho_payload' bytes: o escritor
+# a copia para um segmento do seu tamanho (a única cópia do caminho) e o leitor a lê como uma visão
+# sobre o próprio segmento; só os avisos trafegam pelos buffers circulares.
+def benchmark_eco_matriz(tamanho_payload, num_mensagens, metodo_inicio=None):
+    matriz = criar_matriz(tamanho_payload)
+    ring_ida = RingBufferSPSC()
+    ring_volta = RingBufferSPSC()
+
+    # Os processos precisam compartilhar o rastreador de segmentos (ver segmento.py).
+    iniciar_rastreador()
+    segmento = Segmento.criar(matriz.nbytes)
+    destino = matriz_sobre(segmento.dados, matriz.shape, matriz.dtype)
+    # Toca todas as páginas antes da medição: as faltas de página do primeiro acesso não fazem parte do eco.
+    destino.fill(0)
+    pronto = SinalPronto()
+    p_leitor = iniciar_processo(processo_leitor_eco_matriz,
+                                (ring_ida, ring_volta, segmento.nome, matriz.shape, matriz.dtype, pronto),
+                                metodo_inicio)
+    pronto.esperar()
+
+    aviso = bytes(1)
+    latencias_ns = []
+
+    inicio = time.perf_counter_ns()
+    for _ in range(num_mensagens):
+        t0 = time.perf_counter_ns()
+        destino[...] = matriz
+        ring_ida.escrever(aviso)
+        ring_volta.ler()
+        latencias_ns.append(time.perf_counter_ns() - t0)
+    duracao_ns = time.perf_counter_ns() - inicio
+
+    ring_ida.fechar_escrita()
+    p_leitor.join()
+    del destino
+    segmento.remover()
+    return {"latencias_ns": latencias_ns, "duracao_ns": duracao_ns}
+
+
+# Executa a demonstração com as opções de 'argv' (ou da linha de comando). Também é chamada
+# pelos trabalhadores do daemon (backend/daemon.py), que já têm este módulo importado.
+def main(argv=None):
+    # Lê a mensagem da GUI e as opções do fluxo a partir dos argumentos da linha de comando.
+    parser = argparse.ArgumentParser(description="Demonstração de IPC com Memória Compartilhada.")
+    parser.add_argument("mensagem", help="Mensagem enviada pelo escritor ao leitor.")
+    parser.add_argument("--repeticoes", type=int, default=1,
+                        help="Quantas vezes o escritor publica a mensagem no fluxo.")
+    parser.add_argument("--capacidade", type=int, default=1024,
+                        help="Tamanho em bytes da área de dados do buffer circular.")
+    parser.add_argument("--modo", choices=["ring", "segmento", "broadcast"], default="ring",
+                        help="'ring': a mensagem trafega pelo buffer circular; "
+                             "'segmento': cada mensagem vai em um segmento do seu tamanho; "
+                             "'broadcast': vários leitores acompanham as versões publicadas (seqlock).")
+    parser.add_argument("--leitores", type=int, default=3,
+                        help="No modo 'broadcast', quantos processos leitores acompanham o escritor.")
+    parser.add_argument("--intervalo-ms", type=float, default=10,
+                        help="No modo 'broadcast', pausa do escritor entre duas versões, em milissegundos.")
+    parser.add_argument("--notificacao", choices=list(NOTIFICACOES), default=None,
+                        help="Nos modos 'ring' e 'segmento', como o escritor acorda o leitor do buffer circular "
+                             "(padrão: o leitor consulta o buffer com espera progressiva).")
+    parser.add_argument("--tamanho-payload", type=int, default=0,
+                        help="No modo 'segmento', gera um payload deste tamanho repetindo a mensagem.")
+    parser.add_argument("--metodo-inicio", choices=METODOS_INICIO, default=None,
+                        help="Como os processos escritor e leitor são criados (padrão: o da plataforma).")
+    args = parser.parse_args(argv)
+    # Contexto do multiprocessing com o método de início escolhido.
+    contexto = obter_contexto(args.metodo_inicio)
+
+    if args.modo == "broadcast":
+        # Um snapshot compartilhado por todos; cada leitor tem o seu sinal de "pronto".
+        seqlock = SeqlockBroadcast(args.capacidade)
+        prontos = [SinalPronto(contexto) for _ in range(args.leitores)]
+        p_escritor = contexto.Process(target=processo_escritor_broadcast,
+                                      args=(seqlock, args.mensagem, args.repeticoes, args.intervalo_ms / 1e3, prontos))
+        p_leitores = [contexto.Process(target=processo_leitor_broadcast, args=(seqlock, pronto)) for pronto in prontos]
+        p_escritor.start()
+        for p_leitor in p_leitores:
+            p_leitor.start()
+        p_escritor.join()
+        for p_leitor in p_leitores:
+            p_leitor.join()
+        log_message("MAIN", "Demonstração com Memória Compartilhada finalizada.")
+        return
+
+    # Sinal pelo qual o leitor avisa o escritor que já está esperando as mensagens.
+    pronto = SinalPronto(contexto)
+    # Cria o buffer circular em memória compartilhada que liga o escritor ao leitor.
+    ring = RingBufferSPSC(args.capacidade, criar_notificacao(args.notificacao, contexto))
+
+    if args.modo == "segmento":
+        # Os processos precisam compartilhar o rastreador de segmentos (ver segmento.py).
+        iniciar_rastreador()
+        # No modo segmento, o buffer circular só transporta os nomes dos segmentos.
+        p_escritor = contexto.Process(target=processo_escritor_segmento,
+                                      args=(ring, args.mensagem, args.repeticoes, args.tamanho_payload, pronto))
+        p_leitor = contexto.Process(target=processo_leitor_segmento, args=(ring, pronto))
+    else:
+        # Cria o processo escritor, passando o buffer, a mensagem e o número de repetições.
+        p_escritor = contexto.Process(target=processo_escritor, args=(ring, args.mensagem, args.repeticoes, pronto))
+        # Cria o processo leitor, passando o buffer.
+        p_leitor = contexto.Process(target=processo_leitor, args=(ring, pronto))
+
+    try:
+        # Inicia a execução dos dois processos.
+        p_escritor.start()
+        p_leitor.start()
+
+        # O processo principal espera até que ambos os processos filhos terminem.
+        p_escritor.join()
+        p_leitor.join()
+    finally:
+        # Fecha a notificação (ex: o eventfd) herdada pelos processos, mesmo se a criação de um deles falhar.
+        if ring.notificacao is not None:
+            ring.notificacao.fechar()
+
+    # Loga o fim da demonstração (este log virá de uma fonte "Desconhecida" na GUI, o que é normal).
+    log_message("MAIN", "Demonstração com Memória Compartilhada finalizada.")
+
+
+# Ponto de entrada do script.
+if __name__ == "__main__":
+    main()
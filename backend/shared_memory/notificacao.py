@@ -0,0 +1,266 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/shared_memory/notificacao.py
+# DESCRIÇÃO: Estratégias de notificação entre o escritor e o leitor do buffer
+#            circular (ring_buffer.py), e o benchmark de ida e volta
+#            (ping-pong) que compara a latência de cada uma.
+#
+#   espera   -> sem notificação: o leitor consulta os índices com a espera
+#               progressiva de ring_buffer.esperar (gira, cede a CPU, dorme).
+#   event    -> mp.Event: o escritor chama set() a cada mensagem e o leitor
+#               dorme em wait() (semáforo e condição do multiprocessing).
+#   eventfd  -> os.eventfd (Linux): um contador no kernel; o escritor soma 1 e
+#               o leitor dorme em read() até o contador ficar positivo.
+#   pipe     -> os.pipe como campainha: o escritor escreve 1 byte e o leitor
+#               dorme em read() no outro lado.
+#   hibrido  -> o leitor gira consultando os índices por um tempo limitado e só
+#               depois dorme na campainha (eventfd, ou pipe onde não houver),
+#               avisando por uma flag em memória compartilhada. O escritor só
+#               faz a chamada ao sistema se a flag disser que o leitor dorme.
+#
+# Com mensagens pequenas, acordar o leitor é praticamente todo o custo do
+# caminho por memória compartilhada: a cópia leva nanossegundos e a troca de
+# contexto, microssegundos.
+#
+# Como em ring_buffer.py, não há barreiras de memória em Python: no modo híbrido,
+# o leitor marca a flag e confere os índices de novo antes de dormir, e o
+# escritor publica o índice antes de ler a flag; para o caso raro em que a CPU
+# reordene essas operações, o leitor nunca dorme mais que PAUSA_MAXIMA_S.
+#
+# USO: python -m backend.shared_memory.notificacao [--estrategias espera eventfd ...]
+#                                                  [--tamanhos 16 4096] [--mensagens 5000]
+# -----------------------------------------------------------------------------
+
+import argparse  # Importa a biblioteca para ler as opções da linha de comando.
+import json  # Importa a biblioteca para emitir os resultados em JSON.
+import multiprocessing as mp  # Importa a biblioteca para o Event e a flag compartilhada.
+import os  # Importa a biblioteca do sistema para eventfd, pipes e a contagem de núcleos.
+import select  # Importa a biblioteca para esperar a campainha com limite de tempo.
+import sys  # Importa a biblioteca do sistema para escrever na saída padrão.
+import time  # Importa a biblioteca de tempo para limitar a espera ativa.
+from multiprocessing import reduction  # Duplica os descritores de arquivo para os processos filhos.
+
+from backend.processos import METODOS_INICIO  # Métodos de início dos processos.
+from backend.shared_memory.ring_buffer import esperar  # Espera progressiva (spin, ceder, dormir).
+
+# Tempo padrão de espera ativa do modo híbrido antes de dormir, em microssegundos.
+# Com um único núcleo, girar só atrasa o escritor, então o leitor dorme direto.
+SPIN_PADRAO_US = 50 if (os.cpu_count() or 1) > 1 else 0
+
+# Maior intervalo que o leitor dorme sem conferir os índices de novo (rede de segurança do modo híbrido).
+PAUSA_MAXIMA_S = 0.01
+
+# Bytes lidos de uma vez para esvaziar a campainha de pipe.
+PEDACO_CAMPAINHA = 4096
+
+
+class NotificacaoEspera:
+    """Sem notificação: o leitor consulta os índices com a espera progressiva do buffer circular."""
+
+    def avisar(self):
+        pass
+
+    # Espera até condicao() ser verdadeira.
+    def aguardar(self, condicao):
+        tentativa = 0
+        while not condicao():
+            esperar(tentativa)
+            tentativa += 1
+
+    def fechar(self):
+        pass
+
+
+class NotificacaoEvent:
+    """mp.Event: o escritor chama set() a cada mensagem e o leitor dorme em wait()."""
+
+    # O Event precisa vir do mesmo contexto (método de início) que cria os processos.
+    def __init__(self, contexto=None):
+        self._evento = (contexto or mp).Event()
+
+    def avisar(self):
+        self._evento.set()
+
+    def aguardar(self, condicao):
+        while True:
+            # Limpa antes de conferir: um set() que chegue depois da conferência não se perde.
+            self._evento.clear()
+            if condicao():
+                return
+            self._evento.wait()
+
+    def fechar(self):
+        pass
+
+
+class _Campainha:
+    """Base das campainhas por descritor de arquivo (eventfd e pipe).
+
+    Os descritores viajam para o processo filho com reduction.DupFd, como os das conexões do
+    multiprocessing, então funcionam com qualquer método de início.
+    """
+
+    def __init__(self, fd_leitura, fd_escrita):
+        self._fd_leitura = fd_leitura
+        self._fd_escrita = fd_escrita
+
+    # O eventfd usa o mesmo descritor nas duas pontas, que então viaja uma única vez.
+    def __getstate__(self):
+        if self._fd_leitura == self._fd_escrita:
+            return {"_fds": (reduction.DupFd(self._fd_leitura),)}
+        return {"_fds": (reduction.DupFd(self._fd_leitura), reduction.DupFd(self._fd_escrita))}
+
+    def __setstate__(self, estado):
+        fds = [fd.detach() for fd in estado["_fds"]]
+        self._fd_leitura, self._fd_escrita = fds[0], fds[-1]
+
+    # Espera a campainha tocar por até 'timeout' segundos (None: sem limite) e a esvazia.
+    def _esperar_toque(self, timeout=None):
+        if timeout is not None and not select.select([self._fd_leitura], [], [], timeout)[0]:
+            return
+        self._esvaziar()
+
+    def aguardar(self, condicao):
+        while not condicao():
+            self._esperar_toque()
+
+    def fechar(self):
+        for fd in {self._fd_leitura, self._fd_escrita}:
+            os.close(fd)
+
+
+class NotificacaoEventfd(_Campainha):
+    """os.eventfd: o escritor soma 1 ao contador do kernel e o leitor dorme em read()."""
+
+    def __init__(self):
+        fd = os.eventfd(0, os.EFD_CLOEXEC)
+        super().__init__(fd, fd)
+
+    def avisar(self):
+        os.eventfd_write(self._fd_escrita, 1)
+
+    # read() devolve e zera o contador: vários avisos seguidos acordam o leitor uma única vez.
+    def _esvaziar(self):
+        os.eventfd_read(self._fd_leitura)
+
+
+class NotificacaoPipe(_Campainha):
+    """os.pipe como campainha: o escritor escreve 1 byte e o leitor dorme em read()."""
+
+    def __init__(self):
+        super().__init__(*os.pipe())
+
+    def avisar(self):
+        os.write(self._fd_escrita, b"\0")
+
+    # Lê todos os toques acumulados de uma vez (até PEDACO_CAMPAINHA).
+    def _esvaziar(self):
+        os.read(self._fd_leitura, PEDACO_CAMPAINHA)
+
+
+class NotificacaoHibrida:
+    """Gira consultando os índices por até 'spin_us' e depois dorme numa campainha.
+
+    A flag 'dormindo' fica em memória compartilhada: enquanto o leitor gira, o escritor não faz
+    nenhuma chamada ao sistema para avisá-lo.
+    """
+
+    def __init__(self, spin_us=SPIN_PADRAO_US):
+        self.spin_ns = int(spin_us * 1000)
+        self._dormindo = mp.RawValue('B', 0)
+        self._campainha = NotificacaoEventfd() if hasattr(os, "eventfd") else NotificacaoPipe()
+
+    def avisar(self):
+        if self._dormindo.value:
+            self._campainha.avisar()
+
+    def aguardar(self, condicao):
+        if condicao():
+            return
+        limite = time.perf_counter_ns() + self.spin_ns
+        while time.perf_counter_ns() < limite:
+            if condicao():
+                return
+        while True:
+            self._dormindo.value = 1
+            # Confere de novo depois de marcar a flag: uma mensagem publicada antes da marca não avisaria.
+            if condicao():
+                break
+            self._campainha._esperar_toque(PAUSA_MAXIMA_S)
+            if condicao():
+                break
+        self._dormindo.value = 0
+
+    def fechar(self):
+        self._campainha.fechar()
+
+
+# Estratégias disponíveis nesta plataforma: nome -> classe.
+NOTIFICACOES = {"espera": NotificacaoEspera, "event": NotificacaoEvent}
+if hasattr(os, "eventfd"):
+    NOTIFICACOES["eventfd"] = NotificacaoEventfd
+if hasattr(select, "select") and os.name == "posix":
+    NOTIFICACOES["pipe"] = NotificacaoPipe
+    NOTIFICACOES["hibrido"] = NotificacaoHibrida
+
+
+# Cria a notificação 'nome' (None: a espera progressiva, o comportamento padrão do buffer).
+# 'contexto' é o do multiprocessing que vai criar os processos (só o Event depende dele).
+def criar_notificacao(nome=None, contexto=None, **opcoes):
+    if nome is None:
+        return None
+    classe = NOTIFICACOES[nome]
+    if classe is NotificacaoEvent:
+        opcoes["contexto"] = contexto
+    return classe(**opcoes)
+
+
+# Lê as opções da linha de comando.
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Latência de ida e volta (ping-pong) de cada estratégia de "
+                                                 "notificação do buffer circular.")
+    parser.add_argument("--estrategias", nargs="+", choices=list(NOTIFICACOES), default=list(NOTIFICACOES),
+                        help="Estratégias a medir.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[16, 4096],
+                        help="Tamanhos de payload em bytes.")
+    parser.add_argument("--mensagens", type=int, default=5000, help="Mensagens em cada medição.")
+    parser.add_argument("--spin-us", type=float, default=SPIN_PADRAO_US,
+                        help="No modo híbrido, quanto tempo o leitor gira antes de dormir, em microssegundos.")
+    parser.add_argument("--metodo-inicio", choices=METODOS_INICIO, default=None,
+                        help="Como o processo de eco é criado (padrão: o da plataforma).")
+    parser.add_argument("--json", action="store_true",
+                        help="Emite um objeto JSON por linha em vez da tabela.")
+    return parser
+
+
+# Ponto de entrada do benchmark.
+def main(argv=None):
+    from backend.bench import formatar_tamanho, resumir  # Importado aqui: o benchmark importa a demonstração, que importa este módulo.
+    from backend.shared_memory.logic import benchmark_eco
+
+    args = criar_parser().parse_args(argv)
+    if not args.json:
+        print(f"{'estratégia':<12}{'payload':>10}{'msgs/s':>12}{'p50 (us)':>12}{'p99 (us)':>12}"
+              f"{'p999 (us)':>12}{'CPU (s)':>10}", flush=True)
+    for tamanho in args.tamanhos:
+        for estrategia in args.estrategias:
+            opcoes = {"spin_us": args.spin_us} if estrategia == "hibrido" else {}
+            # O tempo de CPU dos dois processos (incluindo a criação do de eco) mostra o custo de cada
+            # estratégia além da latência: girar reduz a latência, mas ocupa um núcleo.
+            antes = os.times()
+            resultado = benchmark_eco(tamanho, args.mensagens, args.metodo_inicio,
+                                      notificacao=estrategia, opcoes_notificacao=opcoes)
+            depois = os.times()
+            cpu_s = sum(depois[:4]) - sum(antes[:4])
+            resumo = resumir(f"shared_memory_{estrategia}", tamanho, resultado)
+            resumo.update({"notificacao": estrategia, "cpu_s": cpu_s})
+            if args.json:
+                print(json.dumps(resumo), flush=True)
+            else:
+                print(f"{estrategia:<12}{formatar_tamanho(tamanho):>10}{resumo['mensagens_por_s']:>12.0f}"
+                      f"{resumo['p50_us']:>12.1f}{resumo['p99_us']:>12.1f}{resumo['p999_us']:>12.1f}"
+                      f"{cpu_s:>10.2f}", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/shared_memory/ring_buffer.py
+# DESCRIÇÃO: Buffer circular (ring buffer) de um produtor e um consumidor
+#            (SPSC) em memória compartilhada, sem locks.
+#
+# LAYOUT DA MEMÓRIA:
+#   [0:8]      head  -> total de bytes já consumidos (escrito só pelo leitor)
+#   [64:72]    tail  -> total de bytes já publicados (escrito só pelo escritor)
+#   [128:...]  área de dados circular, com registros [tamanho (4 bytes)][dados]
+#
+# head e tail ficam em linhas de cache diferentes para que escritor e leitor não
+# disputem a mesma linha. Como cada índice tem um único processo escritor, não é
+# preciso lock: o escritor copia o registro e só depois publica o novo tail, e o
+# leitor consome o registro e só depois publica o novo head. Os índices crescem
+# sem parar (64 bits) e a posição na área de dados é o índice módulo a capacidade.
+#
+# Por padrão o leitor descobre as mensagens novas consultando o tail com a espera
+# progressiva (esperar). Com uma 'notificacao' (backend/shared_memory/notificacao.py),
+# o escritor avisa o leitor a cada publicação e o leitor dorme até o aviso.
+# -----------------------------------------------------------------------------
+
+import multiprocessing as mp  # Importa a biblioteca para alocar a memória compartilhada.
+import os  # Importa a biblioteca do sistema para contar os núcleos de CPU.
+import struct  # Importa a biblioteca para codificar o cabeçalho de tamanho dos registros.
+import time  # Importa a biblioteca de tempo para as pausas de espera.
+
+# Deslocamentos dos índices e início da área de dados dentro da memória compartilhada.
+OFFSET_HEAD = 0
+OFFSET_TAIL = 64
+OFFSET_DADOS = 128
+
+# Cabeçalho de cada registro: tamanho dos dados em 4 bytes (little-endian).
+CABECALHO = struct.Struct("<I")
+
+# Valor especial de tamanho que marca o fim do fluxo de mensagens.
+FIM_DO_FLUXO = 0xFFFFFFFF
+
+# Capacidade padrão da área de dados (1 MB).
+CAPACIDADE_PADRAO = 1 << 20
+
+# Quantas tentativas de espera ativa (spin) antes de começar a ceder a CPU.
+# Com um único núcleo, girar só atrasa o outro processo, então a espera ativa é desligada.
+TENTATIVAS_SPIN = 200 if (os.cpu_count() or 1) > 1 else 0
+# Quantas tentativas cedendo a CPU (sleep(0)) antes de começar a dormir de verdade.
+TENTATIVAS_CEDER = 2000
+# Pausa usada quando a espera se prolonga (50 microssegundos).
+PAUSA_ESPERA = 50e-6
+
+
+# Espera progressiva usada quando o buffer está cheio (escritor) ou vazio (leitor):
+# primeiro gira sem dormir, depois cede a CPU e, por fim, dorme pequenos intervalos.
+def esperar(tentativa):
+    if tentativa < TENTATIVAS_SPIN:
+        return
+    if tentativa < TENTATIVAS_CEDER:
+        time.sleep(0)
+    else:
+        time.sleep(PAUSA_ESPERA)
+
+
+class RingBufferSPSC:
+    """Fila de mensagens de tamanho variável entre exatamente um escritor e um leitor."""
+
+    # Aloca a memória compartilhada. Deve ser criado antes dos processos e passado a eles como argumento.
+    def __init__(self, capacidade=CAPACIDADE_PADRAO, notificacao=None):
+        self.capacidade = capacidade
+        self.notificacao = notificacao
+        self._memoria = mp.RawArray('B', OFFSET_DADOS + capacidade)
+        self._criar_visoes()
+
+    # Cria as visões (memoryview) sobre a memória; refeito em cada processo após a desserialização.
+    def _criar_visoes(self):
+        bruto = memoryview(self._memoria).cast('B')
+        self._head = bruto[OFFSET_HEAD:OFFSET_HEAD + 8].cast('Q')
+        self._tail = bruto[OFFSET_TAIL:OFFSET_TAIL + 8].cast('Q')
+        self._dados = bruto[OFFSET_DADOS:OFFSET_DADOS + self.capacidade]
+
+    # Só a memória, a capacidade e a notificação viajam para o processo filho; as visões são recriadas lá.
+    def __getstate__(self):
+        return {"capacidade": self.capacidade, "notificacao": self.notificacao, "_memoria": self._memoria}
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._criar_visoes()
+
+    # Maior mensagem que cabe no buffer (a capacidade menos o cabeçalho do registro).
+    @property
+    def tamanho_maximo(self):
+        return self.capacidade - CABECALHO.size
+
+    # Copia 'dados' para a área circular a partir do índice 'indice', dando a volta se necessário.
+    def _copiar_para(self, indice, dados):
+        pos = indice % self.capacidade
+        primeira_parte = min(len(dados), self.capacidade - pos)
+        self._dados[pos:pos + primeira_parte] = dados[:primeira_parte]
+        if primeira_parte < len(dados):
+            self._dados[:len(dados) - primeira_parte] = dados[primeira_parte:]
+
+    # Copia 'tamanho' bytes da área circular a partir do índice 'indice', dando a volta se necessário.
+    def _copiar_de(self, indice, tamanho):
+        pos = indice % self.capacidade
+        primeira_parte = min(tamanho, self.capacidade - pos)
+        if primeira_parte == tamanho:
+            return bytes(self._dados[pos:pos + tamanho])
+        return bytes(self._dados[pos:]) + bytes(self._dados[:tamanho - primeira_parte])
+
+    # Tenta escrever um registro; devolve False se não houver espaço livre no momento.
+    def _tentar_publicar(self, tamanho, dados):
+        tail = self._tail[0]
+        livre = self.capacidade - (tail - self._head[0])
+        if livre < CABECALHO.size + len(dados):
+            return False
+        self._copiar_para(tail, CABECALHO.pack(tamanho))
+        self._copiar_para(tail + CABECALHO.size, dados)
+        # Publica o registro: só agora o leitor passa a enxergá-lo.
+        self._tail[0] = tail + CABECALHO.size + len(dados)
+        if self.notificacao is not None:
+            self.notificacao.avisar()
+        return True
+
+    # Escreve uma mensagem (bytes), esperando se o buffer estiver cheio.
+    def escrever(self, dados):
+        if len(dados) > self.tamanho_maximo:
+            raise ValueError(f"A mensagem ({len(dados)} bytes) excede a capacidade do buffer "
+                             f"({self.tamanho_maximo} bytes).")
+        tentativa = 0
+        while not self._tentar_publicar(len(dados), dados):
+            esperar(tentativa)
+            tentativa += 1
+
+    # Tenta escrever uma mensagem sem esperar; devolve False se o buffer estiver cheio.
+    def tentar_escrever(self, dados):
+        if len(dados) > self.tamanho_maximo:
+            raise ValueError(f"A mensagem ({len(dados)} bytes) excede a capacidade do buffer "
+                             f"({self.tamanho_maximo} bytes).")
+        return self._tentar_publicar(len(dados), dados)
+
+    # Sinaliza ao leitor que não haverá mais mensagens.
+    def fechar_escrita(self):
+        tentativa = 0
+        while not self._tentar_publicar(FIM_DO_FLUXO, b""):
+            esperar(tentativa)
+            tentativa += 1
+
+    # Tenta ler o próximo registro. Devolve (True, dados), (True, None) no fim do fluxo
+    # ou (False, None) se o buffer estiver vazio no momento.
+    def tentar_ler(self):
+        head = self._head[0]
+        if head == self._tail[0]:
+            return False, None
+        (tamanho,) = CABECALHO.unpack(self._copiar_de(head, CABECALHO.size))
+        if tamanho == FIM_DO_FLUXO:
+            self._head[0] = head + CABECALHO.size
+            return True, None
+        dados = self._copiar_de(head + CABECALHO.size, tamanho)
+        # Libera o espaço do registro para o escritor.
+        self._head[0] = head + CABECALHO.size + tamanho
+        return True, dados
+
+    # Indica se há algum registro publicado e ainda não lido.
+    def tem_dados(self):
+        return self._head[0] != self._tail[0]
+
+    # Lê a próxima mensagem, esperando se o buffer estiver vazio. Devolve None no fim do fluxo.
+    def ler(self):
+        if self.notificacao is not None:
+            while True:
+                leu, dados = self.tentar_ler()
+                if leu:
+                    return dados
+                self.notificacao.aguardar(self.tem_dados)
+        tentativa = 0
+        while True:
+            leu, dados = self.tentar_ler()
+            if leu:
+                return dados
+            esperar(tentativa)
+            tentativa += 1
+
+    # Permite percorrer o fluxo com 'for mensagem in ring:' até o fim.
+    def __iter__(self):
+        while True:
+            dados = self.ler()
+            if dados is None:
+                return
+            yield dados
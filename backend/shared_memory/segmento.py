@@ -0,0 +1,85 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/shared_memory/segmento.py
+# DESCRIÇÃO: Segmentos de memória compartilhada dimensionados para o payload,
+#            para transferir mensagens grandes sem cópia no lado do leitor.
+#
+# LAYOUT DO SEGMENTO:
+#   [0:8]   tamanho do payload em bytes (little-endian)
+#   [8:...] payload
+#
+# O tamanho explícito no cabeçalho é necessário porque o sistema pode arredondar o
+# segmento para um múltiplo do tamanho de página, e porque payloads podem terminar
+# em bytes nulos legítimos. O escritor cria o segmento e passa apenas o NOME dele
+# ao leitor (custo constante, independente do tamanho do payload); o leitor abre o
+# segmento e recebe um memoryview sobre os dados, sem copiá-los.
+# -----------------------------------------------------------------------------
+
+import struct  # Importa a biblioteca para codificar o cabeçalho de tamanho.
+from multiprocessing import shared_memory  # Importa os segmentos nomeados de memória compartilhada.
+from multiprocessing import resource_tracker  # Importa o processo que rastreia os segmentos criados.
+
+# Cabeçalho do segmento: tamanho do payload em 8 bytes.
+CABECALHO_SEGMENTO = struct.Struct("<Q")
+
+
+# Inicia o rastreador de recursos do multiprocessing no processo principal, ANTES de criar os
+# processos filhos. Assim todos os processos compartilham o mesmo rastreador e o registro feito
+# por quem cria o segmento é desfeito por quem o remove. Sem isso, cada filho iniciaria o seu
+# próprio rastreador, que removeria no encerramento do filho segmentos ainda em uso pelos outros.
+def iniciar_rastreador():
+    resource_tracker.ensure_running()
+
+
+class Segmento:
+    """Segmento de memória compartilhada com cabeçalho de tamanho e acesso aos dados por memoryview."""
+
+    def __init__(self, shm):
+        self._shm = shm
+        (tamanho,) = CABECALHO_SEGMENTO.unpack_from(shm.buf, 0)
+        # Visão sobre o payload: escrever nela escreve direto na memória compartilhada.
+        self.dados = shm.buf[CABECALHO_SEGMENTO.size:CABECALHO_SEGMENTO.size + tamanho]
+
+    # Cria um novo segmento com espaço exato para 'tamanho' bytes de payload.
+    @classmethod
+    def criar(cls, tamanho):
+        # O sistema não aceita segmentos de tamanho zero, por isso o cabeçalho sempre ocupa espaço.
+        shm = shared_memory.SharedMemory(create=True, size=CABECALHO_SEGMENTO.size + tamanho)
+        CABECALHO_SEGMENTO.pack_into(shm.buf, 0, tamanho)
+        return cls(shm)
+
+    # Cria um segmento e copia 'dados' para ele (a única cópia do caminho inteiro).
+    @classmethod
+    def publicar(cls, dados):
+        segmento = cls.criar(len(dados))
+        segmento.dados[:] = dados
+        return segmento
+
+    # Abre um segmento existente a partir do nome recebido do escritor.
+    @classmethod
+    def abrir(cls, nome):
+        return cls(shared_memory.SharedMemory(name=nome))
+
+    # Nome do segmento no sistema: é o que o escritor envia ao leitor.
+    @property
+    def nome(self):
+        return self._shm.name
+
+    # Tamanho do payload em bytes.
+    def __len__(self):
+        return len(self.dados)
+
+    # Desfaz o mapeamento neste processo. Visões derivadas de 'dados' precisam ter sido liberadas.
+    def fechar(self):
+        self.dados.release()
+        self._shm.close()
+
+    # Fecha o segmento e o remove do sistema. Deve ser chamado por quem fica com a posse final dos dados.
+    def remover(self):
+        self.fechar()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
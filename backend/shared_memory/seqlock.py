@@ -0,0 +1,250 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/shared_memory/seqlock.py
+# DESCRIÇÃO: Difusão (broadcast) de um estado em memória compartilhada: um
+#            escritor publica versões sucessivas de um snapshot e qualquer número
+#            de leitores as lê de forma consistente por um seqlock, sem locks.
+#
+# LAYOUT DA MEMÓRIA:
+#   [0:8]      seq      -> contador de sequência (ímpar = escrita em andamento)
+#   [8:16]     tamanho  -> tamanho do snapshot atual
+#   [16:24]    instante -> relógio monotônico (ns) em que o snapshot foi publicado
+#   [64:72]    fim      -> 1 quando o escritor não vai publicar mais nada
+#   [128:...]  área de dados com o snapshot
+#
+# PROTOCOLO: o escritor torna seq ímpar, grava o snapshot e torna seq par de novo.
+# O leitor lê seq, copia o snapshot e lê seq outra vez: se os dois valores forem
+# iguais e pares, a cópia é consistente; senão, o escritor mexeu no meio e o
+# leitor tenta de novo. Os leitores nunca escrevem na memória, então não
+# disputam linhas de cache entre si nem atrasam o escritor. A versão de um
+# snapshot é seq / 2. Como no buffer circular, a ordem das escritas depende da
+# CPU manter a ordem dos stores (TSO, como no x86): o Python não tem barreiras.
+#
+# Diferente do buffer circular (uma fila), o seqlock guarda só o estado mais
+# recente: um leitor lento pula versões, mas nunca atrasa o escritor.
+#
+# USO: python -m backend.shared_memory.seqlock [--leitores 1 2 4] [--tamanho 4096]
+#                                              [--duracao 1.0] [--intervalo-us 100]
+#      (mede como a leitura escala com o número de processos leitores)
+# -----------------------------------------------------------------------------
+
+import argparse  # Importa a biblioteca para ler as opções da linha de comando.
+import json  # Importa a biblioteca para emitir os resultados em JSON.
+import multiprocessing as mp  # Importa a biblioteca para alocar a memória compartilhada.
+import sys  # Importa a biblioteca do sistema para escrever na saída padrão.
+import time  # Importa a biblioteca de tempo para medir as leituras.
+
+from backend.processos import METODOS_INICIO, SinalPronto, obter_contexto, quantidades_ate_nucleos
+from backend.shared_memory.ring_buffer import esperar  # Espera progressiva (spin, ceder, dormir).
+
+# Deslocamentos dos campos e início da área de dados dentro da memória compartilhada.
+OFFSET_SEQ = 0
+OFFSET_TAMANHO = 8
+OFFSET_INSTANTE = 16
+OFFSET_FIM = 64
+OFFSET_DADOS = 128
+
+# Capacidade padrão da área de dados (64 KB).
+CAPACIDADE_PADRAO = 64 * 1024
+
+
+class SeqlockBroadcast:
+    """Snapshot versionado em memória compartilhada: um escritor, qualquer número de leitores."""
+
+    # Aloca a memória compartilhada. Deve ser criado antes dos processos e passado a eles como argumento.
+    def __init__(self, capacidade=CAPACIDADE_PADRAO):
+        self.capacidade = capacidade
+        self._memoria = mp.RawArray('B', OFFSET_DADOS + capacidade)
+        self._criar_visoes()
+
+    # Cria as visões sobre a memória; refeito em cada processo após a desserialização.
+    def _criar_visoes(self):
+        bruto = memoryview(self._memoria).cast('B')
+        self._seq = bruto[OFFSET_SEQ:OFFSET_SEQ + 8].cast('Q')
+        self._tamanho = bruto[OFFSET_TAMANHO:OFFSET_TAMANHO + 8].cast('Q')
+        self._instante = bruto[OFFSET_INSTANTE:OFFSET_INSTANTE + 8].cast('Q')
+        self._fim = bruto[OFFSET_FIM:OFFSET_FIM + 8].cast('Q')
+        self._dados = bruto[OFFSET_DADOS:OFFSET_DADOS + self.capacidade]
+        # Leituras que precisaram ser refeitas neste processo (escrita em andamento no meio da cópia).
+        self.leituras_repetidas = 0
+
+    # Só a memória e a capacidade viajam para o processo filho; as visões são recriadas lá.
+    def __getstate__(self):
+        return {"capacidade": self.capacidade, "_memoria": self._memoria}
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._criar_visoes()
+
+    # Versão do último snapshot publicado por completo (0 = nenhum).
+    @property
+    def versao(self):
+        return self._seq[0] // 2
+
+    # Publica um novo snapshot. Só o processo escritor chama.
+    def publicar(self, dados):
+        if len(dados) > self.capacidade:
+            raise ValueError(f"O snapshot ({len(dados)} bytes) excede a capacidade ({self.capacidade} bytes).")
+        seq = self._seq[0]
+        # seq ímpar: leitores que começarem agora sabem que a cópia não vale.
+        self._seq[0] = seq + 1
+        self._tamanho[0] = len(dados)
+        self._instante[0] = time.monotonic_ns()
+        self._dados[:len(dados)] = dados
+        # seq par de novo: o snapshot está completo.
+        self._seq[0] = seq + 2
+
+    # Avisa os leitores que não haverá novas versões.
+    def encerrar(self):
+        self._fim[0] = 1
+
+    @property
+    def encerrado(self):
+        return self._fim[0] == 1
+
+    # Lê o snapshot atual de forma consistente. Devolve (versão, dados, instante de publicação em ns).
+    def ler(self):
+        tentativa = 0
+        while True:
+            seq = self._seq[0]
+            if not seq & 1:
+                tamanho = min(self._tamanho[0], self.capacidade)
+                instante = self._instante[0]
+                dados = bytes(self._dados[:tamanho])
+                if self._seq[0] == seq:
+                    return seq // 2, dados, instante
+            # O escritor estava (ou entrou) no meio de uma publicação: descarta a cópia e tenta de novo.
+            self.leituras_repetidas += 1
+            esperar(tentativa)
+            tentativa += 1
+
+    # Lê o snapshot só se houver uma versão mais nova que 'versao'; senão devolve None sem copiar nada.
+    def ler_se_nova(self, versao):
+        if self._seq[0] // 2 <= versao:
+            return None
+        return self.ler()
+
+    # Espera uma versão mais nova que 'versao' e a lê. Devolve None se o escritor encerrou sem publicá-la.
+    def esperar_nova(self, versao):
+        tentativa = 0
+        while True:
+            # 'encerrado' é lido antes: se já estava encerrado e não há versão nova, não haverá mais.
+            encerrado = self.encerrado
+            snapshot = self.ler_se_nova(versao)
+            if snapshot is not None:
+                return snapshot
+            if encerrado:
+                return None
+            esperar(tentativa)
+            tentativa += 1
+
+
+# Função executada por cada leitor no benchmark: lê cada versão nova até o escritor encerrar.
+def processo_leitor_benchmark(seqlock, pronto, conn_resultado):
+    pronto.sinalizar()
+    versao = 0
+    lidas = 0
+    atrasos_ns = []
+    while True:
+        snapshot = seqlock.esperar_nova(versao)
+        if snapshot is None:
+            break
+        versao, _, instante = snapshot
+        # Atraso entre a publicação e a leitura (relógio monotônico comum aos processos).
+        atrasos_ns.append(time.monotonic_ns() - instante)
+        lidas += 1
+    conn_resultado.send({"lidas": lidas, "repetidas": seqlock.leituras_repetidas, "atrasos_ns": atrasos_ns})
+    conn_resultado.close()
+
+
+# Mede um ponto: 'num_leitores' processos acompanham um escritor que publica snapshots de
+# 'tamanho' bytes a cada 'intervalo_us' microssegundos (0 = sem pausa) durante 'duracao' segundos.
+def executar_ponto(num_leitores, tamanho=4096, duracao=1.0, intervalo_us=100, metodo_inicio=None):
+    from backend.bench import percentil  # Importado aqui: o benchmark importa a demonstração, que importa este módulo.
+
+    contexto = obter_contexto(metodo_inicio)
+    seqlock = SeqlockBroadcast(max(tamanho, 1))
+    leitores = []
+    conexoes = []
+    prontos = []
+    for _ in range(num_leitores):
+        conn_resultado, conn_filho = contexto.Pipe(duplex=False)
+        pronto = SinalPronto(contexto)
+        processo = contexto.Process(target=processo_leitor_benchmark, args=(seqlock, pronto, conn_filho))
+        processo.start()
+        conn_filho.close()
+        leitores.append(processo)
+        conexoes.append(conn_resultado)
+        prontos.append(pronto)
+    for pronto in prontos:
+        pronto.esperar()
+
+    # O escritor é o próprio processo principal.
+    payload = b"x" * tamanho
+    publicadas = 0
+    inicio = time.perf_counter()
+    fim = inicio + duracao
+    while time.perf_counter() < fim:
+        seqlock.publicar(payload)
+        publicadas += 1
+        if intervalo_us:
+            time.sleep(intervalo_us / 1e6)
+    duracao_real = time.perf_counter() - inicio
+    seqlock.encerrar()
+
+    resultados = [conn.recv() for conn in conexoes]
+    for processo in leitores:
+        processo.join()
+
+    lidas = sum(r["lidas"] for r in resultados)
+    repetidas = sum(r["repetidas"] for r in resultados)
+    atrasos = sorted(a for r in resultados for a in r["atrasos_ns"])
+    return {
+        "leitores": num_leitores,
+        "tamanho": tamanho,
+        "publicadas_s": publicadas / duracao_real,
+        "leituras_s": lidas / duracao_real,
+        "leituras_s_por_leitor": lidas / duracao_real / num_leitores,
+        # Fração das versões publicadas que cada leitor chegou a ver (o resto foi pulado).
+        "versoes_vistas": lidas / (publicadas * num_leitores) if publicadas else 0.0,
+        "repetidas_por_leitura": repetidas / lidas if lidas else 0.0,
+        "atraso_p50_us": percentil(atrasos, 50) / 1e3 if atrasos else 0.0,
+        "atraso_p99_us": percentil(atrasos, 99) / 1e3 if atrasos else 0.0,
+    }
+
+
+# Lê as opções da linha de comando.
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Escalabilidade da difusão por seqlock com N leitores.")
+    parser.add_argument("--leitores", type=int, nargs="+", default=quantidades_ate_nucleos(),
+                        help="Quantidades de processos leitores (padrão: de 1 ao número de núcleos).")
+    parser.add_argument("--tamanho", type=int, default=4096, help="Tamanho de cada snapshot em bytes.")
+    parser.add_argument("--duracao", type=float, default=1.0, help="Segundos de publicação em cada ponto.")
+    parser.add_argument("--intervalo-us", type=float, default=100,
+                        help="Pausa do escritor entre publicações, em microssegundos (0 = sem pausa).")
+    parser.add_argument("--metodo-inicio", choices=METODOS_INICIO, default=None,
+                        help="Como os processos leitores são criados (padrão: o da plataforma).")
+    parser.add_argument("--json", action="store_true",
+                        help="Emite um objeto JSON por linha em vez da tabela.")
+    return parser
+
+
+# Ponto de entrada do benchmark.
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    if not args.json:
+        print(f"{'leitores':>8}{'publicadas/s':>14}{'leituras/s':>12}{'por leitor':>12}{'vistas':>9}"
+              f"{'repet./leit.':>14}{'atraso p50 (us)':>17}{'p99 (us)':>10}", flush=True)
+    for num_leitores in args.leitores:
+        resumo = executar_ponto(num_leitores, args.tamanho, args.duracao, args.intervalo_us, args.metodo_inicio)
+        if args.json:
+            print(json.dumps(resumo), flush=True)
+        else:
+            print(f"{resumo['leitores']:>8}{resumo['publicadas_s']:>14.0f}{resumo['leituras_s']:>12.0f}"
+                  f"{resumo['leituras_s_por_leitor']:>12.0f}{100 * resumo['versoes_vistas']:>8.0f}%"
+                  f"{resumo['repetidas_por_leitura']:>14.3f}{resumo['atraso_p50_us']:>17.1f}"
+                  f"{resumo['atraso_p99_us']:>10.1f}", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
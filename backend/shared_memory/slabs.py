@@ -0,0 +1,109 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/shared_memory/slabs.py
+# DESCRIÇÃO: Alocador de slabs em memória compartilhada: blocos de tamanho fixo,
+#            criados uma única vez e reaproveitados a cada mensagem grande.
+#
+# LAYOUT:
+#   um segmento de memória compartilhada por classe de tamanho, dividido em
+#   'slabs_por_classe' slabs do tamanho da classe:
+#     classe 0 (64 KB)  -> [slab 0][slab 1][slab 2][slab 3]
+#     classe 1 (256 KB) -> [slab 0][slab 1][slab 2][slab 3]
+#     ...
+#
+# Cada mensagem ocupa o menor slab que a comporta. Um slab é identificado por
+# (classe, índice), que é o que viaja entre os processos; o tamanho do payload
+# vai junto, já que o slab quase nunca fica cheio. Diferente do modo "segmento"
+# (segmento.py), que cria e remove um segmento por mensagem (shm_open, ftruncate,
+# mmap e falhas de página a cada vez), aqui os segmentos existem desde o início
+# e as páginas de um slab reaproveitado já estão mapeadas.
+#
+# A lista de slabs livres é local ao processo que escreve: quem lê devolve cada
+# slab ao escritor por uma mensagem de controle (ver backend/pipes/canal.py,
+# modo "hibrido"), então não há lock compartilhado. Os segmentos só ocupam
+# memória quando as páginas são tocadas.
+# -----------------------------------------------------------------------------
+
+import bisect  # Importa a busca binária para escolher a classe de cada tamanho.
+from multiprocessing import shared_memory  # Importa os segmentos nomeados de memória compartilhada.
+
+# Tamanhos padrão das classes: de 64 KB a 64 MB, multiplicando por 4 a cada classe.
+CLASSES_PADRAO = tuple(64 * 1024 * 4 ** i for i in range(6))
+
+# Número padrão de slabs em cada classe.
+SLABS_POR_CLASSE_PADRAO = 4
+
+
+class PoolSlabs:
+    """Slabs reaproveitáveis em memória compartilhada, com um segmento por classe de tamanho.
+
+    Criado pelo processo principal e enviado aos filhos por pickle (só os nomes dos segmentos
+    viajam) ou herdado no fork. Só o processo que escreve usa alocar() e liberar().
+    """
+
+    def __init__(self, classes=CLASSES_PADRAO, slabs_por_classe=SLABS_POR_CLASSE_PADRAO, nomes=None):
+        self.classes = tuple(classes)
+        self.slabs_por_classe = slabs_por_classe
+        if nomes is None:
+            self._segmentos = [shared_memory.SharedMemory(create=True, size=tamanho * slabs_por_classe)
+                               for tamanho in self.classes]
+        else:
+            self._segmentos = [shared_memory.SharedMemory(name=nome) for nome in nomes]
+        # Slabs livres de cada classe, usados como pilha: o último devolvido é o primeiro reaproveitado,
+        # com as páginas ainda quentes no cache e na TLB.
+        self._livres = [list(range(slabs_por_classe - 1, -1, -1)) for _ in self.classes]
+        # Alocações atendidas pelo pool e pedidos que não couberam (maiores que a maior classe ou classe esgotada).
+        self.alocacoes = 0
+        self.recusas = 0
+
+    # Só os nomes dos segmentos viajam para outro processo, que os abre e começa com todos os slabs livres.
+    def __reduce__(self):
+        return (PoolSlabs, (self.classes, self.slabs_por_classe, [segmento.name for segmento in self._segmentos]))
+
+    # Abre os mesmos segmentos numa nova instância, com todos os slabs livres: para outro canal do
+    # mesmo processo, que pode fechá-la sem afetar esta.
+    def reabrir(self):
+        return PoolSlabs(self.classes, self.slabs_por_classe, [segmento.name for segmento in self._segmentos])
+
+    # Maior payload que cabe num slab.
+    @property
+    def tamanho_maximo(self):
+        return self.classes[-1]
+
+    # Índice da menor classe que comporta 'tamanho' bytes (None se nenhuma comportar).
+    def classe_para(self, tamanho):
+        classe = bisect.bisect_left(self.classes, tamanho)
+        return classe if classe < len(self.classes) else None
+
+    # Reserva um slab para 'tamanho' bytes e devolve (classe, indice), ou None se não houver slab livre.
+    def alocar(self, tamanho):
+        classe = self.classe_para(tamanho)
+        if classe is None or not self._livres[classe]:
+            self.recusas += 1
+            return None
+        self.alocacoes += 1
+        return classe, self._livres[classe].pop()
+
+    # Indica se há um slab livre para 'tamanho' bytes, sem reservá-lo.
+    def tem_livre(self, tamanho):
+        classe = self.classe_para(tamanho)
+        return classe is not None and bool(self._livres[classe])
+
+    # Devolve o slab (classe, indice) à lista de livres.
+    def liberar(self, classe, indice):
+        self._livres[classe].append(indice)
+
+    # Visão sobre os primeiros 'tamanho' bytes do slab. Precisa ser liberada (release) antes de fechar().
+    def visao(self, classe, indice, tamanho):
+        inicio = indice * self.classes[classe]
+        return self._segmentos[classe].buf[inicio:inicio + tamanho]
+
+    # Desfaz o mapeamento dos segmentos neste processo.
+    def fechar(self):
+        for segmento in self._segmentos:
+            segmento.close()
+
+    # Fecha e remove os segmentos do sistema. Deve ser chamado por quem criou o pool, no fim.
+    def remover(self):
+        for segmento in self._segmentos:
+            segmento.close()
+            segmento.unlink()
@@ -0,0 +1,202 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/sockets/ajustes.py
+# DESCRIÇÃO: Perfis de ajuste das opções dos sockets do backend de Sockets e
+#            a medição do efeito de cada perfil na latência e na vazão.
+#
+#   padrao   -> as opções padrão do sistema (algoritmo de Nagle ligado).
+#   sem_nagle -> só TCP_NODELAY: cada escrita sai na hora, sem a chamada extra
+#               por leitura do QUICKACK. É o perfil do benchmark (backend/bench.py).
+#   latencia -> TCP_NODELAY (desliga o Nagle: cada escrita sai na hora) e
+#               TCP_QUICKACK (ACK imediato, sem o "delayed ACK" do receptor).
+#               No Linux o QUICKACK não é permanente, então é rearmado depois
+#               de cada leitura.
+#   vazao    -> buffers de envio e recepção maiores (SO_SNDBUF/SO_RCVBUF) e
+#               TCP_CORK: as escritas de uma rajada se acumulam em segmentos
+#               cheios, que só saem quando o remetente descarrega (ou o
+#               segmento enche).
+#
+# As opções TCP_* só valem para o transporte TCP; no AF_UNIX, só os buffers.
+# A recepção com recv_into num buffer reaproveitado (LeitorQuadros) também é
+# comparada aqui com o caminho que aloca um novo objeto bytes a cada recv().
+#
+# USO: python -m backend.sockets.ajustes [--perfis padrao sem_nagle latencia vazao]
+#                                        [--tamanhos 16 1024 65536] [--mensagens 2000]
+# -----------------------------------------------------------------------------
+
+import argparse  # Importa a biblioteca para ler as opções da linha de comando.
+import json  # Importa a biblioteca para emitir os resultados em JSON.
+import socket  # Importa a biblioteca de Sockets.
+import sys  # Importa a biblioteca do sistema para escrever na saída padrão.
+
+from backend.processos import METODOS_INICIO  # Métodos de início dos processos.
+from backend.sockets.protocolo import CABECALHO_QUADRO  # Cabeçalho dos quadros com prefixo de tamanho.
+
+# Perfis disponíveis: opções aplicadas a cada socket (None/False = padrão do sistema).
+PERFIS = {
+    "padrao": {"nodelay": False, "quickack": False, "buffer": None, "cork": False},
+    "sem_nagle": {"nodelay": True, "quickack": False, "buffer": None, "cork": False},
+    "latencia": {"nodelay": True, "quickack": True, "buffer": None, "cork": False},
+    "vazao": {"nodelay": False, "quickack": False, "buffer": 4 << 20, "cork": True},
+}
+
+# Modos de recepção comparados na medição.
+RECEPCOES = ["reaproveitar", "alocar"]
+
+# Pedaço máximo lido por recv() no caminho que aloca.
+PEDACO_RECV = 64 * 1024
+
+
+# Indica se o socket é TCP (as opções TCP_* não existem no AF_UNIX).
+def _eh_tcp(sock):
+    return sock.family in (socket.AF_INET, socket.AF_INET6)
+
+
+# Aplica o perfil 'nome' a um socket. Os buffers devem ser ajustados antes de connect()/listen(),
+# para valerem na negociação da janela do TCP; os sockets aceitos herdam as opções do de escuta.
+def aplicar_perfil(sock, nome="padrao"):
+    perfil = PERFIS[nome]
+    if perfil["buffer"]:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, perfil["buffer"])
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, perfil["buffer"])
+    if not _eh_tcp(sock):
+        return
+    if perfil["nodelay"]:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    rearmar_quickack(sock, nome)
+    if perfil["cork"] and hasattr(socket, "TCP_CORK"):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 1)
+
+
+# Religa o TCP_QUICKACK, que o Linux desliga sozinho; chamado depois de cada leitura no perfil de latência.
+def rearmar_quickack(sock, nome="padrao"):
+    if PERFIS[nome]["quickack"] and hasattr(socket, "TCP_QUICKACK") and _eh_tcp(sock):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+
+
+# Com TCP_CORK, envia na hora o que estiver acumulado (desliga e religa o cork). Chamado antes de o
+# remetente parar para esperar respostas, senão os dados só sairiam depois de 200 ms.
+def descarregar(sock, nome="padrao"):
+    if PERFIS[nome]["cork"] and hasattr(socket, "TCP_CORK") and _eh_tcp(sock):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 0)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 1)
+
+
+# Valores efetivos das opções de um socket, para os relatórios (o Linux dobra os buffers pedidos).
+def opcoes_efetivas(sock):
+    opcoes = {
+        "sndbuf": sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF),
+        "rcvbuf": sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF),
+    }
+    if _eh_tcp(sock):
+        opcoes["nodelay"] = bool(sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY))
+        if hasattr(socket, "TCP_CORK"):
+            opcoes["cork"] = bool(sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_CORK))
+    return opcoes
+
+
+class LeitorAlocando:
+    """Recepção de quadros com recv(), que aloca um novo objeto bytes a cada chamada.
+
+    Era o caminho antes do LeitorQuadros; fica aqui só para comparação, com a mesma interface.
+    """
+
+    def __init__(self, sock, perfil="padrao"):
+        self.sock = sock
+        self.perfil = perfil
+
+    def _receber_exato(self, tamanho):
+        partes = []
+        while tamanho:
+            parte = self.sock.recv(min(tamanho, PEDACO_RECV))
+            if not parte:
+                return None
+            rearmar_quickack(self.sock, self.perfil)
+            partes.append(parte)
+            tamanho -= len(parte)
+        return b"".join(partes)
+
+    def receber(self):
+        cabecalho = self._receber_exato(CABECALHO_QUADRO.size)
+        if cabecalho is None:
+            return None
+        (tamanho,) = CABECALHO_QUADRO.unpack(cabecalho)
+        dados = self._receber_exato(tamanho)
+        if dados is None:
+            raise ConnectionError("Conexão fechada antes de receber o quadro completo.")
+        return dados
+
+
+# Mede um ponto: latência de ida e volta (uma mensagem por vez) e vazão com pipelining, com o
+# perfil 'perfil' nos dois lados da conexão e a recepção escolhida no cliente.
+def executar_ponto(perfil, tamanho_payload, num_mensagens, transporte="tcp", recepcao="reaproveitar",
+                   metodo_inicio=None):
+    from backend.bench import resumir  # Importado aqui: o benchmark importa a demonstração, que importa este módulo.
+    from backend.sockets.logic import benchmark_eco, benchmark_pipeline
+
+    eco = resumir("eco", tamanho_payload, benchmark_eco(tamanho_payload, num_mensagens, transporte, metodo_inicio,
+                                                        perfil=perfil, recepcao=recepcao))
+    pipeline = resumir("pipeline", tamanho_payload,
+                       benchmark_pipeline(tamanho_payload, num_mensagens, transporte, metodo_inicio,
+                                          perfil=perfil, recepcao=recepcao))
+    return {
+        "perfil": perfil,
+        "recepcao": recepcao,
+        "transporte": transporte,
+        "tamanho_payload": tamanho_payload,
+        "mensagens": num_mensagens,
+        "eco_p50_us": eco["p50_us"],
+        "eco_p99_us": eco["p99_us"],
+        "eco_mensagens_por_s": eco["mensagens_por_s"],
+        "pipeline_mb_por_s": pipeline["mb_por_s"],
+        "pipeline_mensagens_por_s": pipeline["mensagens_por_s"],
+        "pipeline_p99_us": pipeline["p99_us"],
+    }
+
+
+# Lê as opções da linha de comando.
+def criar_parser():
+    from backend.sockets.transporte import TRANSPORTES  # Importado aqui: o transporte importa este módulo.
+
+    parser = argparse.ArgumentParser(description="Efeito dos perfis de ajuste dos sockets na latência e na vazão.")
+    parser.add_argument("--perfis", nargs="+", choices=list(PERFIS), default=list(PERFIS),
+                        help="Perfis a medir.")
+    parser.add_argument("--recepcao", nargs="+", choices=RECEPCOES, default=RECEPCOES,
+                        help="'reaproveitar': recv_into num buffer reaproveitado; 'alocar': recv() com um "
+                             "novo bytes a cada chamada.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[16, 1024, 65536, 1 << 20],
+                        help="Tamanhos de payload em bytes.")
+    parser.add_argument("--mensagens", type=int, default=2000, help="Mensagens em cada medição.")
+    parser.add_argument("--transporte", choices=TRANSPORTES, default="tcp",
+                        help="'tcp': loopback TCP; 'unix': AF_UNIX (só os buffers se aplicam).")
+    parser.add_argument("--metodo-inicio", choices=METODOS_INICIO, default=None,
+                        help="Como o processo servidor é criado (padrão: o da plataforma).")
+    parser.add_argument("--json", action="store_true",
+                        help="Emite um objeto JSON por linha em vez da tabela.")
+    return parser
+
+
+# Ponto de entrada da medição.
+def main(argv=None):
+    from backend.bench import MAX_BYTES_PADRAO, formatar_tamanho, mensagens_para_ponto
+
+    args = criar_parser().parse_args(argv)
+    if not args.json:
+        print(f"{'perfil':<10}{'recepção':<14}{'payload':>10}{'eco p50 (us)':>14}{'eco p99 (us)':>14}"
+              f"{'pipeline MB/s':>15}{'pipeline msgs/s':>17}", flush=True)
+    for tamanho in args.tamanhos:
+        num_mensagens = mensagens_para_ponto(tamanho, args.mensagens, MAX_BYTES_PADRAO)
+        for perfil in args.perfis:
+            for recepcao in args.recepcao:
+                resumo = executar_ponto(perfil, tamanho, num_mensagens, args.transporte, recepcao,
+                                        args.metodo_inicio)
+                if args.json:
+                    print(json.dumps(resumo), flush=True)
+                else:
+                    print(f"{perfil:<10}{recepcao:<14}{formatar_tamanho(tamanho):>10}{resumo['eco_p50_us']:>14.1f}"
+                          f"{resumo['eco_p99_us']:>14.1f}{resumo['pipeline_mb_por_s']:>15.1f}"
+                          f"{resumo['pipeline_mensagens_por_s']:>17.0f}", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/sockets/arquivo.py
+# DESCRIÇÃO: Modo --arquivo do backend de Sockets: o cliente envia um arquivo
+#            ao servidor, que o grava no destino, com a cópia feita pelo kernel
+#            (os.sendfile no envio, os.splice na recepção) ou em espaço de
+#            usuário (read() + sendall() e recv_into() + write()).
+#
+# Na conexão: [tamanho do arquivo (8 bytes)][conteúdo], e o servidor responde
+# com o total de bytes gravados (ver backend/transferencia.py). O cabeçalho é
+# lido com o tamanho exato, para nenhum byte do conteúdo ficar num buffer do
+# processo antes do splice.
+# -----------------------------------------------------------------------------
+
+import os  # Importa a biblioteca do sistema para o PID e os descritores de arquivo.
+
+# Socket de escuta e conexão dos transportes TCP e AF_UNIX.
+from backend.sockets.transporte import conectar, criar_socket_escuta, descrever_endereco, remover_endereco
+# Cópias pelo kernel e em espaço de usuário, e o progresso da transferência.
+from backend.transferencia import (
+    BLOCO_PADRAO, CABECALHO_ARQUIVO, Progresso, abrir_destino, enviar_copiando, enviar_sendfile, ler_exato,
+    receber_copiando, receber_splice,
+)
+from backend.processos import obter_contexto  # Método de início dos processos.
+from backend.telemetria import log_message  # Função de log compartilhada pelos backends.
+from backend.recursos import iniciar_medicao  # Recursos usados por cada papel, enviados no fim.
+
+# Descrição de cada tipo de cópia nos logs: (envio, recepção).
+DESCRICOES_COPIA = {
+    "kernel": ("os.sendfile", "os.splice (socket -> pipe -> arquivo)"),
+    "usuario": ("read() + sendall()", "recv_into() + write()"),
+}
+
+
+# Função do servidor no modo arquivo: recebe um arquivo pela conexão e o grava em 'destino'
+# (ou num arquivo temporário, apagado no fim).
+def processo_servidor_arquivo(conn_endereco, transporte, copia, destino=None, bloco=BLOCO_PADRAO):
+    pid = os.getpid()
+    source_id = f"SERVIDOR (PID: {pid})"
+    medicao = iniciar_medicao(source_id)
+
+    with criar_socket_escuta(transporte) as s:
+        endereco = s.getsockname()
+        log_message(source_id, f"PID: {pid} -> Escutando por conexões em {descrever_endereco(endereco)}")
+        # Entrega o endereço ao cliente. Isso também avisa que o servidor já está pronto.
+        conn_endereco.send(endereco)
+        conn_endereco.close()
+
+        conn, _ = s.accept()
+        with conn:
+            (total,) = CABECALHO_ARQUIVO.unpack(ler_exato(conn.fileno(), CABECALHO_ARQUIVO.size))
+            fd_destino, caminho_destino, temporario = abrir_destino(destino)
+            log_message(source_id, f"PID: {pid} -> Recebendo {total / 1e6:.1f} MB com {DESCRICOES_COPIA[copia][1]} "
+                                   f"em {caminho_destino}.")
+            progresso = Progresso(source_id, total, "recepcao")
+            try:
+                if copia == "kernel":
+                    recebidos = receber_splice(conn.fileno(), fd_destino, total, progresso, bloco)
+                else:
+                    recebidos = receber_copiando(conn.recv_into, fd_destino, total, progresso, bloco)
+            finally:
+                os.close(fd_destino)
+            relatorio = progresso.concluir()
+            # Confirma ao cliente quantos bytes foram gravados.
+            conn.sendall(CABECALHO_ARQUIVO.pack(recebidos))
+
+    log_message(source_id, f"PID: {pid} -> Recebeu {recebidos / 1e6:.1f} MB em {relatorio['duracao_s']:.2f} s "
+                           f"({relatorio['mb_por_s_medio']:.1f} MB/s).")
+    if temporario:
+        os.unlink(caminho_destino)
+    remover_endereco(endereco)
+    log_message(source_id, f"PID: {pid} -> Encerrado.")
+    medicao.encerrar()
+
+
+# Função do cliente no modo arquivo: envia o arquivo 'caminho' ao servidor.
+def processo_cliente_arquivo(conn_endereco, caminho, copia, bloco=BLOCO_PADRAO):
+    pid = os.getpid()
+    source_id = f"CLIENTE (PID: {pid})"
+    medicao = iniciar_medicao(source_id)
+
+    log_message(source_id, f"PID: {pid} -> Iniciado.")
+    # Espera o servidor entregar o endereço em que está escutando.
+    endereco = conn_endereco.recv()
+    conn_endereco.close()
+
+    fd_arquivo = os.open(caminho, os.O_RDONLY)
+    try:
+        total = os.fstat(fd_arquivo).st_size
+        with conectar(endereco) as s:
+            log_message(source_id, f"PID: {pid} -> Enviando {caminho} ({total / 1e6:.1f} MB) com "
+                                   f"{DESCRICOES_COPIA[copia][0]}.")
+            s.sendall(CABECALHO_ARQUIVO.pack(total))
+            progresso = Progresso(source_id, total, "envio")
+            if copia == "kernel":
+                enviar_sendfile(s.fileno(), fd_arquivo, total, progresso, bloco)
+            else:
+                enviar_copiando(fd_arquivo, s.sendall, total, progresso, bloco)
+            relatorio = progresso.concluir()
+            # Espera o servidor confirmar quantos bytes gravou.
+            (confirmados,) = CABECALHO_ARQUIVO.unpack(ler_exato(s.fileno(), CABECALHO_ARQUIVO.size))
+    finally:
+        os.close(fd_arquivo)
+
+    log_message(source_id, f"PID: {pid} -> Enviou {relatorio['bytes'] / 1e6:.1f} MB em {relatorio['duracao_s']:.2f} s "
+                           f"({relatorio['mb_por_s_medio']:.1f} MB/s); o servidor confirmou {confirmados} bytes.")
+    medicao.encerrar()
+
+
+# Executa a demonstração do modo arquivo: um servidor que recebe e um cliente que envia 'caminho'.
+def demonstrar(caminho, transporte="tcp", copia="kernel", destino=None, metodo_inicio=None, bloco=BLOCO_PADRAO):
+    contexto = obter_contexto(metodo_inicio)
+    # Pipe pelo qual o servidor entrega ao cliente o endereço em que está escutando.
+    conn_endereco_cliente, conn_endereco_servidor = contexto.Pipe(duplex=False)
+    servidor = contexto.Process(target=processo_servidor_arquivo,
+                                args=(conn_endereco_servidor, transporte, copia, destino, bloco))
+    cliente = contexto.Process(target=processo_cliente_arquivo, args=(conn_endereco_cliente, caminho, copia, bloco))
+    servidor.start()
+    cliente.start()
+    servidor.join()
+    cliente.join()
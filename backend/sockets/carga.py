@@ -0,0 +1,147 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/sockets/carga.py
+# DESCRIÇÃO: Gerador de carga para o servidor de eco concorrente. Lança N
+#            processos clientes, cada um com várias conexões simultâneas, e
+#            mede como a vazão e a latência escalam com o número de conexões
+#            e de processos servidores (núcleos).
+#
+# USO: python -m backend.sockets.carga [--transportes tcp unix] [--servidores 1 2] [--clientes 1 4]
+#                                      [--conexoes 1 50] [--mensagens 200]
+# -----------------------------------------------------------------------------
+
+import argparse  # Importa a biblioteca para ler as opções da linha de comando.
+import json  # Importa a biblioteca para emitir os resultados em JSON.
+import multiprocessing as mp  # Importa a biblioteca para criar e gerenciar processos.
+import sys  # Importa a biblioteca do sistema para escrever na saída padrão.
+import time  # Importa a biblioteca de tempo para medir as latências.
+
+from backend.bench import percentil  # Reaproveita o cálculo de percentis do benchmark.
+from backend.sockets.protocolo import LeitorQuadros, enviar_quadro, encerrar_envio
+from backend.sockets.servidor_concorrente import criar_socket_escuta, processo_servidor_concorrente
+from backend.sockets.transporte import TRANSPORTES, conectar, remover_endereco
+
+
+# Função executada por cada processo cliente: abre 'num_conexoes' conexões e, em cada rodada,
+# envia uma mensagem por todas elas antes de ler as respostas (todas ficam em voo ao mesmo tempo).
+def processo_cliente_carga(endereco, num_conexoes, num_mensagens, tamanho_payload, barreira, conn_resultado):
+    conexoes = [conectar(endereco) for _ in range(num_conexoes)]
+    leitores = [LeitorQuadros(s) for s in conexoes]
+    payload = b"x" * tamanho_payload
+    envios = [0] * num_conexoes
+    latencias_ns = []
+
+    # Todos os clientes começam juntos, depois de todas as conexões estarem abertas.
+    barreira.wait()
+    for _ in range(num_mensagens):
+        for i, s in enumerate(conexoes):
+            envios[i] = time.perf_counter_ns()
+            enviar_quadro(s, payload)
+        for i, leitor in enumerate(leitores):
+            leitor.receber()
+            latencias_ns.append(time.perf_counter_ns() - envios[i])
+
+    for s in conexoes:
+        encerrar_envio(s)
+        s.close()
+    conn_resultado.send(latencias_ns)
+    conn_resultado.close()
+
+
+# Executa um ponto da varredura e devolve o resumo com vazão e latência agregadas.
+def executar_ponto(num_servidores, num_clientes, num_conexoes, num_mensagens, tamanho_payload, transporte="tcp"):
+    # O socket de escuta é criado aqui e herdado por todos os processos servidores.
+    sock_escuta = criar_socket_escuta(transporte)
+    endereco = sock_escuta.getsockname()
+    servidores = []
+    for _ in range(num_servidores):
+        conn_parada, conn_parada_filho = mp.Pipe()
+        p = mp.Process(target=processo_servidor_concorrente, args=(sock_escuta, conn_parada_filho))
+        p.start()
+        conn_parada_filho.close()
+        servidores.append((p, conn_parada))
+    sock_escuta.close()
+
+    # A barreira inclui o processo principal, que marca o início da medição.
+    barreira = mp.Barrier(num_clientes + 1)
+    clientes = []
+    for _ in range(num_clientes):
+        conn_resultado, conn_resultado_filho = mp.Pipe(duplex=False)
+        p = mp.Process(target=processo_cliente_carga,
+                       args=(endereco, num_conexoes, num_mensagens, tamanho_payload, barreira, conn_resultado_filho))
+        p.start()
+        conn_resultado_filho.close()
+        clientes.append((p, conn_resultado))
+
+    barreira.wait()
+    inicio = time.perf_counter_ns()
+    latencias_ns = []
+    for p, conn_resultado in clientes:
+        latencias_ns.extend(conn_resultado.recv())
+        p.join()
+    duracao_s = (time.perf_counter_ns() - inicio) / 1e9
+
+    # Pede a parada dos servidores e recolhe os contadores de cada um.
+    for p, conn_parada in servidores:
+        conn_parada.send("parar")
+        conn_parada.recv()
+        p.join()
+    remover_endereco(endereco)
+
+    latencias_ns.sort()
+    total = len(latencias_ns)
+    return {
+        "transporte": transporte,
+        "servidores": num_servidores,
+        "clientes": num_clientes,
+        "conexoes": num_clientes * num_conexoes,
+        "tamanho_payload": tamanho_payload,
+        "mensagens": total,
+        "duracao_s": duracao_s,
+        "mensagens_por_s": total / duracao_s,
+        "mb_por_s": total * tamanho_payload / duracao_s / 1e6,
+        "p50_us": percentil(latencias_ns, 50) / 1e3,
+        "p99_us": percentil(latencias_ns, 99) / 1e3,
+    }
+
+
+# Lê as opções da linha de comando.
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Gerador de carga para o servidor de eco concorrente.")
+    parser.add_argument("--transportes", nargs="+", choices=TRANSPORTES, default=["tcp"],
+                        help="Transportes a testar: 'tcp' (loopback) e/ou 'unix' (AF_UNIX).")
+    parser.add_argument("--servidores", nargs="+", type=int, default=[1],
+                        help="Números de processos servidores a testar (compartilham o socket de escuta).")
+    parser.add_argument("--clientes", nargs="+", type=int, default=[1, 4],
+                        help="Números de processos clientes a testar.")
+    parser.add_argument("--conexoes", nargs="+", type=int, default=[1, 25, 100],
+                        help="Conexões simultâneas abertas por cada processo cliente.")
+    parser.add_argument("--mensagens", type=int, default=200,
+                        help="Mensagens enviadas por cada conexão.")
+    parser.add_argument("--tamanho", type=int, default=64,
+                        help="Tamanho do payload de cada mensagem em bytes.")
+    parser.add_argument("--json", action="store_true",
+                        help="Emite um objeto JSON por linha em vez da tabela.")
+    return parser
+
+
+# Ponto de entrada do gerador de carga.
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    if not args.json:
+        print(f"{'transporte':<12}{'servidores':>10}{'clientes':>10}{'conexões':>10}{'msgs/s':>12}{'MB/s':>10}"
+              f"{'p50 (us)':>12}{'p99 (us)':>12}", flush=True)
+    pontos = [(t, s, c, n) for t in args.transportes for s in args.servidores
+              for c in args.clientes for n in args.conexoes]
+    for transporte, num_servidores, num_clientes, num_conexoes in pontos:
+        resumo = executar_ponto(num_servidores, num_clientes, num_conexoes, args.mensagens, args.tamanho, transporte)
+        if args.json:
+            print(json.dumps(resumo), flush=True)
+        else:
+            print(f"{resumo['transporte']:<12}{resumo['servidores']:>10}{resumo['clientes']:>10}"
+                  f"{resumo['conexoes']:>10}{resumo['mensagens_por_s']:>12.0f}{resumo['mb_por_s']:>10.2f}"
+                  f"{resumo['p50_us']:>12.1f}{resumo['p99_us']:>12.1f}", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,127 +1,394 @@
-# -----------------------------------------------------------------------------
-# ARQUIVO: backend/sockets/logic.py
-# DESCRIÇÃO: Lógica de comunicação cliente-servidor usando Sockets.
-# -----------------------------------------------------------------------------
-
-import multiprocessing as mp  # Importa a biblioteca para criar e gerenciar processos.
-import socket  # Importa a biblioteca de Sockets para comunicação em rede.
-import time  # Importa a biblioteca de tempo para adicionar pequenas pausas.
-import os  # Importa a biblioteca do sistema para obter o ID do processo (PID).
-import json  # Importa a biblioteca para formatar os logs em JSON.
-import sys  # Importa a biblioteca para ler argumentos da linha de comando.
-
-# Define o endereço do host (localhost) e a porta para a comunicação.
-HOST = '127.0.0.1'  # Endereço de loopback, significa "este computador".
-PORT = 65432       # Porta a ser usada. Acima de 1023 para não precisar de privilégios.
-
-# Função para criar e imprimir logs no formato JSON esperado pela GUI.
-def log_message(source, message):
-    # Cria um dicionário (estrutura de dados) para o log.
-    log_entry = {
-        "source": source,  # A origem da mensagem (ex: "SERVIDOR").
-        "payload": {"message": message}  # O conteúdo da mensagem.
-    }
-    # Converte o dicionário para uma string JSON e a imprime na saída padrão.
-    print(json.dumps(log_entry), flush=True)
-
-# Função que define o comportamento do processo Servidor.
-def processo_servidor():
-    # Obtém o ID deste processo.
-    pid = os.getpid()
-    # Define um nome de origem para os logs.
-    source_id = f"SERVIDOR (PID: {pid})"
-
-    # Cria um objeto socket. AF_INET é para IPv4, SOCK_STREAM é para TCP.
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        # Adiciona esta opção para permitir que o endereço seja reutilizado imediatamente.
-        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        # Associa o socket ao endereço (host) e à porta definidos.
-        s.bind((HOST, PORT))
-        # Coloca o socket em modo de escuta, aguardando conexões.
-        s.listen()
-        # Loga que o servidor está pronto e escutando.
-        log_message(source_id, f"PID: {pid} -> Escutando por conexões em {HOST}:{PORT}")
-
-        # Aceita uma conexão. A execução fica bloqueada aqui até um cliente se conectar.
-        # 'conn' é o novo socket para comunicar com o cliente, 'addr' é o endereço do cliente.
-        conn, addr = s.accept()
-        # Usa um bloco 'with' para garantir que a conexão 'conn' seja fechada no final.
-        with conn:
-            # Loga que uma conexão foi aceita.
-            log_message(source_id, f"PID: {pid} -> Conexão aceita de {addr}")
-            
-            # Recebe dados do cliente (até 1024 bytes). Fica bloqueado até receber algo.
-            data = conn.recv(1024)
-            # Decodifica os bytes recebidos para uma string.
-            mensagem_recebida = data.decode('utf-8')
-            # Loga a mensagem que foi recebida.
-            log_message(source_id, f"PID: {pid} -> Recebeu: '{mensagem_recebida}'")
-
-            # Prepara uma resposta de "eco".
-            resposta = f"Eco do servidor: {mensagem_recebida}"
-            # Loga a resposta que será enviada.
-            log_message(source_id, f"Enviando resposta: '{resposta}'")
-            # Envia a resposta de volta para o cliente, codificando a string para bytes.
-            conn.sendall(resposta.encode('utf-8'))
-            
-    # Loga que o servidor está encerrando.
-    log_message(source_id, f"PID: {pid} -> Encerrado.")
-
-
-# Função que define o comportamento do processo Cliente.
-def processo_cliente(msg):
-    # Obtém o ID deste processo.
-    pid = os.getpid()
-    # Define um nome de origem para os logs.
-    source_id = f"CLIENTE (PID: {pid})"
-    
-    # Loga que o cliente foi iniciado.
-    log_message(source_id, f"PID: {pid} -> Iniciado.")
-    # Adiciona uma pausa de 1 segundo para dar tempo ao servidor de iniciar primeiro.
-    time.sleep(1)
-
-    # Cria um objeto socket, igual ao do servidor.
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        # Loga que está tentando se conectar ao servidor.
-        log_message(source_id, f"PID: {pid} -> Conectando a {HOST}:{PORT}...")
-        # Tenta se conectar ao servidor no endereço e porta especificados.
-        s.connect((HOST, PORT))
-        # Loga que a conexão foi bem-sucedida.
-        log_message(source_id, f"PID: {pid} -> Conexão estabelecida.")
-
-        # Loga a mensagem que será enviada.
-        log_message(source_id, f"PID: {pid} -> Enviando mensagem: '{msg}'")
-        # Envia a mensagem (recebida da GUI), codificando-a para bytes.
-        s.sendall(msg.encode('utf-8'))
-
-        # Espera pela resposta do servidor (até 1024 bytes).
-        resposta_data = s.recv(1024)
-        # Loga a resposta recebida, decodificando-a de volta para string.
-        log_message(source_id, f"PID: {pid} -> Resposta recebida: '{resposta_data.decode('utf-8')}'")
-        
-    # Loga que o cliente está encerrando.
-    log_message(source_id, f"PID: {pid} -> Encerrado.")
-
-
-# Ponto de entrada do script.
-if __name__ == "__main__":
-    # Obtém a mensagem da GUI a partir dos argumentos da linha de comando.
-    mensagem_da_gui = sys.argv[1]
-
-    # Cria um processo para executar a função 'processo_servidor'.
-    servidor = mp.Process(target=processo_servidor)
-    # Cria um processo para executar a função 'processo_cliente', passando a mensagem.
-    cliente = mp.Process(target=processo_cliente, args=(mensagem_da_gui,))
-
-    # Inicia a execução do processo servidor.
-    servidor.start()
-    # Inicia a execução do processo cliente.
-    cliente.start()
-
-    # O processo principal espera que o processo servidor termine.
-    servidor.join()
-    # O processo principal espera que o processo cliente termine.
-    cliente.join()
-    
-    # Loga o fim da demonstração.
-    log_message("MAIN", "Demonstração com Sockets finalizada.")
\ No newline at end of file
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/sockets/logic.py
+# DESCRIÇÃO: Lógica de comunicação cliente-servidor usando Sockets.
+# -----------------------------------------------------------------------------
+
+import multiprocessing as mp  # Importa a biblioteca para criar e gerenciar processos.
+import time  # Importa a biblioteca de tempo para adicionar pequenas pausas.
+import os  # Importa a biblioteca do sistema para obter o ID do processo (PID).
+import argparse  # Importa a biblioteca para ler as opções da linha de comando.
+import threading  # Importa a biblioteca para receber respostas enquanto o envio continua.
+import collections  # Importa a fila (deque) usada para casar envios e respostas no benchmark.
+from multiprocessing.connection import Connection  # Tipo das pontas de Pipe (entrega do endereço).
+
+# Protocolo de quadros com prefixo de tamanho (várias mensagens por conexão, de qualquer tamanho).
+from backend.sockets.protocolo import (
+    CABECALHO_QUADRO, TAMANHO_BUFFER_INICIAL, LeitorQuadros, encerrar_envio, enviar_quadro,
+)
+# Servidor de eco concorrente (selectors), que atende vários clientes em um único processo.
+from backend.sockets import servidor_concorrente
+# Modo arquivo: o cliente envia um arquivo ao servidor, com os.sendfile ou sendall.
+from backend.sockets import arquivo
+from backend.transferencia import BLOCO_PADRAO, COPIAS
+# Perfis de ajuste das opções dos sockets (Nagle, ACK imediato, buffers e cork).
+from backend.sockets.ajustes import PERFIS, LeitorAlocando, descarregar, opcoes_efetivas, rearmar_quickack
+# Transportes TCP (porta livre escolhida pelo sistema) e AF_UNIX.
+from backend.sockets.transporte import (
+    TRANSPORTES, conectar, criar_socket_escuta, descrever_endereco, remover_endereco,
+)
+# Método de início dos processos e pool de processos pré-iniciados.
+from backend.processos import METODOS_INICIO, iniciar_processo, obter_contexto
+# Payload de matriz NumPy do benchmark, recebido direto numa matriz pré-alocada (o NumPy é opcional).
+from backend.matrizes import LeitorMatriz, criar_matriz
+
+# Função de log compartilhada pelos backends: registros binários no canal de telemetria da GUI,
+# ou linhas JSON na saída padrão quando executado pela linha de comando.
+from backend.telemetria import log_message
+# Recursos usados por cada papel (CPU, RSS, trocas de contexto, chamadas de E/S), enviados no fim.
+from backend.recursos import iniciar_medicao
+# Marcas de rastreio de cada envio e recebimento (ligadas com IPC_RASTRO=1).
+from backend.rastreio import (
+    codificar_texto, criar_rastro, decodificar_texto, enviar_rastreado, receber_rastreado,
+)
+
+# Número máximo de mensagens do fluxo registradas individualmente no log de cada processo.
+MAX_MENSAGENS_LOGADAS = 5
+
+# Função que define o comportamento do processo Servidor.
+def processo_servidor(conn_endereco, transporte="tcp", perfil="padrao"):
+    # Obtém o ID deste processo.
+    pid = os.getpid()
+    # Define um nome de origem para os logs.
+    source_id = f"SERVIDOR (PID: {pid})"
+    medicao = iniciar_medicao(source_id, contar_es=False)
+
+    # Cria o socket de escuta do transporte escolhido: no TCP, numa porta livre escolhida pelo
+    # sistema (sem colisão entre execuções); no AF_UNIX, num arquivo de socket temporário.
+    with criar_socket_escuta(transporte, perfil=perfil) as s:
+        endereco = s.getsockname()
+        # Loga que o servidor está pronto e escutando.
+        log_message(source_id, f"PID: {pid} -> Escutando por conexões em {descrever_endereco(endereco)}")
+        # Entrega o endereço ao cliente. Isso também avisa que o servidor já está pronto.
+        conn_endereco.send(endereco)
+        conn_endereco.close()
+
+        # Aceita uma conexão. A execução fica bloqueada aqui até um cliente se conectar.
+        # 'conn' é o novo socket para comunicar com o cliente, 'addr' é o endereço do cliente.
+        conn, addr = s.accept()
+        # Usa um bloco 'with' para garantir que a conexão 'conn' seja fechada no final.
+        with conn:
+            # Loga que uma conexão foi aceita.
+            log_message(source_id, f"PID: {pid} -> Conexão aceita de {addr} (perfil '{perfil}': "
+                                   f"{opcoes_efetivas(conn)})")
+
+            # A conexão é persistente: o servidor responde a cada quadro recebido até o cliente
+            # encerrar o envio. Cada quadro traz seu tamanho, então nada é truncado.
+            leitor = LeitorQuadros(conn)
+            # Rastros de cada sentido da conexão (None se o rastreio estiver desligado).
+            rastro_ida = criar_rastro("cliente->servidor")
+            rastro_volta = criar_rastro("servidor->cliente")
+            total = 0
+            while True:
+                # Recebe o próximo quadro e o decodifica para uma string (None quando o cliente encerra o envio).
+                mensagem_recebida = receber_rastreado(rastro_ida, leitor.receber, decodificar_texto)
+                if mensagem_recebida is None:
+                    break
+                rearmar_quickack(conn, perfil)
+                total += 1
+                # Prepara uma resposta de "eco" com o conteúdo recebido.
+                resposta = "Eco do servidor: " + mensagem_recebida
+                if total <= MAX_MENSAGENS_LOGADAS:
+                    # Loga a mensagem que foi recebida e a resposta que será enviada.
+                    log_message(source_id, f"PID: {pid} -> Recebeu: '{mensagem_recebida}'")
+                    log_message(source_id, f"Enviando resposta: '{resposta}'")
+                # Envia a resposta de volta para o cliente, em um quadro.
+                enviar_rastreado(rastro_volta, resposta, codificar_texto, lambda dados: enviar_quadro(conn, dados))
+                # Com cork, as respostas se acumulam enquanto houver quadros já recebidos para responder.
+                if not leitor.tem_quadro():
+                    descarregar(conn, perfil)
+
+            log_message(source_id, f"PID: {pid} -> Cliente encerrou o envio após {total} mensagem(ns).")
+
+    # Remove o arquivo do socket AF_UNIX (no TCP não há nada a remover).
+    remover_endereco(endereco)
+    # Loga que o servidor está encerrando.
+    log_message(source_id, f"PID: {pid} -> Encerrado.")
+    medicao.encerrar(total)
+
+
+# Lê as respostas do servidor em uma thread separada, para que o envio não precise esperar
+# cada resposta (pipelining). Libera uma vaga na janela a cada resposta recebida.
+def receber_respostas(s, janela, quantidade, source_id, pid, rastro=None, perfil="padrao"):
+    leitor = LeitorQuadros(s)
+    for recebidas in range(1, quantidade + 1):
+        # Recebe a resposta e a decodifica de volta para string.
+        resposta = receber_rastreado(rastro, leitor.receber, decodificar_texto)
+        if resposta is None:
+            log_message(source_id, f"PID: {pid} -> Conexão fechada pelo servidor antes de todas as respostas.")
+            return
+        rearmar_quickack(s, perfil)
+        janela.release()
+        if recebidas <= MAX_MENSAGENS_LOGADAS:
+            # Loga a resposta recebida.
+            log_message(source_id, f"PID: {pid} -> Resposta recebida: '{resposta}'")
+    log_message(source_id, f"PID: {pid} -> {quantidade} resposta(s) recebida(s).")
+
+
+# Função que define o comportamento do processo Cliente.
+# 'endereco' é o endereço do servidor ou uma ponta de Pipe pela qual o servidor vai entregá-lo.
+# Com 'rastrear', as mensagens são rastreadas (se IPC_RASTRO=1); o servidor concorrente não
+# rastreia as suas, então os clientes dele também não.
+def processo_cliente(endereco, msg, repeticoes=1, janela=8, rastrear=True, perfil="padrao"):
+    # Obtém o ID deste processo.
+    pid = os.getpid()
+    # Define um nome de origem para os logs.
+    source_id = f"CLIENTE (PID: {pid})"
+    medicao = iniciar_medicao(source_id, contar_es=False)
+    
+    # Loga que o cliente foi iniciado.
+    log_message(source_id, f"PID: {pid} -> Iniciado.")
+    # Espera o servidor entregar o endereço em que está escutando (em vez de uma pausa fixa).
+    if isinstance(endereco, Connection):
+        conn_endereco = endereco
+        endereco = conn_endereco.recv()
+        conn_endereco.close()
+
+    # Loga que está tentando se conectar ao servidor.
+    log_message(source_id, f"PID: {pid} -> Conectando a {descrever_endereco(endereco)}...")
+    # Conecta ao servidor no endereço recebido (TCP ou AF_UNIX).
+    with conectar(endereco, perfil) as s:
+        # Loga que a conexão foi bem-sucedida.
+        log_message(source_id, f"PID: {pid} -> Conexão estabelecida.")
+
+        # Rastros de cada sentido da conexão (None se o rastreio estiver desligado).
+        rastro_ida = criar_rastro("cliente->servidor") if rastrear else None
+        rastro_volta = criar_rastro("servidor->cliente") if rastrear else None
+
+        # A janela limita quantas mensagens podem estar "em voo" (enviadas e ainda sem resposta).
+        vagas = threading.Semaphore(janela)
+        receptor = threading.Thread(target=receber_respostas,
+                                    args=(s, vagas, repeticoes, source_id, pid, rastro_volta, perfil))
+        receptor.start()
+
+        # Loga a mensagem que será enviada.
+        log_message(source_id, f"PID: {pid} -> Enviando mensagem: '{msg}' ({repeticoes}x, janela de {janela})")
+        # Codifica a mensagem (recebida da GUI) e a envia em quadros pela mesma conexão.
+        for _ in range(repeticoes):
+            # Com a janela cheia, o que estiver acumulado pelo cork sai antes de esperar as respostas.
+            if not vagas.acquire(blocking=False):
+                descarregar(s, perfil)
+                vagas.acquire()
+            enviar_rastreado(rastro_ida, msg, codificar_texto, lambda dados: enviar_quadro(s, dados))
+        # Avisa o servidor que não há mais mensagens; a leitura das respostas continua aberta.
+        encerrar_envio(s)
+
+        # Espera a thread receber todas as respostas.
+        receptor.join()
+        
+    # Loga que o cliente está encerrando.
+    log_message(source_id, f"PID: {pid} -> Encerrado.")
+    medicao.encerrar(repeticoes)
+
+
+# Função executada pelo servidor durante o benchmark: devolve (eco) cada quadro recebido.
+def processo_servidor_eco(conn_endereco, transporte, perfil="padrao"):
+    with criar_socket_escuta(transporte, perfil=perfil) as s:
+        # Informa ao processo que mede o endereço escolhido.
+        endereco = s.getsockname()
+        conn_endereco.send(endereco)
+        conn_endereco.close()
+
+        conn, _ = s.accept()
+        with conn:
+            leitor = LeitorQuadros(conn)
+            for dados in leitor:
+                rearmar_quickack(conn, perfil)
+                enviar_quadro(conn, dados)
+                if not leitor.tem_quadro():
+                    descarregar(conn, perfil)
+    remover_endereco(endereco)
+
+
+# Inicia o servidor de eco do benchmark (num processo novo ou do pool) e devolve (processo, endereço).
+def iniciar_servidor_eco(transporte, metodo_inicio=None, pool=None, perfil="padrao"):
+    conn_endereco, conn_endereco_filho = mp.Pipe()
+    servidor = iniciar_processo(processo_servidor_eco, (conn_endereco_filho, transporte, perfil), metodo_inicio, pool)
+    conn_endereco_filho.close()
+    # Espera o servidor informar o endereço em que está escutando.
+    endereco = conn_endereco.recv()
+    conn_endereco.close()
+    return servidor, endereco
+
+
+# Cria o leitor de quadros do cliente no benchmark: recv_into num buffer reaproveitado ('reaproveitar')
+# ou recv() com um novo objeto bytes a cada chamada ('alocar', para comparação).
+def criar_leitor_benchmark(s, tamanho_payload, recepcao="reaproveitar", perfil="padrao"):
+    if recepcao == "alocar":
+        return LeitorAlocando(s, perfil)
+    return LeitorQuadros(s, max(TAMANHO_BUFFER_INICIAL, tamanho_payload + CABECALHO_QUADRO.size))
+
+
+# Mede o tempo de ida e volta (RTT) de 'num_mensagens' mensagens de 'tamanho_payload' bytes por TCP,
+# uma de cada vez, sobre uma única conexão persistente com quadros. 'perfil' ajusta as opções dos
+# sockets dos dois lados (backend/sockets/ajustes.py). Com carga="matriz", o payload é uma matriz
+# NumPy de float64: sai por sendmsg sem cópia e a resposta volta direto numa matriz pré-alocada.
+def benchmark_eco(tamanho_payload, num_mensagens, transporte="tcp", metodo_inicio=None, pool=None,
+                  perfil="padrao", recepcao="reaproveitar", carga="bytes"):
+    # Sem o NumPy, o modo "matriz" falha aqui, antes de o servidor ser iniciado.
+    matriz = criar_matriz(tamanho_payload) if carga == "matriz" else None
+    servidor, endereco = iniciar_servidor_eco(transporte, metodo_inicio, pool, perfil)
+
+    # Visão em bytes da matriz: len() de uma ndarray conta elementos, não bytes.
+    payload = memoryview(matriz).cast('B') if matriz is not None else b"x" * tamanho_payload
+    latencias_ns = []
+
+    with conectar(endereco, perfil) as s:
+        if matriz is not None:
+            leitor = LeitorMatriz(s, matriz.shape, matriz.dtype)
+        else:
+            leitor = criar_leitor_benchmark(s, tamanho_payload, recepcao, perfil)
+        inicio = time.perf_counter_ns()
+        for _ in range(num_mensagens):
+            t0 = time.perf_counter_ns()
+            enviar_quadro(s, payload)
+            descarregar(s, perfil)
+            leitor.receber()
+            rearmar_quickack(s, perfil)
+            latencias_ns.append(time.perf_counter_ns() - t0)
+        duracao_ns = time.perf_counter_ns() - inicio
+        encerrar_envio(s)
+
+    servidor.join()
+    return {"latencias_ns": latencias_ns, "duracao_ns": duracao_ns}
+
+
+# Número de mensagens em voo usado no benchmark com pipelining.
+JANELA_BENCHMARK = 32
+
+# Lê as respostas do benchmark com pipelining, medindo a latência de cada mensagem
+# desde o seu envio (os instantes de envio chegam pela fila 'enviados').
+def receber_respostas_benchmark(s, janela, enviados, num_mensagens, tamanho_payload, latencias_ns,
+                                recepcao="reaproveitar", perfil="padrao"):
+    leitor = criar_leitor_benchmark(s, tamanho_payload, recepcao, perfil)
+    for _ in range(num_mensagens):
+        leitor.receber()
+        rearmar_quickack(s, perfil)
+        latencias_ns.append(time.perf_counter_ns() - enviados.popleft())
+        janela.release()
+
+
+# Mede vazão e latência com pipelining: até JANELA_BENCHMARK mensagens ficam em voo ao mesmo
+# tempo na mesma conexão, enquanto uma thread separada recebe as respostas.
+def benchmark_pipeline(tamanho_payload, num_mensagens, transporte="tcp", metodo_inicio=None, pool=None,
+                       perfil="padrao", recepcao="reaproveitar"):
+    servidor, endereco = iniciar_servidor_eco(transporte, metodo_inicio, pool, perfil)
+
+    payload = b"x" * tamanho_payload
+    latencias_ns = []
+    enviados = collections.deque()
+    janela = threading.Semaphore(JANELA_BENCHMARK)
+
+    with conectar(endereco, perfil) as s:
+        receptor = threading.Thread(target=receber_respostas_benchmark,
+                                    args=(s, janela, enviados, num_mensagens, tamanho_payload, latencias_ns,
+                                          recepcao, perfil))
+        inicio = time.perf_counter_ns()
+        receptor.start()
+        for _ in range(num_mensagens):
+            # Com a janela cheia, o que estiver acumulado pelo cork sai antes de esperar as respostas.
+            if not janela.acquire(blocking=False):
+                descarregar(s, perfil)
+                janela.acquire()
+            enviados.append(time.perf_counter_ns())
+            enviar_quadro(s, payload)
+        descarregar(s, perfil)
+        receptor.join()
+        duracao_ns = time.perf_counter_ns() - inicio
+        encerrar_envio(s)
+
+    servidor.join()
+    return {"latencias_ns": latencias_ns, "duracao_ns": duracao_ns}
+
+
+# Executa a demonstração com as opções de 'argv' (ou da linha de comando). Também é chamada
+# pelos trabalhadores do daemon (backend/daemon.py), que já têm este módulo importado.
+def main(argv=None):
+    # Lê a mensagem da GUI e as opções do fluxo a partir dos argumentos da linha de comando.
+    parser = argparse.ArgumentParser(description="Demonstração de IPC com Sockets.")
+    parser.add_argument("mensagem", help="Mensagem enviada pelo cliente ao servidor.")
+    parser.add_argument("--repeticoes", type=int, default=1,
+                        help="Quantas vezes o cliente envia a mensagem pela mesma conexão.")
+    parser.add_argument("--janela", type=int, default=8,
+                        help="Quantas mensagens podem ser enviadas antes de chegar a primeira resposta.")
+    parser.add_argument("--modo", choices=["simples", "concorrente"], default="simples",
+                        help="'simples': um servidor atende um cliente; "
+                             "'concorrente': um servidor com selectors atende vários clientes.")
+    parser.add_argument("--clientes", type=int, default=1,
+                        help="No modo 'concorrente', quantos processos clientes se conectam ao servidor.")
+    parser.add_argument("--transporte", choices=TRANSPORTES, default="tcp",
+                        help="'tcp': loopback TCP numa porta livre; 'unix': Unix domain socket (AF_UNIX).")
+    parser.add_argument("--perfil", choices=list(PERFIS), default="padrao",
+                        help="Ajuste das opções dos sockets: 'sem_nagle' (TCP_NODELAY), 'latencia' (TCP_NODELAY "
+                             "e TCP_QUICKACK) ou 'vazao' (buffers maiores e TCP_CORK); ver backend/sockets/ajustes.py.")
+    parser.add_argument("--metodo-inicio", choices=METODOS_INICIO, default=None,
+                        help="Como os processos servidor e cliente são criados (padrão: o da plataforma).")
+    parser.add_argument("--arquivo", default=None,
+                        help="Envia este arquivo em vez da mensagem, gravando-o no destino (a mensagem não é usada).")
+    parser.add_argument("--copia", choices=COPIAS, default=COPIAS[0],
+                        help="Com --arquivo: 'kernel' (os.sendfile e os.splice) ou 'usuario' (sendall e recv_into).")
+    parser.add_argument("--destino", default=None,
+                        help="Com --arquivo, onde gravar o arquivo recebido (padrão: um temporário, apagado no fim).")
+    parser.add_argument("--bloco", type=int, default=BLOCO_PADRAO >> 10,
+                        help="Com --arquivo, tamanho de cada bloco transferido, em KB.")
+    args = parser.parse_args(argv)
+    # Contexto do multiprocessing com o método de início escolhido.
+    contexto = obter_contexto(args.metodo_inicio)
+
+    # Modo arquivo: o conteúdo de um arquivo no lugar da mensagem.
+    if args.arquivo:
+        arquivo.demonstrar(args.arquivo, args.transporte, args.copia, args.destino, args.metodo_inicio,
+                           args.bloco << 10)
+        log_message("MAIN", "Demonstração com Sockets finalizada.")
+        return
+
+    if args.modo == "concorrente":
+        # O socket de escuta é criado antes dos processos, então os clientes já recebem o endereço pronto.
+        sock_escuta = servidor_concorrente.criar_socket_escuta(args.transporte, args.perfil)
+        endereco = sock_escuta.getsockname()
+        conn_parada, conn_parada_servidor = contexto.Pipe()
+        servidor = contexto.Process(target=servidor_concorrente.processo_servidor_concorrente,
+                                    args=(sock_escuta, conn_parada_servidor, log_message, args.perfil))
+        clientes = [contexto.Process(target=processo_cliente,
+                                     args=(endereco, args.mensagem, args.repeticoes, args.janela, False,
+                                           args.perfil))
+                    for _ in range(args.clientes)]
+        servidor.start()
+        sock_escuta.close()
+        for cliente in clientes:
+            cliente.start()
+
+        # Quando todos os clientes terminarem, pede a parada do servidor.
+        for cliente in clientes:
+            cliente.join()
+        conn_parada.send("parar")
+        conn_parada.recv()
+        servidor.join()
+        remover_endereco(endereco)
+    else:
+        # Pipe pelo qual o servidor entrega ao cliente o endereço em que está escutando.
+        conn_endereco_cliente, conn_endereco_servidor = contexto.Pipe(duplex=False)
+        # Cria um processo para executar a função 'processo_servidor'.
+        servidor = contexto.Process(target=processo_servidor,
+                                    args=(conn_endereco_servidor, args.transporte, args.perfil))
+        # Cria um processo para executar a função 'processo_cliente', passando a mensagem e as opções do fluxo.
+        cliente = contexto.Process(target=processo_cliente,
+                                   args=(conn_endereco_cliente, args.mensagem, args.repeticoes, args.janela,
+                                         True, args.perfil))
+
+        # Inicia a execução do processo servidor.
+        servidor.start()
+        # Inicia a execução do processo cliente.
+        cliente.start()
+
+        # O processo principal espera que o processo servidor termine.
+        servidor.join()
+        # O processo principal espera que o processo cliente termine.
+        cliente.join()
+    
+    # Loga o fim da demonstração.
+    log_message("MAIN", "Demonstração com Sockets finalizada.")
+
+
+# Ponto de entrada do script.
+if __name__ == "__main__":
+    main()
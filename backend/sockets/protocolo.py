@@ -0,0 +1,123 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/sockets/protocolo.py
+# DESCRIÇÃO: Protocolo de quadros (framing) com prefixo de tamanho para enviar
+#            um fluxo de mensagens de qualquer tamanho por uma conexão TCP.
+#
+# FORMATO DE CADA QUADRO:
+#   [tamanho (4 bytes, big-endian)][payload]
+#
+# O TCP entrega um fluxo de bytes, não mensagens: um recv() pode trazer meia
+# mensagem ou várias de uma vez. O prefixo de tamanho permite separar as
+# mensagens de novo no lado de quem recebe, e a mesma conexão pode carregar
+# quantas mensagens forem necessárias.
+# -----------------------------------------------------------------------------
+
+import socket  # Importa a biblioteca de Sockets.
+import struct  # Importa a biblioteca para codificar o cabeçalho de tamanho.
+
+# Cabeçalho de cada quadro: tamanho do payload em 4 bytes (ordem de rede).
+CABECALHO_QUADRO = struct.Struct("!I")
+
+# Tamanho inicial do buffer de recepção (64 KB). Cresce sob demanda para payloads maiores.
+TAMANHO_BUFFER_INICIAL = 64 * 1024
+
+# Payloads até este tamanho são copiados junto com o cabeçalho em um único sendall();
+# acima dele, cabeçalho e payload são enviados juntos por sendmsg(), sem cópia.
+LIMITE_CONCATENAR = 16 * 1024
+
+
+# Envia um quadro (cabeçalho + payload) de uma só vez. Enviar o cabeçalho e o payload em
+# chamadas separadas faria o algoritmo de Nagle segurar a segunda escrita esperando um ACK.
+def enviar_quadro(sock, dados):
+    cabecalho = CABECALHO_QUADRO.pack(len(dados))
+    if len(dados) <= LIMITE_CONCATENAR or not hasattr(sock, "sendmsg"):
+        sock.sendall(cabecalho + bytes(dados))
+        return
+    # Scatter/gather: o kernel lê o cabeçalho e o payload direto dos buffers originais.
+    partes = [memoryview(cabecalho), memoryview(dados).cast('B')]
+    while partes:
+        enviados = sock.sendmsg(partes)
+        # Descarta as partes já enviadas por completo e recorta a parte enviada pela metade.
+        while partes and enviados >= len(partes[0]):
+            enviados -= len(partes[0])
+            partes.pop(0)
+        if partes:
+            partes[0] = partes[0][enviados:]
+
+
+class LeitorQuadros:
+    """Lê quadros de um socket usando um buffer pré-alocado e reaproveitado (recv_into).
+
+    Cada recv_into() lê o máximo que couber no buffer, então vários quadros pequenos
+    que chegaram juntos são separados sem novas chamadas ao sistema. O memoryview
+    devolvido por receber() aponta para o buffer interno e só é válido até a próxima
+    chamada; quem precisar guardar os dados deve copiá-los (ex: bytes(visao)).
+    """
+
+    def __init__(self, sock, tamanho_buffer=TAMANHO_BUFFER_INICIAL):
+        self.sock = sock
+        self._buffer = bytearray(tamanho_buffer)
+        self._visao = memoryview(self._buffer)
+        # Bytes válidos ainda não consumidos ficam em self._buffer[self._inicio:self._fim].
+        self._inicio = 0
+        self._fim = 0
+
+    # Garante que pelo menos 'necessarios' bytes não consumidos estejam no buffer.
+    # Devolve False se a conexão fechar antes disso.
+    def _garantir(self, necessarios):
+        if self._fim - self._inicio >= necessarios:
+            return True
+        # Sem espaço no final do buffer: move os bytes pendentes para o início ou aloca um buffer maior.
+        if self._inicio + necessarios > len(self._buffer):
+            pendentes = self._fim - self._inicio
+            if necessarios > len(self._buffer):
+                # Um buffer novo (em vez de redimensionar) mantém válidas as visões já entregues.
+                novo = bytearray(max(necessarios, 2 * len(self._buffer)))
+                novo[:pendentes] = self._visao[self._inicio:self._fim]
+                self._buffer = novo
+                self._visao = memoryview(novo)
+            else:
+                self._visao[:pendentes] = self._visao[self._inicio:self._fim]
+            self._inicio, self._fim = 0, pendentes
+        # Lê direto para o espaço livre do buffer até ter os bytes necessários.
+        while self._fim - self._inicio < necessarios:
+            n = self.sock.recv_into(self._visao[self._fim:])
+            if n == 0:
+                return False
+            self._fim += n
+        return True
+
+    # Recebe o próximo quadro. Devolve um memoryview sobre o payload, ou None se a conexão
+    # foi fechada de forma limpa entre dois quadros.
+    def receber(self):
+        if not self._garantir(CABECALHO_QUADRO.size):
+            if self._fim != self._inicio:
+                raise ConnectionError("Conexão fechada no meio do cabeçalho de um quadro.")
+            return None
+        (tamanho,) = CABECALHO_QUADRO.unpack_from(self._visao, self._inicio)
+        if not self._garantir(CABECALHO_QUADRO.size + tamanho):
+            raise ConnectionError("Conexão fechada antes de receber o quadro completo.")
+        inicio_payload = self._inicio + CABECALHO_QUADRO.size
+        self._inicio = inicio_payload + tamanho
+        return self._visao[inicio_payload:self._inicio]
+
+    # Indica se já há um quadro completo no buffer, que receber() devolve sem ler do socket.
+    def tem_quadro(self):
+        pendentes = self._fim - self._inicio
+        if pendentes < CABECALHO_QUADRO.size:
+            return False
+        (tamanho,) = CABECALHO_QUADRO.unpack_from(self._visao, self._inicio)
+        return pendentes >= CABECALHO_QUADRO.size + tamanho
+
+    # Permite percorrer os quadros com 'for visao in leitor:' até a conexão fechar.
+    def __iter__(self):
+        while True:
+            visao = self.receber()
+            if visao is None:
+                return
+            yield visao
+
+
+# Sinaliza ao outro lado que não haverá mais quadros, mantendo a leitura aberta.
+def encerrar_envio(sock):
+    sock.shutdown(socket.SHUT_WR)
@@ -0,0 +1,200 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/sockets/servidor_concorrente.py
+# DESCRIÇÃO: Servidor de eco concorrente baseado em 'selectors': um único
+#            processo atende centenas de conexões simultâneas, sem uma thread
+#            por cliente.
+#
+# Todos os sockets ficam em modo não bloqueante e registrados em um seletor
+# (epoll no Linux). O laço principal acorda apenas quando algum socket tem dados
+# para ler ou espaço para escrever. Os quadros seguem o protocolo de
+# backend/sockets/protocolo.py; como a resposta de eco é idêntica ao quadro
+# recebido, o servidor devolve os bytes do quadro (cabeçalho incluso) sem
+# decodificá-los.
+# -----------------------------------------------------------------------------
+
+import os  # Importa a biblioteca do sistema para obter o ID do processo (PID).
+import selectors  # Importa o multiplexador de E/S (epoll/kqueue/select).
+
+from backend.sockets.protocolo import CABECALHO_QUADRO  # Cabeçalho de tamanho dos quadros.
+from backend.sockets import transporte as transporte_sockets  # Sockets de escuta TCP ou AF_UNIX.
+# Perfis de ajuste das opções dos sockets (Nagle, ACK imediato, buffers e cork).
+from backend.sockets.ajustes import aplicar_perfil, descarregar, rearmar_quickack
+from backend.recursos import iniciar_medicao  # Recursos usados pelo servidor na demonstração.
+
+# Tamanho do buffer reaproveitado em cada leitura (256 KB).
+TAMANHO_LEITURA = 256 * 1024
+
+# Se as respostas pendentes de uma conexão passarem deste volume, o servidor para de ler
+# dela até o cliente consumir as respostas (contrapressão), em vez de acumular memória.
+LIMITE_SAIDA = 4 * 1024 * 1024
+
+# Tamanho da fila de conexões aguardando accept().
+BACKLOG = 1024
+
+
+class ConexaoEco:
+    """Estado de uma conexão: bytes recebidos ainda sem quadro completo e respostas a enviar."""
+
+    __slots__ = ("sock", "entrada", "saida", "leitura_encerrada")
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.entrada = bytearray()
+        self.saida = bytearray()
+        self.leitura_encerrada = False
+
+
+# Cria o socket de escuta do servidor concorrente, com uma fila grande de conexões pendentes e o
+# perfil de ajuste 'perfil' (backend/sockets/ajustes.py).
+def criar_socket_escuta(transporte="tcp", perfil="padrao"):
+    return transporte_sockets.criar_socket_escuta(transporte, BACKLOG, perfil)
+
+
+class ServidorEcoConcorrente:
+    """Laço de eventos que aceita conexões e devolve cada quadro recebido.
+
+    Cada conexão aceita recebe o perfil de ajuste 'perfil', o mesmo do socket de escuta.
+    """
+
+    def __init__(self, sock_escuta, conn_parada=None, perfil="padrao"):
+        self.sock_escuta = sock_escuta
+        self.perfil = perfil
+        self.sock_escuta.setblocking(False)
+        self.seletor = selectors.DefaultSelector()
+        self.seletor.register(sock_escuta, selectors.EVENT_READ, self._aceitar)
+        # Uma ponta de Pipe opcional: quando o outro lado enviar algo ou fechar, o servidor para.
+        if conn_parada is not None:
+            self.seletor.register(conn_parada, selectors.EVENT_READ, self._parar)
+        self._buffer_leitura = bytearray(TAMANHO_LEITURA)
+        self._visao_leitura = memoryview(self._buffer_leitura)
+        self.rodando = False
+        # Contadores reportados no final.
+        self.conexoes_atendidas = 0
+        self.conexoes_abertas = 0
+        self.conexoes_simultaneas_max = 0
+        self.mensagens = 0
+
+    # Aceita todas as conexões pendentes na fila.
+    def _aceitar(self, sock_escuta, _mascara):
+        while True:
+            try:
+                conn, _ = sock_escuta.accept()
+            except BlockingIOError:
+                return
+            # Nem todo sistema copia as opções do socket de escuta para os aceitos: o perfil é reaplicado.
+            aplicar_perfil(conn, self.perfil)
+            conn.setblocking(False)
+            self.seletor.register(conn, selectors.EVENT_READ, ConexaoEco(conn))
+            self.conexoes_atendidas += 1
+            self.conexoes_abertas += 1
+            self.conexoes_simultaneas_max = max(self.conexoes_simultaneas_max, self.conexoes_abertas)
+
+    # Chamado quando o processo que controla o servidor pede a parada.
+    def _parar(self, _conn, _mascara):
+        self.rodando = False
+
+    # Separa os quadros completos da entrada e coloca o eco de cada um na saída.
+    def _processar_entrada(self, conexao):
+        entrada = conexao.entrada
+        pos = 0
+        while len(entrada) - pos >= CABECALHO_QUADRO.size:
+            (tamanho,) = CABECALHO_QUADRO.unpack_from(entrada, pos)
+            fim = pos + CABECALHO_QUADRO.size + tamanho
+            if fim > len(entrada):
+                break
+            conexao.saida += entrada[pos:fim]
+            self.mensagens += 1
+            pos = fim
+        if pos:
+            del entrada[:pos]
+
+    # Envia o quanto o kernel aceitar das respostas pendentes.
+    def _enviar_pendente(self, conexao):
+        if conexao.saida:
+            try:
+                enviados = conexao.sock.send(conexao.saida)
+            except BlockingIOError:
+                enviados = 0
+            del conexao.saida[:enviados]
+
+    # Ajusta os eventos de interesse da conexão conforme o estado dos buffers.
+    def _atualizar_interesse(self, conexao):
+        if conexao.leitura_encerrada and not conexao.saida:
+            self._fechar(conexao)
+            return
+        eventos = 0
+        if not conexao.leitura_encerrada and len(conexao.saida) < LIMITE_SAIDA:
+            eventos |= selectors.EVENT_READ
+        if conexao.saida:
+            eventos |= selectors.EVENT_WRITE
+        if self.seletor.get_key(conexao.sock).events != eventos:
+            self.seletor.modify(conexao.sock, eventos, conexao)
+
+    # Remove a conexão do seletor e a fecha.
+    def _fechar(self, conexao):
+        self.seletor.unregister(conexao.sock)
+        conexao.sock.close()
+        self.conexoes_abertas -= 1
+
+    # Trata um evento de leitura e/ou escrita em uma conexão de cliente.
+    def _atender(self, conexao, mascara):
+        if mascara & selectors.EVENT_READ:
+            try:
+                n = conexao.sock.recv_into(self._buffer_leitura)
+            except (BlockingIOError, InterruptedError):
+                n = None
+            except ConnectionError:
+                conexao.saida.clear()
+                n = 0
+            if n == 0:
+                # O cliente encerrou o envio: termina de mandar as respostas e fecha.
+                conexao.leitura_encerrada = True
+            elif n:
+                rearmar_quickack(conexao.sock, self.perfil)
+                conexao.entrada += self._visao_leitura[:n]
+                self._processar_entrada(conexao)
+        # Tenta enviar na hora, sem esperar uma nova volta do laço de eventos. Com o cork, o que o
+        # kernel acumulou sai antes de o servidor voltar a esperar.
+        try:
+            self._enviar_pendente(conexao)
+            descarregar(conexao.sock, self.perfil)
+        except ConnectionError:
+            conexao.saida.clear()
+            conexao.leitura_encerrada = True
+        self._atualizar_interesse(conexao)
+
+    # Executa o laço de eventos até receber o pedido de parada.
+    def servir(self):
+        self.rodando = True
+        while self.rodando:
+            for chave, mascara in self.seletor.select():
+                if isinstance(chave.data, ConexaoEco):
+                    self._atender(chave.data, mascara)
+                else:
+                    chave.data(chave.fileobj, mascara)
+        # Fecha as conexões que ainda estiverem abertas.
+        for chave in list(self.seletor.get_map().values()):
+            if isinstance(chave.data, ConexaoEco):
+                self._fechar(chave.data)
+        self.seletor.close()
+
+
+# Função executada por cada processo servidor concorrente. Vários processos podem compartilhar
+# o mesmo socket de escuta: o kernel distribui as novas conexões entre eles.
+def processo_servidor_concorrente(sock_escuta, conn_parada, log=None, perfil="padrao"):
+    pid = os.getpid()
+    source_id = f"SERVIDOR (PID: {pid})"
+    servidor = ServidorEcoConcorrente(sock_escuta, conn_parada, perfil)
+    # Só a demonstração (que passa 'log') mede os recursos; o gerador de carga não.
+    medicao = iniciar_medicao(source_id, contar_es=False) if log else None
+    if log:
+        endereco = transporte_sockets.descrever_endereco(sock_escuta.getsockname())
+        log(source_id, f"PID: {pid} -> Servidor concorrente escutando em {endereco}")
+    servidor.servir()
+    if log:
+        log(source_id, f"PID: {pid} -> Encerrado. {servidor.conexoes_atendidas} conexão(ões) atendida(s), "
+                       f"até {servidor.conexoes_simultaneas_max} simultânea(s), {servidor.mensagens} mensagem(ns).")
+        medicao.encerrar(servidor.mensagens)
+    # Informa os contadores a quem pediu a parada.
+    conn_parada.send({"conexoes": servidor.conexoes_atendidas, "mensagens": servidor.mensagens})
+    conn_parada.close()
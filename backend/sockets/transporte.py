@@ -0,0 +1,81 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/sockets/transporte.py
+# DESCRIÇÃO: Criação dos sockets de escuta e de conexão para os dois
+#            transportes suportados pelo backend de Sockets:
+#
+#   tcp  -> AF_INET em 127.0.0.1, numa porta livre escolhida pelo sistema
+#           (porta 0), evitando o erro "Address already in use" entre execuções.
+#   unix -> AF_UNIX (Unix domain socket), num arquivo de socket em um diretório
+#           temporário. Não passa pela pilha TCP/IP de loopback, então é mais
+#           rápido para processos na mesma máquina.
+#
+# Em ambos os casos o servidor cria o socket e entrega o ENDEREÇO resultante
+# ao cliente: uma tupla (host, porta) no TCP ou o caminho do arquivo no AF_UNIX.
+# Os dois lados aceitam um perfil de ajuste das opções (backend/sockets/ajustes.py).
+# -----------------------------------------------------------------------------
+
+import os  # Importa a biblioteca do sistema para remover o arquivo do socket AF_UNIX.
+import socket  # Importa a biblioteca de Sockets.
+import tempfile  # Importa a biblioteca para criar o diretório temporário do socket AF_UNIX.
+
+from backend.sockets.ajustes import aplicar_perfil  # Perfis de ajuste das opções dos sockets.
+
+# Endereço de loopback usado pelo transporte TCP.
+HOST = '127.0.0.1'
+
+# Transportes disponíveis nesta plataforma (o Windows não tem AF_UNIX no Python).
+TRANSPORTES = ["tcp", "unix"] if hasattr(socket, "AF_UNIX") else ["tcp"]
+
+# Tamanho padrão da fila de conexões aguardando accept().
+BACKLOG_PADRAO = 128
+
+
+# Cria, associa e coloca em escuta um socket do transporte escolhido, com o perfil de ajuste 'perfil'
+# (herdado pelas conexões aceitas). Devolve o socket; o endereço a ser entregue ao cliente é
+# sock.getsockname().
+def criar_socket_escuta(transporte="tcp", backlog=BACKLOG_PADRAO, perfil="padrao"):
+    if transporte == "unix":
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Cada servidor usa um diretório próprio, então não há colisão entre execuções.
+        s.bind(os.path.join(tempfile.mkdtemp(prefix="ipc_"), "servidor.sock"))
+    elif transporte == "tcp":
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # Porta 0: o sistema escolhe uma porta livre.
+        s.bind((HOST, 0))
+    else:
+        raise ValueError(f"Transporte desconhecido: {transporte!r}. Use um de {TRANSPORTES}.")
+    aplicar_perfil(s, perfil)
+    s.listen(backlog)
+    return s
+
+
+# Conecta ao endereço entregue pelo servidor: caminho (str) para AF_UNIX, tupla para TCP. O perfil
+# de ajuste é aplicado antes do connect(), para os buffers valerem na negociação da conexão.
+def conectar(endereco, perfil="padrao"):
+    familia = socket.AF_UNIX if isinstance(endereco, str) else socket.AF_INET
+    s = socket.socket(familia, socket.SOCK_STREAM)
+    try:
+        aplicar_perfil(s, perfil)
+        s.connect(endereco)
+    except OSError:
+        s.close()
+        raise
+    return s
+
+
+# Formata o endereço para os logs (ex: "127.0.0.1:41234" ou "unix:/tmp/ipc_x/servidor.sock").
+def descrever_endereco(endereco):
+    if isinstance(endereco, str):
+        return f"unix:{endereco}"
+    return f"{endereco[0]}:{endereco[1]}"
+
+
+# Remove o arquivo e o diretório temporário de um socket AF_UNIX (no TCP não há nada a remover).
+def remover_endereco(endereco):
+    if isinstance(endereco, str):
+        try:
+            os.unlink(endereco)
+            os.rmdir(os.path.dirname(endereco))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,512 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/telemetria.py
+# DESCRIÇÃO: Canal de telemetria binário entre os backends e a GUI, separado da
+#            saída padrão. Substitui as cópias de log_message de cada backend.
+#
+# FORMATO DE CADA REGISTRO (little-endian):
+#   [tamanho total (4 bytes)][código do evento (2)][PID (4)][instante (8, ns)]
+#   [tamanho da origem (2)][origem (UTF-8)][mensagem (UTF-8)]
+#
+# Quem inicia o backend (a GUI) cria um pipe e informa a ponta de escrita pelas
+# variáveis de ambiente IPC_TELEMETRIA_FD e IPC_TELEMETRIA_ID. Cada registro vai
+# em um único os.write() de no máximo PIPE_BUF bytes, que o sistema garante ser
+# atômico: registros de processos diferentes nunca se misturam. Sem o canal (na
+# linha de comando, ou em processos criados com 'spawn', que não herdam o
+# descritor), os eventos saem como linhas JSON na saída padrão, como antes.
+#
+# Uma mensagem que não cabe num registro é dividida em fragmentos: todos menos o
+# último levam BIT_CONTINUA no código do evento, e o decodificador junta os
+# fragmentos com o mesmo PID, instante e origem (os de outros processos podem
+# chegar entre eles). Nenhuma mensagem é cortada no meio, então os eventos com
+# corpo JSON (recursos, progresso) sempre chegam inteiros. Acima de
+# TAMANHO_MAXIMO_MENSAGEM, um log é encurtado e um evento estruturado é trocado
+# por um log de erro.
+#
+# REGISTRO ASSÍNCRONO: log_message só coloca o evento numa fila em memória; uma
+# thread de cada processo esvazia a fila e escreve os eventos em lotes. Assim o
+# laço de comunicação nunca espera a GUI ler a saída. Quando a fila enche, vale
+# a política escolhida em IPC_LOG_POLITICA (ou configurar_registro()):
+#   descartar_antigos -> (padrão) descarta o evento mais antigo da fila;
+#   amostrar          -> aceita só 1 de cada IPC_LOG_AMOSTRA eventos, no lugar
+#                        do mais antigo, e descarta os demais;
+#   bloquear          -> o processo espera haver espaço (nenhum evento perdido).
+# A capacidade da fila vem de IPC_LOG_CAPACIDADE.
+# -----------------------------------------------------------------------------
+
+import collections  # Importa a deque usada como fila de eventos.
+import io  # Importa as classes de arquivo usadas para reabrir a saída padrão no filho de um fork.
+import json  # Importa a biblioteca para o formato alternativo em JSON.
+import os  # Importa a biblioteca do sistema para escrever no descritor do canal.
+import select  # Importa PIPE_BUF, o maior tamanho de escrita atômica num pipe.
+import struct  # Importa a biblioteca para codificar o cabeçalho dos registros.
+import sys  # Importa a biblioteca do sistema para a saída padrão.
+import threading  # Importa a biblioteca para a thread que escreve os eventos.
+import time  # Importa a biblioteca de tempo para o instante de cada evento.
+from multiprocessing import util  # Importa Finalize, executado também na saída dos processos filhos.
+
+# Variáveis de ambiente com o descritor do canal e a identidade (dispositivo:inode) do pipe.
+VARIAVEL_FD = "IPC_TELEMETRIA_FD"
+VARIAVEL_ID = "IPC_TELEMETRIA_ID"
+
+# Cabeçalho de cada registro: tamanho total, código do evento, PID, instante e tamanho da origem.
+CABECALHO_REGISTRO = struct.Struct("<IHIQH")
+
+# Maior registro escrito de uma só vez com garantia de atomicidade.
+TAMANHO_MAXIMO_REGISTRO = getattr(select, "PIPE_BUF", 4096)
+
+# Mensagem mais longa aceita num evento (somando os fragmentos).
+TAMANHO_MAXIMO_MENSAGEM = 256 * 1024
+
+# Bit do código do evento que marca um fragmento seguido de outros da mesma mensagem.
+BIT_CONTINUA = 0x8000
+
+# Códigos de evento: mensagens de log, marcas de rastreio (ver backend/rastreio.py), os recursos
+# usados por cada papel (ver backend/recursos.py) e o progresso das transferências de arquivos
+# (ver backend/transferencia.py).
+EVENTO_LOG = 1
+EVENTO_RASTRO = 2
+EVENTO_RECURSOS = 3
+EVENTO_PROGRESSO = 4
+
+# Nomes dos códigos de evento, usados na decodificação.
+NOMES_EVENTOS = {EVENTO_LOG: "log", EVENTO_RASTRO: "rastro", EVENTO_RECURSOS: "recursos",
+                 EVENTO_PROGRESSO: "progresso"}
+
+# Mensagem de um evento de rastreio: fase (1 byte) e número de sequência da mensagem no canal (4 bytes).
+# A origem do registro é o nome do canal (ex: "pai->filho").
+MARCA_RASTRO = struct.Struct("<BI")
+
+# Fases de uma mensagem rastreada, na ordem em que acontecem (o código de cada fase é o índice + 1).
+FASES_RASTRO = ["envio", "serializado", "enviado", "recebido", "desserializado"]
+
+# Variáveis de ambiente com a configuração do registro assíncrono.
+VARIAVEL_POLITICA = "IPC_LOG_POLITICA"
+VARIAVEL_CAPACIDADE = "IPC_LOG_CAPACIDADE"
+VARIAVEL_AMOSTRA = "IPC_LOG_AMOSTRA"
+
+# Políticas para quando a fila de eventos está cheia.
+POLITICAS_REGISTRO = ["descartar_antigos", "amostrar", "bloquear"]
+
+# Eventos que cabem na fila antes de a política entrar em ação.
+CAPACIDADE_PADRAO = 8192
+
+# Com a política 'amostrar', 1 de cada AMOSTRA_PADRAO eventos é aceito com a fila cheia.
+AMOSTRA_PADRAO = 10
+
+# Tempo máximo (em segundos) para a thread escrever os eventos pendentes ao encerrar o processo.
+TIMEOUT_ESVAZIAR = 5.0
+
+# Tempo máximo (em segundos) que um fork espera a escrita em andamento terminar. Com a GUI atrasada e a
+# política 'bloquear', a escrita pode demorar o quanto a GUI demorar: o fork não espera por ela.
+TIMEOUT_FORK = 0.05
+
+# Descritor do canal neste processo: None = ainda não verificado, -1 = sem canal.
+_fd_canal = None
+
+# Registrador assíncrono deste processo (criado no primeiro evento) e a configuração dos próximos.
+_registrador = None
+_configuracao = None
+
+
+# Verifica se o descritor informado no ambiente é mesmo o pipe de telemetria. Um processo criado
+# com 'spawn' herda as variáveis de ambiente mas não o descritor, e o mesmo número pode ser outro arquivo.
+def _descobrir_canal():
+    valor = os.environ.get(VARIAVEL_FD)
+    if not valor:
+        return -1
+    try:
+        fd = int(valor)
+        estado = os.fstat(fd)
+    except (ValueError, OSError):
+        return -1
+    if os.environ.get(VARIAVEL_ID) != f"{estado.st_dev}:{estado.st_ino}":
+        return -1
+    return fd
+
+
+# Devolve o descritor do canal, ou -1 se os eventos devem sair em JSON na saída padrão.
+def obter_fd_canal():
+    global _fd_canal
+    if _fd_canal is None:
+        _fd_canal = _descobrir_canal()
+    return _fd_canal
+
+
+# Codifica um evento como registros binários de até PIPE_BUF bytes: um só, ou vários fragmentos se a
+# mensagem não couber (ver BIT_CONTINUA). A mensagem é texto nos eventos de log e bytes (MARCA_RASTRO)
+# nos de rastreio; nos de recursos e progresso, é um JSON.
+def codificar_registros(codigo, origem, mensagem, pid=None, instante_ns=None):
+    origem_bytes = origem.encode("utf-8")[:1024]
+    mensagem_bytes = mensagem if isinstance(mensagem, bytes) else mensagem.encode("utf-8")
+    pid = pid or os.getpid()
+    instante_ns = instante_ns or time.monotonic_ns()
+    if len(mensagem_bytes) > TAMANHO_MAXIMO_MENSAGEM:
+        if codigo == EVENTO_LOG:
+            mensagem_bytes = mensagem_bytes[:TAMANHO_MAXIMO_MENSAGEM - 3] + "…".encode("utf-8")
+        else:
+            # Um evento estruturado cortado não seria decodificável: vai um log de erro no lugar dele.
+            mensagem_bytes = (f"Evento '{NOMES_EVENTOS.get(codigo, codigo)}' descartado: {len(mensagem_bytes)} "
+                              f"bytes (máximo {TAMANHO_MAXIMO_MENSAGEM}).").encode("utf-8")
+            codigo = EVENTO_LOG
+    espaco = TAMANHO_MAXIMO_REGISTRO - CABECALHO_REGISTRO.size - len(origem_bytes)
+    registros = []
+    inicio = 0
+    while True:
+        fragmento = mensagem_bytes[inicio:inicio + espaco]
+        inicio += espaco
+        continua = inicio < len(mensagem_bytes)
+        cabecalho = CABECALHO_REGISTRO.pack(CABECALHO_REGISTRO.size + len(origem_bytes) + len(fragmento),
+                                            codigo | BIT_CONTINUA if continua else codigo, pid, instante_ns,
+                                            len(origem_bytes))
+        registros.append(cabecalho + origem_bytes + fragmento)
+        if not continua:
+            return registros
+
+
+# Junta as partes em blocos de até PIPE_BUF bytes, sem dividir nenhuma parte: cada bloco é escrito
+# de uma só vez e não se mistura com as escritas de outros processos.
+def _agrupar(partes):
+    bloco = []
+    tamanho = 0
+    for parte in partes:
+        if bloco and tamanho + len(parte) > TAMANHO_MAXIMO_REGISTRO:
+            yield bloco
+            bloco = []
+            tamanho = 0
+        bloco.append(parte)
+        tamanho += len(parte)
+    if bloco:
+        yield bloco
+
+
+# Escreve um lote de eventos (código, origem, mensagem, PID, instante) no canal de telemetria,
+# ou em JSON na saída padrão se não houver canal. Devolve quantos eventos não puderam ser escritos.
+def _escrever_lote(eventos):
+    global _fd_canal
+    if obter_fd_canal() >= 0:
+        try:
+            for bloco in _agrupar([registro for evento in eventos for registro in codificar_registros(*evento)]):
+                os.write(_fd_canal, b"".join(bloco))
+            return 0
+        except OSError:
+            # O leitor fechou o canal (ex: a GUI parou a execução): os próximos eventos vão para a saída padrão.
+            _fd_canal = -1
+    linhas = [json.dumps(descrever_evento(*evento)) + "\n" for evento in eventos]
+    try:
+        # Cada bloco de linhas inteiras vai em uma única escrita, para não se misturar com as de outro processo.
+        for bloco in _agrupar(linhas):
+            sys.stdout.write("".join(bloco))
+            sys.stdout.flush()
+    except (OSError, ValueError):
+        # A saída padrão também foi fechada: não há para onde escrever.
+        return len(eventos)
+    return 0
+
+
+class RegistradorAssincrono:
+    """Fila de eventos de um processo, esvaziada em lotes por uma thread em segundo plano.
+
+    Os contadores 'recebidos', 'enfileirados', 'descartados' e 'escritos' mostram quantos eventos
+    o processo registrou, quantos entraram na fila, quantos a política de fila cheia (ou um erro
+    de escrita) descartou e quantos saíram.
+    """
+
+    def __init__(self, politica="descartar_antigos", capacidade=CAPACIDADE_PADRAO, amostra=AMOSTRA_PADRAO):
+        if politica not in POLITICAS_REGISTRO:
+            raise ValueError(f"Política de registro desconhecida: {politica!r}. Use uma de {POLITICAS_REGISTRO}.")
+        self.politica = politica
+        self.capacidade = max(1, capacidade)
+        self.amostra = max(1, amostra)
+        self.recebidos = 0
+        self.enfileirados = 0
+        self.descartados = 0
+        self.escritos = 0
+        self._fila = collections.deque()
+        self._trava = threading.Lock()
+        # Avisa a thread de escrita que há eventos, e o processo (política 'bloquear') que há espaço.
+        self._tem_eventos = threading.Condition(self._trava)
+        self._tem_espaco = threading.Condition(self._trava)
+        # Mantida durante cada escrita; o fork espera por ela (até TIMEOUT_FORK) para o filho não herdar
+        # a saída padrão travada.
+        self.trava_escrita = threading.Lock()
+        self._chegadas_com_fila_cheia = 0
+        self._encerrado = False
+        self._thread = threading.Thread(target=self._esvaziar_fila, name="telemetria", daemon=True)
+        self._thread.start()
+        # Finalize roda na saída do processo principal (atexit) e também dos filhos do multiprocessing,
+        # que terminam com os._exit sem passar pelo atexit.
+        util.Finalize(None, self.fechar, exitpriority=0)
+
+    # Coloca um evento na fila, aplicando a política se ela estiver cheia. Não escreve nada.
+    def registrar(self, evento):
+        with self._trava:
+            self.recebidos += 1
+            if self._encerrado:
+                # O processo já está encerrando: escreve direto, sem a thread.
+                self.descartados += _escrever_lote([evento])
+                return
+            if len(self._fila) >= self.capacidade:
+                if self.politica == "bloquear":
+                    while len(self._fila) >= self.capacidade and not self._encerrado:
+                        self._tem_espaco.wait()
+                else:
+                    if self.politica == "amostrar":
+                        self._chegadas_com_fila_cheia += 1
+                        if self._chegadas_com_fila_cheia % self.amostra:
+                            self.descartados += 1
+                            return
+                    self._fila.popleft()
+                    self.descartados += 1
+            self._fila.append(evento)
+            self.enfileirados += 1
+            if len(self._fila) == 1:
+                self._tem_eventos.notify()
+
+    # Laço da thread: pega tudo o que está na fila e escreve de uma vez, até o registrador ser fechado.
+    def _esvaziar_fila(self):
+        while True:
+            with self._trava:
+                while not self._fila and not self._encerrado:
+                    self._tem_eventos.wait()
+                if not self._fila:
+                    return
+                lote = list(self._fila)
+                self._fila.clear()
+                self._tem_espaco.notify_all()
+            with self.trava_escrita:
+                falhas = _escrever_lote(lote)
+            with self._trava:
+                self.escritos += len(lote) - falhas
+                self.descartados += falhas
+
+    # Quantidade de eventos esperando na fila.
+    def pendentes(self):
+        with self._trava:
+            return len(self._fila)
+
+    # Devolve os contadores do registrador.
+    def estatisticas(self):
+        with self._trava:
+            return {
+                "politica": self.politica,
+                "capacidade": self.capacidade,
+                "recebidos": self.recebidos,
+                "enfileirados": self.enfileirados,
+                "pendentes": len(self._fila),
+                "descartados": self.descartados,
+                "escritos": self.escritos,
+            }
+
+    # Escreve os eventos pendentes e encerra a thread. Se algum evento foi descartado, registra quantos.
+    def fechar(self):
+        with self._trava:
+            if self._encerrado:
+                return
+            self._encerrado = True
+            self._tem_eventos.notify_all()
+            self._tem_espaco.notify_all()
+        self._thread.join(TIMEOUT_ESVAZIAR)
+        if self.descartados:
+            aviso = (f"{self.descartados} de {self.recebidos} eventos descartados "
+                     f"(política '{self.politica}', capacidade {self.capacidade}).")
+            _escrever_lote([(EVENTO_LOG, "TELEMETRIA", aviso, os.getpid(), time.monotonic_ns())])
+
+
+# Lê a configuração do registro nas variáveis de ambiente, com os valores padrão para as ausentes.
+def _configuracao_ambiente():
+    try:
+        capacidade = int(os.environ.get(VARIAVEL_CAPACIDADE, CAPACIDADE_PADRAO))
+        amostra = int(os.environ.get(VARIAVEL_AMOSTRA, AMOSTRA_PADRAO))
+    except ValueError:
+        capacidade, amostra = CAPACIDADE_PADRAO, AMOSTRA_PADRAO
+    politica = os.environ.get(VARIAVEL_POLITICA, "descartar_antigos")
+    if politica not in POLITICAS_REGISTRO:
+        politica = "descartar_antigos"
+    return {"politica": politica, "capacidade": capacidade, "amostra": amostra}
+
+
+# Devolve o registrador assíncrono deste processo, criando-o no primeiro uso.
+def obter_registrador():
+    global _registrador, _configuracao
+    if _registrador is None:
+        if _configuracao is None:
+            _configuracao = _configuracao_ambiente()
+        _registrador = RegistradorAssincrono(**_configuracao)
+    return _registrador
+
+
+# Troca a política de fila cheia deste processo (e dos filhos criados depois). Os eventos pendentes
+# do registrador anterior são escritos antes da troca.
+def configurar_registro(politica=None, capacidade=None, amostra=None):
+    global _registrador, _configuracao
+    configuracao = dict(_configuracao or _configuracao_ambiente())
+    for chave, valor in (("politica", politica), ("capacidade", capacidade), ("amostra", amostra)):
+        if valor is not None:
+            configuracao[chave] = valor
+    if configuracao["politica"] not in POLITICAS_REGISTRO:
+        raise ValueError(f"Política de registro desconhecida: {configuracao['politica']!r}. "
+                         f"Use uma de {POLITICAS_REGISTRO}.")
+    anterior, _registrador, _configuracao = _registrador, None, configuracao
+    if anterior is not None:
+        anterior.fechar()
+
+
+# Contadores do registrador deste processo (recebidos, enfileirados, pendentes, descartados, escritos).
+def estatisticas_registro():
+    return obter_registrador().estatisticas()
+
+
+# Registra um evento: o instante é tomado agora, mas a escrita fica com a thread do registrador.
+def registrar_evento(codigo, origem, mensagem):
+    obter_registrador().registrar((codigo, origem, mensagem, os.getpid(), time.monotonic_ns()))
+
+
+# Função de log usada por todos os backends, com a mesma assinatura das versões anteriores.
+def log_message(source, message):
+    registrar_evento(EVENTO_LOG, source, message)
+
+
+# No fork, o filho recebe só a thread que chamou fork(): a thread do registrador e a fila
+# pertencem ao pai, que as escreve. O filho cria o próprio registrador no primeiro evento.
+# Antes do fork, espera a escrita em andamento terminar por no máximo TIMEOUT_FORK. Se ela
+# não terminar (a GUI está atrasada), o fork segue, e o filho troca a saída padrão, que pode
+# ter ficado travada no meio da escrita do pai, por uma nova sobre o mesmo descritor.
+# As escritas no canal (os.write) não usam trava e não precisam disso.
+_registrador_travado = None
+_escrita_em_andamento = False
+
+# Saídas padrão substituídas em filhos de fork: mantidas vivas para que nunca sejam finalizadas,
+# o que tentaria esvaziá-las com a trava herdada.
+_saidas_abandonadas = []
+
+
+def _antes_do_fork():
+    global _registrador_travado, _escrita_em_andamento
+    _registrador_travado = None
+    _escrita_em_andamento = False
+    if _registrador is not None:
+        if _registrador.trava_escrita.acquire(timeout=TIMEOUT_FORK):
+            _registrador_travado = _registrador
+        else:
+            _escrita_em_andamento = True
+
+
+def _depois_do_fork_no_pai():
+    global _registrador_travado
+    if _registrador_travado is not None:
+        _registrador_travado.trava_escrita.release()
+    _registrador_travado = None
+
+
+# Troca a saída padrão do filho por uma nova, sobre o mesmo descritor e com a mesma codificação.
+def _reabrir_saida_padrao():
+    antiga = sys.stdout
+    if antiga is None:
+        return
+    try:
+        fd = antiga.fileno()
+    except (OSError, ValueError):
+        return
+    _saidas_abandonadas.append(antiga)
+    sys.stdout = io.TextIOWrapper(io.FileIO(fd, "w", closefd=False), encoding=antiga.encoding,
+                                  errors=antiga.errors, line_buffering=antiga.line_buffering)
+
+
+def _depois_do_fork_no_filho():
+    global _registrador, _registrador_travado, _escrita_em_andamento
+    _registrador = None
+    _registrador_travado = None
+    if _escrita_em_andamento:
+        _reabrir_saida_padrao()
+    _escrita_em_andamento = False
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=_antes_do_fork, after_in_parent=_depois_do_fork_no_pai,
+                        after_in_child=_depois_do_fork_no_filho)
+
+
+# Cria o pipe do canal para um processo de backend. Devolve (fd_leitura, fd_escrita, variáveis de
+# ambiente); a ponta de escrita deve ser repassada ao processo (ex: Popen(pass_fds=...)) e depois
+# fechada por quem a criou, para que o fim do canal seja percebido quando o backend terminar.
+def criar_canal():
+    fd_leitura, fd_escrita = os.pipe()
+    estado = os.fstat(fd_escrita)
+    ambiente = {VARIAVEL_FD: str(fd_escrita), VARIAVEL_ID: f"{estado.st_dev}:{estado.st_ino}"}
+    return fd_leitura, fd_escrita, ambiente
+
+
+# Monta o dicionário de um evento, no mesmo formato para as linhas JSON e para os registros decodificados.
+def descrever_evento(codigo, origem, mensagem, pid, instante_ns):
+    evento = {
+        "source": origem,  # A origem da mensagem (ex: "PROCESSO PAI") ou o canal rastreado.
+        "event": NOMES_EVENTOS.get(codigo, codigo),
+        "pid": pid,
+        "timestamp_ns": instante_ns,
+    }
+    if codigo == EVENTO_RASTRO:
+        fase, seq = MARCA_RASTRO.unpack(mensagem)
+        # A correlação (canal + sequência) identifica a mesma mensagem nos dois processos.
+        evento["trace"] = {"fase": FASES_RASTRO[fase - 1], "seq": seq, "correlacao": f"{origem}#{seq}"}
+    elif codigo == EVENTO_RECURSOS:
+        # A mensagem é o relatório do papel em JSON (ver backend/recursos.py).
+        evento["recursos"] = json.loads(mensagem)
+    elif codigo == EVENTO_PROGRESSO:
+        # A mensagem é o progresso da transferência em JSON (ver backend/transferencia.py).
+        evento["progresso"] = json.loads(mensagem)
+    else:
+        if isinstance(mensagem, (bytes, bytearray)):
+            mensagem = mensagem.decode("utf-8", errors="replace")
+        evento["payload"] = {"message": mensagem}  # O conteúdo da mensagem.
+    return evento
+
+
+class DecodificadorTelemetria:
+    """Separa os registros de um fluxo de bytes do canal, que pode chegar em pedaços de qualquer tamanho.
+
+    Cada registro vira um dicionário no mesmo formato das linhas JSON (ver descrever_evento); os
+    fragmentos de uma mensagem (BIT_CONTINUA) são juntados antes.
+    """
+
+    def __init__(self):
+        self._pendente = bytearray()
+        # Fragmentos das mensagens ainda incompletas: (PID, instante, origem) -> bytes recebidos.
+        self._fragmentos = {}
+
+    # Acrescenta bytes lidos do canal e devolve a lista de registros completos.
+    def alimentar(self, dados):
+        self._pendente += dados
+        registros = []
+        pos = 0
+        pendente = self._pendente
+        while len(pendente) - pos >= CABECALHO_REGISTRO.size:
+            tamanho, codigo, pid, instante_ns, tamanho_origem = CABECALHO_REGISTRO.unpack_from(pendente, pos)
+            if len(pendente) - pos < tamanho:
+                break
+            inicio_origem = pos + CABECALHO_REGISTRO.size
+            inicio_mensagem = inicio_origem + tamanho_origem
+            origem = pendente[inicio_origem:inicio_mensagem].decode("utf-8", errors="replace")
+            mensagem = bytes(pendente[inicio_mensagem:pos + tamanho])
+            pos += tamanho
+            chave = (pid, instante_ns, origem)
+            if codigo & BIT_CONTINUA:
+                self._fragmentos[chave] = self._fragmentos.get(chave, b"") + mensagem
+                continue
+            if chave in self._fragmentos:
+                mensagem = self._fragmentos.pop(chave) + mensagem
+            registros.append(descrever_evento(codigo, origem, mensagem, pid, instante_ns))
+        if pos:
+            del pendente[:pos]
+        return registros
+
+
+# Lê o canal até o fim (todas as pontas de escrita fechadas), entregando os registros em blocos.
+def ler_canal(fd_leitura, tamanho_leitura=65536):
+    decodificador = DecodificadorTelemetria()
+    while True:
+        dados = os.read(fd_leitura, tamanho_leitura)
+        if not dados:
+            return
+        registros = decodificador.alimentar(dados)
+        if registros:
+            yield registros
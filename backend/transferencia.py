@@ -0,0 +1,296 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: backend/transferencia.py
+# DESCRIÇÃO: Transferência de arquivos entre processos, usada pelo modo
+#            --arquivo dos backends de Sockets (backend/sockets/arquivo.py) e de
+#            Pipes (backend/pipes/arquivo.py), e a ferramenta que compara as
+#            cópias feitas pelo kernel com as cópias em espaço de usuário.
+#
+#   kernel  -> os.sendfile (arquivo -> socket) e os.splice (arquivo -> pipe,
+#              pipe -> arquivo, socket -> pipe): os dados vão de um descritor
+#              a outro dentro do kernel, sem passar pela memória do processo.
+#   usuario -> read() num buffer do processo e sendall()/send_bytes() dele, e o
+#              inverso na recepção: duas cópias a mais por bloco, com o CPU do
+#              processo fazendo o trabalho.
+#
+# Quem envia manda antes o tamanho do arquivo (CABECALHO_ARQUIVO) e quem recebe
+# responde, no fim, quantos bytes gravou. Os dois lados enviam o progresso
+# (bytes, total e MB/s) como eventos "progresso" no canal de telemetria
+# (backend/telemetria.py), a cada INTERVALO_PROGRESSO segundos, que a GUI mostra
+# numa barra de progresso.
+#
+# USO: python -m backend.transferencia ARQUIVO [--bloco 1024] [--json]
+#      (executa as demonstrações com --arquivo e compara MB/s e CPU de cada cópia)
+# -----------------------------------------------------------------------------
+
+import argparse  # Importa a biblioteca para ler as opções da linha de comando.
+import json  # Importa a biblioteca para codificar os eventos de progresso.
+import os  # Importa a biblioteca do sistema para sendfile, splice e os descritores.
+import stat  # Importa a biblioteca para reconhecer os pipes pelo modo do descritor.
+import struct  # Importa a biblioteca para codificar o tamanho do arquivo.
+import sys  # Importa a biblioteca do sistema para escrever na saída padrão.
+import tempfile  # Importa a biblioteca para o arquivo de destino temporário.
+import time  # Importa a biblioteca de tempo para medir a vazão.
+
+from backend.telemetria import EVENTO_PROGRESSO, registrar_evento
+
+try:
+    import fcntl  # Só existe nos sistemas Unix.
+except ImportError:
+    fcntl = None
+
+# Tipos de cópia disponíveis: 'kernel' precisa de os.sendfile e os.splice (Linux).
+COPIAS = ["kernel", "usuario"] if hasattr(os, "splice") and hasattr(os, "sendfile") else ["usuario"]
+
+# Tamanho padrão de cada bloco transferido (1 MB).
+BLOCO_PADRAO = 1 << 20
+
+# Intervalo padrão entre dois eventos de progresso, em segundos.
+INTERVALO_PROGRESSO = 0.25
+
+# Cabeçalho da transferência e da confirmação: tamanho em bytes (8 bytes, little-endian).
+CABECALHO_ARQUIVO = struct.Struct("<Q")
+
+# Capacidade pedida para os pipes das cópias com splice: cada os.splice move no máximo o que cabe
+# no pipe (64 KB por padrão no Linux). Limitada por /proc/sys/fs/pipe-max-size.
+CAPACIDADE_PIPE = 1 << 20
+
+
+class Progresso:
+    """Bytes transferidos por um papel, enviados como eventos "progresso" a cada 'intervalo' segundos.
+
+    'sentido' é "envio" ou "recepcao": a GUI e a ferramenta de comparação separam os dois lados por ele.
+    """
+
+    def __init__(self, origem, total, sentido, intervalo=INTERVALO_PROGRESSO):
+        self.origem = origem
+        self.total = total
+        self.sentido = sentido
+        self.transferidos = 0
+        self._intervalo_ns = int(intervalo * 1e9)
+        self._inicio_ns = time.monotonic_ns()
+        self._ultimo_ns = self._inicio_ns
+        self._ultimo_bytes = 0
+
+    # Soma 'quantidade' bytes e envia um evento se o intervalo já passou.
+    def avancar(self, quantidade):
+        self.transferidos += quantidade
+        agora = time.monotonic_ns()
+        if agora - self._ultimo_ns >= self._intervalo_ns:
+            self._registrar(agora, False)
+
+    # Envia o evento final e devolve o relatório da transferência inteira.
+    def concluir(self):
+        return self._registrar(time.monotonic_ns(), True)
+
+    # 'mb_por_s' é a vazão desde o evento anterior (a que a GUI mostra ao vivo); 'mb_por_s_medio', desde o início.
+    def _registrar(self, agora, concluido):
+        duracao_s = (agora - self._inicio_ns) / 1e9
+        intervalo_s = (agora - self._ultimo_ns) / 1e9
+        relatorio = {
+            "sentido": self.sentido,
+            "bytes": self.transferidos,
+            "total": self.total,
+            "duracao_s": duracao_s,
+            "mb_por_s": (self.transferidos - self._ultimo_bytes) / intervalo_s / 1e6 if intervalo_s else 0.0,
+            "mb_por_s_medio": self.transferidos / duracao_s / 1e6 if duracao_s else 0.0,
+            "concluido": concluido,
+        }
+        self._ultimo_ns = agora
+        self._ultimo_bytes = self.transferidos
+        registrar_evento(EVENTO_PROGRESSO, self.origem, json.dumps(relatorio))
+        return relatorio
+
+
+# Aumenta a capacidade do pipe 'fd' (se a plataforma permitir), para cada os.splice mover mais bytes.
+def ampliar_pipe(fd, capacidade=CAPACIDADE_PIPE):
+    if fcntl is None or not hasattr(fcntl, "F_SETPIPE_SZ"):
+        return
+    try:
+        fcntl.fcntl(fd, fcntl.F_SETPIPE_SZ, capacidade)
+    except OSError:
+        # Acima do limite do sistema para usuários comuns: fica a capacidade padrão.
+        pass
+
+
+# Escreve todos os bytes de 'dados' no descritor 'fd'.
+def escrever_tudo(fd, dados):
+    visao = memoryview(dados).cast('B')
+    while visao:
+        visao = visao[os.write(fd, visao):]
+
+
+# Lê exatamente 'tamanho' bytes do descritor 'fd' (sem consumir nada além deles).
+def ler_exato(fd, tamanho):
+    dados = bytearray()
+    while len(dados) < tamanho:
+        parte = os.read(fd, tamanho - len(dados))
+        if not parte:
+            raise EOFError(f"Fim dos dados após {len(dados)} de {tamanho} bytes.")
+        dados += parte
+    return bytes(dados)
+
+
+# Abre o arquivo de destino: 'destino', ou um arquivo temporário se não for informado.
+# Devolve (fd, caminho, temporario); o temporário deve ser apagado por quem o abriu.
+def abrir_destino(destino=None):
+    if destino:
+        return os.open(destino, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644), destino, False
+    fd, caminho = tempfile.mkstemp(prefix="ipc_arquivo_")
+    return fd, caminho, True
+
+
+# Envia 'total' bytes do arquivo 'fd_arquivo' para o socket 'fd_saida' com os.sendfile, em blocos.
+def enviar_sendfile(fd_saida, fd_arquivo, total, progresso=None, bloco=BLOCO_PADRAO):
+    posicao = 0
+    while posicao < total:
+        enviados = os.sendfile(fd_saida, fd_arquivo, posicao, min(bloco, total - posicao))
+        if not enviados:
+            break  # O arquivo encolheu durante a transferência.
+        posicao += enviados
+        if progresso:
+            progresso.avancar(enviados)
+    return posicao
+
+
+# Envia 'total' bytes do arquivo 'fd_arquivo' para o pipe 'fd_pipe' com os.splice, em blocos.
+def enviar_splice(fd_arquivo, fd_pipe, total, progresso=None, bloco=BLOCO_PADRAO):
+    posicao = 0
+    while posicao < total:
+        enviados = os.splice(fd_arquivo, fd_pipe, min(bloco, total - posicao), offset_src=posicao)
+        if not enviados:
+            break
+        posicao += enviados
+        if progresso:
+            progresso.avancar(enviados)
+    return posicao
+
+
+# Grava 'total' bytes lidos de 'fd_entrada' no arquivo 'fd_destino' com os.splice. Um dos lados do
+# splice precisa ser um pipe: se 'fd_entrada' não for (ex: um socket), os dados passam por um pipe
+# intermediário, ainda dentro do kernel.
+def receber_splice(fd_entrada, fd_destino, total, progresso=None, bloco=BLOCO_PADRAO):
+    if stat.S_ISFIFO(os.fstat(fd_entrada).st_mode):
+        recebidos = 0
+        while recebidos < total:
+            parte = os.splice(fd_entrada, fd_destino, min(bloco, total - recebidos))
+            if not parte:
+                break
+            recebidos += parte
+            if progresso:
+                progresso.avancar(parte)
+        return recebidos
+
+    fd_leitura, fd_escrita = os.pipe()
+    ampliar_pipe(fd_escrita)
+    recebidos = 0
+    try:
+        while recebidos < total:
+            parte = os.splice(fd_entrada, fd_escrita, min(bloco, total - recebidos))
+            if not parte:
+                break
+            # Esvazia o pipe intermediário no arquivo antes de ler mais.
+            restante = parte
+            while restante:
+                restante -= os.splice(fd_leitura, fd_destino, restante)
+            recebidos += parte
+            if progresso:
+                progresso.avancar(parte)
+    finally:
+        os.close(fd_leitura)
+        os.close(fd_escrita)
+    return recebidos
+
+
+# Envia 'total' bytes do arquivo 'fd_arquivo' lendo-os num buffer do processo e passando cada
+# bloco para 'escrever' (ex: sock.sendall ou conn.send_bytes).
+def enviar_copiando(fd_arquivo, escrever, total, progresso=None, bloco=BLOCO_PADRAO):
+    visao = memoryview(bytearray(bloco))
+    posicao = 0
+    while posicao < total:
+        lidos = os.readv(fd_arquivo, [visao[:min(bloco, total - posicao)]])
+        if not lidos:
+            break
+        escrever(visao[:lidos])
+        posicao += lidos
+        if progresso:
+            progresso.avancar(lidos)
+    return posicao
+
+
+# Grava 'total' bytes no arquivo 'fd_destino', recebendo cada bloco num buffer do processo com
+# 'ler_em(visao)', que devolve quantos bytes leu (ex: sock.recv_into ou conn.recv_bytes_into).
+def receber_copiando(ler_em, fd_destino, total, progresso=None, bloco=BLOCO_PADRAO):
+    visao = memoryview(bytearray(bloco))
+    recebidos = 0
+    while recebidos < total:
+        parte = ler_em(visao[:min(bloco, total - recebidos)])
+        if not parte:
+            break
+        escrever_tudo(fd_destino, visao[:parte])
+        recebidos += parte
+        if progresso:
+            progresso.avancar(parte)
+    return recebidos
+
+
+# Lê as opções da linha de comando.
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        description="Transfere um arquivo entre dois processos por Sockets e por Pipes, com as cópias feitas "
+                    "pelo kernel (sendfile/splice) e em espaço de usuário, e compara a vazão e o CPU.")
+    parser.add_argument("arquivo", help="Arquivo a transferir.")
+    parser.add_argument("--mecanismos", nargs="+", choices=["sockets", "pipes"], default=["sockets", "pipes"],
+                        help="Backends a comparar.")
+    parser.add_argument("--copias", nargs="+", choices=COPIAS, default=COPIAS, help="Tipos de cópia a comparar.")
+    parser.add_argument("--bloco", type=int, default=BLOCO_PADRAO >> 10,
+                        help="Tamanho de cada bloco transferido, em KB.")
+    parser.add_argument("--json", action="store_true",
+                        help="Emite um objeto JSON por linha em vez da tabela.")
+    return parser
+
+
+# Ponto de entrada da ferramenta.
+def main(argv=None):
+    from backend.rastreio import executar_demonstracao  # Importado aqui: a ferramenta executa as demonstrações.
+
+    args = criar_parser().parse_args(argv)
+    if not args.json:
+        print(f"{'mecanismo':<10}{'cópia':<10}{'MB':>10}{'MB/s':>10}{'CPU envio (ms)':>16}"
+              f"{'CPU recepção (ms)':>19}", flush=True)
+    for mecanismo in args.mecanismos:
+        for copia in args.copias:
+            eventos = executar_demonstracao(mecanismo, ["arquivo", "--arquivo", args.arquivo, "--copia", copia,
+                                                        "--bloco", str(args.bloco)])
+            # O relatório final de cada lado da transferência.
+            finais = {evento["progresso"]["sentido"]: evento for evento in eventos
+                      if evento.get("event") == "progresso" and evento["progresso"]["concluido"]}
+            recursos = {evento["source"]: evento["recursos"] for evento in eventos
+                        if evento.get("event") == "recursos"}
+            if len(finais) < 2:
+                print(f"{mecanismo}/{copia}: a transferência não terminou.", file=sys.stderr)
+                continue
+            envio, recepcao = finais["envio"], finais["recepcao"]
+
+            def cpu_ms(origem):
+                relatorio = recursos.get(origem, {})
+                return (relatorio.get("cpu_usuario_s", 0) + relatorio.get("cpu_sistema_s", 0)) * 1e3
+
+            resumo = {
+                "mecanismo": mecanismo,
+                "copia": copia,
+                "bytes": recepcao["progresso"]["bytes"],
+                "duracao_s": recepcao["progresso"]["duracao_s"],
+                "mb_por_s": recepcao["progresso"]["mb_por_s_medio"],
+                "cpu_envio_ms": cpu_ms(envio["source"]),
+                "cpu_recepcao_ms": cpu_ms(recepcao["source"]),
+            }
+            if args.json:
+                print(json.dumps(resumo), flush=True)
+            else:
+                print(f"{mecanismo:<10}{copia:<10}{resumo['bytes'] / 1e6:>10.1f}{resumo['mb_por_s']:>10.1f}"
+                      f"{resumo['cpu_envio_ms']:>16.1f}{resumo['cpu_recepcao_ms']:>19.1f}", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,12 +5,24 @@
 # -----------------------------------------------------------------------------
 
 import tkinter as tk  # Importa a biblioteca Tkinter para criar a interface gráfica e a renomeia para 'tk'.
-from tkinter import scrolledtext, ttk, messagebox  # Importa componentes específicos do Tkinter.
+from tkinter import scrolledtext, ttk, messagebox, filedialog  # Importa componentes específicos do Tkinter.
 import subprocess  # Importa a biblioteca para executar processos externos (os scripts de backend).
 import json  # Importa a biblioteca para trabalhar com dados no formato JSON.
 import threading  # Importa a biblioteca para executar tarefas em paralelo (evitar que a GUI trave).
 import queue  # Importa uma estrutura de fila segura para comunicação entre threads.
+import selectors  # Importa o multiplexador de E/S que lê as saídas de todas as sessões numa única thread.
 import sys  # Importa a biblioteca do sistema, usada aqui para encontrar o executável do Python.
+import os  # Importa a biblioteca do sistema para localizar a raiz do projeto.
+import math  # Importa funções matemáticas para as escalas logarítmicas dos gráficos.
+import time  # Importa a biblioteca de tempo para identificar cada execução do benchmark.
+
+# Torna o pacote 'backend' importável quando a GUI é executada como 'python frontend/main_gui.py'.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.daemon import DISPONIVEL as DAEMON_DISPONIVEL, SessaoDaemon, garantir_daemon  # Cliente do daemon.
+# Canal binário de telemetria dos backends.
+from backend.telemetria import DecodificadorTelemetria, criar_canal
+from backend.bench import MECANISMOS as BENCH_MECHANISMS, formatar_tamanho  # Mecanismos do benchmark.
+from backend.transferencia import COPIAS  # Tipos de cópia da transferência de arquivos.
 
 
 # Define a classe principal da aplicação.
@@ -20,36 +32,85 @@ class App:
         # Mapeia o nome do backend para os rótulos que aparecerão na tela.
         "pipes": {"labels": ["Processo Pai", "Processo Filho"]},
         "sockets": {"labels": ["Servidor", "Cliente"]},
-        "shared_memory": {"labels": ["Processo Escritor", "Processo Leitor"]}
+        "shared_memory": {"labels": ["Processo Escritor", "Processo Leitor"]},
+        "mmap_file": {"labels": ["Processo Escritor", "Processo Leitor"]}
     }
+    # Métodos que aceitam um arquivo no lugar da mensagem (opção --arquivo do backend).
+    FILE_METHODS = ("pipes", "sockets")
+    # Máximo de cópias do mesmo cenário iniciadas por um clique.
+    MAX_COPIES = 16
+
+    # Limite da exibição dos logs: itens da fila processados por volta de process_log_queue.
+    MAX_LINES_PER_TICK = 2000
+    # Intervalos (ms) entre as verificações da fila: com a fila cheia, com logs chegando e o máximo ocioso.
+    POLL_MIN_MS = 10
+    POLL_ACTIVE_MS = 50
+    POLL_MAX_MS = 200
+    # Colunas do resumo de recursos por papel: (campo do relatório, título, largura, escala, formato).
+    RESOURCE_COLUMNS = (
+        ("mensagens", "Msgs", 60, 1, "d"),
+        ("cpu_usuario_s", "CPU usr (ms)", 90, 1e3, ".1f"),
+        ("cpu_sistema_s", "CPU sys (ms)", 90, 1e3, ".1f"),
+        ("cpu_por_mensagem_us", "CPU/msg (us)", 90, 1, ".1f"),
+        ("rss_pico_kb", "RSS pico (MB)", 90, 1 / 1024, ".1f"),
+        ("trocas_voluntarias", "Trocas vol.", 80, 1, "d"),
+        ("trocas_involuntarias", "Trocas invol.", 85, 1, "d"),
+        ("syscalls", "read/write", 75, 1, "d"),
+        ("rchar", "Lido (KB)", 75, 1 / 1024, ".1f"),
+        ("wchar", "Escrito (KB)", 80, 1 / 1024, ".1f"),
+    )
 
     # Método construtor, que é executado quando a classe é criada.
     def __init__(self, root):
         self.root = root  # Armazena a janela principal (root) na variável da classe.
         self.root.title("Visualizador de IPC Unificado")  # Define o título da janela.
-        self.root.geometry("950x650")  # Define o tamanho inicial da janela.
-        self.stopping = False
-        self.process = None  # Variável para armazenar o processo de backend em execução (começa como nulo).
-        self.log_queue = queue.Queue()  # Cria uma fila para receber as mensagens de log do backend.
+        self.root.geometry("950x820")  # Define o tamanho inicial da janela.
+        # Sessões da aba de demonstração, pelo número de cada uma (várias podem rodar ao mesmo tempo).
+        self.sessions = {}
+        self.session_count = 0
+        # Fila com os itens (número da sessão, linha ou registro) lidos das saídas de todas as sessões.
+        self.log_queue = queue.Queue()
+        # Uma única thread lê as saídas de todas as sessões, qualquer que seja o número delas.
+        self.multiplexer = OutputMultiplexer(self.log_queue)
+        self.poll_interval = self.POLL_ACTIVE_MS  # Intervalo atual entre as verificações da fila.
 
         # Cria uma variável especial do Tkinter para armazenar qual método de IPC foi escolhido.
         self.ipc_method_var = tk.StringVar(value="pipes")  # O valor inicial é "pipes".
+        # Variável que indica se os cenários rodam no daemon de backend (trabalhadores já aquecidos)
+        # em vez de um novo interpretador Python a cada clique.
+        self.use_daemon_var = tk.BooleanVar(value=False)
+        # Quantas sessões do cenário escolhido cada clique em "Iniciar" cria.
+        self.copies_var = tk.StringVar(value="1")
+        # Variáveis da transferência de arquivo: se está ligada, o caminho e o tipo de cópia.
+        self.send_file_var = tk.BooleanVar(value=False)
+        self.file_path_var = tk.StringVar()
+        self.copy_var = tk.StringVar(value=COPIAS[0])
 
         self._create_widgets()  # Chama o método que cria todos os botões, caixas de texto, etc.
 
-        # Agenda a função 'process_log_queue' para ser executada a cada 100ms para verificar novos logs.
-        self.root.after(100, self.process_log_queue)
+        # Agenda a função 'process_log_queue', que verifica novos logs em intervalos adaptativos.
+        self.root.after(self.poll_interval, self.process_log_queue)
         # Define uma função a ser chamada quando o usuário clica no 'X' para fechar a janela.
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
-        self.is_terminating_manually = False  # Flag para indicar encerramento manual
 
     # Método para criar os componentes visuais (widgets) da interface.
     def _create_widgets(self):
         """Cria e organiza todos os widgets na janela."""
 
+        # --- Abas: Demonstração e Benchmark ---
+        # Cria o caderno de abas que ocupa toda a janela.
+        notebook = ttk.Notebook(self.root)
+        notebook.pack(expand=True, fill=tk.BOTH)
+        # A aba de demonstração contém os controles e as sessões em execução.
+        demo_tab = ttk.Frame(notebook)
+        notebook.add(demo_tab, text="Demonstração")
+        # A aba de benchmark executa varreduras e plota os resultados ao vivo.
+        self.benchmark_panel = BenchmarkPanel(notebook, self.root)
+        notebook.add(self.benchmark_panel.frame, text="Benchmark")
+
         # --- Frame Superior: Controles ---
         # Cria um contêiner (frame) para os controles de configuração.
-        controls_frame = ttk.LabelFrame(self.root, text="Configuração", padding=(10, 10))
+        controls_frame = ttk.LabelFrame(demo_tab, text="Configuração", padding=(10, 10))
         # Posiciona o frame na janela, com algum espaçamento.
         controls_frame.pack(padx=10, pady=10, fill=tk.X)
 
@@ -87,213 +148,862 @@ class App:
         # Insere um texto padrão no campo de entrada.
         self.message_entry.insert(0, "Olá, mundo do IPC!")
 
+        # Arquivo a ser enviado no lugar da mensagem (só Pipes e Sockets).
+        file_frame = ttk.Frame(controls_frame)
+        file_frame.pack(fill=tk.X, pady=(0, 10))
+        ttk.Checkbutton(file_frame, text="Enviar arquivo:", variable=self.send_file_var).pack(side=tk.LEFT,
+                                                                                           padx=(0, 10))
+        ttk.Entry(file_frame, textvariable=self.file_path_var, width=45).pack(side=tk.LEFT, expand=True, fill=tk.X)
+        ttk.Button(file_frame, text="Escolher...", command=self.choose_file).pack(side=tk.LEFT, padx=5)
+        ttk.Label(file_frame, text="Cópia:").pack(side=tk.LEFT, padx=(10, 5))
+        ttk.Combobox(file_frame, textvariable=self.copy_var, values=COPIAS, state="readonly",
+                     width=8).pack(side=tk.LEFT)
+
         # Botões de Ação
         # Cria um frame para os botões de ação.
         button_frame = ttk.Frame(controls_frame)
         # Posiciona o frame na tela.
         button_frame.pack(fill=tk.X)
-        # Cria o botão "Iniciar Comunicação" e associa ao método 'start_process'.
+        # Cria o botão "Iniciar Comunicação" e associa ao método 'start_process'. Ele continua habilitado
+        # durante as execuções: cada clique abre novas sessões ao lado das que já estão rodando.
         self.start_button = ttk.Button(button_frame, text="Iniciar Comunicação", command=self.start_process)
         # Posiciona o botão à esquerda.
         self.start_button.pack(side=tk.LEFT, padx=5)
-        # Cria o botão "Parar" e associa ao método 'stop_process', começando desabilitado.
+        # Quantidade de cópias do cenário iniciadas a cada clique.
+        ttk.Label(button_frame, text="Cópias:").pack(side=tk.LEFT, padx=(5, 2))
+        ttk.Spinbox(button_frame, from_=1, to=self.MAX_COPIES, textvariable=self.copies_var,
+                    width=4).pack(side=tk.LEFT)
+        # Cria o botão "Parar", que interrompe a sessão da aba selecionada, começando desabilitado.
         self.stop_button = ttk.Button(button_frame, text="Parar", command=self.stop_process, state=tk.DISABLED)
         # Posiciona o botão à esquerda do anterior.
-        self.stop_button.pack(side=tk.LEFT, padx=5)
-
-        # --- Frame Inferior: Logs ---
-        # Cria um frame para a área de logs.
-        log_frame = ttk.Frame(self.root, padding=(10, 10))
-        # Posiciona o frame, fazendo-o ocupar todo o espaço restante.
-        log_frame.pack(pady=10, padx=10, expand=True, fill=tk.BOTH)
-        # Configura as colunas do grid para terem o mesmo peso (se expandirem igualmente).
-        log_frame.grid_columnconfigure(0, weight=1)
-        log_frame.grid_columnconfigure(1, weight=1)
-        # Configura a linha do grid para se expandir verticalmente.
-        log_frame.grid_rowconfigure(1, weight=1)
-
-        # Cria o rótulo para a primeira área de log.
-        self.log_label_1 = ttk.Label(log_frame, text="Processo 1", font=("Helvetica", 12, "bold"))
-        # Posiciona o rótulo na primeira linha e primeira coluna do grid.
-        self.log_label_1.grid(row=0, column=0, pady=(0, 5))
-        # Cria o rótulo para a segunda área de log.
-        self.log_label_2 = ttk.Label(log_frame, text="Processo 2", font=("Helvetica", 12, "bold"))
-        # Posiciona o rótulo na primeira linha e segunda coluna do grid.
-        self.log_label_2.grid(row=0, column=1, pady=(0, 5))
-
-        # Cria a primeira caixa de texto com barra de rolagem para os logs.
-        self.log_area_1 = scrolledtext.ScrolledText(log_frame, wrap=tk.WORD, width=45, height=20)
-        # Posiciona a caixa de texto para ocupar todo o espaço da célula do grid.
-        self.log_area_1.grid(row=1, column=0, sticky="nsew", padx=(0, 5))
-        # Cria a segunda caixa de texto com barra de rolagem.
-        self.log_area_2 = scrolledtext.ScrolledText(log_frame, wrap=tk.WORD, width=45, height=20)
-        # Posiciona a segunda caixa de texto na célula ao lado.
-        self.log_area_2.grid(row=1, column=1, sticky="nsew", padx=(5, 0))
+        self.stop_button.pack(side=tk.LEFT, padx=(15, 5))
+        # Interrompe todas as sessões em execução.
+        self.stop_all_button = ttk.Button(button_frame, text="Parar Todas", command=self.stop_all_processes,
+                                          state=tk.DISABLED)
+        self.stop_all_button.pack(side=tk.LEFT, padx=5)
+        # Remove as abas (e as linhas do resumo) das sessões que já terminaram.
+        ttk.Button(button_frame, text="Fechar Concluídas", command=self.close_finished).pack(side=tk.LEFT, padx=5)
+        # Cria a caixa de seleção que envia as execuções ao daemon de backend (só no POSIX).
+        if DAEMON_DISPONIVEL:
+            ttk.Checkbutton(button_frame, text="Usar daemon",
+                            variable=self.use_daemon_var).pack(side=tk.LEFT, padx=15)
+
+        # --- Sessões: uma aba por execução, com as áreas de log e o progresso de cada uma ---
+        self.sessions_notebook = ttk.Notebook(demo_tab)
+        self.sessions_notebook.pack(padx=10, expand=True, fill=tk.BOTH)
+        # Os botões de parada acompanham a sessão selecionada.
+        self.sessions_notebook.bind("<<NotebookTabChanged>>", lambda _: self._update_buttons())
+
+        # --- Resumo: Recursos por Papel ---
+        # Tabela com os recursos que cada processo usou (eventos "recursos", enviados no fim de cada papel),
+        # agrupados por sessão, para comparar as sessões que rodaram ao mesmo tempo.
+        resources_frame = ttk.LabelFrame(demo_tab, text="Recursos por papel", padding=(10, 5))
+        resources_frame.pack(padx=10, pady=10, fill=tk.X)
+        columns = [name for name, *_ in self.RESOURCE_COLUMNS]
+        self.resources_table = ttk.Treeview(resources_frame, columns=columns, height=5)
+        # A primeira coluna (a árvore) mostra a sessão e, abaixo dela, a origem, ex: "SERVIDOR (PID: 123)".
+        self.resources_table.heading("#0", text="Papel")
+        self.resources_table.column("#0", width=200, stretch=True)
+        for name, title, width, _, _ in self.RESOURCE_COLUMNS:
+            self.resources_table.heading(name, text=title)
+            self.resources_table.column(name, width=width, anchor=tk.E, stretch=False)
+        self.resources_table.pack(fill=tk.X)
 
     # Método chamado quando o botão "Iniciar" é clicado.
     def start_process(self):
-        """Inicia o processo backend com base nas seleções do usuário."""
-        self.stopping = False
-
-        # Limpa o conteúdo das duas áreas de log.
-        self.log_area_1.delete('1.0', tk.END)
-        self.log_area_2.delete('1.0', tk.END)
-
+        """Inicia uma ou mais sessões do backend com base nas seleções do usuário."""
         # Obtém o método de IPC selecionado (ex: "pipes").
         ipc_method = self.ipc_method_var.get()
         # Obtém o texto digitado na caixa de mensagem.
         message_to_send = self.message_entry.get()
-
+        # Opções repassadas ao backend além da mensagem (ex: o arquivo a ser enviado).
+        extra_args = []
+
+        if self.send_file_var.get():
+            # No modo arquivo, o backend envia o conteúdo do arquivo e a mensagem não é usada.
+            file_path = self.file_path_var.get().strip()
+            if ipc_method not in self.FILE_METHODS:
+                messagebox.showerror("Erro", "O envio de arquivo está disponível para Pipes e Sockets.")
+                return
+            if not os.path.isfile(file_path):
+                messagebox.showerror("Erro", "Escolha um arquivo existente para enviar.")
+                return
+            extra_args = ["--arquivo", file_path, "--copia", self.copy_var.get()]
+            message_to_send = message_to_send or "arquivo"
         # Verifica se a mensagem não está vazia.
-        if not message_to_send.strip():
+        elif not message_to_send.strip():
             # Se estiver vazia, mostra uma mensagem de erro.
             messagebox.showerror("Erro", "A mensagem não pode estar vazia.")
             # E para a execução do método.
             return
 
-        # Busca os rótulos corretos no dicionário de configuração (ex: ["Processo Pai", "Processo Filho"]).
-        labels = self.IPC_CONFIG[ipc_method]["labels"]
-        # Atualiza o texto do primeiro rótulo de log.
-        self.log_label_1.config(text=labels[0])
-        # Atualiza o texto do segundo rótulo de log.
-        self.log_label_2.config(text=labels[1])
-
-        # Monta o comando que será executado no terminal.
-        # Ex: ["python", "-m", "backend.pipes.logic", "minha mensagem"]
-        command = [sys.executable, "-m", f"backend.{ipc_method}.logic", message_to_send]
-
-        # Inicia a execução do comando em um novo processo.
-        self.process = subprocess.Popen(
-            command,  # O comando a ser executado.
-            stdout=subprocess.PIPE,  # Redireciona a saída padrão do processo para que possamos lê-la.
-            stderr=subprocess.PIPE,  # Redireciona a saída de erro também.
-            text=True,  # Lê a saída como texto (string).
-            encoding='utf-8'  # Define a codificação do texto como UTF-8.
-        )
-
-        # Cria e Armazena as threads para que possam ser gerenciadas ao parar o processo
-        self.stdout_thread = threading.Thread(target=self.read_output, args=(self.process.stdout,), daemon=True)
-        self.stderr_thread = threading.Thread(target=self.read_output, args=(self.process.stderr,), daemon=True)
-        self.stdout_thread.start()
-        self.stderr_thread.start()
-
-        # Desabilita o botão "Iniciar" para evitar múltiplos cliques.
-        self.start_button.config(state=tk.DISABLED)
-        # Habilita o botão "Parar".
-        self.stop_button.config(state=tk.NORMAL)
-
-    # Método chamado quando o botão "Parar" é clicado.
-    def stop_process(self):
-        """Para o processo backend e sinaliza para a GUI parar de imprimir logs."""
-        # 1. ATIVA O MODO DE PARADA IMEDIATAMENTE.
-        # A partir deste ponto, process_log_queue vai ignorar logs do backend.
-        self.stopping = True
+        try:
+            copies = int(self.copies_var.get())
+            if not 1 <= copies <= self.MAX_COPIES:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Erro", f"O número de cópias deve estar entre 1 e {self.MAX_COPIES}.")
+            return
 
-        # 2. LIMPA A FILA de logs que podem ter chegado antes da flag ser checada.
-        while not self.log_queue.empty():
+        if self.use_daemon_var.get():
+            # Inicia o daemon na primeira vez; as sessões são criadas logo abaixo.
             try:
-                self.log_queue.get_nowait()
-            except queue.Empty:
+                garantir_daemon()
+            except OSError as erro:
+                messagebox.showerror("Erro", f"Não foi possível usar o daemon de backend: {erro}")
+                return
+
+        session = None
+        for _ in range(copies):
+            session = self._start_session(ipc_method, [message_to_send, *extra_args])
+            if session is None:
                 break
+        # Mostra a última sessão criada e, com execuções começando, volta a verificar a fila com frequência.
+        if session is not None:
+            self.sessions_notebook.select(session.frame)
+        self.poll_interval = self.POLL_ACTIVE_MS
+        self._update_buttons()
+
+    # Cria a aba de uma sessão e inicia o seu backend. Devolve a sessão, ou None se o backend não pôde ser iniciado.
+    def _start_session(self, ipc_method, arguments):
+        self.session_count += 1
+        session = SessionPanel(self.sessions_notebook, self.session_count, ipc_method,
+                               self.IPC_CONFIG[ipc_method]["labels"])
+
+        if self.use_daemon_var.get():
+            # Envia o cenário ao daemon. A sessão tem a mesma interface de um subprocess.Popen, então o
+            # restante da GUI não precisa saber qual caminho foi usado.
+            try:
+                session.process = SessaoDaemon(ipc_method, arguments)
+            except OSError as erro:
+                session.frame.destroy()
+                messagebox.showerror("Erro", f"Não foi possível usar o daemon de backend: {erro}")
+                return None
+        else:
+            # Monta o comando que será executado no terminal.
+            # Ex: ["python", "-m", "backend.pipes.logic", "minha mensagem"]
+            command = [sys.executable, "-m", f"backend.{ipc_method}.logic", *arguments]
+
+            # Cria o canal de telemetria: os eventos do backend chegam por ele em registros binários,
+            # separados da saída padrão (que fica só com erros e tracebacks). O Windows não repassa
+            # descritores ao processo filho (pass_fds); lá o backend, sem o canal, emite os eventos
+            # como linhas JSON na saída padrão, que a GUI também interpreta.
+            extra_popen = {}
+            if os.name == "posix":
+                telemetry_fd, telemetry_write_fd, telemetry_env = criar_canal()
+                extra_popen = {
+                    "pass_fds": (telemetry_write_fd,),  # Repassa a ponta de escrita do canal ao backend.
+                    "env": {**os.environ, **telemetry_env},  # Informa ao backend qual descritor usar.
+                }
+
+            # Inicia a execução do comando em um novo processo. A saída é lida em bytes pelo
+            # OutputMultiplexer, que a decodifica linha a linha.
+            session.process = subprocess.Popen(
+                command,  # O comando a ser executado.
+                stdout=subprocess.PIPE,  # Redireciona a saída padrão do processo para que possamos lê-la.
+                stderr=subprocess.PIPE,  # Redireciona a saída de erro também.
+                **extra_popen
+            )
+            if extra_popen:
+                # A GUI só lê o canal: fechar sua cópia da ponta de escrita faz a leitura terminar
+                # quando o último processo do backend sair.
+                os.close(telemetry_write_fd)
+                self.multiplexer.add_telemetry(session.session_id, telemetry_fd)
+                session.open_streams += 1
+
+        self.multiplexer.add_lines(session.session_id, session.process.stdout)
+        session.open_streams += 1
+        # No daemon, a saída de erro chega misturada à saída padrão, pelo mesmo socket.
+        if session.process.stderr is not None:
+            self.multiplexer.add_lines(session.session_id, session.process.stderr)
+            session.open_streams += 1
+
+        self.sessions[session.session_id] = session
+        self.sessions_notebook.add(session.frame, text=session.title)
+        return session
+
+    # Sessão da aba selecionada (None se não houver nenhuma).
+    def _selected_session(self):
+        selected = self.sessions_notebook.select()
+        for session in self.sessions.values():
+            if str(session.frame) == selected:
+                return session
+        return None
 
-        # 3. TERMINA O PROCESSO E AS THREADS DE LEITURA (boa prática)
-        if self.process and self.process.poll() is None:
+    # Método chamado quando o botão "Parar" é clicado.
+    def stop_process(self):
+        """Para o backend da sessão selecionada e sinaliza para a GUI parar de imprimir os seus logs."""
+        session = self._selected_session()
+        if session is not None:
+            self._stop_sessions([session])
+
+    # Método chamado quando o botão "Parar Todas" é clicado (ou a janela é fechada).
+    def stop_all_processes(self):
+        """Para o backend de todas as sessões em execução."""
+        self._stop_sessions(list(self.sessions.values()))
+
+    # Termina os backends das sessões: primeiro pede a todos que terminem e só depois espera cada um,
+    # para que parar várias sessões não some as esperas.
+    def _stop_sessions(self, sessions):
+        running = [session for session in sessions if not session.finished and not session.stopping]
+        for session in running:
+            # A partir deste ponto, process_log_queue ignora os logs do backend desta sessão.
+            session.stopping = True
+            if session.process.poll() is None:
+                session.process.terminate()
+        for session in running:
             try:
-                self.process.terminate()
-                self.process.wait(timeout=1.0)
+                session.process.wait(timeout=1.0)
             except subprocess.TimeoutExpired:
-                self.process.kill()
-                self.process.wait()
-            
-            if self.stdout_thread and self.stdout_thread.is_alive():
-                self.stdout_thread.join(timeout=0.5)
-            if self.stderr_thread and self.stderr_thread.is_alive():
-                self.stderr_thread.join(timeout=0.5)
-            self.process = None
-
-        # 4. ENVIA A MENSAGEM FINAL, que será a única permitida pelo filtro.
-        # Usamos 'App' como 'source' para que o filtro a reconheça.
-        log_msg = {"source": "App", "payload": {"message": "Processo finalizado pelo usuário."}}
-        self.log_queue.put(json.dumps(log_msg) + '\n')
-
-        # 5. ATUALIZA A INTERFACE
-        self.start_button.config(state=tk.NORMAL)
-        self.stop_button.config(state=tk.DISABLED)
-
-    # Método executado pelas threads para ler a saída do processo de backend.
-    def read_output(self, pipe):
-        """Lê a saída (stdout/stderr) do processo linha por linha e a coloca na fila."""
-        # Loop que lê cada linha da saída do processo.
-        for line in iter(pipe.readline, ''):
-            # Se a linha não estiver vazia.
-            if line:
-                # Coloca a linha na fila para ser processada pela thread principal da GUI.
-                self.log_queue.put(line)
-        # Fecha o canal de comunicação quando a leitura terminar.
-        pipe.close()
+                session.process.kill()
+                session.process.wait()
+            # A saída termina com o processo; a thread de leitura recebe o fim dos fluxos e avisa pela fila.
+            session.append_lines(["[APP]: Processo finalizado pelo usuário.\n"], [])
+            self.sessions_notebook.tab(session.frame, text=f"{session.title} (interrompida)")
+        self._update_buttons()
+
+    # Remove as abas e as linhas do resumo das sessões que já terminaram.
+    def close_finished(self):
+        for session_id, session in list(self.sessions.items()):
+            if session.finished:
+                self.sessions_notebook.forget(session.frame)
+                session.frame.destroy()
+                if self.resources_table.exists(session.resources_node):
+                    self.resources_table.delete(session.resources_node)
+                del self.sessions[session_id]
+        self._update_buttons()
+
+    # Habilita "Parar" se a sessão selecionada está rodando e "Parar Todas" se alguma está.
+    def _update_buttons(self):
+        def running(session):
+            return session is not None and not session.finished and not session.stopping
+
+        selected = self._selected_session()
+        self.stop_button.config(state=tk.NORMAL if running(selected) else tk.DISABLED)
+        any_running = any(running(session) for session in self.sessions.values())
+        self.stop_all_button.config(state=tk.NORMAL if any_running else tk.DISABLED)
 
     # Método que é executado repetidamente para exibir os logs na tela.
     def process_log_queue(self):
-        """Processa as mensagens da fila e as exibe nas áreas de log corretas."""
+        """Processa os itens da fila e os exibe nas áreas de log das sessões corretas.
+
+        As linhas de cada volta são agrupadas e inseridas de uma só vez em cada área, com no máximo
+        MAX_LINES_PER_TICK itens por volta, para que a interface continue respondendo mesmo quando os
+        backends geram dezenas de milhares de eventos por segundo.
+        """
+        # Texto acumulado nesta volta para as duas áreas de log de cada sessão.
+        pending = {}
+        # Sessões com progresso de transferência novo nesta volta.
+        progress_sessions = set()
+        processed = 0
         try:
-            while True:
-                line = self.log_queue.get_nowait()
+            while processed < self.MAX_LINES_PER_TICK:
+                session_id, line = self.log_queue.get_nowait()
+                processed += 1
+                session = self.sessions.get(session_id)
+                # Sessão já fechada: descarta o que ainda estava na fila.
+                if session is None:
+                    continue
+                # None marca o fim de um dos fluxos da sessão (stdout, stderr ou telemetria).
+                if line is None:
+                    session.open_streams -= 1
+                    continue
+                # Sessão interrompida pelo usuário: os logs que ainda chegam são descartados.
+                if session.stopping:
+                    continue
+                pending_1, pending_2 = pending.setdefault(session, ([], []))
+                # Rótulos do método da sessão, já em maiúsculas (calculados uma vez na criação da sessão).
+                label_1, label_2 = session.labels
                 try:
-                    log_entry = json.loads(line)
-
-                    # --- NOVA LÓGICA DE FILTRAGEM ---
-                    # Se estamos no processo de parada E a mensagem NÃO é da nossa GUI,
-                    # simplesmente descarte-a e pule para a próxima da fila.
-                    if self.stopping and log_entry.get('source') != 'App':
-                        continue # Ignora o log e continua o loop
+                    # Registros do canal de telemetria já chegam decodificados; linhas da saída padrão são JSON.
+                    log_entry = line if isinstance(line, dict) else json.loads(line)
+
+                    # Marcas de rastreio (backend/rastreio.py) são para análise, não para as áreas de log.
+                    if log_entry.get('event') == 'rastro':
+                        continue
+                    # Relatórios de recursos vão para a tabela de resumo.
+                    if log_entry.get('event') == 'recursos':
+                        self._add_resource_row(session, log_entry['source'], log_entry['recursos'])
+                        continue
+                    # O progresso das transferências de arquivo vai para a barra de progresso da sessão.
+                    if log_entry.get('event') == 'progresso':
+                        session.transfer_progress[log_entry['progresso']['sentido']] = log_entry['progresso']
+                        progress_sessions.add(session)
+                        continue
 
-                    # O código abaixo só será executado para logs do backend (se não estiver parando)
-                    # ou para a nossa mensagem final "App".
                     source = log_entry.get('source', 'Desconhecido')
                     payload = log_entry.get('payload', {})
                     message = payload.get('message', '')
-                    formatted_log = f"-> {message}\n"
+                    source_upper = source.upper()
 
-                    ipc_method = self.ipc_method_var.get()
-                    labels = self.IPC_CONFIG[ipc_method]["labels"]
-
-                    if labels[0].upper() in source.upper():
-                        self.log_area_1.insert(tk.END, formatted_log)
-                        self.log_area_1.see(tk.END)
-                    elif labels[1].upper() in source.upper():
-                        self.log_area_2.insert(tk.END, formatted_log)
-                        self.log_area_2.see(tk.END)
+                    if label_1 in source_upper:
+                        pending_1.append(f"-> {message}\n")
+                    elif label_2 in source_upper:
+                        pending_2.append(f"-> {message}\n")
                     else:
-                        # Trata a mensagem da "App" e outras fontes desconhecidas
-                        self.log_area_1.insert(tk.END, f"[{source.upper()}]: {message}\n")
-                        self.log_area_1.see(tk.END)
+                        # Trata as fontes desconhecidas (ex: "MAIN")
+                        pending_1.append(f"[{source_upper}]: {message}\n")
 
                 except json.JSONDecodeError:
-                    # Se não for um JSON válido e não estivermos parando, exibe como log bruto.
-                    if not self.stopping:
-                        self.log_area_1.insert(tk.END, f"[LOG BRUTO]: {line}")
+                    # Se não for um JSON válido, exibe como log bruto.
+                    pending_1.append(f"[LOG BRUTO]: {line}")
 
         except queue.Empty:
             pass  # Fila vazia, comportamento normal.
 
-        # Lógica para reativar o botão Iniciar quando o processo termina sozinho
-        if self.process and self.process.poll() is not None:
-            if not self.stopping: # Só reativa se não foi o usuário que parou
-                self.start_button.config(state=tk.NORMAL)
-                self.stop_button.config(state=tk.DISABLED)
-                self.process = None
+        # Uma única inserção (e um único 'see') por área de log de cada sessão em cada volta.
+        for session, (pending_1, pending_2) in pending.items():
+            session.append_lines(pending_1, pending_2)
+        # A barra só é redesenhada uma vez por volta, com o progresso mais recente.
+        for session in progress_sessions:
+            session.update_progress()
+
+        # Uma sessão termina quando todos os seus fluxos chegaram ao fim e o processo saiu.
+        finished = False
+        for session in self.sessions.values():
+            if not session.finished and session.open_streams == 0 and session.process.poll() is not None:
+                session.finished = True
+                finished = True
+                if not session.stopping:
+                    self.sessions_notebook.tab(session.frame, text=f"{session.title} (concluída)")
+        if finished:
+            self._update_buttons()
+
+        # Intervalo adaptativo: volta logo se ainda há linhas na fila, e espaça as verificações
+        # (até POLL_MAX_MS) enquanto não chega nada.
+        if processed >= self.MAX_LINES_PER_TICK:
+            self.poll_interval = self.POLL_MIN_MS
+        elif processed:
+            self.poll_interval = self.POLL_ACTIVE_MS
+        else:
+            self.poll_interval = min(self.poll_interval * 2, self.POLL_MAX_MS)
+        self.root.after(self.poll_interval, self.process_log_queue)
+
+    # Abre o seletor de arquivos e liga o envio de arquivo com o arquivo escolhido.
+    def choose_file(self):
+        path = filedialog.askopenfilename(title="Arquivo a ser enviado")
+        if path:
+            self.file_path_var.set(path)
+            self.send_file_var.set(True)
+
+    # Acrescenta ao resumo a linha de um papel, com os campos do relatório de backend/recursos.py,
+    # abaixo da linha da sessão (criada no primeiro relatório).
+    def _add_resource_row(self, session, source, report):
+        if not self.resources_table.exists(session.resources_node):
+            self.resources_table.insert("", tk.END, iid=session.resources_node, text=session.title, open=True)
+        if "syscr" in report:
+            report = {**report, "syscalls": report["syscr"] + report["syscw"]}
+        values = []
+        for name, _, _, scale, fmt in self.RESOURCE_COLUMNS:
+            value = report.get(name)
+            values.append("-" if value is None else format(value * scale, fmt))
+        self.resources_table.insert(session.resources_node, tk.END, text=source, values=values)
 
-        self.root.after(100, self.process_log_queue)
-        
     # Método chamado quando a janela é fechada.
     def on_close(self):
         """Função chamada ao fechar a janela."""
-        # Para qualquer processo de backend que esteja em execução.
-        self.stop_process()
+        # Para os backends de todas as sessões em execução.
+        self.stop_all_processes()
+        # Para a varredura de benchmark, se houver uma em andamento.
+        self.benchmark_panel.stop_benchmark()
+        # Encerra a thread que lê as saídas das sessões.
+        self.multiplexer.close()
         # Fecha e destrói a janela da aplicação.
         self.root.destroy()
 
 
+# Define uma sessão da aba de demonstração.
+class SessionPanel:
+    """Uma execução de backend na aba de demonstração: o processo, as duas áreas de log e a barra de progresso.
+
+    Várias sessões rodam ao mesmo tempo, cada uma na sua aba; as saídas de todas são lidas pelo
+    OutputMultiplexer e distribuídas por App.process_log_queue.
+    """
+
+    # Linhas mantidas em cada área de log (as mais antigas são descartadas).
+    MAX_LINES_PER_PANE = 5000
+
+    def __init__(self, parent, session_id, ipc_method, labels):
+        self.session_id = session_id
+        self.title = f"#{session_id} {ipc_method.replace('_', ' ').title()}"
+        # Linha da sessão no resumo de recursos; os papéis ficam abaixo dela.
+        self.resources_node = f"sessao-{session_id}"
+        # Rótulos (em maiúsculas) usados para direcionar cada log à sua área.
+        self.labels = (labels[0].upper(), labels[1].upper())
+        self.process = None  # Processo de backend (subprocess.Popen ou SessaoDaemon).
+        self.stopping = False  # Interrompida pelo usuário: os logs que ainda chegam são descartados.
+        self.finished = False
+        # Fluxos da sessão (stdout, stderr, telemetria) que ainda não chegaram ao fim.
+        self.open_streams = 0
+        # Último progresso de cada lado da transferência ("envio" e "recepcao").
+        self.transfer_progress = {}
+
+        self.frame = ttk.Frame(parent, padding=(10, 10))
+
+        # --- Progresso da Transferência de Arquivo ---
+        # Barra com o avanço de quem recebe e a vazão ao vivo dos dois lados (eventos "progresso").
+        progress_frame = ttk.Frame(self.frame)
+        progress_frame.pack(fill=tk.X, pady=(0, 5))
+        self.progress_bar = ttk.Progressbar(progress_frame, maximum=100)
+        self.progress_bar.pack(side=tk.LEFT, expand=True, fill=tk.X)
+        self.progress_label = ttk.Label(progress_frame, text="", width=60)
+        self.progress_label.pack(side=tk.LEFT, padx=(10, 0))
+
+        # --- Logs ---
+        log_frame = ttk.Frame(self.frame)
+        log_frame.pack(expand=True, fill=tk.BOTH)
+        # Configura as colunas do grid para terem o mesmo peso (se expandirem igualmente).
+        log_frame.grid_columnconfigure(0, weight=1)
+        log_frame.grid_columnconfigure(1, weight=1)
+        # Configura a linha do grid para se expandir verticalmente.
+        log_frame.grid_rowconfigure(1, weight=1)
+        # Um rótulo e uma caixa de texto com barra de rolagem para cada papel.
+        ttk.Label(log_frame, text=labels[0], font=("Helvetica", 12, "bold")).grid(row=0, column=0, pady=(0, 5))
+        ttk.Label(log_frame, text=labels[1], font=("Helvetica", 12, "bold")).grid(row=0, column=1, pady=(0, 5))
+        self.log_area_1 = scrolledtext.ScrolledText(log_frame, wrap=tk.WORD, width=45, height=16)
+        self.log_area_1.grid(row=1, column=0, sticky="nsew", padx=(0, 5))
+        self.log_area_2 = scrolledtext.ScrolledText(log_frame, wrap=tk.WORD, width=45, height=16)
+        self.log_area_2.grid(row=1, column=1, sticky="nsew", padx=(5, 0))
+
+    # Insere as linhas de cada papel na sua área de log.
+    def append_lines(self, lines_1, lines_2):
+        self._append_lines(self.log_area_1, lines_1)
+        self._append_lines(self.log_area_2, lines_2)
+
+    # Insere um bloco de linhas numa área de log e descarta as mais antigas além de MAX_LINES_PER_PANE.
+    def _append_lines(self, log_area, lines):
+        if not lines:
+            return
+        # Numa rajada, só as últimas MAX_LINES_PER_PANE linhas chegariam a ficar na tela.
+        log_area.insert(tk.END, "".join(lines[-self.MAX_LINES_PER_PANE:]))
+        total_lines = int(log_area.index('end-1c').split('.')[0])
+        excess = total_lines - self.MAX_LINES_PER_PANE
+        if excess > 0:
+            log_area.delete('1.0', f"{excess + 1}.0")
+        log_area.see(tk.END)
+
+    # Atualiza a barra com o avanço de quem recebe (ou de quem envia, antes do primeiro evento do outro
+    # lado) e o texto com a vazão de cada lado: a do último intervalo, ou a média quando concluído.
+    def update_progress(self):
+        reference = self.transfer_progress.get("recepcao") or self.transfer_progress.get("envio")
+        if reference["total"]:
+            self.progress_bar.config(value=100 * reference["bytes"] / reference["total"])
+        parts = []
+        for direction, title in (("envio", "Envio"), ("recepcao", "Recepção")):
+            report = self.transfer_progress.get(direction)
+            if report is not None:
+                rate = report["mb_por_s_medio"] if report["concluido"] else report["mb_por_s"]
+                parts.append(f"{title}: {report['bytes'] / 1e6:.0f}/{report['total'] / 1e6:.0f} MB, {rate:.0f} MB/s")
+        self.progress_label.config(text="  |  ".join(parts))
+
+
+# Define o leitor das saídas de todas as sessões.
+class OutputMultiplexer:
+    """Lê a saída padrão, a de erro e o canal de telemetria de todas as sessões numa única thread (selectors).
+
+    Cada linha (ou registro de telemetria) lida vira um item (número da sessão, linha ou registro) na fila
+    da GUI, e o fim de cada fluxo, um item (número da sessão, None). Os fluxos novos são entregues à thread
+    por uma lista e um pipe de despertar, para que só ela use o seletor. No Windows, onde o seletor só
+    aceita sockets, cada fluxo é lido por uma thread própria.
+    """
+
+    # Bytes lidos de um fluxo a cada vez que ele fica pronto.
+    READ_SIZE = 65536
+    # Uma única thread com o seletor (POSIX) ou uma thread por fluxo (Windows).
+    USE_SELECTOR = os.name == "posix"
+
+    def __init__(self, output_queue):
+        self.output_queue = output_queue
+        if not self.USE_SELECTOR:
+            return
+        self.selector = selectors.DefaultSelector()
+        self._pending = []  # Fluxos aguardando o registro no seletor.
+        self._lock = threading.Lock()
+        self._closed = False
+        # Um byte neste pipe acorda a thread para registrar os fluxos novos (ou encerrar).
+        self._wake_read, self._wake_write = os.pipe()
+        os.set_blocking(self._wake_read, False)
+        self.selector.register(self._wake_read, selectors.EVENT_READ, None)
+        threading.Thread(target=self._run, daemon=True).start()
+
+    # Registra um fluxo de linhas: a saída de um subprocess.Popen ou de uma SessaoDaemon.
+    def add_lines(self, session_id, stream):
+        self._add({"session": session_id, "fd": stream.fileno(), "decoder": None, "close": stream.close,
+                   "buffer": bytearray()})
+
+    # Registra a ponta de leitura de um canal de telemetria, que é fechada no fim do fluxo.
+    def add_telemetry(self, session_id, fd):
+        self._add({"session": session_id, "fd": fd, "decoder": DecodificadorTelemetria(),
+                   "close": lambda: os.close(fd), "buffer": None})
+
+    def _add(self, stream):
+        if not self.USE_SELECTOR:
+            threading.Thread(target=self._read_until_end, args=(stream,), daemon=True).start()
+            return
+        with self._lock:
+            self._pending.append(stream)
+        os.write(self._wake_write, b"\0")
+
+    # Encerra a thread de leitura. Os fluxos ainda abertos terminam com os seus processos.
+    def close(self):
+        if not self.USE_SELECTOR:
+            return
+        self._closed = True
+        os.write(self._wake_write, b"\0")
+
+    # Laço da thread: espera qualquer fluxo ficar pronto e lê o que ele tiver.
+    def _run(self):
+        while not self._closed:
+            for key, _ in self.selector.select():
+                if key.data is None:
+                    self._register_pending()
+                else:
+                    self._read(key.data)
+        self.selector.close()
+        os.close(self._wake_read)
+        os.close(self._wake_write)
+
+    # Esvazia o pipe de despertar e registra os fluxos novos.
+    def _register_pending(self):
+        try:
+            while os.read(self._wake_read, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        with self._lock:
+            streams, self._pending = self._pending, []
+        for stream in streams:
+            self.selector.register(stream["fd"], selectors.EVENT_READ, stream)
+
+    # Laço da thread de um fluxo (sem o seletor): lê até o fim do fluxo.
+    def _read_until_end(self, stream):
+        while self._read(stream):
+            pass
+
+    # Lê um fluxo pronto e coloca na fila as linhas (ou registros) completas. Devolve False no fim do fluxo.
+    def _read(self, stream):
+        try:
+            data = os.read(stream["fd"], self.READ_SIZE)
+        except OSError:
+            data = b""
+        session_id = stream["session"]
+        if not data:
+            # Fim do fluxo: entrega a última linha incompleta, se houver, e avisa a GUI.
+            if self.USE_SELECTOR:
+                self.selector.unregister(stream["fd"])
+            if stream["buffer"]:
+                self.output_queue.put((session_id, stream["buffer"].decode("utf-8", errors="replace")))
+            stream["close"]()
+            self.output_queue.put((session_id, None))
+            return False
+        if stream["decoder"] is not None:
+            for record in stream["decoder"].alimentar(data):
+                self.output_queue.put((session_id, record))
+            return True
+        # Só as linhas completas saem; o restante fica no buffer até a próxima leitura.
+        buffer = stream["buffer"]
+        buffer += data
+        end = buffer.rfind(b"\n") + 1
+        if end:
+            for line in buffer[:end].decode("utf-8", errors="replace").splitlines(keepends=True):
+                self.output_queue.put((session_id, line))
+            del buffer[:end]
+        return True
+
+
+# Define a aba de benchmark da aplicação.
+class BenchmarkPanel:
+    """Executa uma varredura do benchmark (backend/bench.py) em segundo plano e plota os resultados ao vivo.
+
+    Cada linha JSON do benchmark é um ponto: a vazão (MB/s) e as latências p50/p99 aparecem nos
+    gráficos assim que chegam. As execuções anteriores continuam nos gráficos, em tons mais claros,
+    para comparação.
+    """
+
+    # Cores das séries (uma por combinação de mecanismo e concorrência).
+    COLORS = ["#1f77b4", "#d62728", "#2ca02c", "#ff7f0e", "#9467bd", "#8c564b", "#e377c2", "#17becf",
+              "#7f7f7f", "#bcbd22"]
+    # Execuções mantidas nos gráficos (a atual e as anteriores).
+    MAX_RUNS = 4
+    # Intervalo (ms) entre as verificações da fila de resultados.
+    POLL_MS = 100
+    # Margens da área de plotagem dentro de cada Canvas: esquerda, topo, direita, base.
+    MARGINS = (60, 28, 150, 35)
+    # Mecanismos marcados ao abrir a aba.
+    DEFAULT_MECHANISMS = ("pipes", "sockets", "shared_memory")
+
+    def __init__(self, parent, root):
+        self.root = root
+        self.frame = ttk.Frame(parent, padding=(10, 10))
+        self.process = None  # Processo do benchmark em execução.
+        self.stopping = False
+        self.result_queue = queue.Queue()  # Resultados lidos da saída do benchmark.
+        # Execuções plotadas, da mais antiga para a atual: {"label": ..., "results": [...]}.
+        self.runs = []
+        self.run_count = 0
+        # Cor fixa de cada série (mecanismo, concorrência), para que seja a mesma em todas as execuções.
+        self.series_colors = {}
+
+        self.mechanism_vars = {name: tk.BooleanVar(value=name in self.DEFAULT_MECHANISMS)
+                               for name in BENCH_MECHANISMS}
+        self.sizes_var = tk.StringVar(value="64 4096 65536 1048576")
+        self.concurrency_var = tk.StringVar(value="1 2")
+        self.messages_var = tk.StringVar(value="500")
+        self.status_var = tk.StringVar(value="Nenhuma execução.")
+
+        self._create_widgets()
+        self.root.after(self.POLL_MS, self.process_results)
+
+    # Cria os controles da varredura e os dois gráficos.
+    def _create_widgets(self):
+        # --- Controles da varredura ---
+        controls_frame = ttk.LabelFrame(self.frame, text="Varredura", padding=(10, 10))
+        controls_frame.pack(fill=tk.X)
+
+        # Um Checkbutton por mecanismo, em linhas de 5.
+        mechanisms_frame = ttk.Frame(controls_frame)
+        mechanisms_frame.pack(fill=tk.X, pady=(0, 8))
+        for i, (name, var) in enumerate(self.mechanism_vars.items()):
+            ttk.Checkbutton(mechanisms_frame, text=name, variable=var).grid(row=i // 5, column=i % 5, sticky="w",
+                                                                             padx=(0, 12))
+
+        # Eixos da varredura: tamanhos de payload, níveis de concorrência e mensagens por ponto.
+        params_frame = ttk.Frame(controls_frame)
+        params_frame.pack(fill=tk.X, pady=(0, 8))
+        ttk.Label(params_frame, text="Tamanhos (bytes):").pack(side=tk.LEFT)
+        ttk.Entry(params_frame, textvariable=self.sizes_var, width=30).pack(side=tk.LEFT, padx=(5, 15))
+        ttk.Label(params_frame, text="Concorrência:").pack(side=tk.LEFT)
+        ttk.Entry(params_frame, textvariable=self.concurrency_var, width=10).pack(side=tk.LEFT, padx=(5, 15))
+        ttk.Label(params_frame, text="Mensagens:").pack(side=tk.LEFT)
+        ttk.Entry(params_frame, textvariable=self.messages_var, width=8).pack(side=tk.LEFT, padx=(5, 0))
+
+        # Botões de ação e estado da execução.
+        button_frame = ttk.Frame(controls_frame)
+        button_frame.pack(fill=tk.X)
+        self.run_button = ttk.Button(button_frame, text="Executar Benchmark", command=self.start_benchmark)
+        self.run_button.pack(side=tk.LEFT, padx=5)
+        self.stop_button = ttk.Button(button_frame, text="Parar", command=self.stop_benchmark, state=tk.DISABLED)
+        self.stop_button.pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Limpar Execuções Anteriores", command=self.clear_runs).pack(side=tk.LEFT, padx=5)
+        ttk.Label(button_frame, textvariable=self.status_var).pack(side=tk.LEFT, padx=15)
+
+        # --- Gráficos: vazão e latência, lado a lado ---
+        charts_frame = ttk.Frame(self.frame)
+        charts_frame.pack(expand=True, fill=tk.BOTH, pady=(10, 0))
+        charts_frame.grid_columnconfigure(0, weight=1)
+        charts_frame.grid_columnconfigure(1, weight=1)
+        charts_frame.grid_rowconfigure(0, weight=1)
+        self.throughput_canvas = tk.Canvas(charts_frame, background="white", highlightthickness=0)
+        self.throughput_canvas.grid(row=0, column=0, sticky="nsew", padx=(0, 5))
+        self.latency_canvas = tk.Canvas(charts_frame, background="white", highlightthickness=0)
+        self.latency_canvas.grid(row=0, column=1, sticky="nsew", padx=(5, 0))
+        # Redesenha os gráficos quando a janela muda de tamanho.
+        self.throughput_canvas.bind("<Configure>", lambda _: self.redraw())
+        self.latency_canvas.bind("<Configure>", lambda _: self.redraw())
+
+    # Lê uma lista de inteiros positivos separados por espaços (ou vírgulas).
+    @staticmethod
+    def _parse_ints(text):
+        values = [int(value) for value in text.replace(",", " ").split()]
+        if not values or min(values) <= 0:
+            raise ValueError
+        return values
+
+    # Método chamado quando o botão "Executar Benchmark" é clicado.
+    def start_benchmark(self):
+        """Inicia o benchmark com a varredura escolhida, emitindo uma linha JSON por ponto."""
+        mechanisms = [name for name, var in self.mechanism_vars.items() if var.get()]
+        if not mechanisms:
+            messagebox.showerror("Erro", "Escolha ao menos um mecanismo.")
+            return
+        try:
+            sizes = self._parse_ints(self.sizes_var.get())
+            concurrency = self._parse_ints(self.concurrency_var.get())
+            messages = self._parse_ints(self.messages_var.get())
+        except ValueError:
+            messagebox.showerror("Erro", "Tamanhos, concorrência e mensagens devem ser inteiros positivos.")
+            return
+
+        command = [sys.executable, "-m", "backend.bench", "--json",
+                   "--mecanismos", *mechanisms,
+                   "--tamanhos", *map(str, sizes),
+                   "--concorrencia", *map(str, concurrency),
+                   "--mensagens", *map(str, messages)]
+        self.process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                        encoding='utf-8')
+        self.stopping = False
+
+        # Nova execução; as mais antigas além de MAX_RUNS saem dos gráficos.
+        self.run_count += 1
+        self.runs.append({"label": f"Execução {self.run_count} ({time.strftime('%H:%M:%S')})", "results": []})
+        del self.runs[:-self.MAX_RUNS]
+        self.total_points = len(mechanisms) * len(sizes) * len(concurrency) * len(messages)
+        self.status_var.set(f"{self.runs[-1]['label']}: 0 de {self.total_points} pontos...")
+
+        threading.Thread(target=self.read_results, args=(self.process,), daemon=True).start()
+        self.run_button.config(state=tk.DISABLED)
+        self.stop_button.config(state=tk.NORMAL)
+        self.redraw()
+
+    # Método chamado quando o botão "Parar" é clicado (ou a janela é fechada).
+    def stop_benchmark(self):
+        """Interrompe o benchmark em execução; os pontos já medidos continuam nos gráficos."""
+        if self.process and self.process.poll() is None:
+            self.stopping = True
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=1.0)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+    # Remove dos gráficos todas as execuções, menos a atual.
+    def clear_runs(self):
+        del self.runs[:-1]
+        self.redraw()
+
+    # Método executado por uma thread para ler os resultados do benchmark.
+    def read_results(self, process):
+        """Lê a saída do benchmark linha por linha e coloca cada resultado na fila."""
+        # A saída de erro é lida em paralelo, para que o benchmark não bloqueie com o pipe cheio.
+        errors = []
+        stderr_thread = threading.Thread(target=lambda: errors.extend(process.stderr), daemon=True)
+        stderr_thread.start()
+        for line in iter(process.stdout.readline, ''):
+            try:
+                self.result_queue.put(("result", json.loads(line)))
+            except json.JSONDecodeError:
+                errors.append(line)
+        process.stdout.close()
+        stderr_thread.join()
+        process.stderr.close()
+        self.result_queue.put(("done", process.wait(), "".join(errors[-20:])))
+
+    # Método que é executado repetidamente para incluir os novos resultados nos gráficos.
+    def process_results(self):
+        """Passa os resultados da fila para a execução atual e redesenha os gráficos se algo chegou."""
+        changed = False
+        try:
+            while True:
+                item = self.result_queue.get_nowait()
+                if item[0] == "result":
+                    results = self.runs[-1]["results"]
+                    results.append(item[1])
+                    self.status_var.set(f"{self.runs[-1]['label']}: {len(results)} de {self.total_points} pontos...")
+                    changed = True
+                else:
+                    _, returncode, errors = item
+                    label = self.runs[-1]["label"]
+                    points = len(self.runs[-1]["results"])
+                    if self.stopping:
+                        self.status_var.set(f"{label}: interrompida após {points} pontos.")
+                    elif returncode != 0:
+                        self.status_var.set(f"{label}: falhou após {points} pontos.")
+                        messagebox.showerror("Erro no benchmark", errors or f"Código de saída {returncode}.")
+                    else:
+                        self.status_var.set(f"{label}: concluída ({points} pontos).")
+                    self.process = None
+                    self.run_button.config(state=tk.NORMAL)
+                    self.stop_button.config(state=tk.DISABLED)
+        except queue.Empty:
+            pass
+        if changed:
+            self.redraw()
+        self.root.after(self.POLL_MS, self.process_results)
+
+    # Redesenha os dois gráficos com todas as execuções guardadas.
+    def redraw(self):
+        self._draw_chart(self.throughput_canvas, "Vazão (MB/s) x payload", [("mb_por_s", ())])
+        self._draw_chart(self.latency_canvas, "Latência (us) x payload: p50 ——  p99 - -",
+                         [("p50_us", ()), ("p99_us", (4, 3))])
+
+    # Clareia uma cor '#rrggbb' misturando-a com branco na proporção 'amount' (0 a 1).
+    @staticmethod
+    def _fade(color, amount):
+        r, g, b = (int(color[i:i + 2], 16) for i in (1, 3, 5))
+        return "#{:02x}{:02x}{:02x}".format(*(int(c + (255 - c) * amount) for c in (r, g, b)))
+
+    # Cor da série (mecanismo, concorrência), atribuída na primeira vez em que ela aparece.
+    def _series_color(self, key):
+        if key not in self.series_colors:
+            self.series_colors[key] = self.COLORS[len(self.series_colors) % len(self.COLORS)]
+        return self.series_colors[key]
+
+    # Limites (em log10) de um eixo, arredondados para potências de 10 inteiras.
+    @staticmethod
+    def _log_bounds(values):
+        low = math.floor(math.log10(min(values)))
+        high = math.ceil(math.log10(max(values)))
+        return (low, high) if high > low else (low, low + 1)
+
+    # Desenha um gráfico log-log de 'metrics' [(campo, traço da linha)] em função do tamanho do payload.
+    def _draw_chart(self, canvas, title, metrics):
+        canvas.delete("all")
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        left, top, right, bottom = self.MARGINS
+        if width <= left + right or height <= top + bottom:
+            return  # Canvas ainda não exibido.
+        canvas.create_text(left, 12, text=title, anchor="w", font=("Helvetica", 10, "bold"))
+
+        points = [(r["tamanho_payload"], r[field]) for run in self.runs for r in run["results"]
+                  for field, _ in metrics if r[field] > 0]
+        if not points:
+            canvas.create_text(width / 2, height / 2, text="Execute o benchmark para ver os resultados.",
+                               fill="gray")
+            return
+
+        # Escalas logarítmicas nos dois eixos.
+        x_low, x_high = self._log_bounds([x for x, _ in points])
+        y_low, y_high = self._log_bounds([y for _, y in points])
+        plot_right, plot_bottom = width - right, height - bottom
+
+        def to_canvas(x, y):
+            cx = left + (math.log10(x) - x_low) / (x_high - x_low) * (plot_right - left)
+            cy = plot_bottom - (math.log10(y) - y_low) / (y_high - y_low) * (plot_bottom - top)
+            return cx, cy
+
+        # Eixos e grade: uma linha por potência de 10 em y e um rótulo por tamanho medido em x.
+        canvas.create_rectangle(left, top, plot_right, plot_bottom, outline="#999999")
+        for exponent in range(y_low, y_high + 1):
+            _, cy = to_canvas(10 ** x_low, 10 ** exponent)
+            canvas.create_line(left, cy, plot_right, cy, fill="#eeeeee")
+            canvas.create_text(left - 5, cy, text=f"{10 ** exponent:g}", anchor="e", font=("Helvetica", 8))
+        for size in sorted({x for x, _ in points}):
+            cx, _ = to_canvas(size, 10 ** y_low)
+            canvas.create_line(cx, plot_bottom, cx, plot_bottom + 4, fill="#999999")
+            canvas.create_text(cx, plot_bottom + 6, text=formatar_tamanho(size), anchor="n", font=("Helvetica", 8))
+
+        # Uma linha por (execução, mecanismo, concorrência, métrica). As execuções anteriores são desenhadas
+        # primeiro, mais claras quanto mais antigas, e a atual fica por cima.
+        for age, run in reversed(list(enumerate(reversed(self.runs)))):
+            series = {}
+            for r in run["results"]:
+                series.setdefault((r["mecanismo"], r["concorrencia"]), []).append(r)
+            for key, results in series.items():
+                color = self._fade(self._series_color(key), min(0.8, 0.3 * age)) if age else self._series_color(key)
+                results.sort(key=lambda r: r["tamanho_payload"])
+                for field, dash in metrics:
+                    coords = [to_canvas(r["tamanho_payload"], r[field]) for r in results if r[field] > 0]
+                    if len(coords) > 1:
+                        options = {"dash": dash} if dash else {}
+                        canvas.create_line(*coords, fill=color, width=1 if age else 2, **options)
+                    for cx, cy in coords:
+                        canvas.create_oval(cx - 2, cy - 2, cx + 2, cy + 2, fill=color, outline=color)
+
+        # Legenda: as séries da execução atual e o significado dos tons mais claros.
+        legend_y = top
+        keys = sorted({(r["mecanismo"], r["concorrencia"]) for r in self.runs[-1]["results"]})
+        for mechanism, concurrency in keys:
+            color = self._series_color((mechanism, concurrency))
+            canvas.create_line(plot_right + 10, legend_y + 6, plot_right + 25, legend_y + 6, fill=color, width=2)
+            canvas.create_text(plot_right + 30, legend_y + 6, text=f"{mechanism} x{concurrency}", anchor="w",
+                               font=("Helvetica", 8))
+            legend_y += 15
+        if len(self.runs) > 1:
+            canvas.create_text(plot_right + 10, legend_y + 10, text="Tons claros:\nexecuções anteriores",
+                               anchor="nw", font=("Helvetica", 8), fill="gray")
+
+
 # Ponto de entrada do script: este código só executa se o arquivo for o principal.
 if __name__ == "__main__":
     root = tk.Tk()  # Cria a janela principal da aplicação.
@@ -0,0 +1,33 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: tests/test_percentil.py
+# DESCRIÇÃO: Testes do cálculo de percentis pelo posto mais próximo
+#            (percentil em backend/bench.py), usado pelo benchmark, pela
+#            topologia e pelo armazém de resultados.
+#
+# USO: python -m pytest tests/test_percentil.py
+# -----------------------------------------------------------------------------
+
+import pytest
+
+from backend.bench import percentil
+
+
+# Posto mais próximo: o menor valor com pelo menos p% da lista até ele (posto ceil(p/100 * N)).
+@pytest.mark.parametrize("p, esperado", [(0, 1), (1, 1), (20, 1), (21, 2), (50, 3), (80, 4), (99, 5), (100, 5)])
+def test_posto_mais_proximo(p, esperado):
+    assert percentil([1, 2, 3, 4, 5], p) == esperado
+
+
+# Nas listas longas, o posto não é arredondado para baixo (nem pelo arredondamento "metade para o par").
+def test_percentis_altos_em_listas_longas():
+    valores = list(range(1, 1501))
+    assert percentil(valores, 99.9) == 1499
+    assert percentil(valores, 99) == 1485
+    assert percentil(list(range(1, 101)), 7) == 7
+
+
+# Lista vazia devolve 0; com um único valor, todo percentil é esse valor.
+def test_listas_vazia_e_unitaria():
+    assert percentil([], 50) == 0
+    assert percentil([42], 0) == 42
+    assert percentil([42], 99.9) == 42
@@ -0,0 +1,36 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: tests/test_preencher_repetindo.py
+# DESCRIÇÃO: Testes do preenchimento dos segmentos do modo "segmento"
+#            (preencher_repetindo em backend/shared_memory/logic.py): o padrão
+#            repetido até o fim da visão, inclusive quando não a divide, e o
+#            padrão vazio.
+#
+# USO: python -m pytest tests/test_preencher_repetindo.py
+# -----------------------------------------------------------------------------
+
+import pytest
+
+from backend.shared_memory.logic import preencher_repetindo
+
+
+# O padrão se repete até o fim da visão, cortado no último trecho quando o tamanho não é múltiplo dele.
+@pytest.mark.parametrize("tamanho", [0, 1, 3, 4, 1000, 1024])
+def test_repete_o_padrao_ate_o_fim(tamanho):
+    visao = memoryview(bytearray(tamanho))
+    preencher_repetindo(visao, b"abcd")
+    assert bytes(visao) == (b"abcd" * (tamanho // 4 + 1))[:tamanho]
+
+
+# Um padrão maior que a visão é cortado no tamanho dela.
+def test_padrao_maior_que_a_visao():
+    visao = memoryview(bytearray(3))
+    preencher_repetindo(visao, b"mensagem")
+    assert bytes(visao) == b"men"
+
+
+# Com o padrão vazio (mensagem vazia e --tamanho-payload), a visão é preenchida com zeros, em vez
+# de o laço de dobrar o trecho preenchido nunca terminar.
+def test_padrao_vazio_preenche_com_zeros():
+    visao = memoryview(bytearray(b"\xff" * 1024))
+    preencher_repetindo(visao, b"")
+    assert bytes(visao) == bytes(1024)
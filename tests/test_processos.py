@@ -0,0 +1,46 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: tests/test_processos.py
+# DESCRIÇÃO: Testes do pool de processos pré-iniciados (PoolProcessos em
+#            backend/processos.py): tarefas que terminam bem, que levantam
+#            uma exceção e processos que morrem no meio da tarefa.
+#
+# USO: python -m pytest tests/test_processos.py
+# -----------------------------------------------------------------------------
+
+import os
+import time
+
+from backend.processos import PoolProcessos
+
+
+# Uma tarefa que termina bem devolve o processo ao pool, que o reaproveita na próxima.
+def test_tarefa_reaproveita_o_processo():
+    with PoolProcessos(tamanho=1) as pool:
+        tarefa = pool.executar(time.sleep, 0)
+        tarefa.join()
+        assert (tarefa.exitcode, tarefa.erro) == (0, None)
+        assert pool.executar(time.sleep, 0).pid == tarefa.pid
+
+
+# Uma exceção na tarefa vira exitcode 1 e a mensagem do erro, e o processo continua no pool.
+def test_tarefa_com_excecao():
+    with PoolProcessos(tamanho=1) as pool:
+        tarefa = pool.executar(time.sleep, -1)
+        tarefa.join()
+        assert tarefa.exitcode == 1
+        assert tarefa.erro.startswith("ValueError")
+        assert pool.executar(time.sleep, 0).pid == tarefa.pid
+
+
+# Um processo que morre no meio da tarefa não trava o join(): a tarefa termina com o código de saída
+# dele, e o pool inicia outro processo no lugar.
+def test_processo_morto_no_meio_da_tarefa_e_substituido():
+    with PoolProcessos(tamanho=1) as pool:
+        tarefa = pool.executar(os._exit, 3)
+        tarefa.join(timeout=10)
+        assert tarefa.exitcode == 3
+        assert str(tarefa.pid) in tarefa.erro
+        nova = pool.executar(time.sleep, 0)
+        assert nova.pid != tarefa.pid
+        nova.join(timeout=10)
+        assert nova.exitcode == 0
@@ -0,0 +1,146 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: tests/test_protocolo.py
+# DESCRIÇÃO: Testes do protocolo de quadros com prefixo de tamanho
+#            (backend/sockets/protocolo.py): quadros que chegam juntos ou
+#            partidos em vários recv(), o crescimento do buffer de recepção, o
+#            fechamento da conexão e os envios parciais do sendmsg().
+#
+# USO: python -m pytest tests/test_protocolo.py
+# -----------------------------------------------------------------------------
+
+import socket
+
+import pytest
+
+from backend.sockets.protocolo import (
+    CABECALHO_QUADRO, LIMITE_CONCATENAR, LeitorQuadros, encerrar_envio, enviar_quadro,
+)
+
+
+class SocketRoteirizado:
+    """Socket falso que entrega os bytes em pedaços pré-definidos, um por recv_into().
+
+    Depois do último pedaço, recv_into() devolve 0 (a conexão fechou).
+    """
+
+    def __init__(self, pedacos):
+        self.pedacos = [bytes(pedaco) for pedaco in pedacos]
+        self.leituras = 0
+
+    def recv_into(self, visao):
+        self.leituras += 1
+        if not self.pedacos:
+            return 0
+        pedaco = self.pedacos.pop(0)
+        n = min(len(pedaco), len(visao))
+        visao[:n] = pedaco[:n]
+        if n < len(pedaco):
+            self.pedacos.insert(0, pedaco[n:])
+        return n
+
+
+class SocketEnvioParcial:
+    """Socket falso cujo sendmsg() aceita no máximo 'limite' bytes por chamada."""
+
+    def __init__(self, limite):
+        self.limite = limite
+        self.enviado = bytearray()
+        self.chamadas = 0
+
+    def sendall(self, dados):
+        self.enviado += dados
+
+    def sendmsg(self, partes):
+        self.chamadas += 1
+        restante = self.limite
+        for parte in partes:
+            n = min(len(parte), restante)
+            self.enviado += parte[:n]
+            restante -= n
+            if not restante:
+                break
+        return self.limite - restante
+
+
+# Monta um quadro como enviar_quadro() o coloca no fio.
+def quadro(payload):
+    return CABECALHO_QUADRO.pack(len(payload)) + payload
+
+
+# Vários quadros que chegam num único recv() são separados sem novas leituras do socket.
+def test_varios_quadros_num_unico_recv():
+    sock = SocketRoteirizado([quadro(b"um") + quadro(b"") + quadro(b"tres")])
+    leitor = LeitorQuadros(sock)
+    assert bytes(leitor.receber()) == b"um"
+    assert leitor.tem_quadro()
+    assert bytes(leitor.receber()) == b""
+    assert bytes(leitor.receber()) == b"tres"
+    assert sock.leituras == 1
+    assert not leitor.tem_quadro()
+    assert leitor.receber() is None
+
+
+# Um quadro que chega byte a byte, com o cabeçalho partido, é remontado.
+def test_quadro_partido_em_varios_recv():
+    dados = quadro(b"mensagem partida") + quadro(b"outra")
+    sock = SocketRoteirizado([dados[i:i + 1] for i in range(len(dados))])
+    assert [bytes(visao) for visao in LeitorQuadros(sock)] == [b"mensagem partida", b"outra"]
+
+
+# Os bytes pendentes no fim do buffer são movidos para o início quando o próximo quadro não cabe.
+def test_reaproveita_o_buffer_movendo_os_pendentes():
+    payloads = [bytes([i]) * 20 for i in range(10)]
+    sock = SocketRoteirizado([b"".join(quadro(p) for p in payloads)])
+    leitor = LeitorQuadros(sock, tamanho_buffer=32)
+    assert [bytes(visao) for visao in leitor] == payloads
+
+
+# Um payload maior que o buffer faz o buffer crescer, e a visão já entregue continua válida.
+def test_buffer_cresce_para_payloads_grandes():
+    grande = bytes(range(256)) * 40
+    sock = SocketRoteirizado([quadro(b"antes"), quadro(grande)[:100], quadro(grande)[100:]])
+    leitor = LeitorQuadros(sock, tamanho_buffer=16)
+    antes = leitor.receber()
+    assert bytes(leitor.receber()) == grande
+    assert bytes(antes) == b"antes"
+
+
+# Fechar a conexão entre dois quadros é o fim limpo do fluxo; no meio de um quadro, é um erro.
+@pytest.mark.parametrize("corte", [1, CABECALHO_QUADRO.size - 1, CABECALHO_QUADRO.size,
+                                   CABECALHO_QUADRO.size + 3])
+def test_conexao_fechada_no_meio_do_quadro(corte):
+    sock = SocketRoteirizado([quadro(b"completo") + quadro(b"incompleto")[:corte]])
+    leitor = LeitorQuadros(sock)
+    assert bytes(leitor.receber()) == b"completo"
+    with pytest.raises(ConnectionError):
+        leitor.receber()
+
+
+# Payloads pequenos saem num único sendall() junto com o cabeçalho.
+def test_enviar_quadro_pequeno_concatena():
+    sock = SocketEnvioParcial(limite=1)
+    enviar_quadro(sock, b"x" * LIMITE_CONCATENAR)
+    assert sock.chamadas == 0
+    assert bytes(sock.enviado) == quadro(b"x" * LIMITE_CONCATENAR)
+
+
+# Payloads grandes saem por sendmsg(); os envios parciais continuam do ponto em que pararam,
+# inclusive no meio do cabeçalho.
+@pytest.mark.parametrize("limite", [3, 4, 4097, 1 << 20])
+def test_enviar_quadro_grande_com_envios_parciais(limite):
+    payload = bytes(range(256)) * 100
+    sock = SocketEnvioParcial(limite)
+    enviar_quadro(sock, payload)
+    assert bytes(sock.enviado) == quadro(payload)
+    assert sock.chamadas == -(-len(quadro(payload)) // limite)
+
+
+# Ida e volta por um par de sockets de verdade: os quadros enviados são os recebidos, na ordem.
+def test_ida_e_volta_por_socketpair():
+    payloads = [b"", b"a", b"b" * 1000, b"c" * (LIMITE_CONCATENAR + 1)]
+    escritor, leitor_sock = socket.socketpair()
+    with escritor, leitor_sock:
+        for payload in payloads:
+            enviar_quadro(escritor, payload)
+        encerrar_envio(escritor)
+        assert [bytes(visao) for visao in LeitorQuadros(leitor_sock, tamanho_buffer=64)] == payloads
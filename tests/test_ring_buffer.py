@@ -0,0 +1,79 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: tests/test_ring_buffer.py
+# DESCRIÇÃO: Testes do buffer circular SPSC (backend/shared_memory/ring_buffer.py):
+#            registros que dão a volta na área de dados, o marcador de fim do
+#            fluxo e os limites de capacidade. Escritor e leitor rodam no mesmo
+#            processo, alternando as chamadas.
+#
+# USO: python -m pytest tests/test_ring_buffer.py
+# -----------------------------------------------------------------------------
+
+import pytest
+
+from backend.shared_memory.ring_buffer import CABECALHO, FIM_DO_FLUXO, RingBufferSPSC
+
+
+# Registros que atravessam o fim da área de dados, inclusive com o cabeçalho partido ao meio.
+def test_registros_dao_a_volta_na_area_de_dados():
+    ring = RingBufferSPSC(16)
+    # 4 + 10 bytes: o próximo registro começa na posição 14, e o seu cabeçalho fica 2 bytes no fim
+    # da área e 2 no começo.
+    ring.escrever(b"0123456789")
+    assert ring.ler() == b"0123456789"
+    ring.escrever(b"abcde")
+    assert ring.ler() == b"abcde"
+    # Várias voltas seguidas, com tamanhos que não dividem a capacidade.
+    for i in range(50):
+        mensagem = bytes([i]) * (i % 12)
+        ring.escrever(mensagem)
+        assert ring.ler() == mensagem
+
+
+# Vários registros pendentes ao mesmo tempo saem na ordem em que foram escritos.
+def test_preserva_a_ordem_dos_registros():
+    ring = RingBufferSPSC(64)
+    mensagens = [b"a", b"", b"bb", b"ccc" * 5]
+    for mensagem in mensagens:
+        ring.escrever(mensagem)
+    assert [ring.ler() for _ in mensagens] == mensagens
+    assert ring.tentar_ler() == (False, None)
+
+
+# O marcador de fim do fluxo encerra a iteração depois das mensagens pendentes.
+def test_fim_do_fluxo_encerra_a_leitura():
+    ring = RingBufferSPSC(32)
+    ring.escrever(b"um")
+    ring.escrever(b"dois")
+    ring.fechar_escrita()
+    assert list(ring) == [b"um", b"dois"]
+    assert not ring.tem_dados()
+
+
+# O fim do fluxo é um registro só de cabeçalho, com o tamanho FIM_DO_FLUXO, mesmo dando a volta.
+def test_fim_do_fluxo_dando_a_volta():
+    ring = RingBufferSPSC(16)
+    ring.escrever(b"x" * 10)
+    ring.ler()
+    ring.fechar_escrita()
+    assert ring.tentar_ler() == (True, None)
+    assert ring.tentar_ler() == (False, None)
+    # Um tamanho real nunca se confunde com o marcador.
+    assert FIM_DO_FLUXO > ring.tamanho_maximo
+
+
+# Com o buffer cheio, tentar_escrever() devolve False até o leitor liberar espaço.
+def test_buffer_cheio_recusa_sem_esperar():
+    ring = RingBufferSPSC(16)
+    assert ring.tentar_escrever(b"x" * (16 - CABECALHO.size))
+    assert not ring.tentar_escrever(b"")
+    assert ring.ler() == b"x" * 12
+    assert ring.tentar_escrever(b"y")
+
+
+# Uma mensagem maior que a capacidade nunca caberia: é recusada na hora, em vez de esperar para sempre.
+def test_mensagem_maior_que_a_capacidade():
+    ring = RingBufferSPSC(16)
+    with pytest.raises(ValueError):
+        ring.escrever(b"x" * 13)
+    with pytest.raises(ValueError):
+        ring.tentar_escrever(b"x" * 13)
@@ -0,0 +1,107 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: tests/test_seqlock.py
+# DESCRIÇÃO: Testes da difusão por seqlock (backend/shared_memory/seqlock.py):
+#            versões publicadas, a leitura refeita quando o escritor está (ou
+#            entra) no meio de uma publicação e o fim das publicações. Escritor
+#            e leitor rodam no mesmo processo.
+#
+# USO: python -m pytest tests/test_seqlock.py
+# -----------------------------------------------------------------------------
+
+import threading
+import time
+
+import pytest
+
+from backend.shared_memory.seqlock import SeqlockBroadcast
+
+
+class DadosComEscritaNoMeio:
+    """Área de dados falsa: a primeira cópia feita pelo leitor dispara uma publicação no meio dela."""
+
+    def __init__(self, seqlock, nova):
+        self.seqlock = seqlock
+        self.nova = nova
+        self.original = seqlock._dados
+        self.copias = 0
+
+    def __getitem__(self, fatia):
+        copia = self.original[fatia]
+        self.copias += 1
+        if self.copias == 1:
+            # Publica com a área de dados verdadeira, como faria o escritor em outro processo.
+            self.seqlock._dados = self.original
+            self.seqlock.publicar(self.nova)
+            self.seqlock._dados = self
+        return copia
+
+
+# Cada publicação avança a versão em 1, e a leitura devolve o snapshot mais recente.
+def test_publicar_e_ler():
+    seqlock = SeqlockBroadcast(64)
+    assert seqlock.versao == 0
+    seqlock.publicar(b"primeiro")
+    seqlock.publicar(b"segundo")
+    versao, dados, instante = seqlock.ler()
+    assert (versao, dados) == (2, b"segundo")
+    assert instante > 0
+    assert seqlock.leituras_repetidas == 0
+
+
+# ler_se_nova() só copia quando há uma versão mais nova que a já vista.
+def test_ler_se_nova():
+    seqlock = SeqlockBroadcast(64)
+    assert seqlock.ler_se_nova(0) is None
+    seqlock.publicar(b"v1")
+    assert seqlock.ler_se_nova(0)[:2] == (1, b"v1")
+    assert seqlock.ler_se_nova(1) is None
+
+
+# Se o escritor publica no meio da cópia, seq muda: a cópia é descartada e a leitura refeita
+# devolve a versão nova, sem misturar as duas.
+def test_leitura_refeita_quando_a_versao_muda_no_meio():
+    seqlock = SeqlockBroadcast(64)
+    seqlock.publicar(b"antigo")
+    seqlock._dados = DadosComEscritaNoMeio(seqlock, b"novo")
+    assert seqlock.ler()[:2] == (2, b"novo")
+    assert seqlock.leituras_repetidas == 1
+
+
+# Com seq ímpar (escrita em andamento), o leitor espera até o escritor terminar a publicação.
+def test_leitura_espera_escrita_em_andamento():
+    seqlock = SeqlockBroadcast(64)
+    seqlock.publicar(b"antigo")
+    # Simula um escritor parado no meio da publicação: seq ímpar e os dados pela metade.
+    seqlock._seq[0] = 3
+    seqlock._dados[:6] = b"nov###"
+    resultado = []
+    leitor = threading.Thread(target=lambda: resultado.append(seqlock.ler()))
+    leitor.start()
+    time.sleep(0.05)
+    assert not resultado
+    # O escritor termina: dados completos e seq par de novo.
+    seqlock._tamanho[0] = 4
+    seqlock._dados[:4] = b"novo"
+    seqlock._seq[0] = 4
+    leitor.join(timeout=5)
+    assert resultado[0][:2] == (2, b"novo")
+    assert seqlock.leituras_repetidas > 0
+
+
+# esperar_nova() devolve None quando o escritor encerra sem publicar uma versão nova,
+# mas ainda entrega a última versão publicada antes do encerramento.
+def test_esperar_nova_depois_do_encerramento():
+    seqlock = SeqlockBroadcast(64)
+    seqlock.publicar(b"ultima")
+    seqlock.encerrar()
+    assert seqlock.esperar_nova(0)[:2] == (1, b"ultima")
+    assert seqlock.esperar_nova(1) is None
+
+
+# Um snapshot maior que a capacidade é recusado sem tocar na versão.
+def test_snapshot_maior_que_a_capacidade():
+    seqlock = SeqlockBroadcast(8)
+    with pytest.raises(ValueError):
+        seqlock.publicar(b"x" * 9)
+    assert seqlock.versao == 0
+
@@ -0,0 +1,89 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: tests/test_slabs.py
+# DESCRIÇÃO: Testes do alocador de slabs em memória compartilhada
+#            (backend/shared_memory/slabs.py): a escolha da classe de cada
+#            tamanho, o esgotamento de uma classe, a devolução dos slabs e as
+#            visões sobre os segmentos.
+#
+# USO: python -m pytest tests/test_slabs.py
+# -----------------------------------------------------------------------------
+
+import pickle
+
+import pytest
+
+from backend.shared_memory.slabs import PoolSlabs
+
+
+# Pool pequeno (classes de 1 KB e 4 KB, dois slabs em cada), removido do sistema no fim do teste.
+@pytest.fixture
+def pool():
+    pool = PoolSlabs(classes=(1024, 4096), slabs_por_classe=2)
+    yield pool
+    pool.remover()
+
+
+# Cada tamanho vai para a menor classe que o comporta; acima da maior, para nenhuma.
+def test_classe_para_cada_tamanho(pool):
+    assert pool.classe_para(0) == 0
+    assert pool.classe_para(1024) == 0
+    assert pool.classe_para(1025) == 1
+    assert pool.classe_para(4096) == 1
+    assert pool.classe_para(4097) is None
+    assert pool.tamanho_maximo == 4096
+
+
+# Com a classe esgotada, alocar() devolve None e conta a recusa, sem tomar slab de outra classe.
+def test_alocar_ate_esgotar_a_classe(pool):
+    assert pool.alocar(100) == (0, 0)
+    assert pool.alocar(1000) == (0, 1)
+    assert not pool.tem_livre(1000)
+    assert pool.alocar(1000) is None
+    assert pool.tem_livre(2000)
+    assert pool.alocar(5000) is None
+    assert (pool.alocacoes, pool.recusas) == (2, 2)
+
+
+# Um slab devolvido é o primeiro a ser reaproveitado (pilha), e volta a atender a classe esgotada.
+def test_liberar_devolve_o_slab(pool):
+    a = pool.alocar(10)
+    b = pool.alocar(10)
+    pool.liberar(*a)
+    assert pool.tem_livre(10)
+    assert pool.alocar(10) == a
+    pool.liberar(*b)
+    pool.liberar(*a)
+    assert pool.alocar(10) == a
+    assert pool.alocar(10) == b
+
+
+# As visões de slabs diferentes não se sobrepõem, e uma segunda abertura dos segmentos vê os mesmos bytes.
+def test_visoes_sobre_os_segmentos(pool):
+    outra = pool.reabrir()
+    try:
+        slabs = [pool.alocar(1024), pool.alocar(1024), pool.alocar(4096)]
+        for numero, (classe, indice) in enumerate(slabs):
+            tamanho = pool.classes[classe]
+            with pool.visao(classe, indice, tamanho) as visao:
+                visao[:] = bytes([numero + 1]) * tamanho
+        for numero, (classe, indice) in enumerate(slabs):
+            with outra.visao(classe, indice, 8) as visao:
+                assert bytes(visao) == bytes([numero + 1]) * 8
+        # A outra instância começa com todos os slabs livres.
+        assert outra.alocar(1024) == (0, 0)
+    finally:
+        outra.fechar()
+
+
+# Por pickle só viajam os nomes dos segmentos; o outro lado abre os mesmos segmentos.
+def test_pickle_abre_os_mesmos_segmentos(pool):
+    classe, indice = pool.alocar(3000)
+    with pool.visao(classe, indice, 5) as visao:
+        visao[:] = b"slabs"
+    copia = pickle.loads(pickle.dumps(pool))
+    try:
+        assert (copia.classes, copia.slabs_por_classe) == (pool.classes, pool.slabs_por_classe)
+        with copia.visao(classe, indice, 5) as visao:
+            assert bytes(visao) == b"slabs"
+    finally:
+        copia.fechar()
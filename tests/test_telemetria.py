@@ -0,0 +1,124 @@
+# -----------------------------------------------------------------------------
+# ARQUIVO: tests/test_telemetria.py
+# DESCRIÇÃO: Testes do formato binário do canal de telemetria
+#            (backend/telemetria.py): codificação e decodificação dos
+#            registros, a divisão das mensagens longas em fragmentos de até
+#            PIPE_BUF bytes e o limite do tamanho das mensagens.
+#
+# USO: python -m pytest tests/test_telemetria.py
+# -----------------------------------------------------------------------------
+
+import json
+import os
+
+from backend.telemetria import (
+    BIT_CONTINUA, CABECALHO_REGISTRO, EVENTO_LOG, EVENTO_PROGRESSO, EVENTO_RASTRO, EVENTO_RECURSOS, MARCA_RASTRO,
+    TAMANHO_MAXIMO_MENSAGEM, TAMANHO_MAXIMO_REGISTRO, DecodificadorTelemetria, codificar_registros, ler_canal,
+)
+
+
+# Decodifica uma sequência de registros entregue de uma vez.
+def decodificar(registros):
+    return DecodificadorTelemetria().alimentar(b"".join(registros))
+
+
+# Um log curto é um único registro, e volta com a origem, o PID e o instante.
+def test_log_curto_ida_e_volta():
+    registros = codificar_registros(EVENTO_LOG, "PROCESSO PAI (PID: 7)", "Olá, filho!", pid=7, instante_ns=123)
+    assert len(registros) == 1
+    tamanho, codigo, pid, instante_ns, tamanho_origem = CABECALHO_REGISTRO.unpack_from(registros[0])
+    assert (tamanho, codigo, pid, instante_ns) == (len(registros[0]), EVENTO_LOG, 7, 123)
+    assert tamanho_origem == len("PROCESSO PAI (PID: 7)")
+    assert decodificar(registros) == [{
+        "source": "PROCESSO PAI (PID: 7)", "event": "log", "pid": 7, "timestamp_ns": 123,
+        "payload": {"message": "Olá, filho!"},
+    }]
+
+
+# As marcas de rastreio levam a fase e a sequência em binário.
+def test_marca_de_rastreio():
+    registros = codificar_registros(EVENTO_RASTRO, "pai->filho", MARCA_RASTRO.pack(4, 42), pid=1, instante_ns=5)
+    (evento,) = decodificar(registros)
+    assert evento["trace"] == {"fase": "recebido", "seq": 42, "correlacao": "pai->filho#42"}
+
+
+# Uma mensagem que não cabe num registro é dividida em fragmentos de até PIPE_BUF bytes, todos menos o
+# último com BIT_CONTINUA, e volta inteira, mesmo com caracteres de vários bytes cortados no meio.
+def test_mensagem_longa_em_fragmentos():
+    mensagem = "ção" * 3000
+    registros = codificar_registros(EVENTO_LOG, "ORIGEM", mensagem, pid=3, instante_ns=9)
+    assert len(registros) > 1
+    assert all(len(registro) <= TAMANHO_MAXIMO_REGISTRO for registro in registros)
+    codigos = [CABECALHO_REGISTRO.unpack_from(registro)[1] for registro in registros]
+    assert codigos == [EVENTO_LOG | BIT_CONTINUA] * (len(registros) - 1) + [EVENTO_LOG]
+    (evento,) = decodificar(registros)
+    assert evento["payload"]["message"] == mensagem
+
+
+# Os eventos com corpo JSON nunca são cortados: o relatório volta completo e decodificável.
+def test_evento_estruturado_longo_chega_inteiro():
+    relatorio = {"papel": "SERVIDOR", "campos": list(range(2000))}
+    registros = codificar_registros(EVENTO_RECURSOS, "SERVIDOR (PID: 2)", json.dumps(relatorio), pid=2,
+                                    instante_ns=1)
+    assert len(registros) > 1
+    (evento,) = decodificar(registros)
+    assert evento["recursos"] == relatorio
+
+
+# Os fragmentos de processos diferentes podem chegar intercalados no pipe; cada mensagem é remontada
+# pelos fragmentos com o mesmo PID, instante e origem.
+def test_fragmentos_intercalados_de_varios_processos():
+    progresso = {"bytes": 10, "total": 20, "detalhes": "x" * 6000}
+    a = codificar_registros(EVENTO_PROGRESSO, "CLIENTE", json.dumps(progresso), pid=10, instante_ns=1)
+    b = codificar_registros(EVENTO_LOG, "SERVIDOR", "y" * 9000, pid=11, instante_ns=1)
+    intercalados = [registro for par in zip(a, b) for registro in par] + a[len(b):] + b[len(a):]
+    eventos = decodificar(intercalados)
+    assert sorted(evento["pid"] for evento in eventos) == [10, 11]
+    por_pid = {evento["pid"]: evento for evento in eventos}
+    assert por_pid[10]["progresso"] == progresso
+    assert por_pid[11]["payload"]["message"] == "y" * 9000
+
+
+# O fluxo do canal pode chegar em pedaços de qualquer tamanho, até byte a byte.
+def test_decodificador_alimentado_byte_a_byte():
+    fluxo = b"".join(registro for i in range(5)
+                     for registro in codificar_registros(EVENTO_LOG, "O", f"mensagem {i}" * (i * 100), pid=1,
+                                                         instante_ns=i + 1))
+    decodificador = DecodificadorTelemetria()
+    eventos = []
+    for i in range(len(fluxo)):
+        eventos.extend(decodificador.alimentar(fluxo[i:i + 1]))
+    assert [evento["payload"]["message"] for evento in eventos] == [f"mensagem {i}" * (i * 100) for i in range(5)]
+
+
+# Acima de TAMANHO_MAXIMO_MENSAGEM, um log é encurtado, com reticências no fim.
+def test_log_acima_do_maximo_e_encurtado():
+    registros = codificar_registros(EVENTO_LOG, "O", "z" * (TAMANHO_MAXIMO_MENSAGEM + 10), pid=1, instante_ns=1)
+    (evento,) = decodificar(registros)
+    mensagem = evento["payload"]["message"]
+    assert mensagem.endswith("…")
+    assert len(mensagem.encode("utf-8")) == TAMANHO_MAXIMO_MENSAGEM
+
+
+# Acima de TAMANHO_MAXIMO_MENSAGEM, um evento estruturado vira um log de erro, em vez de um JSON cortado.
+def test_evento_estruturado_acima_do_maximo_vira_log_de_erro():
+    corpo = json.dumps({"dados": "w" * TAMANHO_MAXIMO_MENSAGEM})
+    (evento,) = decodificar(codificar_registros(EVENTO_RECURSOS, "O", corpo, pid=1, instante_ns=1))
+    assert evento["event"] == "log"
+    assert "recursos" in evento["payload"]["message"]
+    assert str(len(corpo)) in evento["payload"]["message"]
+
+
+# Ida e volta por um pipe de verdade, lido por ler_canal() até a ponta de escrita fechar.
+def test_ler_canal_por_um_pipe():
+    fd_leitura, fd_escrita = os.pipe()
+    mensagens = ["curta", "longa" * 2000]
+    for mensagem in mensagens:
+        for registro in codificar_registros(EVENTO_LOG, "O", mensagem, pid=1, instante_ns=1):
+            os.write(fd_escrita, registro)
+    os.close(fd_escrita)
+    try:
+        eventos = [evento for bloco in ler_canal(fd_leitura, tamanho_leitura=1000) for evento in bloco]
+    finally:
+        os.close(fd_leitura)
+    assert [evento["payload"]["message"] for evento in eventos] == mensagens